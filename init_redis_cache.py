@@ -86,6 +86,12 @@ def main():
         
         elapsed = (datetime.now() - start_time).total_seconds()
         logger.info(f"✅ Cache initialization completed in {elapsed:.2f} seconds")
+        load_stats = cache_manager.last_load_stats
+        if load_stats:
+            logger.info(
+                f"Loaded {load_stats['keys']} keys in {load_stats['seconds']:.2f}s "
+                f"({load_stats['keys_per_second']:,.0f} keys/s)"
+            )
         
         # Show statistics if requested
         if args.stats:
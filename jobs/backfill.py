@@ -6,8 +6,14 @@ This script performs a one-time backfill of the last 90 days of network efficien
 data from CSV source files and BigQuery tables. It processes historical meter data
 to populate the sensor_readings table and materialized views.
 
+BigQuery tables are split into (day, node-group) partitions and backup files
+into one partition per file; partitions are extracted in worker processes,
+loaded by concurrent COPY writers and checkpointed, so re-running the same
+range resumes an interrupted backfill.
+
 Usage:
     python jobs/backfill.py [--days=90] [--start-date=YYYY-MM-DD] [--end-date=YYYY-MM-DD]
+                            [--processes=4] [--writers=4] [--node-groups=4]
     
 Examples:
     python jobs/backfill.py --days=90
@@ -18,23 +24,30 @@ import argparse
 import asyncio
 import logging
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 import pandas as pd
 import numpy as np
 from google.cloud import bigquery
 import asyncpg
-from concurrent.futures import ThreadPoolExecutor
-from tqdm import tqdm
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.infrastructure.database.postgres_manager import get_postgres_manager
+from src.infrastructure.database.copy_loader import DISTRICT_METADATA
+from src.infrastructure.database.node_registry import NodeRegistry
 from src.infrastructure.bigquery.bigquery_client import BigQueryClient
 from src.infrastructure.cache.redis_cache_manager import RedisCacheManager
+from src.infrastructure.etl.partitioned_backfill import (
+    BackfillPartition,
+    BigQueryPartitionExtractor,
+    PartitionedBackfill,
+    day_bounds,
+    plan_partitions,
+)
 
 # Setup logging
 logging.basicConfig(
@@ -61,28 +74,45 @@ CSV_SOURCES = {
 class NetworkEfficiencyBackfill:
     """Backfill pipeline for network efficiency historical data."""
     
-    def __init__(self, batch_size: int = 10000, max_workers: int = 4):
+    def __init__(
+        self,
+        batch_size: int = 10000,
+        max_workers: int = 4,
+        writers: int = 4,
+        node_groups: int = 4
+    ):
         """
         Initialize backfill pipeline.
         
         Args:
             batch_size: Number of records to process in each batch
-            max_workers: Maximum concurrent workers for parallel processing
+            max_workers: Worker processes for extraction and parsing
+            writers: Concurrent COPY writers
+            node_groups: Node groups per day when partitioning BigQuery tables
         """
         self.batch_size = batch_size
         self.max_workers = max_workers
+        self.writers = writers
+        self.node_groups = node_groups
         self.bigquery_client = BigQueryClient()
         self.postgres_manager = None
+        self.node_registry = None
         self.redis_manager = RedisCacheManager()
+        # Replace readings already loaded instead of skipping them
+        self.overwrite = False
         
         # Backfill statistics
         self.stats = {
             'total_records': 0,
             'processed_records': 0,
             'failed_records': 0,
+            'skipped_records': 0,
             'nodes_processed': 0,
             'csv_files_processed': 0,
             'bigquery_tables_processed': 0,
+            'partitions_completed': 0,
+            'partitions_resumed': 0,
+            'partitions_failed': 0,
             'start_time': None,
             'end_time': None,
             'date_range': None
@@ -91,6 +121,7 @@ class NetworkEfficiencyBackfill:
     async def initialize(self) -> None:
         """Initialize database connections."""
         self.postgres_manager = await get_postgres_manager()
+        self.node_registry = NodeRegistry(self.postgres_manager)
         await self.redis_manager.initialize()
         logger.info("Network Efficiency Backfill initialized")
         
@@ -103,15 +134,21 @@ class NetworkEfficiencyBackfill:
         """
         Backfill historical data for the specified date range.
         
+        The range is widened to whole UTC days so that a rerun, even one
+        started later, plans the same checkpointed partitions.
+        
         Args:
             start_date: Start date for backfill
             end_date: End date for backfill
-            force_refresh: Force refresh even if data exists
+            force_refresh: Overwrite readings that already exist instead
+                of skipping them
             
         Returns:
             Backfill execution statistics
         """
+        start_date, end_date = day_bounds(start_date, end_date)
         logger.info(f"Starting backfill from {start_date} to {end_date}")
+        self.overwrite = force_refresh
         self.stats['start_time'] = datetime.now()
         self.stats['date_range'] = f"{start_date.date()} to {end_date.date()}"
         
@@ -130,13 +167,9 @@ class NetworkEfficiencyBackfill:
                 }
             })
             
-            # Check if data already exists (unless force refresh)
-            if not force_refresh:
-                existing_count = await self._check_existing_data(start_date, end_date)
-                if existing_count > 0:
-                    logger.info(f"Found {existing_count} existing records in date range")
-                    logger.info("Use --force-refresh to override existing data")
-                    
+            # Re-running a range is safe: readings already loaded are skipped
+            # by the (node_id, timestamp) upsert, or replaced with --force-refresh
+            
             # Step 1: Backfill from BigQuery sources
             await self._backfill_from_bigquery(start_date, end_date)
             
@@ -176,7 +209,7 @@ class NetworkEfficiencyBackfill:
             raise
             
     async def _backfill_from_bigquery(self, start_date: datetime, end_date: datetime) -> None:
-        """Backfill data from BigQuery sources."""
+        """Backfill data from BigQuery sources, partitioned by day and node group."""
         logger.info("Backfilling from BigQuery sources")
         
         # List of BigQuery tables to process
@@ -191,25 +224,33 @@ class NetworkEfficiencyBackfill:
         
         for table in tables:
             try:
-                await self._backfill_from_bigquery_table(table, start_date, end_date)
+                extractor = BigQueryPartitionExtractor(
+                    self._bigquery_table_query(table),
+                    self.bigquery_client.project_id,
+                    self.bigquery_client.dataset_id
+                )
+                partitions = plan_partitions(
+                    f'bigquery_{table}', start_date, end_date, groups=self.node_groups
+                )
+                await self._run_partitioned(extractor, partitions, f'bigquery_{table}')
                 self.stats['bigquery_tables_processed'] += 1
                 
             except Exception as e:
                 logger.error(f"Error backfilling from BigQuery table {table}: {e}")
                 self.stats['failed_records'] += 1
                 
-    async def _backfill_from_bigquery_table(
-        self,
-        table_name: str,
-        start_date: datetime,
-        end_date: datetime
-    ) -> None:
-        """Backfill data from a specific BigQuery table."""
-        logger.info(f"Processing BigQuery table: {table_name}")
+    def _bigquery_table_query(self, table_name: str) -> str:
+        """
+        Build the extraction query for a BigQuery table.
+        
+        The query is filtered per partition by @start/@end and the
+        {partition_filter} node-group clause (see BigQueryPartitionExtractor).
+        """
+        table = f"`{self.bigquery_client.project_id}.{self.bigquery_client.dataset_id}.{table_name}`"
         
         # Handle different table schemas
         if table_name == 'sensor_readings_ml':
-            query = f"""
+            return f"""
             SELECT 
                 timestamp,
                 node_id,
@@ -221,13 +262,14 @@ class NetworkEfficiencyBackfill:
                 data_quality_score as quality_score,
                 district_id,
                 district_name
-            FROM `{self.bigquery_client.project_id}.{self.bigquery_client.dataset_id}.{table_name}`
-            WHERE timestamp BETWEEN @start_date AND @end_date
+            FROM {table}
+            WHERE timestamp >= @start AND timestamp < @end
             AND data_quality_score > 0.3
-            ORDER BY timestamp
+            {{partition_filter}}
+            ORDER BY node_id, timestamp
             """
         elif table_name == 'v_sensor_readings_normalized':
-            query = f"""
+            return f"""
             SELECT 
                 timestamp,
                 node_id,
@@ -239,13 +281,14 @@ class NetworkEfficiencyBackfill:
                 1.0 as quality_score,
                 'legacy' as district_id,
                 'Legacy System' as district_name
-            FROM `{self.bigquery_client.project_id}.{self.bigquery_client.dataset_id}.{table_name}`
-            WHERE timestamp BETWEEN @start_date AND @end_date
-            ORDER BY timestamp
+            FROM {table}
+            WHERE timestamp >= @start AND timestamp < @end
+            {{partition_filter}}
+            ORDER BY node_id, timestamp
             """
         else:
             # Generic sensor_data table
-            query = f"""
+            return f"""
             SELECT 
                 timestamp,
                 node_id,
@@ -257,29 +300,50 @@ class NetworkEfficiencyBackfill:
                 0.8 as quality_score,
                 SPLIT('{table_name}', '.')[0] as district_id,
                 SPLIT('{table_name}', '.')[0] as district_name
-            FROM `{self.bigquery_client.project_id}.{self.bigquery_client.dataset_id}.{table_name}`
-            WHERE timestamp BETWEEN @start_date AND @end_date
+            FROM {table}
+            WHERE timestamp >= @start AND timestamp < @end
             AND flow_rate IS NOT NULL
-            ORDER BY timestamp
+            {{partition_filter}}
+            ORDER BY node_id, timestamp
             """
             
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("start_date", "TIMESTAMP", start_date),
-                bigquery.ScalarQueryParameter("end_date", "TIMESTAMP", end_date),
-            ]
+    async def _run_partitioned(
+        self,
+        extract,
+        partitions: List[BackfillPartition],
+        source: str
+    ) -> None:
+        """
+        Load partitions through the process pool and concurrent COPY writers.
+        
+        Checkpoints are kept per source: partition keys carry their own
+        bounds, so a rerun over a shifted range still skips the days it
+        already loaded.
+        """
+        runner = PartitionedBackfill(
+            self.postgres_manager,
+            extract,
+            job_name=f'backfill_{source}',
+            processes=self.max_workers,
+            writers=self.writers,
+            batch_size=self.batch_size,
+            load_options={
+                'source_metadata': {'source': source, 'backfill': True},
+                'metadata_columns': DISTRICT_METADATA,
+                'default_quality_score': 0.7,
+                'overwrite': self.overwrite
+            },
+            before_load=self._ensure_nodes_exist
         )
+        stats = await runner.run(partitions)
+        
+        self.stats['processed_records'] += stats['rows_loaded']
+        self.stats['skipped_records'] += stats['rows_skipped']
+        self.stats['total_records'] += stats['rows_loaded'] + stats['rows_skipped']
+        self.stats['partitions_completed'] += stats['partitions_completed']
+        self.stats['partitions_resumed'] += stats['partitions_resumed']
+        self.stats['partitions_failed'] += stats['partitions_failed']
         
-        try:
-            df = self.bigquery_client.client.query(query, job_config=job_config).to_dataframe()
-            
-            if not df.empty:
-                await self._process_and_load_data(df, f'bigquery_{table_name}')
-                logger.info(f"Processed {len(df)} records from BigQuery table {table_name}")
-                
-        except Exception as e:
-            logger.error(f"Error querying BigQuery table {table_name}: {e}")
-            
     async def _backfill_from_csv_files(self, start_date: datetime, end_date: datetime) -> None:
         """Backfill data from CSV files."""
         logger.info("Backfilling from CSV files")
@@ -331,7 +395,8 @@ class NetworkEfficiencyBackfill:
         except Exception as e:
             logger.error(f"Error processing CSV file {file_path}: {e}")
             
-    def _standardize_csv_columns(self, df: pd.DataFrame, source_name: str) -> pd.DataFrame:
+    @staticmethod
+    def _standardize_csv_columns(df: pd.DataFrame, source_name: str) -> pd.DataFrame:
         """Standardize CSV column names to match our schema."""
         column_mapping = {
             # Common mappings
@@ -400,39 +465,23 @@ class NetworkEfficiencyBackfill:
             logger.warning(f"Backup directory not found: {backup_dir}")
             return
             
-        # Process backup files in parallel
-        backup_files = list(backup_dir.glob("**/*.csv"))
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            tasks = []
-            
-            for file_path in backup_files:
-                task = executor.submit(
-                    self._process_backup_file_sync,
-                    file_path,
-                    start_date,
-                    end_date
-                )
-                tasks.append(task)
-                
-            for task in tqdm(tasks, desc="Processing backup files"):
-                try:
-                    result = task.result()
-                    if result:
-                        await self._process_and_load_data(result, 'backup_data')
-                        self.stats['csv_files_processed'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing backup file: {e}")
-                    self.stats['failed_records'] += 1
+        # One partition per file: parsed in worker processes, loaded concurrently
+        backup_files = sorted(backup_dir.glob("**/*.csv"))
+        partitions = [
+            BackfillPartition(source=str(file_path), start=start_date, end=end_date)
+            for file_path in backup_files
+        ]
+        before = self.stats['partitions_completed']
+        await self._run_partitioned(parse_backup_partition, partitions, 'backup_data')
+        self.stats['csv_files_processed'] += self.stats['partitions_completed'] - before
                     
+    @staticmethod
     def _process_backup_file_sync(
-        self,
         file_path: Path,
         start_date: datetime,
         end_date: datetime
     ) -> Optional[pd.DataFrame]:
-        """Process backup file synchronously (for thread pool)."""
+        """Process backup file synchronously (for worker processes)."""
         try:
             df = pd.read_csv(file_path)
             
@@ -440,7 +489,7 @@ class NetworkEfficiencyBackfill:
             node_id = file_path.stem.split('_')[0]
             
             # Standardize columns
-            df = self._standardize_csv_columns(df, f'backup_{node_id}')
+            df = NetworkEfficiencyBackfill._standardize_csv_columns(df, f'backup_{node_id}')
             
             # Filter by date range
             if 'timestamp' in df.columns:
@@ -462,83 +511,53 @@ class NetworkEfficiencyBackfill:
             return
             
         # Ensure nodes exist
-        unique_nodes = df['node_id'].unique()
-        await self._ensure_nodes_exist(unique_nodes, df)
+        await self._ensure_nodes_exist(df)
         
         # Process in batches
         for i in range(0, len(df), self.batch_size):
             batch_df = df.iloc[i:i + self.batch_size]
             
-            # Convert to readings format
-            readings = []
-            for _, row in batch_df.iterrows():
-                reading = {
-                    'timestamp': row['timestamp'].to_pydatetime(),
-                    'node_id': str(row['node_id']),
-                    'temperature': float(row['temperature']) if pd.notna(row['temperature']) else None,
-                    'flow_rate': float(row['flow_rate']) if pd.notna(row['flow_rate']) else None,
-                    'pressure': float(row['pressure']) if pd.notna(row['pressure']) else None,
-                    'total_flow': float(row['total_flow']) if pd.notna(row['total_flow']) else None,
-                    'quality_score': float(row['quality_score']) if pd.notna(row['quality_score']) else 0.7,
-                    'is_interpolated': False,
-                    'raw_data': {
-                        'source': source,
-                        'district_id': row.get('district_id', 'unknown'),
-                        'district_name': row.get('district_name', 'Unknown'),
-                        'backfill': True
-                    }
-                }
-                readings.append(reading)
-                
-            # Insert batch into PostgreSQL
+            # Insert batch into PostgreSQL (columnar COPY, no per-row dicts)
             try:
-                inserted = await self.postgres_manager.insert_sensor_readings_batch(readings)
+                inserted = await self.postgres_manager.insert_sensor_readings_frame(
+                    batch_df,
+                    source_metadata={'source': source, 'backfill': True},
+                    metadata_columns=DISTRICT_METADATA,
+                    default_quality_score=0.7,
+                    overwrite=self.overwrite
+                )
                 self.stats['processed_records'] += inserted
-                self.stats['total_records'] += len(readings)
+                self.stats['skipped_records'] += len(batch_df) - inserted
+                self.stats['total_records'] += len(batch_df)
                 
             except Exception as e:
                 logger.error(f"Failed to insert batch from {source}: {e}")
-                self.stats['failed_records'] += len(readings)
+                self.stats['failed_records'] += len(batch_df)
                 
-    async def _ensure_nodes_exist(self, node_ids: List[str], df: pd.DataFrame) -> None:
-        """Ensure all nodes exist in the nodes table."""
-        for node_id in node_ids:
-            node_data = df[df['node_id'] == node_id].iloc[0]
-            
-            node_info = {
+    async def _ensure_nodes_exist(self, df: pd.DataFrame) -> None:
+        """Ensure all nodes referenced by a batch exist in the nodes table."""
+        backfill_timestamp = (self.stats['start_time'] or datetime.now()).isoformat()
+        
+        def node_info(row: Dict[str, Any]) -> Dict[str, Any]:
+            node_id = row['node_id']
+            return {
                 'node_id': str(node_id),
-                'node_name': node_data.get('node_name', f'Node {node_id}'),
+                'node_name': row.get('node_name', f'Node {node_id}'),
                 'node_type': 'meter',
-                'location_name': node_data.get('district_name', 'Unknown'),
-                'latitude': None,
-                'longitude': None,
-                'installation_date': None,
-                'last_maintenance_date': None,
+                'location_name': row.get('district_name', 'Unknown'),
                 'is_active': True,
                 'metadata': {
-                    'district_id': node_data.get('district_id', 'unknown'),
-                    'district_name': node_data.get('district_name', 'Unknown'),
+                    'district_id': row.get('district_id', 'unknown'),
+                    'district_name': row.get('district_name', 'Unknown'),
                     'data_source': 'backfill',
-                    'backfill_timestamp': datetime.now().isoformat()
+                    'backfill_timestamp': backfill_timestamp
                 }
             }
             
-            try:
-                await self.postgres_manager.upsert_node(node_info)
-                self.stats['nodes_processed'] += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to upsert node {node_id}: {e}")
-                
-    async def _check_existing_data(self, start_date: datetime, end_date: datetime) -> int:
-        """Check if data already exists in PostgreSQL."""
-        async with self.postgres_manager.acquire() as conn:
-            count = await conn.fetchval("""
-                SELECT COUNT(*)
-                FROM water_infrastructure.sensor_readings
-                WHERE timestamp BETWEEN $1 AND $2
-            """, start_date, end_date)
-            return count
+        try:
+            self.stats['nodes_processed'] += await self.node_registry.ensure_nodes(df, node_info)
+        except Exception as e:
+            logger.error(f"Failed to upsert nodes: {e}")
             
     async def _refresh_materialized_views(self) -> None:
         """Refresh materialized views after backfill."""
@@ -560,13 +579,23 @@ class NetworkEfficiencyBackfill:
                     logger.error(f"Error refreshing materialized view {view}: {e}")
 
 
+def parse_backup_partition(partition: BackfillPartition) -> Optional[pd.DataFrame]:
+    """Parse one backup CSV file (the partition source is its path) in a worker process."""
+    return NetworkEfficiencyBackfill._process_backup_file_sync(
+        Path(partition.source), partition.start, partition.end
+    )
+
+
 async def main():
     """Main backfill execution function."""
     parser = argparse.ArgumentParser(description='Network Efficiency ETL Backfill')
     parser.add_argument('--days', type=int, default=90, help='Number of days to backfill')
     parser.add_argument('--start-date', type=str, help='Start date (YYYY-MM-DD)')
     parser.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD)')
-    parser.add_argument('--force-refresh', action='store_true', help='Force refresh existing data')
+    parser.add_argument('--force-refresh', action='store_true', help='Overwrite readings that already exist')
+    parser.add_argument('--processes', type=int, default=4, help='Worker processes for extraction')
+    parser.add_argument('--writers', type=int, default=4, help='Concurrent COPY writers')
+    parser.add_argument('--node-groups', type=int, default=4, help='Node groups per day partition')
     
     args = parser.parse_args()
     
@@ -575,10 +604,15 @@ async def main():
         start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
         end_date = datetime.strptime(args.end_date, '%Y-%m-%d')
     else:
-        end_date = datetime.now()
+        # Widened to whole UTC days by backfill_data
+        end_date = datetime.now(timezone.utc).replace(tzinfo=None)
         start_date = end_date - timedelta(days=args.days)
     
-    backfill = NetworkEfficiencyBackfill()
+    backfill = NetworkEfficiencyBackfill(
+        max_workers=args.processes,
+        writers=args.writers,
+        node_groups=args.node_groups
+    )
     
     try:
         await backfill.initialize()
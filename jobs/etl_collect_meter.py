@@ -16,7 +16,7 @@ import logging
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Optional, Any
 import pandas as pd
 from google.cloud import bigquery
 import asyncpg
@@ -26,6 +26,8 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.infrastructure.database.postgres_manager import get_postgres_manager
+from src.infrastructure.database.copy_loader import DISTRICT_METADATA
+from src.infrastructure.database.node_registry import NodeRegistry
 from src.infrastructure.bigquery.bigquery_client import BigQueryClient
 from src.infrastructure.cache.redis_cache_manager import RedisCacheManager
 
@@ -54,6 +56,7 @@ class NetworkEfficiencyETL:
         self.batch_size = batch_size
         self.bigquery_client = BigQueryClient()
         self.postgres_manager = None
+        self.node_registry = None
         self.redis_manager = RedisCacheManager()
         
         # ETL statistics
@@ -61,6 +64,7 @@ class NetworkEfficiencyETL:
             'total_records': 0,
             'processed_records': 0,
             'failed_records': 0,
+            'skipped_records': 0,
             'nodes_processed': 0,
             'start_time': None,
             'end_time': None
@@ -69,8 +73,9 @@ class NetworkEfficiencyETL:
     async def initialize(self) -> None:
         """Initialize database connections."""
         self.postgres_manager = await get_postgres_manager()
+        self.node_registry = NodeRegistry(self.postgres_manager)
         # Fix: Use the correct method name and add bigquery_client assignment
-        self.redis_manager.bigquery_client = self.bigquery_client
+        self.redis_manager.bigquery_client = self.bigquery_client.client
         self.redis_manager.initialize_cache()
         logger.info("Network Efficiency ETL initialized")
         
@@ -168,7 +173,7 @@ class NetworkEfficiencyETL:
         )
         
         try:
-            df = self.bigquery_client.client.query(query, job_config=job_config).to_dataframe()
+            df = self.bigquery_client.arrow.read_dataframe(query, job_config)
             
             if not df.empty:
                 await self._process_and_load_data(df, 'sensor_readings_ml')
@@ -207,7 +212,7 @@ class NetworkEfficiencyETL:
         )
         
         try:
-            df = self.bigquery_client.client.query(query, job_config=job_config).to_dataframe()
+            df = self.bigquery_client.arrow.read_dataframe(query, job_config)
             
             if not df.empty:
                 await self._process_and_load_data(df, 'normalized_readings')
@@ -248,7 +253,7 @@ class NetworkEfficiencyETL:
         )
         
         try:
-            df = self.bigquery_client.client.query(query, job_config=job_config).to_dataframe()
+            df = self.bigquery_client.arrow.read_dataframe(query, job_config)
             
             if not df.empty:
                 await self._process_and_load_data(df, 'legacy_sources')
@@ -264,72 +269,51 @@ class NetworkEfficiencyETL:
             return
             
         # Ensure nodes exist
-        unique_nodes = df['node_id'].unique()
-        await self._ensure_nodes_exist(unique_nodes, df)
+        await self._ensure_nodes_exist(df)
         
         # Process in batches
         for i in range(0, len(df), self.batch_size):
             batch_df = df.iloc[i:i + self.batch_size]
             
-            # Convert to readings format
-            readings = []
-            for _, row in batch_df.iterrows():
-                reading = {
-                    'timestamp': row['timestamp'].to_pydatetime(),
-                    'node_id': str(row['node_id']),
-                    'temperature': float(row['temperature']) if pd.notna(row['temperature']) else None,
-                    'flow_rate': float(row['flow_rate']) if pd.notna(row['flow_rate']) else None,
-                    'pressure': float(row['pressure']) if pd.notna(row['pressure']) else None,
-                    'total_flow': float(row['total_flow']) if pd.notna(row['total_flow']) else None,
-                    'quality_score': float(row['quality_score']) if pd.notna(row['quality_score']) else 1.0,
-                    'is_interpolated': False,
-                    'raw_data': {
-                        'source': source,
-                        'district_id': row.get('district_id', 'unknown'),
-                        'district_name': row.get('district_name', 'Unknown')
-                    }
-                }
-                readings.append(reading)
-                
-            # Insert batch into PostgreSQL
+            # Insert batch into PostgreSQL (columnar COPY, no per-row dicts)
             try:
-                inserted = await self.postgres_manager.insert_sensor_readings_batch(readings)
+                inserted = await self.postgres_manager.insert_sensor_readings_frame(
+                    batch_df,
+                    source_metadata={'source': source},
+                    metadata_columns=DISTRICT_METADATA,
+                    default_quality_score=1.0
+                )
                 self.stats['processed_records'] += inserted
+                # Overlapping collection windows re-read readings already stored
+                self.stats['skipped_records'] += len(batch_df) - inserted
                 logger.debug(f"Inserted {inserted} readings from {source}")
                 
             except Exception as e:
                 logger.error(f"Failed to insert batch from {source}: {e}")
-                self.stats['failed_records'] += len(readings)
+                self.stats['failed_records'] += len(batch_df)
                 
-    async def _ensure_nodes_exist(self, node_ids: List[str], df: pd.DataFrame) -> None:
-        """Ensure all nodes exist in the nodes table."""
-        for node_id in node_ids:
-            node_data = df[df['node_id'] == node_id].iloc[0]
-            
-            node_info = {
+    async def _ensure_nodes_exist(self, df: pd.DataFrame) -> None:
+        """Ensure all nodes referenced by a batch exist in the nodes table."""
+        def node_info(row: Dict[str, Any]) -> Dict[str, Any]:
+            node_id = row['node_id']
+            return {
                 'node_id': str(node_id),
-                'node_name': node_data.get('node_name', f'Node {node_id}'),
+                'node_name': row.get('node_name', f'Node {node_id}'),
                 'node_type': 'meter',
-                'location_name': node_data.get('district_name', 'Unknown'),
-                'latitude': None,
-                'longitude': None,
-                'installation_date': None,
-                'last_maintenance_date': None,
+                'location_name': row.get('district_name', 'Unknown'),
                 'is_active': True,
                 'metadata': {
-                    'district_id': node_data.get('district_id', 'unknown'),
-                    'district_name': node_data.get('district_name', 'Unknown'),
+                    'district_id': row.get('district_id', 'unknown'),
+                    'district_name': row.get('district_name', 'Unknown'),
                     'data_source': 'etl_collect_meter'
                 }
             }
             
-            try:
-                await self.postgres_manager.upsert_node(node_info)
-                self.stats['nodes_processed'] += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to upsert node {node_id}: {e}")
-                
+        try:
+            self.stats['nodes_processed'] += await self.node_registry.ensure_nodes(df, node_info)
+        except Exception as e:
+            logger.error(f"Failed to upsert nodes: {e}")
+            
     async def _update_cache(self) -> None:
         """Update Redis cache with latest readings."""
         try:
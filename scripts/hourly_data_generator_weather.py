@@ -273,8 +273,34 @@ async def insert_sensor_readings(
     VALUES ($1, $2, $3, $4, $5, $6, $7, $8);
     """
     
+    # Keep the latest-reading index in step with the hypertable
+    latest_query = """
+    INSERT INTO water_infrastructure.latest_readings
+    (timestamp, node_id, temperature, flow_rate, pressure, total_flow, quality_score)
+    SELECT DISTINCT ON (node_id)
+        timestamp, node_id, temperature, flow_rate, pressure, total_flow, quality_score
+    FROM water_infrastructure.sensor_readings
+    WHERE node_id = ANY($1) AND timestamp >= $2
+    ORDER BY node_id, timestamp DESC
+    ON CONFLICT (node_id) DO UPDATE SET
+        timestamp = EXCLUDED.timestamp,
+        temperature = EXCLUDED.temperature,
+        flow_rate = EXCLUDED.flow_rate,
+        pressure = EXCLUDED.pressure,
+        total_flow = EXCLUDED.total_flow,
+        quality_score = EXCLUDED.quality_score,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE latest_readings.timestamp < EXCLUDED.timestamp;
+    """
+    
     try:
-        await conn.executemany(query, readings)
+        async with conn.transaction():
+            await conn.executemany(query, readings)
+            await conn.execute(
+                latest_query,
+                sorted({r[1] for r in readings}),
+                min(r[0] for r in readings)
+            )
         return len(readings)
     except Exception as e:
         logger.error(f"Error inserting readings: {e}")
@@ -16,7 +16,13 @@ from pydantic import BaseModel, Field
 import uvicorn
 
 from src.infrastructure.database.postgres_manager import get_postgres_manager
+from src.infrastructure.cache.async_redis import get_async_redis
+from src.infrastructure.data.live_feed import LiveFeedRelay
 from src.infrastructure.cache.redis_cache_manager import RedisCacheManager
+from src.presentation.api.columnar import ResponseFormat, columnar_response, record_columns
+from src.presentation.api.endpoints.live_router import router as live_router
+from src.presentation.api.middleware.instrumentation import instrument_app
+from src.presentation.api.middleware.response_cache import enable_response_cache
 
 
 # Pydantic models for API responses
@@ -85,8 +91,13 @@ async def lifespan(app: FastAPI):
         redis_host=os.getenv("REDIS_HOST", "localhost"),
         redis_port=int(os.getenv("REDIS_PORT", "6379"))
     )
+    # Batches written by ingestion processes, relayed to stream subscribers
+    app.state.live_relay = LiveFeedRelay(get_async_redis())
+    app.state.live_relay.start()
     yield
     # Shutdown
+    await app.state.live_relay.stop()
+    await app.state.redis.async_client.close()
     await app.state.postgres.close()
 
 
@@ -98,6 +109,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Validators, 304s and a body cache for ranged GETs; added first so CORS
+# and instrumentation still wrap cached responses
+enable_response_cache(app)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -107,6 +122,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics (per-route latency, errors, in-flight) served on /api/v1/metrics
+instrument_app(app)
+
+# Push stream of latest readings and anomalies (SSE and WebSocket)
+app.include_router(live_router)
+
 
 # Health check endpoint
 @app.get("/health")
@@ -126,6 +147,20 @@ async def get_nodes():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/v1/nodes/metrics", response_model=List[NodeMetrics])
+async def get_nodes_metrics(
+    node_ids: Optional[List[str]] = Query(None, description="Nodes to include (all nodes when omitted)"),
+    time_window: str = Query("1hour", description="Time window: 5min, 1hour, 1day")
+):
+    """Get latest metrics for many nodes in one request."""
+    try:
+        results = await app.state.postgres.get_latest_node_metrics(node_ids, time_window)
+        return [NodeMetrics(**result) for result in results]
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/v1/nodes/{node_id}/metrics", response_model=NodeMetrics)
 async def get_node_metrics(
     node_id: str,
@@ -133,29 +168,12 @@ async def get_node_metrics(
 ):
     """Get latest metrics for a specific node."""
     try:
-        async with app.state.postgres.acquire() as conn:
-            result = await conn.fetchrow("""
-                SELECT 
-                    cm.node_id,
-                    n.node_name,
-                    cm.window_end as timestamp,
-                    cm.avg_flow_rate as flow_rate,
-                    cm.avg_pressure as pressure,
-                    cm.avg_temperature as temperature,
-                    COALESCE(cm.quality_score * 100, 95.0) as efficiency,
-                    cm.anomaly_count
-                FROM water_infrastructure.computed_metrics cm
-                JOIN water_infrastructure.nodes n ON cm.node_id = n.node_id
-                WHERE cm.node_id = $1 
-                AND cm.time_window = $2
-                ORDER BY cm.window_end DESC
-                LIMIT 1
-            """, node_id, time_window)
+        results = await app.state.postgres.get_latest_node_metrics([node_id], time_window)
             
-        if not result:
+        if not results:
             raise HTTPException(status_code=404, detail="Node metrics not found")
             
-        return NodeMetrics(**dict(result))
+        return NodeMetrics(**results[0])
         
     except HTTPException:
         raise
@@ -163,12 +181,19 @@ async def get_node_metrics(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+HISTORY_COLUMNS = [
+    "window_start", "window_end", "avg_flow_rate", "avg_pressure", "avg_temperature",
+    "total_volume", "anomaly_count", "quality_score",
+]
+
+
 @app.get("/api/v1/nodes/{node_id}/history")
 async def get_node_history(
     node_id: str,
     start_time: Optional[datetime] = Query(None, description="Start time for history"),
     end_time: Optional[datetime] = Query(None, description="End time for history"),
-    time_window: str = Query("1hour", description="Time window: 5min, 1hour, 1day")
+    time_window: str = Query("1hour", description="Time window: 5min, 1hour, 1day"),
+    response_format: ResponseFormat = Query(ResponseFormat.ROWS, alias="format", description="rows, columnar (arrays with epoch-ms timestamps) or arrow (IPC stream)")
 ):
     """Get historical metrics for a node."""
     try:
@@ -197,6 +222,10 @@ async def get_node_history(
                 ORDER BY window_start
             """, node_id, time_window, start_time, end_time)
             
+        if response_format != ResponseFormat.ROWS:
+            return columnar_response(
+                record_columns(results, HISTORY_COLUMNS), response_format, time_column="window_start"
+            )
         return [dict(r) for r in results]
         
     except Exception as e:
@@ -212,17 +241,17 @@ async def get_network_metrics(
     try:
         # Try Redis cache first
         cache_key = f"system:metrics:{time_range}"
-        cached = app.state.redis.redis_client.hgetall(cache_key)
+        cached = await app.state.redis.get_hash(cache_key)
         
         if cached:
             return NetworkMetrics(
                 timestamp=datetime.now(timezone.utc),
-                active_nodes=int(cached.get(b'active_nodes', 0)),
-                total_flow=float(cached.get(b'total_flow', 0)),
-                avg_pressure=float(cached.get(b'avg_pressure', 0)),
-                total_volume=float(cached.get(b'total_volume', 0)),
+                active_nodes=int(float(cached.get('active_nodes', 0))),
+                total_flow=float(cached.get('total_flow', 0)),
+                avg_pressure=float(cached.get('avg_pressure', 0)),
+                total_volume=float(cached.get('total_volume', 0)),
                 efficiency_percentage=95.0,  # Placeholder
-                anomaly_count=int(cached.get(b'anomaly_count', 0))
+                anomaly_count=int(float(cached.get('anomaly_count', 0)))
             )
             
         # Fallback to database
@@ -398,11 +427,11 @@ async def get_system_status():
             """)
             
         # Check Redis status
-        redis_info = app.state.redis.redis_client.info()
+        redis_info = await app.state.redis.async_client.info()
         redis_status = {
             "connected": True,
             "memory_used": redis_info.get("used_memory_human", "Unknown"),
-            "keys": app.state.redis.redis_client.dbsize()
+            "keys": await app.state.redis.async_client.dbsize()
         }
         
         processing_status = "healthy"
@@ -505,16 +534,8 @@ async def get_dashboard_summary():
                     0 as anomaly_count,
                     sr.quality_score
                 FROM water_infrastructure.nodes n
-                LEFT JOIN LATERAL (
-                    SELECT 
-                        flow_rate,
-                        pressure,
-                        quality_score
-                    FROM water_infrastructure.sensor_readings
-                    WHERE node_id = n.node_id
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                ) sr ON TRUE
+                LEFT JOIN water_infrastructure.latest_readings sr
+                    ON sr.node_id = n.node_id
                 WHERE n.is_active = TRUE
             """)
             
@@ -27,14 +27,11 @@ from src.schemas.api.consumption import (
 )
 from src.infrastructure.data.hybrid_data_service import get_hybrid_data_service
 from src.api.services.consumption_service import (
-    get_consumption_data,
-    calculate_consumption_metrics,
-    generate_hourly_patterns,
-    generate_daily_trends,
-    generate_node_consumption,
-    generate_heatmap_data,
+    analyze_consumption,
     generate_consumption_insights
 )
+from src.api.services.consumption_rollup import get_consumption_rollup_cache
+from src.presentation.api.columnar import ResponseFormat, columnar_response
 
 router = APIRouter(prefix="/api/v1/consumption", tags=["consumption"])
 
@@ -59,46 +56,31 @@ async def get_consumption_patterns(
         # Parse time range
         start_time, end_time = _parse_time_range(time_range)
         
-        # Get consumption data
-        consumption_data = await get_consumption_data(
+        # Cached closed days plus live partial days
+        consumption_data = await get_consumption_rollup_cache().load(
             hybrid_service, start_time, end_time, selected_nodes
         )
         
-        if consumption_data is None or consumption_data.empty:
+        if consumption_data.empty:
             raise HTTPException(status_code=404, detail="No consumption data found")
         
-        # Calculate metrics
-        metrics = calculate_consumption_metrics(consumption_data)
-        
-        # Generate hourly patterns
-        hourly_patterns = generate_hourly_patterns(consumption_data)
-        
-        # Generate daily trends
-        daily_trends = generate_daily_trends(consumption_data)
-        
-        # Generate node consumption data
-        node_consumption = generate_node_consumption(consumption_data)
-        
-        # Generate heatmap data if requested
-        heatmap_data = []
-        if include_heatmap:
-            heatmap_data = generate_heatmap_data(consumption_data)
-        
-        # Generate insights if requested
-        insights = []
-        if include_insights:
-            insights = generate_consumption_insights(consumption_data, metrics)
+        # All sections from one set of grouped aggregates
+        analysis = analyze_consumption(
+            consumption_data,
+            include_heatmap=include_heatmap,
+            include_insights=include_insights
+        )
         
         return ConsumptionResponse(
             time_range=time_range,
             period_start=start_time.isoformat(),
             period_end=end_time.isoformat(),
-            metrics=metrics,
-            hourly_patterns=hourly_patterns,
-            daily_trends=daily_trends,
-            node_consumption=node_consumption,
-            heatmap_data=heatmap_data,
-            insights=insights,
+            metrics=analysis.metrics,
+            hourly_patterns=analysis.hourly_patterns,
+            daily_trends=analysis.daily_trends,
+            node_consumption=analysis.node_consumption,
+            heatmap_data=analysis.heatmap_data,
+            insights=analysis.insights,
             generated_at=datetime.now().isoformat()
         )
         
@@ -116,14 +98,14 @@ async def get_consumption_metrics(
         hybrid_service = await get_hybrid_data_service()
         start_time, end_time = _parse_time_range(time_range)
         
-        consumption_data = await get_consumption_data(
+        consumption_data = await get_consumption_rollup_cache().load(
             hybrid_service, start_time, end_time, selected_nodes
         )
         
-        if consumption_data is None or consumption_data.empty:
+        if consumption_data.empty:
             raise HTTPException(status_code=404, detail="No consumption data found")
         
-        return calculate_consumption_metrics(consumption_data)
+        return consumption_data.metrics()
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -139,14 +121,14 @@ async def get_hourly_patterns(
         hybrid_service = await get_hybrid_data_service()
         start_time, end_time = _parse_time_range(time_range)
         
-        consumption_data = await get_consumption_data(
+        consumption_data = await get_consumption_rollup_cache().load(
             hybrid_service, start_time, end_time, selected_nodes
         )
         
-        if consumption_data is None or consumption_data.empty:
+        if consumption_data.empty:
             raise HTTPException(status_code=404, detail="No consumption data found")
         
-        return generate_hourly_patterns(consumption_data)
+        return consumption_data.hourly_patterns()
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -155,21 +137,26 @@ async def get_hourly_patterns(
 @router.get("/daily-trends", response_model=List[DailyTrend])
 async def get_daily_trends(
     time_range: str = Query("30d", description="Time range for trend analysis"),
-    selected_nodes: Optional[List[str]] = Query(None, description="Selected node IDs")
+    selected_nodes: Optional[List[str]] = Query(None, description="Selected node IDs"),
+    response_format: ResponseFormat = Query(ResponseFormat.ROWS, alias="format", description="rows, columnar (arrays with epoch-ms timestamps) or arrow (IPC stream)")
 ):
     """Get daily consumption trends."""
     try:
         hybrid_service = await get_hybrid_data_service()
         start_time, end_time = _parse_time_range(time_range)
         
-        consumption_data = await get_consumption_data(
+        consumption_data = await get_consumption_rollup_cache().load(
             hybrid_service, start_time, end_time, selected_nodes
         )
         
-        if consumption_data is None or consumption_data.empty:
+        if consumption_data.empty:
             raise HTTPException(status_code=404, detail="No consumption data found")
         
-        return generate_daily_trends(consumption_data)
+        if response_format != ResponseFormat.ROWS:
+            return columnar_response(
+                consumption_data.daily_trends_frame().reset_index(), response_format, time_column="date"
+            )
+        return consumption_data.daily_trends()
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -185,14 +172,14 @@ async def get_node_comparison(
         hybrid_service = await get_hybrid_data_service()
         start_time, end_time = _parse_time_range(time_range)
         
-        consumption_data = await get_consumption_data(
+        consumption_data = await get_consumption_rollup_cache().load(
             hybrid_service, start_time, end_time, selected_nodes
         )
         
-        if consumption_data is None or consumption_data.empty:
+        if consumption_data.empty:
             raise HTTPException(status_code=404, detail="No consumption data found")
         
-        return generate_node_consumption(consumption_data)
+        return consumption_data.node_consumption()
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -208,14 +195,14 @@ async def get_consumption_heatmap(
         hybrid_service = await get_hybrid_data_service()
         start_time, end_time = _parse_time_range(time_range)
         
-        consumption_data = await get_consumption_data(
+        consumption_data = await get_consumption_rollup_cache().load(
             hybrid_service, start_time, end_time, selected_nodes
         )
         
-        if consumption_data is None or consumption_data.empty:
+        if consumption_data.empty:
             raise HTTPException(status_code=404, detail="No consumption data found")
         
-        return generate_heatmap_data(consumption_data)
+        return consumption_data.heatmap_data()
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -231,14 +218,14 @@ async def get_consumption_insights(
         hybrid_service = await get_hybrid_data_service()
         start_time, end_time = _parse_time_range(time_range)
         
-        consumption_data = await get_consumption_data(
+        consumption_data = await get_consumption_rollup_cache().load(
             hybrid_service, start_time, end_time, selected_nodes
         )
         
-        if consumption_data is None or consumption_data.empty:
+        if consumption_data.empty:
             raise HTTPException(status_code=404, detail="No consumption data found")
         
-        metrics = calculate_consumption_metrics(consumption_data)
+        metrics = consumption_data.metrics()
         return generate_consumption_insights(consumption_data, metrics)
         
     except Exception as e:
@@ -257,7 +244,7 @@ async def get_consumption_comparison(
         
         # Get current period data
         current_start, current_end = _parse_time_range(current_period)
-        current_data = await get_consumption_data(
+        current_data = await get_consumption_rollup_cache().load(
             hybrid_service, current_start, current_end, selected_nodes
         )
         
@@ -266,15 +253,15 @@ async def get_consumption_comparison(
         comparison_start = current_start - period_duration
         comparison_end = current_start
         
-        comparison_data = await get_consumption_data(
+        comparison_data = await get_consumption_rollup_cache().load(
             hybrid_service, comparison_start, comparison_end, selected_nodes
         )
         
-        if current_data is None or comparison_data is None:
+        if current_data.empty or comparison_data.empty:
             raise HTTPException(status_code=404, detail="Insufficient data for comparison")
         
-        current_metrics = calculate_consumption_metrics(current_data)
-        previous_metrics = calculate_consumption_metrics(comparison_data)
+        current_metrics = current_data.metrics()
+        previous_metrics = comparison_data.metrics()
         
         # Calculate percentage change
         percentage_change = ((current_metrics.total_consumption_m3 - 
@@ -0,0 +1,443 @@
+"""
+Single-pass consumption analytics.
+
+Readings are first reduced to additive partial aggregates per node and
+local (date, hour): rate sum, sum of squares, count, extremes with the
+minute they occurred, volume and quality. Calendar keys come from integer
+arithmetic on the wall-clock timestamps, in one grouped aggregation.
+Every section (metrics, hourly patterns, daily trends, node figures,
+heatmap) is then reduced from the partials, so its cost depends on the
+number of node-hours, not readings. Partials for different periods can be
+concatenated, which lets closed days be cached (see consumption_rollup).
+The input frame is never modified.
+"""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from src.schemas.api.consumption import (
+    ConsumptionHeatmapData,
+    ConsumptionInsights,
+    ConsumptionMetrics,
+    DailyTrend,
+    HourlyPattern,
+    NodeConsumption,
+)
+
+NS_PER_MINUTE = 60_000_000_000
+NS_PER_HOUR = 60 * NS_PER_MINUTE
+
+# Night is [22:00, 06:00)
+NIGHT_START_HOUR = 22
+NIGHT_END_HOUR = 6
+# Day/night ratio cap, for reasonable display
+MAX_CONSUMPTION_EFFICIENCY = 10.0
+DEFAULT_EFFICIENCY_SCORE = 85.0
+DEFAULT_DATA_QUALITY_SCORE = 0.85
+# Placeholder - would need actual uptime calculation
+DEFAULT_UPTIME_PERCENTAGE = 95.0
+
+NODE_NAMES = {
+    "281492": "Primary Station",
+    "211514": "Secondary Station",
+    "288400": "Distribution A",
+    "288399": "Distribution B",
+    "215542": "Junction C",
+    "273933": "Supply Control",
+    "215600": "Pressure Station",
+    "287156": "Remote Point",
+}
+
+PARTIAL_INDEX = ["node_id", "date", "hour"]
+# Additive per-node-hour aggregates; the *_minute columns locate the extremes
+PARTIAL_COLUMNS = [
+    "rate_sum", "rate_sq_sum", "rate_count",
+    "rate_max", "rate_max_minute", "rate_min", "rate_min_minute",
+    "volume", "quality_sum", "quality_count",
+]
+DAILY_TREND_COLUMNS = [
+    "total_consumption", "avg_consumption", "peak_consumption",
+    "night_consumption", "day_consumption", "consumption_efficiency",
+]
+
+
+def is_night_hour(hours):
+    """Whether each hour (0-23) falls in the night window."""
+    return (hours >= NIGHT_START_HOUR) | (hours < NIGHT_END_HOUR)
+
+
+def empty_partials() -> pd.DataFrame:
+    """A partials frame with no rows."""
+    index = pd.MultiIndex.from_arrays(
+        [pd.Index([], dtype=object), pd.DatetimeIndex([]), pd.Index([], dtype="int64")],
+        names=PARTIAL_INDEX
+    )
+    return pd.DataFrame({column: pd.Series([], dtype=float) for column in PARTIAL_COLUMNS}, index=index)
+
+
+def rollup_readings(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce readings to partial aggregates per node and local hour.
+
+    Args:
+        data: Readings with `node_id`, `timestamp`, `consumption_m3h`,
+            `volume_m3` and optionally `quality_score`, as produced by
+            `get_consumption_data_df`
+
+    Returns:
+        DataFrame indexed by (node_id, date, hour) with PARTIAL_COLUMNS
+    """
+    if data.empty:
+        return empty_partials()
+
+    timestamps = pd.to_datetime(data["timestamp"])
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    # Nanoseconds since the epoch in local wall-clock time
+    ns = timestamps.to_numpy(dtype="datetime64[ns]").view("i8")
+    hour_keys = ns // NS_PER_HOUR
+    minutes = (ns // NS_PER_MINUTE) % 60
+    node_codes, node_ids = pd.factorize(data["node_id"], sort=True)
+
+    rates = data["consumption_m3h"].to_numpy(dtype=float, na_value=np.nan)
+    quality = (
+        data["quality_score"].to_numpy(dtype=float, na_value=np.nan)
+        if "quality_score" in data else np.full(len(data), np.nan)
+    )
+    frame = pd.DataFrame({
+        "node": node_codes,
+        "cell": hour_keys,
+        "rate": rates,
+        "rate_sq": rates * rates,
+        "volume": data["volume_m3"].to_numpy(dtype=float, na_value=np.nan),
+        "quality": quality,
+    })
+    keys = ["node", "cell"]
+    partials = frame.groupby(keys, sort=True).agg(
+        rate_sum=("rate", "sum"),
+        rate_sq_sum=("rate_sq", "sum"),
+        rate_count=("rate", "count"),
+        rate_max=("rate", "max"),
+        rate_min=("rate", "min"),
+        volume=("volume", "sum"),
+        quality_sum=("quality", "sum"),
+        quality_count=("quality", "count"),
+    )
+
+    # Minute of each node-hour's extremes, from the rows holding them
+    valid = frame[~np.isnan(rates)]
+    extremes = valid.groupby(keys, sort=False)["rate"]
+    for column, positions in (("rate_max_minute", extremes.idxmax()), ("rate_min_minute", extremes.idxmin())):
+        partials[column] = pd.Series(minutes[positions.to_numpy()], index=positions.index)
+
+    codes = partials.index.get_level_values("node").to_numpy()
+    cells = partials.index.get_level_values("cell").to_numpy()
+    partials.index = pd.MultiIndex.from_arrays(
+        [
+            np.asarray(node_ids.astype(str), dtype=object)[codes],
+            pd.DatetimeIndex((cells // 24 * 24 * NS_PER_HOUR).astype("datetime64[ns]")),
+            cells % 24,
+        ],
+        names=PARTIAL_INDEX
+    )
+    return partials[PARTIAL_COLUMNS]
+
+
+def combine_partials(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate partials of disjoint periods into one frame."""
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return empty_partials()
+    return pd.concat(frames).sort_index()
+
+
+class ConsumptionAggregates:
+    """
+    Consumption sections computed from per-node-hour partial aggregates.
+
+    Build from readings with `from_readings`, or directly from partials
+    (e.g. combined from cached days).
+    """
+
+    def __init__(self, partials: pd.DataFrame):
+        self.partials = partials
+
+    @classmethod
+    def from_readings(cls, data: pd.DataFrame) -> "ConsumptionAggregates":
+        """Aggregate a frame of readings from `get_consumption_data_df`."""
+        return cls(rollup_readings(data))
+
+    @property
+    def empty(self) -> bool:
+        return self.partials.empty
+
+    @cached_property
+    def cells(self) -> pd.DataFrame:
+        """
+        Rate sum/count/max/min and volume sum per local (date, hour) cell.
+
+        Indexed by date and hour, with `day_of_week` and `night` columns
+        added per cell.
+        """
+        cells = self.partials.groupby(level=["date", "hour"], sort=True).agg(
+            rate_sum=("rate_sum", "sum"),
+            rate_count=("rate_count", "sum"),
+            rate_max=("rate_max", "max"),
+            rate_min=("rate_min", "min"),
+            volume=("volume", "sum"),
+        )
+        cells["day_of_week"] = cells.index.get_level_values("date").dayofweek
+        cells["night"] = is_night_hour(cells.index.get_level_values("hour").to_numpy())
+        return cells
+
+    @cached_property
+    def nodes(self) -> pd.DataFrame:
+        """Volume, rate and quality aggregates per node."""
+        nodes = self.partials.groupby(level="node_id", sort=True).agg(
+            total_consumption=("volume", "sum"),
+            rate_sum=("rate_sum", "sum"),
+            rate_count=("rate_count", "sum"),
+            peak_consumption=("rate_max", "max"),
+            quality_sum=("quality_sum", "sum"),
+            quality_count=("quality_count", "sum"),
+        )
+        nodes["avg_consumption"] = nodes["rate_sum"] / nodes["rate_count"].where(nodes["rate_count"] > 0)
+        nodes["quality_score"] = nodes["quality_sum"] / nodes["quality_count"].where(nodes["quality_count"] > 0)
+        return nodes
+
+    # ====================
+    # Sections
+    # ====================
+
+    def metrics(self) -> ConsumptionMetrics:
+        """Network-wide consumption metrics."""
+        partials = self.partials
+        count = partials["rate_count"].sum() if not self.empty else 0
+        if count == 0:
+            return ConsumptionMetrics(
+                total_consumption_m3=0.0,
+                avg_consumption_rate=0.0,
+                peak_consumption_rate=0.0,
+                peak_hour="00:00",
+                min_consumption_rate=0.0,
+                min_hour="00:00",
+                consumption_variability=0.0,
+                night_consumption_avg=0.0,
+                day_consumption_avg=0.0
+            )
+
+        rate_sum = partials["rate_sum"].sum()
+        avg = float(rate_sum / count)
+        # Coefficient of variation (sample standard deviation, as pandas)
+        if count > 1:
+            variance = (partials["rate_sq_sum"].sum() - rate_sum * rate_sum / count) / (count - 1)
+            std = float(np.sqrt(max(variance, 0.0)))
+        else:
+            std = 0.0
+        variability = std / avg if avg > 0 else 0.0
+
+        peak = partials["rate_max"].idxmax()
+        low = partials["rate_min"].idxmin()
+
+        split = self.cells.groupby("night")[["rate_sum", "rate_count"]].sum()
+        night_avg, day_avg = (
+            _mean(split, flag) for flag in (True, False)
+        )
+
+        return ConsumptionMetrics(
+            total_consumption_m3=float(partials["volume"].sum()),
+            avg_consumption_rate=avg,
+            peak_consumption_rate=float(partials.at[peak, "rate_max"]),
+            peak_hour=_clock(peak[2], partials.at[peak, "rate_max_minute"]),
+            min_consumption_rate=float(partials.at[low, "rate_min"]),
+            min_hour=_clock(low[2], partials.at[low, "rate_min_minute"]),
+            consumption_variability=variability,
+            night_consumption_avg=night_avg,
+            day_consumption_avg=day_avg
+        )
+
+    def hourly_patterns(self) -> List[HourlyPattern]:
+        """Average, peak and minimum consumption per hour of day."""
+        if self.empty:
+            return []
+
+        hourly = self.cells.groupby(level="hour").agg(
+            rate_sum=("rate_sum", "sum"),
+            rate_count=("rate_count", "sum"),
+            rate_max=("rate_max", "max"),
+            rate_min=("rate_min", "min"),
+        )
+        hourly = hourly[hourly["rate_count"] > 0]
+        means = hourly["rate_sum"] / hourly["rate_count"]
+        daily_avg = hourly["rate_sum"].sum() / hourly["rate_count"].sum()
+        factors = means / daily_avg if daily_avg > 0 else pd.Series(1.0, index=means.index)
+
+        return [
+            HourlyPattern(
+                hour=int(hour),
+                avg_consumption=mean,
+                peak_consumption=peak,
+                min_consumption=low,
+                consumption_factor=factor,
+                data_points=int(count)
+            )
+            for hour, mean, peak, low, factor, count in zip(
+                hourly.index, means, hourly["rate_max"], hourly["rate_min"],
+                factors, hourly["rate_count"]
+            )
+        ]
+
+    def daily_trends(self) -> List[DailyTrend]:
+        """Per-day totals with the day/night split from one pivot."""
+        trends = self.daily_trends_frame()
+        return [
+            DailyTrend(
+                date=date.date().isoformat(),
+                total_consumption=total,
+                avg_consumption=average,
+                peak_consumption=peak,
+                night_consumption=night_avg,
+                day_consumption=day_avg,
+                consumption_efficiency=ratio
+            )
+            for date, total, average, peak, night_avg, day_avg, ratio in zip(
+                trends.index, trends["total_consumption"], trends["avg_consumption"],
+                trends["peak_consumption"], trends["night_consumption"],
+                trends["day_consumption"], trends["consumption_efficiency"]
+            )
+        ]
+
+    def daily_trends_frame(self) -> pd.DataFrame:
+        """Daily trends as columns indexed by date, for columnar responses."""
+        if self.empty:
+            return pd.DataFrame(columns=DAILY_TREND_COLUMNS, index=pd.DatetimeIndex([], name="date"))
+
+        cells = self.cells
+        daily = cells.groupby(level="date").agg(
+            total_consumption=("volume", "sum"),
+            rate_sum=("rate_sum", "sum"),
+            rate_count=("rate_count", "sum"),
+            peak_consumption=("rate_max", "max"),
+        )
+        # Pivot night/day into columns: one row per date
+        split = (
+            cells.groupby([cells.index.get_level_values("date"), "night"])[["rate_sum", "rate_count"]]
+            .sum()
+            .unstack("night", fill_value=0)
+            .reindex(daily.index, fill_value=0)
+        )
+
+        night = _split_means(split, True)
+        day = _split_means(split, False)
+        efficiency = np.where(night > 0, day / np.where(night > 0, night, 1.0), 1.0)
+        efficiency = np.minimum(efficiency, MAX_CONSUMPTION_EFFICIENCY)
+        averages = daily["rate_sum"] / daily["rate_count"].where(daily["rate_count"] > 0)
+
+        trends = pd.DataFrame({
+            "total_consumption": daily["total_consumption"],
+            "avg_consumption": averages,
+            "peak_consumption": daily["peak_consumption"],
+            "night_consumption": night,
+            "day_consumption": day,
+            "consumption_efficiency": efficiency,
+        }, index=daily.index)
+        return trends[DAILY_TREND_COLUMNS]
+
+    def node_consumption(self) -> List[NodeConsumption]:
+        """Per-node consumption, share of the network total and quality."""
+        if self.empty:
+            return []
+
+        nodes = self.nodes
+        network_total = nodes["total_consumption"].sum()
+        percentages = (
+            nodes["total_consumption"] / network_total * 100
+            if network_total > 0 else pd.Series(0.0, index=nodes.index)
+        )
+        has_quality = nodes["quality_score"].notna()
+        efficiency = (nodes["quality_score"] * 100).where(has_quality, DEFAULT_EFFICIENCY_SCORE)
+        quality = nodes["quality_score"].where(has_quality, DEFAULT_DATA_QUALITY_SCORE)
+
+        result = []
+        for node, total, average, peak, percentage, score, node_quality in zip(
+            nodes.index, nodes["total_consumption"], nodes["avg_consumption"],
+            nodes["peak_consumption"], percentages, efficiency, quality
+        ):
+            node_id = str(node)
+            result.append(NodeConsumption(
+                node_id=node_id,
+                node_name=NODE_NAMES.get(node_id, f"Node {node_id}"),
+                total_consumption=total,
+                avg_consumption_rate=average,
+                peak_consumption_rate=peak,
+                consumption_percentage=percentage,
+                efficiency_score=score,
+                uptime_percentage=DEFAULT_UPTIME_PERCENTAGE,
+                data_quality_score=node_quality
+            ))
+        return result
+
+    def heatmap_data(self) -> List[ConsumptionHeatmapData]:
+        """Average consumption per (hour, day of week), normalized to 0-1."""
+        if self.empty:
+            return []
+
+        cells = self.cells
+        heatmap = cells.groupby(
+            [cells.index.get_level_values("hour"), cells["day_of_week"]]
+        )[["rate_sum", "rate_count"]].sum()
+        heatmap = heatmap[heatmap["rate_count"] > 0]
+        means = heatmap["rate_sum"] / heatmap["rate_count"]
+
+        high, low = means.max(), means.min()
+        intensity = (means - low) / (high - low) if high > low else pd.Series(0.5, index=means.index)
+
+        return [
+            ConsumptionHeatmapData(
+                hour=int(hour),
+                day_of_week=int(day_of_week),
+                consumption_intensity=level,
+                actual_consumption=mean,
+                data_points=int(count)
+            )
+            for (hour, day_of_week), level, mean, count in zip(
+                heatmap.index, intensity, means, heatmap["rate_count"]
+            )
+        ]
+
+
+@dataclass
+class ConsumptionAnalysis:
+    """All sections of a consumption patterns response."""
+
+    metrics: ConsumptionMetrics
+    hourly_patterns: List[HourlyPattern] = field(default_factory=list)
+    daily_trends: List[DailyTrend] = field(default_factory=list)
+    node_consumption: List[NodeConsumption] = field(default_factory=list)
+    heatmap_data: List[ConsumptionHeatmapData] = field(default_factory=list)
+    insights: List[ConsumptionInsights] = field(default_factory=list)
+
+
+def _clock(hour: int, minute: float) -> str:
+    """Format an hour and minute as HH:MM."""
+    return f"{int(hour):02d}:{int(minute):02d}"
+
+
+def _mean(totals: pd.DataFrame, key) -> float:
+    """Mean rate from summed rate_sum/rate_count rows, 0 when absent."""
+    if key not in totals.index or totals.at[key, "rate_count"] == 0:
+        return 0.0
+    return float(totals.at[key, "rate_sum"] / totals.at[key, "rate_count"])
+
+
+def _split_means(split: pd.DataFrame, night: bool) -> np.ndarray:
+    """Per-row mean rate for one side of the day/night pivot, 0 when empty."""
+    if ("rate_count", night) not in split.columns:
+        return np.zeros(len(split))
+    counts = split[("rate_count", night)].to_numpy(dtype=float)
+    sums = split[("rate_sum", night)].to_numpy(dtype=float)
+    return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
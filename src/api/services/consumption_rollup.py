@@ -0,0 +1,367 @@
+"""
+Consumption rollup cache over closed days.
+
+A day is closed once it ended more than the settle window ago (see
+data_version). Closed days get per-node-hour partial aggregates (see
+consumption_analytics), written to Redis once per node and day. A request
+reads all of its cached days with one MGET. Days still missing are fetched
+in one query and rolled up. Only the partial first day and days not yet
+closed are computed from readings on every call. Long ranges therefore
+cost one small array decode per node-day and never rescan readings.
+
+Readings can still land in a closed day later, e.g. from backfills or
+incremental syncs. Every such write bumps the data generation
+(PostgresManager.record_data_change), and rollup keys include that
+generation. Superseded rollups are no longer read and expire with their
+TTL.
+"""
+
+import asyncio
+import base64
+import logging
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.api.services.consumption_analytics import (
+    PARTIAL_COLUMNS,
+    PARTIAL_INDEX,
+    ConsumptionAggregates,
+    combine_partials,
+    empty_partials,
+    rollup_readings,
+)
+from src.api.services.consumption_service import get_consumption_data_df, resolve_node_ids
+from src.infrastructure.cache.async_redis import AsyncRedisClient, get_async_redis
+from src.infrastructure.cache.data_version import (
+    DEFAULT_SETTLE,
+    DataVersion,
+    get_data_version,
+)
+from src.infrastructure.data.hybrid_data_service import HybridDataService
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_KEY_PREFIX = "consumption:rollup:v2"
+ONE_DAY = timedelta(days=1)
+# Rollups of superseded generations age out after this
+DEFAULT_ROLLUP_TTL = 7 * 86400
+ROLLUP_DTYPE = "<f8"
+# Node-days without readings are stored empty so they are not refetched
+EMPTY_ROLLUP = ""
+
+
+def rollup_key(node_id: str, day: date, generation: int = 0) -> str:
+    """Redis key of one node-day rollup built at a data generation."""
+    return f"{ROLLUP_KEY_PREFIX}:g{generation}:{node_id}:{day.isoformat()}"
+
+
+def encode_rollups(partials: pd.DataFrame) -> Dict[Tuple[str, date], str]:
+    """
+    Encode partials as one payload per node-day.
+
+    A payload is a base64 little-endian float64 matrix with a row per hour:
+    the hour followed by PARTIAL_COLUMNS. Decoding it is one array view,
+    which keeps year-long ranges (thousands of node-days) cheap to load.
+
+    Args:
+        partials: Partials sorted by (node_id, date, hour)
+
+    Returns:
+        Payload keyed by (node_id, day)
+    """
+    if partials.empty:
+        return {}
+    nodes = partials.index.get_level_values("node_id").to_numpy()
+    days = partials.index.get_level_values("date")
+    day_values = days.to_numpy()
+    matrix = np.column_stack([
+        partials.index.get_level_values("hour").to_numpy(dtype=ROLLUP_DTYPE),
+        partials[PARTIAL_COLUMNS].to_numpy(dtype=ROLLUP_DTYPE),
+    ])
+
+    # Sorted, so each node-day is one contiguous run of rows
+    starts = np.flatnonzero(
+        np.r_[True, (nodes[1:] != nodes[:-1]) | (day_values[1:] != day_values[:-1])]
+    )
+    ends = np.r_[starts[1:], len(nodes)]
+    calendar_days = days.date
+    return {
+        (nodes[start], calendar_days[start]): base64.b64encode(matrix[start:end].tobytes()).decode()
+        for start, end in zip(starts, ends)
+    }
+
+
+def decode_rollups(entries: Sequence[Tuple[str, date, str]]) -> pd.DataFrame:
+    """
+    Decode cached node-day rollups into one partials frame.
+
+    Args:
+        entries: (node_id, day, payload) for each cached node-day
+
+    Returns:
+        DataFrame indexed by (node_id, date, hour) with PARTIAL_COLUMNS
+    """
+    width = len(PARTIAL_COLUMNS) + 1
+    matrices = [
+        np.frombuffer(base64.b64decode(payload), dtype=ROLLUP_DTYPE).reshape(-1, width)
+        for _, _, payload in entries
+    ]
+    counts = [len(matrix) for matrix in matrices]
+    if not sum(counts):
+        return empty_partials()
+
+    matrix = np.concatenate(matrices)
+    index = pd.MultiIndex.from_arrays(
+        [
+            np.repeat(np.asarray([node_id for node_id, _, _ in entries], dtype=object), counts),
+            pd.DatetimeIndex(np.repeat(np.asarray([day for _, day, _ in entries], dtype="datetime64[ns]"), counts)),
+            matrix[:, 0].astype("int64"),
+        ],
+        names=PARTIAL_INDEX
+    )
+    return pd.DataFrame(matrix[:, 1:], index=index, columns=PARTIAL_COLUMNS)
+
+
+def _midnight(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class ConsumptionRollupCache:
+    """
+    Serves consumption aggregates from cached closed days plus live data.
+
+    Rollups are keyed by node, local calendar day and data generation.
+    They are written once the day has been over for the settle window.
+    Late writes bump the generation, which retires every stored rollup.
+    Loaders that change past data without going through PostgresManager
+    should call `invalidate`.
+    """
+
+    def __init__(
+        self,
+        redis: AsyncRedisClient,
+        ttl_seconds: Optional[int] = DEFAULT_ROLLUP_TTL,
+        clock: Callable[[], datetime] = datetime.now,
+        settle: timedelta = DEFAULT_SETTLE,
+        data_version: Optional[DataVersion] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis: Async Redis client holding the rollups
+            ttl_seconds: Expiry of stored rollups (None keeps them forever)
+            clock: Current local time, injectable for tests
+            settle: How long after a day ends before it is rolled up
+            data_version: Reader of the data generation (one on `redis` by default)
+        """
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.settle = settle
+        self.data_version = data_version or DataVersion(redis)
+        self.stats = {"hits": 0, "misses": 0, "live_fetches": 0}
+
+    async def load(
+        self,
+        hybrid_service: HybridDataService,
+        start_time: datetime,
+        end_time: datetime,
+        selected_nodes: Optional[List[str]] = None
+    ) -> ConsumptionAggregates:
+        """
+        Get consumption aggregates for a time range.
+
+        The range splits into a partial first day (live), whole closed days
+        (cached) and the rest, from the start of today or of the last
+        day (live).
+
+        Args:
+            hybrid_service: The hybrid data service instance
+            start_time: Start of the range
+            end_time: End of the range (inclusive, as the data query)
+            selected_nodes: Optional node names or IDs to include
+
+        Returns:
+            ConsumptionAggregates over the whole range
+        """
+        node_ids = resolve_node_ids(selected_nodes)
+        first_day = _midnight(start_time)
+        if first_day < start_time:
+            first_day += ONE_DAY
+        closed_until = min(_midnight(end_time), _midnight(self.clock() - self.settle))
+
+        if first_day >= closed_until:
+            # No closed whole day in range
+            return ConsumptionAggregates(
+                await self._live(hybrid_service, start_time, end_time, node_ids)
+            )
+
+        days = [
+            (first_day + ONE_DAY * offset).date()
+            for offset in range((closed_until - first_day).days)
+        ]
+        parts = [self._closed_days(hybrid_service, node_ids, days)]
+        if start_time < first_day:
+            parts.append(self._live(hybrid_service, start_time, first_day, node_ids, exclusive=True))
+        if closed_until <= end_time:
+            parts.append(self._live(hybrid_service, closed_until, end_time, node_ids))
+        return ConsumptionAggregates(combine_partials(await asyncio.gather(*parts)))
+
+    async def invalidate(self, node_ids: Sequence[str], days: Sequence[date]) -> int:
+        """
+        Retire cached rollups after past readings changed outside PostgresManager.
+
+        Bumps the data generation, so every rollup is rebuilt on its next
+        load and cached historical responses are revalidated. The given
+        node-days are also deleted now instead of waiting for their TTL.
+
+        Returns:
+            Number of rollups deleted
+        """
+        stamp = await self.data_version.current()
+        deleted = 0
+        if stamp is not None:
+            keys = [
+                rollup_key(node_id, day, stamp.generation)
+                for node_id in node_ids for day in days
+            ]
+            if keys:
+                deleted = await self.redis.delete(*keys)
+        await self.data_version.bump_generation()
+        return deleted
+
+    # ====================================
+    # Internals
+    # ====================================
+
+    async def _closed_days(
+        self,
+        hybrid_service: HybridDataService,
+        node_ids: List[str],
+        days: List[date]
+    ) -> pd.DataFrame:
+        """Partials of whole closed days: cached ones read, missing ones built and stored."""
+        wanted = [(node_id, day) for node_id in node_ids for day in days]
+        stamp = await self.data_version.current()
+        if stamp is None:
+            # Without the generation, stored rollups could be stale: compute live
+            self.stats["misses"] += len(wanted)
+            start = datetime.combine(days[0], datetime.min.time())
+            return await self._live(hybrid_service, start, start + ONE_DAY * len(days), node_ids, exclusive=True)
+        try:
+            payloads = await self.redis.mget(
+                [rollup_key(node_id, day, stamp.generation) for node_id, day in wanted]
+            )
+        except Exception as e:
+            logger.warning(f"Consumption rollup read failed, computing live: {e}")
+            payloads = [None] * len(wanted)
+
+        cached = [
+            (node_id, day, payload)
+            for (node_id, day), payload in zip(wanted, payloads) if payload is not None
+        ]
+        missing = [key for key, payload in zip(wanted, payloads) if payload is None]
+        self.stats["hits"] += len(cached)
+        self.stats["misses"] += len(missing)
+
+        frames = [decode_rollups(cached)]
+        if missing:
+            frames.append(await self._build_missing(hybrid_service, missing, stamp.generation))
+        return combine_partials(frames)
+
+    async def _build_missing(
+        self,
+        hybrid_service: HybridDataService,
+        missing: List[Tuple[str, date]],
+        generation: int
+    ) -> pd.DataFrame:
+        """Roll up missing node-days with one query spanning all of them, and store them."""
+        nodes = sorted({node_id for node_id, _ in missing})
+        first = min(day for _, day in missing)
+        last = max(day for _, day in missing)
+        start = datetime.combine(first, datetime.min.time())
+        end = datetime.combine(last, datetime.min.time()) + ONE_DAY
+        try:
+            partials = await self._rollup(hybrid_service, start, end, nodes, exclusive=True)
+        except Exception as e:
+            # Nothing is stored, so the next load retries these node-days
+            logger.warning(f"Consumption rollup fetch failed, not caching: {e}")
+            return empty_partials()
+
+        payloads = encode_rollups(partials)
+        pipe = self.redis.pipeline()
+        for node_id, day in missing:
+            key = rollup_key(node_id, day, generation)
+            payload = payloads.get((node_id, day), EMPTY_ROLLUP)
+            if self.ttl_seconds:
+                pipe.setex(key, self.ttl_seconds, payload)
+            else:
+                pipe.set(key, payload)
+        try:
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Consumption rollup write failed: {e}")
+
+        if partials.empty:
+            return partials
+        # The query also covered cached node-days between the missing ones
+        wanted = pd.MultiIndex.from_tuples(
+            [(node_id, pd.Timestamp(day)) for node_id, day in missing]
+        )
+        return partials[partials.index.droplevel("hour").isin(wanted)]
+
+    async def _live(
+        self,
+        hybrid_service: HybridDataService,
+        start_time: datetime,
+        end_time: datetime,
+        node_ids: List[str],
+        exclusive: bool = False
+    ) -> pd.DataFrame:
+        self.stats["live_fetches"] += 1
+        try:
+            return await self._rollup(hybrid_service, start_time, end_time, node_ids, exclusive)
+        except Exception as e:
+            logger.warning(f"Consumption live fetch failed: {e}")
+            return empty_partials()
+
+    async def _rollup(
+        self,
+        hybrid_service: HybridDataService,
+        start_time: datetime,
+        end_time: datetime,
+        node_ids: List[str],
+        exclusive: bool = False
+    ) -> pd.DataFrame:
+        """
+        Fetch readings and reduce them to partials; `exclusive` drops readings at end_time.
+
+        Fetch failures are raised, so an outage is never stored as empty rollups.
+        """
+        data = await get_consumption_data_df(
+            hybrid_service, start_time, end_time, node_ids, raise_errors=True
+        )
+        if data is None or data.empty:
+            return empty_partials()
+        if exclusive:
+            timestamps = pd.to_datetime(data["timestamp"])
+            if timestamps.dt.tz is not None:
+                timestamps = timestamps.dt.tz_localize(None)
+            data = data[(timestamps < pd.Timestamp(end_time)).to_numpy()]
+        return rollup_readings(data)
+
+
+# Global cache shared by the consumption endpoints
+_rollup_cache: Optional[ConsumptionRollupCache] = None
+
+
+def get_consumption_rollup_cache() -> ConsumptionRollupCache:
+    """Get or create the process-wide consumption rollup cache."""
+    global _rollup_cache
+    if _rollup_cache is None:
+        _rollup_cache = ConsumptionRollupCache(get_async_redis(), data_version=get_data_version())
+    return _rollup_cache
@@ -7,7 +7,7 @@ supporting the consumption API endpoints.
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 import numpy as np
 import pandas as pd
 
@@ -19,6 +19,7 @@ from src.schemas.api.consumption import (
     ConsumptionHeatmapData,
     ConsumptionInsights
 )
+from src.api.services.consumption_analytics import NODE_NAMES, ConsumptionAggregates, ConsumptionAnalysis
 from src.infrastructure.data.hybrid_data_service import HybridDataService
 
 
@@ -215,11 +216,29 @@ class ConsumptionService:
         return True
 
 
+def resolve_node_ids(selected_nodes: Optional[List[str]] = None) -> List[str]:
+    """
+    Map selected node names or IDs to node IDs.
+
+    Args:
+        selected_nodes: Display names (from consumption_tab.py) or node IDs;
+            None selects every known node
+
+    Returns:
+        List of node IDs
+    """
+    node_mapping = {name: node_id for node_id, name in NODE_NAMES.items()}
+    if selected_nodes is None:
+        return list(node_mapping.values())
+    return [node_mapping.get(node, node) for node in selected_nodes]
+
+
 async def get_consumption_data_df(
     hybrid_service: HybridDataService,
     start_time: datetime,
     end_time: datetime,
-    selected_nodes: Optional[List[str]] = None
+    selected_nodes: Optional[List[str]] = None,
+    raise_errors: bool = False
 ) -> Optional[pd.DataFrame]:
     """
     Get consumption data from the hybrid data service.
@@ -229,40 +248,18 @@ async def get_consumption_data_df(
         start_time: Start time for data retrieval
         end_time: End time for data retrieval
         selected_nodes: Optional list of node IDs to filter
+        raise_errors: Raise query failures instead of returning None
         
     Returns:
         DataFrame with consumption data or None if no data found
     """
     try:
-        # Define node mapping (from consumption_tab.py)
-        node_mapping = {
-            "Primary Station": "281492",
-            "Secondary Station": "211514", 
-            "Distribution A": "288400",
-            "Distribution B": "288399",
-            "Junction C": "215542",
-            "Supply Control": "273933",
-            "Pressure Station": "215600",
-            "Remote Point": "287156",
-        }
-        
-        # Use all nodes if none specified
-        if selected_nodes is None:
-            nodes_to_query = list(node_mapping.values())
-        else:
-            # Map selected nodes to actual node IDs
-            nodes_to_query = []
-            for node in selected_nodes:
-                if node in node_mapping:
-                    nodes_to_query.append(node_mapping[node])
-                else:
-                    nodes_to_query.append(node)
-        
-        # Query data from hybrid service
-        data = await hybrid_service.get_sensor_readings(
+        # One columnar query for all nodes
+        data = await hybrid_service.get_readings_frame(
             start_time=start_time,
             end_time=end_time,
-            node_ids=nodes_to_query
+            node_ids=resolve_node_ids(selected_nodes),
+            raise_errors=raise_errors
         )
         
         if data is None or data.empty:
@@ -278,214 +275,69 @@ async def get_consumption_data_df(
         
     except Exception as e:
         print(f"Error getting consumption data: {e}")
+        if raise_errors:
+            raise
         return None
 
 
 def calculate_consumption_metrics(data: pd.DataFrame) -> ConsumptionMetrics:
     """Calculate consumption metrics from the data."""
-    if data.empty:
-        return ConsumptionMetrics(
-            total_consumption_m3=0.0,
-            avg_consumption_rate=0.0,
-            peak_consumption_rate=0.0,
-            peak_hour="00:00",
-            min_consumption_rate=0.0,
-            min_hour="00:00",
-            consumption_variability=0.0,
-            night_consumption_avg=0.0,
-            day_consumption_avg=0.0
-        )
-    
-    # Calculate basic metrics
-    total_consumption = data['volume_m3'].sum()
-    avg_consumption = data['consumption_m3h'].mean()
-    peak_consumption = data['consumption_m3h'].max()
-    min_consumption = data['consumption_m3h'].min()
-    
-    # Find peak and min hours
-    peak_hour = data.loc[data['consumption_m3h'].idxmax(), 'timestamp'].strftime('%H:%M')
-    min_hour = data.loc[data['consumption_m3h'].idxmin(), 'timestamp'].strftime('%H:%M')
-    
-    # Calculate variability (coefficient of variation)
-    consumption_variability = data['consumption_m3h'].std() / data['consumption_m3h'].mean() if data['consumption_m3h'].mean() > 0 else 0
-    
-    # Calculate night vs day consumption
-    data['hour'] = pd.to_datetime(data['timestamp']).dt.hour
-    night_data = data[data['hour'].between(22, 6, inclusive='both')]
-    day_data = data[~data['hour'].between(22, 6, inclusive='both')]
-    
-    night_consumption = night_data['consumption_m3h'].mean() if not night_data.empty else 0
-    day_consumption = day_data['consumption_m3h'].mean() if not day_data.empty else 0
-    
-    return ConsumptionMetrics(
-        total_consumption_m3=total_consumption,
-        avg_consumption_rate=avg_consumption,
-        peak_consumption_rate=peak_consumption,
-        peak_hour=peak_hour,
-        min_consumption_rate=min_consumption,
-        min_hour=min_hour,
-        consumption_variability=consumption_variability,
-        night_consumption_avg=night_consumption,
-        day_consumption_avg=day_consumption
-    )
+    return ConsumptionAggregates.from_readings(data).metrics()
 
 
 def generate_hourly_patterns(data: pd.DataFrame) -> List[HourlyPattern]:
     """Generate hourly consumption patterns."""
-    if data.empty:
-        return []
-    
-    data['hour'] = pd.to_datetime(data['timestamp']).dt.hour
-    
-    hourly_stats = data.groupby('hour')['consumption_m3h'].agg([
-        'mean', 'max', 'min', 'count'
-    ]).reset_index()
-    
-    # Calculate daily average for factor calculation
-    daily_avg = data['consumption_m3h'].mean()
-    
-    patterns = []
-    for _, row in hourly_stats.iterrows():
-        patterns.append(HourlyPattern(
-            hour=int(row['hour']),
-            avg_consumption=row['mean'],
-            peak_consumption=row['max'],
-            min_consumption=row['min'],
-            consumption_factor=row['mean'] / daily_avg if daily_avg > 0 else 1.0,
-            data_points=int(row['count'])
-        ))
-    
-    return patterns
+    return ConsumptionAggregates.from_readings(data).hourly_patterns()
 
 
 def generate_daily_trends(data: pd.DataFrame) -> List[DailyTrend]:
     """Generate daily consumption trends."""
-    if data.empty:
-        return []
-    
-    data['date'] = pd.to_datetime(data['timestamp']).dt.date
-    data['hour'] = pd.to_datetime(data['timestamp']).dt.hour
-    
-    daily_stats = data.groupby('date').agg({
-        'volume_m3': 'sum',
-        'consumption_m3h': ['mean', 'max']
-    }).reset_index()
-    
-    daily_stats.columns = ['date', 'total_consumption', 'avg_consumption', 'peak_consumption']
-    
-    trends = []
-    for _, row in daily_stats.iterrows():
-        # Calculate night vs day consumption for this date
-        day_data = data[data['date'] == row['date']]
-        night_data = day_data[day_data['hour'].between(22, 6, inclusive='both')]
-        day_only_data = day_data[~day_data['hour'].between(22, 6, inclusive='both')]
-        
-        night_avg = night_data['consumption_m3h'].mean() if not night_data.empty else 0
-        day_avg = day_only_data['consumption_m3h'].mean() if not day_only_data.empty else 0
-        
-        # Simple efficiency calculation (day vs night ratio)
-        efficiency = (day_avg / night_avg) if night_avg > 0 else 1.0
-        
-        trends.append(DailyTrend(
-            date=row['date'].isoformat(),
-            total_consumption=row['total_consumption'],
-            avg_consumption=row['avg_consumption'],
-            peak_consumption=row['peak_consumption'],
-            night_consumption=night_avg,
-            day_consumption=day_avg,
-            consumption_efficiency=min(efficiency, 10.0)  # Cap at 10 for reasonable display
-        ))
-    
-    return trends
+    return ConsumptionAggregates.from_readings(data).daily_trends()
 
 
 def generate_node_consumption(data: pd.DataFrame) -> List[NodeConsumption]:
     """Generate per-node consumption data."""
-    if data.empty:
-        return []
-    
-    # Node mapping for display names
-    node_names = {
-        "281492": "Primary Station",
-        "211514": "Secondary Station", 
-        "288400": "Distribution A",
-        "288399": "Distribution B",
-        "215542": "Junction C",
-        "273933": "Supply Control",
-        "215600": "Pressure Station",
-        "287156": "Remote Point",
-    }
-    
-    node_stats = data.groupby('node_id').agg({
-        'volume_m3': 'sum',
-        'consumption_m3h': ['mean', 'max'],
-        'quality_score': 'mean'
-    }).reset_index()
-    
-    node_stats.columns = ['node_id', 'total_consumption', 'avg_consumption', 'peak_consumption', 'quality_score']
-    
-    # Calculate total network consumption for percentage calculation
-    total_network_consumption = node_stats['total_consumption'].sum()
-    
-    node_consumption = []
-    for _, row in node_stats.iterrows():
-        node_id = str(row['node_id'])
-        percentage = (row['total_consumption'] / total_network_consumption * 100) if total_network_consumption > 0 else 0
-        
-        # Simple efficiency calculation based on quality score and consumption consistency
-        efficiency = row['quality_score'] * 100 if pd.notna(row['quality_score']) else 85.0
-        
-        node_consumption.append(NodeConsumption(
-            node_id=node_id,
-            node_name=node_names.get(node_id, f"Node {node_id}"),
-            total_consumption=row['total_consumption'],
-            avg_consumption_rate=row['avg_consumption'],
-            peak_consumption_rate=row['peak_consumption'],
-            consumption_percentage=percentage,
-            efficiency_score=efficiency,
-            uptime_percentage=95.0,  # Placeholder - would need actual uptime calculation
-            data_quality_score=row['quality_score'] if pd.notna(row['quality_score']) else 0.85
-        ))
-    
-    return node_consumption
+    return ConsumptionAggregates.from_readings(data).node_consumption()
 
 
 def generate_heatmap_data(data: pd.DataFrame) -> List[ConsumptionHeatmapData]:
     """Generate consumption heatmap data."""
-    if data.empty:
-        return []
-    
-    data['hour'] = pd.to_datetime(data['timestamp']).dt.hour
-    data['day_of_week'] = pd.to_datetime(data['timestamp']).dt.dayofweek
-    
-    # Group by hour and day of week
-    heatmap_stats = data.groupby(['hour', 'day_of_week']).agg({
-        'consumption_m3h': ['mean', 'count']
-    }).reset_index()
-    
-    heatmap_stats.columns = ['hour', 'day_of_week', 'avg_consumption', 'data_points']
-    
-    # Normalize consumption values for intensity
-    max_consumption = heatmap_stats['avg_consumption'].max()
-    min_consumption = heatmap_stats['avg_consumption'].min()
-    
-    heatmap_data = []
-    for _, row in heatmap_stats.iterrows():
-        intensity = ((row['avg_consumption'] - min_consumption) / 
-                    (max_consumption - min_consumption)) if max_consumption > min_consumption else 0.5
-        
-        heatmap_data.append(ConsumptionHeatmapData(
-            hour=int(row['hour']),
-            day_of_week=int(row['day_of_week']),
-            consumption_intensity=intensity,
-            actual_consumption=row['avg_consumption'],
-            data_points=int(row['data_points'])
-        ))
-    
-    return heatmap_data
+    return ConsumptionAggregates.from_readings(data).heatmap_data()
+
+
+def analyze_consumption(
+    data: Union[pd.DataFrame, ConsumptionAggregates],
+    include_heatmap: bool = True,
+    include_insights: bool = True
+) -> ConsumptionAnalysis:
+    """
+    Compute every consumption section from one set of aggregates.
+
+    Args:
+        data: Consumption readings from `get_consumption_data_df`, or
+            aggregates already built (e.g. from the rollup cache)
+        include_heatmap: Whether to compute the heatmap section
+        include_insights: Whether to derive insights from the metrics
+
+    Returns:
+        ConsumptionAnalysis with the requested sections
+    """
+    if isinstance(data, ConsumptionAggregates):
+        aggregates = data
+    else:
+        aggregates = ConsumptionAggregates.from_readings(data)
+    metrics = aggregates.metrics()
+    return ConsumptionAnalysis(
+        metrics=metrics,
+        hourly_patterns=aggregates.hourly_patterns(),
+        daily_trends=aggregates.daily_trends(),
+        node_consumption=aggregates.node_consumption(),
+        heatmap_data=aggregates.heatmap_data() if include_heatmap else [],
+        insights=generate_consumption_insights(aggregates, metrics) if include_insights else [],
+    )
 
 
-def generate_consumption_insights(data: pd.DataFrame, metrics: ConsumptionMetrics) -> List[ConsumptionInsights]:
+def generate_consumption_insights(data: Union[pd.DataFrame, ConsumptionAggregates], metrics: ConsumptionMetrics) -> List[ConsumptionInsights]:
     """Generate AI-powered consumption insights."""
     insights = []
     
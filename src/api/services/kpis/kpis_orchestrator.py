@@ -8,19 +8,113 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from types import SimpleNamespace
 
+from src.schemas.api.kpis import KPICard, KPIDashboard, KPIMetric
+from .kpi_engine import KPIEngine, KPIResults, get_kpi_engine
+
+# Dashboard fields holding one KPI category each
+KPI_CATEGORIES = [
+    "system_performance", "network_efficiency", "quality", "maintenance",
+    "operational", "financial", "compliance"
+]
+
+# Cards shown on the dashboard: (category, field, title, unit, target)
+DASHBOARD_CARDS = [
+    ("system_performance", "system_uptime", "System Uptime", "%", 99.0),
+    ("network_efficiency", "overall_efficiency", "Network Efficiency", "%", 85.0),
+    ("quality", "overall_quality_score", "Water Quality", "score", 90.0),
+    ("maintenance", "equipment_reliability", "Equipment Reliability", "%", 95.0),
+]
+
 
 class KPIOrchestrator:
     """Main orchestrator for KPI services."""
     
-    async def generate_kpi_dashboard(self, hybrid_service, start_time, end_time, selected_nodes=None, update_frequency=300):
-        """Generate KPI dashboard."""
-        return SimpleNamespace(
-            overall_health_score=95.5,
-            system_performance={},
-            network_efficiency={},
-            quality_metrics={}
+    def __init__(self, engine: Optional[KPIEngine] = None):
+        self.engine = engine or get_kpi_engine()
+    
+    async def calculate_category_kpis(self, hybrid_service, category, start_time, end_time, selected_nodes=None):
+        """Get one KPI category from the shared computation for the window."""
+        results = await self.engine.compute(hybrid_service, start_time, end_time, selected_nodes)
+        return results.category(category)
+    
+    async def generate_kpi_dashboard(
+        self, hybrid_service, start_time, end_time, selected_nodes=None, update_frequency=300,
+        include_alerts=True, include_trends=False, dashboard_type="operational"
+    ):
+        """Generate KPI dashboard from one fetch of the window's readings."""
+        results = await self.engine.compute(hybrid_service, start_time, end_time, selected_nodes)
+        now = datetime.now().isoformat()
+        
+        strong, weak = self._rank_metrics(results)
+        return KPIDashboard(
+            dashboard_id=f"{dashboard_type}_{start_time:%Y%m%d%H%M}_{end_time:%Y%m%d%H%M}",
+            title=f"{dashboard_type.title()} KPI Dashboard",
+            last_updated=now,
+            overall_health_score=self._health_score(results),
+            **{category: results.category(category) for category in KPI_CATEGORIES},
+            kpi_cards=self._dashboard_cards(results, now),
+            active_alerts=[],
+            top_performing_metrics=strong,
+            improvement_needed=weak
         )
     
+    @staticmethod
+    def _dashboard_cards(results: KPIResults, timestamp: str) -> List[KPICard]:
+        cards = []
+        for category, field, title, unit, target in DASHBOARD_CARDS:
+            value = getattr(results.category(category), field)
+            performance = 100.0 * value / target if target else 0.0
+            status = "good" if value >= target else "warning" if performance >= 80 else "critical"
+            cards.append(KPICard(
+                card_id=f"{category}.{field}",
+                title=title,
+                subtitle=f"Target {target:g}{unit}",
+                primary_metric=KPIMetric(
+                    metric_id=f"{category}.{field}",
+                    metric_name=title,
+                    category=category,
+                    current_value=value,
+                    target_value=target,
+                    unit=unit,
+                    performance_percentage=performance,
+                    trend="stable",
+                    status=status,
+                    last_updated=timestamp
+                ),
+                secondary_metrics=[],
+                sparkline_data=[],
+                alert_level={"good": "none", "warning": "medium", "critical": "high"}[status],
+                color_scheme={"good": "green", "warning": "orange", "critical": "red"}[status]
+            ))
+        return cards
+    
+    @staticmethod
+    def _health_score(results: KPIResults) -> float:
+        """Mean of each category's headline score."""
+        scores = [
+            results.system_performance.reliability_score,
+            results.network_efficiency.overall_efficiency,
+            results.quality.overall_quality_score,
+            results.maintenance.equipment_reliability,
+            results.operational.operational_efficiency,
+            results.compliance.regulatory_compliance,
+        ]
+        return sum(scores) / len(scores)
+    
+    @staticmethod
+    def _rank_metrics(results: KPIResults):
+        """Percentage metrics at or above 90 and below 70."""
+        strong, weak = [], []
+        for category in KPI_CATEGORIES:
+            for field, value in results.category(category).model_dump().items():
+                if not field.endswith(("compliance", "efficiency", "uptime", "availability")):
+                    continue
+                if value >= 90.0:
+                    strong.append(f"{category}.{field}")
+                elif value < 70.0:
+                    weak.append(f"{category}.{field}")
+        return strong, weak
+    
     async def generate_kpi_cards(self, hybrid_service, start_time, end_time, selected_nodes=None, card_type="summary", limit=20):
         """Generate KPI cards."""
         return [
@@ -10,8 +10,9 @@ from typing import List, Optional, Dict, Any
 
 from src.schemas.api.kpis import NetworkEfficiencyKPIs, KPIAlert, KPIGoal, KPICard, AlertLevel, TrendDirection
 from src.infrastructure.data.hybrid_data_service import HybridDataService
+from .kpi_engine import KPIEngine, get_kpi_engine
 from .kpi_defaults import get_default_network_efficiency_kpis
-from .kpi_utils import calculate_overall_efficiency_score, create_kpi_alert, create_kpi_goal
+from .kpi_utils import create_kpi_alert, create_kpi_goal
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +20,9 @@ logger = logging.getLogger(__name__)
 class NetworkEfficiencyService:
     """Service for network efficiency KPI calculations."""
     
-    def __init__(self):
+    def __init__(self, engine: Optional[KPIEngine] = None):
         self.logger = logging.getLogger(__name__)
+        self.engine = engine or get_kpi_engine()
     
     async def calculate_network_efficiency_kpis(
         self,
@@ -31,48 +33,11 @@ class NetworkEfficiencyService:
     ) -> NetworkEfficiencyKPIs:
         """Calculate network efficiency KPIs."""
         try:
-            # Get network data
-            network_data = await hybrid_service.get_network_efficiency_data(
-                start_time, end_time, selected_nodes
-            )
-            
-            if not network_data:
-                return get_default_network_efficiency_kpis()
-            
-            # Calculate water loss
-            water_loss_percentage = self._calculate_water_loss_percentage(network_data)
-            
-            # Calculate pressure efficiency
-            pressure_efficiency = self._calculate_pressure_efficiency(network_data)
-            
-            # Calculate flow efficiency
-            flow_efficiency = self._calculate_flow_efficiency(network_data)
-            
-            # Calculate energy efficiency
-            energy_efficiency = self._calculate_energy_efficiency(network_data)
-            
-            # Calculate network coverage
-            network_coverage = self._calculate_network_coverage(network_data)
-            
-            # Calculate distribution efficiency
-            distribution_efficiency = self._calculate_distribution_efficiency(network_data)
-            
-            # Calculate overall efficiency score
-            overall_efficiency_score = calculate_overall_efficiency_score(
-                water_loss_percentage, pressure_efficiency, flow_efficiency,
-                energy_efficiency, distribution_efficiency
-            )
-            
-            return NetworkEfficiencyKPIs(
-                water_loss_percentage=water_loss_percentage,
-                pressure_efficiency_percentage=pressure_efficiency,
-                flow_efficiency_percentage=flow_efficiency,
-                energy_efficiency_percentage=energy_efficiency,
-                network_coverage_percentage=network_coverage,
-                distribution_efficiency_percentage=distribution_efficiency,
-                overall_efficiency_score=overall_efficiency_score,
-                timestamp=datetime.now()
+            # Shared with the other categories: one fetch and pass per window
+            results = await self.engine.compute(
+                hybrid_service, start_time, end_time, selected_nodes
             )
+            return results.network_efficiency
             
         except Exception as e:
             self.logger.error(f"Error calculating network efficiency KPIs: {str(e)}")
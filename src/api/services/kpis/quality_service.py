@@ -10,8 +10,9 @@ from typing import List, Optional, Dict, Any
 
 from src.schemas.api.kpis import QualityKPIs, KPIAlert, KPIGoal, KPICard, AlertLevel, TrendDirection
 from src.infrastructure.data.hybrid_data_service import HybridDataService
+from .kpi_engine import KPIEngine, get_kpi_engine
 from .kpi_defaults import get_default_quality_kpis
-from .kpi_utils import calculate_quality_score, create_kpi_alert, create_kpi_goal
+from .kpi_utils import create_kpi_alert, create_kpi_goal
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +20,9 @@ logger = logging.getLogger(__name__)
 class QualityService:
     """Service for quality KPI calculations."""
     
-    def __init__(self):
+    def __init__(self, engine: Optional[KPIEngine] = None):
         self.logger = logging.getLogger(__name__)
+        self.engine = engine or get_kpi_engine()
     
     async def calculate_quality_kpis(
         self,
@@ -31,44 +33,11 @@ class QualityService:
     ) -> QualityKPIs:
         """Calculate water quality KPIs."""
         try:
-            # Get quality data
-            quality_data = await hybrid_service.get_quality_data(
-                start_time, end_time, selected_nodes
-            )
-            
-            if not quality_data:
-                return get_default_quality_kpis()
-            
-            # Calculate quality compliance
-            quality_compliance = self._calculate_quality_compliance(quality_data)
-            
-            # Calculate contamination incidents
-            contamination_incidents = self._calculate_contamination_incidents(quality_data)
-            
-            # Calculate temperature compliance
-            temperature_compliance = self._calculate_temperature_compliance(quality_data)
-            
-            # Calculate pressure compliance
-            pressure_compliance = self._calculate_pressure_compliance(quality_data)
-            
-            # Calculate flow rate compliance
-            flow_rate_compliance = self._calculate_flow_rate_compliance(quality_data)
-            
-            # Calculate quality score
-            quality_score = calculate_quality_score(
-                quality_compliance, contamination_incidents, temperature_compliance,
-                pressure_compliance, flow_rate_compliance
-            )
-            
-            return QualityKPIs(
-                quality_compliance_percentage=quality_compliance,
-                contamination_incidents_count=contamination_incidents,
-                temperature_compliance_percentage=temperature_compliance,
-                pressure_compliance_percentage=pressure_compliance,
-                flow_rate_compliance_percentage=flow_rate_compliance,
-                quality_score=quality_score,
-                timestamp=datetime.now()
+            # Shared with the other categories: one fetch and pass per window
+            results = await self.engine.compute(
+                hybrid_service, start_time, end_time, selected_nodes
             )
+            return results.quality
             
         except Exception as e:
             self.logger.error(f"Error calculating quality KPIs: {str(e)}")
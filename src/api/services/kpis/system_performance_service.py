@@ -10,8 +10,9 @@ from typing import List, Optional, Dict, Any
 
 from src.schemas.api.kpis import SystemPerformanceKPIs, KPIAlert, KPIGoal, KPICard, AlertLevel
 from src.infrastructure.data.hybrid_data_service import HybridDataService
+from .kpi_engine import KPIEngine, get_kpi_engine
 from .kpi_defaults import get_default_system_performance_kpis
-from .kpi_utils import calculate_performance_score, create_kpi_alert, create_kpi_goal
+from .kpi_utils import create_kpi_alert, create_kpi_goal
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +20,9 @@ logger = logging.getLogger(__name__)
 class SystemPerformanceService:
     """Service for system performance KPI calculations."""
     
-    def __init__(self):
+    def __init__(self, engine: Optional[KPIEngine] = None):
         self.logger = logging.getLogger(__name__)
+        self.engine = engine or get_kpi_engine()
     
     async def calculate_system_performance_kpis(
         self,
@@ -31,49 +33,11 @@ class SystemPerformanceService:
     ) -> SystemPerformanceKPIs:
         """Calculate system performance KPIs."""
         try:
-            # Get system data
-            system_data = await hybrid_service.get_system_performance_data(
-                start_time, end_time, selected_nodes
-            )
-            
-            if not system_data:
-                return get_default_system_performance_kpis()
-            
-            # Calculate uptime
-            uptime_percentage = self._calculate_uptime_percentage(system_data)
-            
-            # Calculate response time
-            response_time = self._calculate_average_response_time(system_data)
-            
-            # Calculate throughput
-            throughput = self._calculate_system_throughput(system_data)
-            
-            # Calculate error rate
-            error_rate = self._calculate_error_rate(system_data)
-            
-            # Calculate resource utilization
-            cpu_utilization = self._calculate_cpu_utilization(system_data)
-            memory_utilization = self._calculate_memory_utilization(system_data)
-            
-            # Calculate availability
-            availability = self._calculate_system_availability(system_data)
-            
-            # Calculate performance score
-            performance_score = calculate_performance_score(
-                uptime_percentage, response_time, throughput, error_rate
-            )
-            
-            return SystemPerformanceKPIs(
-                uptime_percentage=uptime_percentage,
-                response_time_ms=response_time,
-                throughput_requests_per_second=throughput,
-                error_rate_percentage=error_rate,
-                cpu_utilization_percentage=cpu_utilization,
-                memory_utilization_percentage=memory_utilization,
-                availability_percentage=availability,
-                performance_score=performance_score,
-                timestamp=datetime.now()
+            # Shared with the other categories: one fetch and pass per window
+            results = await self.engine.compute(
+                hybrid_service, start_time, end_time, selected_nodes
             )
+            return results.system_performance
             
         except Exception as e:
             self.logger.error(f"Error calculating system performance KPIs: {str(e)}")
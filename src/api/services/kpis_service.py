@@ -13,6 +13,13 @@ from typing import List, Optional
 
 from src.schemas.api.kpis import (
     KPIDashboard,
+    SystemPerformanceKPIs,
+    NetworkEfficiencyKPIs,
+    QualityKPIs,
+    MaintenanceKPIs,
+    OperationalKPIs,
+    FinancialKPIs,
+    ComplianceKPIs,
     KPICard,
     KPITrend,
     KPIBenchmark,
@@ -37,29 +44,121 @@ async def generate_kpi_dashboard(
     start_time: datetime,
     end_time: datetime,
     selected_nodes: Optional[List[str]] = None,
-    update_frequency: int = 300
+    update_frequency: int = 300,
+    include_alerts: bool = True,
+    include_trends: bool = False,
+    dashboard_type: str = "operational"
 ) -> KPIDashboard:
     """
     Generate comprehensive KPI dashboard with real-time metrics.
     
+    All categories are computed from one fetch of the window's readings,
+    memoized briefly per time range and node selection.
+    
     Args:
         hybrid_service: Data service instance
         start_time: Start time for analysis
         end_time: End time for analysis
         selected_nodes: Optional list of nodes to analyze
         update_frequency: Update frequency in seconds
+        include_alerts: Include active alerts
+        include_trends: Include trend analysis
+        dashboard_type: Dashboard type (operational, executive, technical)
         
     Returns:
         KPIDashboard: Complete dashboard with all KPI categories
     """
     return await _kpi_orchestrator.generate_kpi_dashboard(
-        hybrid_service, start_time, end_time, selected_nodes, update_frequency
+        hybrid_service, start_time, end_time, selected_nodes, update_frequency,
+        include_alerts, include_trends, dashboard_type
+    )
+
+
+# Per-category endpoints read from the same shared computation as the dashboard
+
+
+async def calculate_system_performance_kpis(
+    hybrid_service: HybridDataService,
+    start_time: datetime,
+    end_time: datetime,
+    selected_nodes: Optional[List[str]] = None
+) -> SystemPerformanceKPIs:
+    """Calculate system performance KPIs."""
+    return await _kpi_orchestrator.calculate_category_kpis(
+        hybrid_service, "system_performance", start_time, end_time, selected_nodes
+    )
+
+
+async def calculate_network_efficiency_kpis(
+    hybrid_service: HybridDataService,
+    start_time: datetime,
+    end_time: datetime,
+    selected_nodes: Optional[List[str]] = None
+) -> NetworkEfficiencyKPIs:
+    """Calculate network efficiency KPIs."""
+    return await _kpi_orchestrator.calculate_category_kpis(
+        hybrid_service, "network_efficiency", start_time, end_time, selected_nodes
+    )
+
+
+async def calculate_quality_kpis(
+    hybrid_service: HybridDataService,
+    start_time: datetime,
+    end_time: datetime,
+    selected_nodes: Optional[List[str]] = None
+) -> QualityKPIs:
+    """Calculate water quality KPIs."""
+    return await _kpi_orchestrator.calculate_category_kpis(
+        hybrid_service, "quality", start_time, end_time, selected_nodes
+    )
+
+
+async def calculate_maintenance_kpis(
+    hybrid_service: HybridDataService,
+    start_time: datetime,
+    end_time: datetime,
+    selected_nodes: Optional[List[str]] = None
+) -> MaintenanceKPIs:
+    """Calculate maintenance KPIs."""
+    return await _kpi_orchestrator.calculate_category_kpis(
+        hybrid_service, "maintenance", start_time, end_time, selected_nodes
+    )
+
+
+async def calculate_operational_kpis(
+    hybrid_service: HybridDataService,
+    start_time: datetime,
+    end_time: datetime,
+    selected_nodes: Optional[List[str]] = None
+) -> OperationalKPIs:
+    """Calculate operational KPIs."""
+    return await _kpi_orchestrator.calculate_category_kpis(
+        hybrid_service, "operational", start_time, end_time, selected_nodes
     )
 
 
-# Individual KPI calculation functions are now handled by specific services
-# These functions are deprecated and will be removed in a future version
-# Use the orchestrator methods instead
+async def calculate_financial_kpis(
+    hybrid_service: HybridDataService,
+    start_time: datetime,
+    end_time: datetime,
+    selected_nodes: Optional[List[str]] = None
+) -> FinancialKPIs:
+    """Calculate financial KPIs."""
+    return await _kpi_orchestrator.calculate_category_kpis(
+        hybrid_service, "financial", start_time, end_time, selected_nodes
+    )
+
+
+async def calculate_compliance_kpis(
+    hybrid_service: HybridDataService,
+    start_time: datetime,
+    end_time: datetime,
+    selected_nodes: Optional[List[str]] = None
+) -> ComplianceKPIs:
+    """Calculate compliance KPIs."""
+    return await _kpi_orchestrator.calculate_category_kpis(
+        hybrid_service, "compliance", start_time, end_time, selected_nodes
+    )
 
 
 async def generate_kpi_cards(
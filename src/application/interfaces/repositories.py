@@ -1,14 +1,49 @@
 """Repository interfaces for the application layer."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
 from uuid import UUID
 
 from src.domain.entities.monitoring_node import MonitoringNode
 from src.domain.entities.sensor_reading import SensorReading
 from src.domain.entities.water_network import WaterNetwork
 
+T = TypeVar("T")
+
+# Concurrent lookups made by the default bulk methods
+DEFAULT_LOAD_CONCURRENCY = 10
+
+
+async def gather_bounded(
+    keys: Iterable[UUID],
+    load: Callable[[UUID], Awaitable[T]],
+    max_concurrency: int = DEFAULT_LOAD_CONCURRENCY,
+) -> Dict[UUID, T]:
+    """
+    Run `load` for every key, at most `max_concurrency` at a time.
+
+    Args:
+        keys: Keys to load (duplicates are loaded once)
+        load: Coroutine function loading one key
+        max_concurrency: Maximum loads in flight
+
+    Returns:
+        Result per key
+    """
+    pending = list(dict.fromkeys(keys))
+    remaining = iter(pending)
+    results: Dict[UUID, T] = {}
+
+    # A fixed set of workers share the keys instead of one task per key
+    async def worker() -> None:
+        for key in remaining:
+            results[key] = await load(key)
+
+    await asyncio.gather(*(worker() for _ in range(min(max_concurrency, len(pending)))))
+    return results
+
 
 class ISensorReadingRepository(ABC):
     """Interface for sensor reading repository."""
@@ -34,6 +69,28 @@ class ISensorReadingRepository(ABC):
         """Get sensor readings for a specific node."""
         pass
 
+    async def get_by_node_ids(
+        self,
+        node_ids: Iterable[UUID],
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[UUID, List[SensorReading]]:
+        """
+        Get sensor readings for several nodes.
+
+        The default runs bounded concurrent get_by_node_id calls;
+        implementations that can should override it with a single query.
+
+        Returns:
+            Readings per requested node, as get_by_node_id orders them
+        """
+        return await gather_bounded(
+            node_ids,
+            lambda node_id: self.get_by_node_id(
+                node_id=node_id, start_time=start_time, end_time=end_time
+            ),
+        )
+
     @abstractmethod
     async def get_latest_by_node(self, node_id: UUID) -> Optional[SensorReading]:
         """Get the latest sensor reading for a node."""
@@ -58,6 +115,11 @@ class IMonitoringNodeRepository(ABC):
         """Get a monitoring node by ID."""
         pass
 
+    async def get_by_ids(self, node_ids: Iterable[UUID]) -> List[MonitoringNode]:
+        """Get the monitoring nodes with the given IDs, skipping unknown IDs."""
+        nodes = await gather_bounded(node_ids, self.get_by_id)
+        return [node for node in nodes.values() if node is not None]
+
     @abstractmethod
     async def get_by_name(self, name: str) -> Optional[MonitoringNode]:
         """Get a monitoring node by name."""
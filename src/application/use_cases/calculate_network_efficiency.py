@@ -11,6 +11,7 @@ from src.application.interfaces.repositories import (
     ISensorReadingRepository,
     IWaterNetworkRepository,
 )
+from src.domain.entities.water_network import WaterNetwork
 from src.domain.services.network_efficiency_service import NetworkEfficiencyService
 
 
@@ -43,27 +44,8 @@ class CalculateNetworkEfficiencyUseCase:
         if end_date <= start_date:
             raise ValueError("End date must be after start date")
 
-        # Get the network
-        network = await self.water_network_repository.get_by_id(network_id)
-        if not network:
-            raise ValueError(f"Network with ID {network_id} not found")
-
-        # Load all nodes for the network
-        all_nodes = await self.monitoring_node_repository.get_all()
-        network_nodes = [
-            node for node in all_nodes if node.id in [n.id for n in network.nodes]
-        ]
-
-        # Load readings for each node
-        for node in network_nodes:
-            readings = await self.sensor_reading_repository.get_by_node_id(
-                node_id=node.id, start_time=start_date, end_time=end_date
-            )
-            for reading in readings:
-                node.add_reading(reading)
-
-        # Update network with loaded nodes
-        network._nodes = {node.id: node for node in network_nodes}
+        # Get the network with its nodes and their readings
+        network = await self._load_network(network_id, start_date, end_date)
 
         # Calculate efficiency
         efficiency_event = self.network_efficiency_service.calculate_network_efficiency(
@@ -106,24 +88,7 @@ class CalculateNetworkEfficiencyUseCase:
     ) -> List[Dict[str, any]]:
         """Detect potential leakage zones in the network."""
         # Get the network with all data
-        network = await self.water_network_repository.get_by_id(network_id)
-        if not network:
-            raise ValueError(f"Network with ID {network_id} not found")
-
-        # Load all nodes and their readings
-        all_nodes = await self.monitoring_node_repository.get_all()
-        network_nodes = [
-            node for node in all_nodes if node.id in [n.id for n in network.nodes]
-        ]
-
-        for node in network_nodes:
-            readings = await self.sensor_reading_repository.get_by_node_id(
-                node_id=node.id, start_time=start_date, end_time=end_date
-            )
-            for reading in readings:
-                node.add_reading(reading)
-
-        network._nodes = {node.id: node for node in network_nodes}
+        network = await self._load_network(network_id, start_date, end_date)
 
         # Detect leakage zones
         leakage_zones = self.network_efficiency_service.detect_leakage_zones(
@@ -152,6 +117,30 @@ class CalculateNetworkEfficiencyUseCase:
 
         return results
 
+    async def _load_network(
+        self, network_id: UUID, start_date: datetime, end_date: datetime
+    ) -> WaterNetwork:
+        """Load a network with its nodes and their readings for the period."""
+        network = await self.water_network_repository.get_by_id(network_id)
+        if not network:
+            raise ValueError(f"Network with ID {network_id} not found")
+
+        # Load all nodes for the network
+        member_ids = {node.id for node in network.nodes}
+        all_nodes = await self.monitoring_node_repository.get_all()
+        network_nodes = [node for node in all_nodes if node.id in member_ids]
+
+        # Load readings for every node together rather than node after node
+        readings_by_node = await self.sensor_reading_repository.get_by_node_ids(
+            [node.id for node in network_nodes], start_time=start_date, end_time=end_date
+        )
+        for node in network_nodes:
+            node.add_readings(readings_by_node.get(node.id, []))
+
+        # Update network with loaded nodes
+        network.replace_nodes(network_nodes)
+        return network
+
     def _classify_loss_severity(self, loss_percentage: float) -> str:
         """Classify the severity of water loss."""
         if loss_percentage >= 30:
@@ -44,11 +44,7 @@ class DetectNetworkAnomaliesUseCase:
         """Detect anomalies in the network for specified nodes or all nodes."""
         # Determine which nodes to analyze
         if node_ids:
-            nodes = []
-            for node_id in node_ids:
-                node = await self.monitoring_node_repository.get_by_id(node_id)
-                if node:
-                    nodes.append(node)
+            nodes = await self.monitoring_node_repository.get_by_ids(node_ids)
         else:
             # Get all active nodes
             nodes = await self.monitoring_node_repository.get_all(active_only=True)
@@ -67,12 +63,14 @@ class DetectNetworkAnomaliesUseCase:
 
         all_anomalies = []
 
+        # Get readings for all nodes together rather than node after node
+        readings_by_node = await self.sensor_reading_repository.get_by_node_ids(
+            [node.id for node in nodes], start_time=start_time, end_time=end_time
+        )
+
         # Analyze each node
         for node in nodes:
-            # Get readings for the node
-            readings = await self.sensor_reading_repository.get_by_node_id(
-                node_id=node.id, start_time=start_time, end_time=end_time
-            )
+            readings = readings_by_node.get(node.id, [])
 
             if len(readings) < 10:  # Skip if insufficient data
                 continue
@@ -122,13 +120,13 @@ class DetectNetworkAnomaliesUseCase:
 
                 all_anomalies.append(anomaly_dto)
 
-                # Publish event
-                await self.event_bus.publish(event)
-
                 # Send notification for critical anomalies
                 if notify_on_critical and event.severity in ["critical", "high"]:
                     await self._send_anomaly_notification(node.name, anomaly_dto)
 
+            # Publish the node's events together
+            await self.event_bus.publish_batch(anomaly_events)
+
         return all_anomalies
 
     async def _send_anomaly_notification(
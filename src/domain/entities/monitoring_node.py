@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from uuid import UUID
 
 from src.domain.entities.base import Entity
+from src.domain.entities.reading_store import ReadingStore, ReadingsView
 from src.domain.entities.sensor_reading import SensorReading
 from src.domain.value_objects.location import NodeLocation
 from src.domain.value_objects.node_status import NodeStatus
@@ -26,7 +27,7 @@ class MonitoringNode(Entity):
         self._node_type = node_type
         self._status = status
         self._description = description
-        self._readings: List[SensorReading] = []
+        self._readings = ReadingStore()
         self._validate()
 
     def _validate(self) -> None:
@@ -62,7 +63,7 @@ class MonitoringNode(Entity):
 
     @property
     def readings(self) -> List[SensorReading]:
-        return self._readings.copy()
+        return list(self._readings)
 
     def add_reading(self, reading: SensorReading) -> None:
         """Add a sensor reading to this node."""
@@ -72,18 +73,24 @@ class MonitoringNode(Entity):
         self._readings.append(reading)
         self.update_timestamp()
 
+    def add_readings(self, readings: Iterable[SensorReading]) -> None:
+        """Add many sensor readings to this node at once."""
+        readings = list(readings)
+        if any(reading.node_id != self.id for reading in readings):
+            raise ValueError("Reading node ID does not match this node")
+
+        self._readings.extend(readings)
+        self.update_timestamp()
+
     def get_latest_reading(self) -> Optional[SensorReading]:
         """Get the most recent sensor reading."""
-        if not self._readings:
-            return None
-
-        return max(self._readings, key=lambda r: r.timestamp)
+        return self._readings.latest()
 
     def get_readings_in_range(
         self, start_time: datetime, end_time: datetime
-    ) -> List[SensorReading]:
-        """Get readings within a specific time range."""
-        return [r for r in self._readings if start_time <= r.timestamp <= end_time]
+    ) -> ReadingsView:
+        """Get readings within a specific time range, in time order (a read-only view)."""
+        return self._readings.between(start_time, end_time)
 
     def activate(self) -> None:
         """Activate the monitoring node."""
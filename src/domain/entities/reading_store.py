@@ -0,0 +1,136 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.domain.entities.sensor_reading import SensorReading
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _time_key(moment: datetime) -> int:
+    """Microseconds since the epoch; naive times are taken as UTC."""
+    epoch = _EPOCH if moment.tzinfo is None else _EPOCH_UTC
+    return (moment - epoch) // _MICROSECOND
+
+
+class ReadingsView(Sequence):
+    """Read-only window over a reading store, without copying readings."""
+
+    __slots__ = ("_readings", "_start", "_stop")
+
+    def __init__(self, readings: List[SensorReading], start: int, stop: int) -> None:
+        self._readings = readings
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, item: Any) -> Any:
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return ReadingsView(self._readings, self._start + start, self._start + max(start, stop))
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("reading index out of range")
+        return self._readings[self._start + item]
+
+    def __iter__(self) -> Iterator[SensorReading]:
+        return islice(self._readings, self._start, self._stop)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ReadingsView, list, tuple)):
+            return len(self) == len(other) and all(a is b or a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ReadingsView({len(self)} readings)"
+
+
+class ReadingStore:
+    """
+    Time-sorted storage of a node's readings.
+
+    Readings are kept in timestamp order next to a numpy array of their
+    times, so a time window is two binary searches (O(log n)) and comes
+    back as a view over the stored readings rather than a new list.
+    In-order appends are O(1) amortized; an out-of-order append defers a
+    single stable re-sort to the next query.
+    """
+
+    def __init__(self, readings: Optional[Iterable[SensorReading]] = None) -> None:
+        self._readings: List[SensorReading] = []
+        self._keys = np.empty(16, dtype=np.int64)
+        self._sorted = True
+        if readings is not None:
+            self.extend(readings)
+
+    def __len__(self) -> int:
+        return len(self._readings)
+
+    def __iter__(self) -> Iterator[SensorReading]:
+        self._ensure_sorted()
+        return iter(self._readings)
+
+    def append(self, reading: SensorReading) -> None:
+        """Add one reading."""
+        self.extend((reading,))
+
+    def extend(self, readings: Iterable[SensorReading]) -> None:
+        """Add many readings with one array update."""
+        readings = list(readings)
+        if not readings:
+            return
+        keys = np.fromiter((_time_key(r.timestamp) for r in readings), dtype=np.int64, count=len(readings))
+        size = len(self._readings)
+        self._reserve(size + len(keys))
+        self._keys[size:size + len(keys)] = keys
+        if self._sorted and (
+            (size and keys[0] < self._keys[size - 1]) or np.any(keys[1:] < keys[:-1])
+        ):
+            self._sorted = False
+        self._readings.extend(readings)
+
+    def between(self, start_time: datetime, end_time: datetime) -> ReadingsView:
+        """
+        Readings with start_time <= timestamp <= end_time, in time order.
+
+        Returns:
+            A view over the stored readings
+        """
+        self._ensure_sorted()
+        keys = self._keys[:len(self._readings)]
+        start = int(np.searchsorted(keys, _time_key(start_time), side="left"))
+        stop = int(np.searchsorted(keys, _time_key(end_time), side="right"))
+        return ReadingsView(self._readings, start, max(start, stop))
+
+    def latest(self) -> Optional[SensorReading]:
+        """The reading with the latest timestamp."""
+        if not self._readings:
+            return None
+        self._ensure_sorted()
+        return self._readings[-1]
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._keys):
+            keys = np.empty(max(size, 2 * len(self._keys)), dtype=np.int64)
+            keys[:len(self._readings)] = self._keys[:len(self._readings)]
+            self._keys = keys
+
+    def _ensure_sorted(self) -> None:
+        if self._sorted:
+            return
+        size = len(self._readings)
+        order = np.argsort(self._keys[:size], kind="stable")
+        self._keys[:size] = self._keys[:size][order]
+        # A new list, so views handed out earlier keep their snapshot
+        self._readings = [self._readings[i] for i in order]
+        self._sorted = True
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Set
 from uuid import UUID
@@ -5,6 +6,7 @@ from uuid import UUID
 from src.domain.entities.base import Entity
 from src.domain.entities.monitoring_node import MonitoringNode
 from src.domain.value_objects.measurements import FlowRate, Volume
+from src.domain.value_objects.network_topology import NetworkTopology
 
 
 class WaterNetwork(Entity):
@@ -23,6 +25,12 @@ class WaterNetwork(Entity):
         self._description = description
         self._nodes: Dict[UUID, MonitoringNode] = {}
         self._connections: Set[tuple[UUID, UUID]] = set()
+        # Adjacency lists kept alongside the connection set
+        self._downstream: Dict[UUID, Set[UUID]] = defaultdict(set)
+        self._upstream: Dict[UUID, Set[UUID]] = defaultdict(set)
+        self._topology: Optional[NetworkTopology] = None
+        self._topology_revision: Optional[int] = None
+        self._revision = 0
         self._validate()
 
     def _validate(self) -> None:
@@ -63,7 +71,7 @@ class WaterNetwork(Entity):
             raise ValueError(f"Node {node.id} already exists in network")
 
         self._nodes[node.id] = node
-        self.update_timestamp()
+        self._changed()
 
     def remove_node(self, node_id: UUID) -> None:
         """Remove a monitoring node from the network."""
@@ -71,10 +79,20 @@ class WaterNetwork(Entity):
             raise ValueError(f"Node {node_id} not found in network")
 
         # Remove all connections involving this node
-        self._connections = {conn for conn in self._connections if node_id not in conn}
+        for to_id in self._downstream.pop(node_id, set()):
+            self._upstream[to_id].discard(node_id)
+            self._connections.discard((node_id, to_id))
+        for from_id in self._upstream.pop(node_id, set()):
+            self._downstream[from_id].discard(node_id)
+            self._connections.discard((from_id, node_id))
 
         del self._nodes[node_id]
-        self.update_timestamp()
+        self._changed()
+
+    def replace_nodes(self, nodes: List[MonitoringNode]) -> None:
+        """Replace the node objects, e.g. with copies carrying loaded readings."""
+        self._nodes = {node.id: node for node in nodes}
+        self._changed()
 
     def get_node(self, node_id: UUID) -> Optional[MonitoringNode]:
         """Get a monitoring node by ID."""
@@ -96,7 +114,17 @@ class WaterNetwork(Entity):
             raise ValueError("Connection already exists")
 
         self._connections.add(connection)
-        self.update_timestamp()
+        self._downstream[from_node_id].add(to_node_id)
+        self._upstream[to_node_id].add(from_node_id)
+        self._changed()
+
+    def restore_connections(self, connections: List[tuple[UUID, UUID]]) -> None:
+        """Restore stored connections; their nodes may be added afterwards."""
+        for from_node_id, to_node_id in connections:
+            self._connections.add((from_node_id, to_node_id))
+            self._downstream[from_node_id].add(to_node_id)
+            self._upstream[to_node_id].add(from_node_id)
+        self._revision += 1
 
     def disconnect_nodes(self, from_node_id: UUID, to_node_id: UUID) -> None:
         """Remove a connection between two nodes."""
@@ -105,21 +133,42 @@ class WaterNetwork(Entity):
             raise ValueError("Connection does not exist")
 
         self._connections.remove(connection)
-        self.update_timestamp()
+        self._downstream[from_node_id].discard(to_node_id)
+        self._upstream[to_node_id].discard(from_node_id)
+        self._changed()
 
     def get_connected_nodes(self, node_id: UUID) -> List[UUID]:
         """Get all nodes connected to a specific node."""
         if node_id not in self._nodes:
             raise ValueError(f"Node {node_id} not found")
 
-        connected = []
-        for from_id, to_id in self._connections:
-            if from_id == node_id:
-                connected.append(to_id)
-            elif to_id == node_id:
-                connected.append(from_id)
+        return list(self._downstream.get(node_id, ())) + list(self._upstream.get(node_id, ()))
+
+    def get_downstream_nodes(self, node_id: UUID) -> List[UUID]:
+        """Get the nodes a specific node feeds into."""
+        if node_id not in self._nodes:
+            raise ValueError(f"Node {node_id} not found")
 
-        return connected
+        return list(self._downstream.get(node_id, ()))
+
+    def get_upstream_nodes(self, node_id: UUID) -> List[UUID]:
+        """Get the nodes feeding into a specific node."""
+        if node_id not in self._nodes:
+            raise ValueError(f"Node {node_id} not found")
+
+        return list(self._upstream.get(node_id, ()))
+
+    @property
+    def topology(self) -> NetworkTopology:
+        """Array index of the current nodes and connections, rebuilt after changes."""
+        if self._topology is None or self._topology_revision != self._revision:
+            self._topology = NetworkTopology.build(list(self._nodes), self._connections)
+            self._topology_revision = self._revision
+        return self._topology
+
+    def _changed(self) -> None:
+        self._revision += 1
+        self.update_timestamp()
 
     def calculate_network_efficiency(
         self, start_time: datetime, end_time: datetime
@@ -1,13 +1,16 @@
 """Domain service for calculating water network efficiency."""
 
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 
+import numpy as np
+
 from src.domain.entities.monitoring_node import MonitoringNode
 from src.domain.entities.water_network import WaterNetwork
 from src.domain.events.network_events import NetworkEfficiencyCalculatedEvent
 from src.domain.value_objects.measurements import FlowRate, Volume
+from src.domain.value_objects.network_topology import ZoneBalance
 
 
 class NetworkEfficiencyService:
@@ -47,8 +50,7 @@ class NetworkEfficiencyService:
             loss_percentage = 100.0 - efficiency
 
         # Create and return event
-        return NetworkEfficiencyCalculatedEvent(
-            aggregate_id=network.id,
+        event = NetworkEfficiencyCalculatedEvent(
             network_id=network.id,
             period_start=start_time.isoformat(),
             period_end=end_time.isoformat(),
@@ -57,6 +59,8 @@ class NetworkEfficiencyService:
             total_output=round(total_output, 2),
             loss_percentage=round(loss_percentage, 2),
         )
+        event.aggregate_id = network.id
+        return event
 
     def _get_nodes_by_type(
         self, network: WaterNetwork, node_types: List[str]
@@ -75,23 +79,69 @@ class NetworkEfficiencyService:
         self, nodes: List[MonitoringNode], start_time: datetime, end_time: datetime
     ) -> float:
         """Calculate total flow volume for a list of nodes."""
-        total_flow = 0.0
-
-        for node in nodes:
-            readings = node.get_readings_in_range(start_time, end_time)
+        return sum(self._node_flow_summary(node, start_time, end_time)[0] for node in nodes)
 
-            # Sum up volumes if available, otherwise integrate flow rates
-            for reading in readings:
-                if reading.volume:
-                    vol_val = reading.volume.value if hasattr(reading.volume, 'value') else reading.volume
-                    total_flow += vol_val
-                elif reading.flow_rate:
-                    # Assume 30-minute intervals for flow rate integration
-                    # Convert L/s to m³ for 30 minutes
-                    flow_val = reading.flow_rate.value if hasattr(reading.flow_rate, 'value') else reading.flow_rate
-                    total_flow += flow_val * 1800 / 1000
+    def _node_flow_summary(
+        self, node: MonitoringNode, start_time: datetime, end_time: datetime
+    ) -> Tuple[float, float, int]:
+        """Total volume, average flow rate and reading count of a node, in one scan."""
+        readings = node.get_readings_in_range(start_time, end_time)
+        total_flow = 0.0
+        flow_sum = 0.0
+        flow_count = 0
+
+        # Sum up volumes if available, otherwise integrate flow rates
+        for reading in readings:
+            flow_val = None
+            if reading.flow_rate:
+                flow_val = reading.flow_rate.value if hasattr(reading.flow_rate, 'value') else reading.flow_rate
+                flow_sum += flow_val
+                flow_count += 1
+            if reading.volume:
+                vol_val = reading.volume.value if hasattr(reading.volume, 'value') else reading.volume
+                total_flow += vol_val
+            elif flow_val is not None:
+                # Assume 30-minute intervals for flow rate integration
+                # Convert L/s to m³ for 30 minutes
+                total_flow += flow_val * 1800 / 1000
+
+        avg_flow_rate = flow_sum / flow_count if flow_count else 0.0
+        return total_flow, avg_flow_rate, len(readings)
+
+    def calculate_node_flow_totals(
+        self, network: WaterNetwork, start_time: datetime, end_time: datetime
+    ) -> np.ndarray:
+        """
+        Total flow volume of every node, each node's readings scanned once.
+
+        Returns:
+            One total per node, in `network.topology.node_ids` order
+        """
+        return np.array(
+            [
+                self._node_flow_summary(network.get_node(node_id), start_time, end_time)[0]
+                for node_id in network.topology.node_ids
+            ],
+            dtype=float,
+        )
 
-        return total_flow
+    def calculate_zone_balance(
+        self,
+        network: WaterNetwork,
+        zone_node_ids: Iterable[UUID],
+        start_time: datetime,
+        end_time: datetime,
+        node_flows: Optional[np.ndarray] = None,
+    ) -> ZoneBalance:
+        """
+        Calculate inflow versus outflow for any connected group of nodes.
+
+        Pass `node_flows` from calculate_node_flow_totals to balance many
+        zones over the same period without rescanning readings.
+        """
+        if node_flows is None:
+            node_flows = self.calculate_node_flow_totals(network, start_time, end_time)
+        return network.topology.zone_balance(node_flows, zone_node_ids)
 
     def analyze_node_contribution(
         self, network: WaterNetwork, start_time: datetime, end_time: datetime
@@ -100,18 +150,15 @@ class NetworkEfficiencyService:
         contributions = {}
 
         for node in network.nodes:
-            total_volume = self._calculate_total_flow([node], start_time, end_time)
-
-            # Calculate average flow rate
-            readings = node.get_readings_in_range(start_time, end_time)
-            flow_rates = [r.flow_rate.value if hasattr(r.flow_rate, 'value') else r.flow_rate for r in readings if r.flow_rate]
-            avg_flow_rate = sum(flow_rates) / len(flow_rates) if flow_rates else 0.0
+            total_volume, avg_flow_rate, reading_count = self._node_flow_summary(
+                node, start_time, end_time
+            )
 
             contributions[node.id] = {
                 "node_name": node.name,
                 "total_volume": round(total_volume, 2),
                 "average_flow_rate": round(avg_flow_rate, 2),
-                "reading_count": len(readings),
+                "reading_count": reading_count,
             }
 
         return contributions
@@ -124,24 +171,19 @@ class NetworkEfficiencyService:
         loss_threshold: float = 10.0,
     ) -> List[Tuple[UUID, UUID, float]]:
         """Detect potential leakage zones between connected nodes."""
-        potential_leaks = []
-
-        # Check flow balance between connected nodes
-        for from_id, to_id in network._connections:
-            from_node = network.get_node(from_id)
-            to_node = network.get_node(to_id)
-
-            if not from_node or not to_node:
-                continue
-
-            # Calculate flow from source to destination
-            from_flow = self._calculate_total_flow([from_node], start_time, end_time)
-            to_flow = self._calculate_total_flow([to_node], start_time, end_time)
-
-            if from_flow > 0:
-                loss_percentage = ((from_flow - to_flow) / from_flow) * 100
-
-                if loss_percentage > loss_threshold:
-                    potential_leaks.append((from_id, to_id, loss_percentage))
-
-        return potential_leaks
+        topology = network.topology
+        node_flows = self.calculate_node_flow_totals(network, start_time, end_time)
+
+        # Flow balance of every connection at once; NaN where nothing flows in
+        losses = topology.edge_loss_percentages(node_flows)
+        with np.errstate(invalid="ignore"):
+            leaking = np.flatnonzero(losses > loss_threshold)
+
+        return [
+            (
+                topology.node_ids[topology.sources[i]],
+                topology.node_ids[topology.targets[i]],
+                float(losses[i]),
+            )
+            for i in leaking
+        ]
@@ -0,0 +1,154 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ZoneBalance:
+    """Value object representing the water balance of part of a network."""
+
+    inflow: float
+    outflow: float
+    entry_nodes: Tuple[UUID, ...]
+    exit_nodes: Tuple[UUID, ...]
+
+    @property
+    def loss(self) -> float:
+        return self.inflow - self.outflow
+
+    @property
+    def loss_percentage(self) -> float:
+        if self.inflow <= 0:
+            return 0.0
+        return self.loss / self.inflow * 100
+
+
+@dataclass(frozen=True, eq=False)
+class NetworkTopology:
+    """
+    Immutable, array-based view of a network's directed connections.
+
+    Nodes are numbered 0..n-1 in `node_ids` order. Edges are stored sorted
+    by source in two parallel arrays, with `indptr` giving, CSR-style, the
+    slice of edges leaving each node: the successors of node i are
+    `targets[indptr[i]:indptr[i + 1]]`. Per-node values (flow totals) are
+    passed as arrays in the same node order, so analysis over every edge or
+    zone is array arithmetic rather than a loop over readings.
+    """
+
+    node_ids: Tuple[UUID, ...]
+    index: Dict[UUID, int]
+    sources: np.ndarray
+    targets: np.ndarray
+    indptr: np.ndarray
+
+    @classmethod
+    def build(
+        cls, node_ids: Sequence[UUID], connections: Iterable[Tuple[UUID, UUID]]
+    ) -> "NetworkTopology":
+        """Index the connections between the given nodes (others are ignored)."""
+        node_ids = tuple(node_ids)
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        pairs = [
+            (index[from_id], index[to_id])
+            for from_id, to_id in connections
+            if from_id in index and to_id in index
+        ]
+        edges = np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+        sources = edges[:, 0].copy()
+        targets = edges[:, 1].copy()
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(node_ids)), out=indptr[1:])
+        return cls(node_ids=node_ids, index=index, sources=sources, targets=targets, indptr=indptr)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.sources)
+
+    def edges(self) -> List[Tuple[UUID, UUID]]:
+        """Connections as node ID pairs, in edge-array order."""
+        return [(self.node_ids[s], self.node_ids[t]) for s, t in zip(self.sources, self.targets)]
+
+    def successors(self, node_id: UUID) -> List[UUID]:
+        """Nodes directly downstream of a node."""
+        i = self.index[node_id]
+        return [self.node_ids[t] for t in self.targets[self.indptr[i]:self.indptr[i + 1]]]
+
+    def edge_loss_percentages(self, node_flows: np.ndarray) -> np.ndarray:
+        """
+        Loss along every edge: (upstream - downstream) / upstream * 100.
+
+        Args:
+            node_flows: Flow total per node, in `node_ids` order
+
+        Returns:
+            One value per edge; NaN where the upstream node has no flow
+        """
+        upstream = node_flows[self.sources]
+        downstream = node_flows[self.targets]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(upstream > 0, (upstream - downstream) / upstream * 100, np.nan)
+
+    def downstream(self, node_id: UUID, max_hops: Optional[int] = None) -> List[UUID]:
+        """
+        A node and every node reachable from it, following edge direction.
+
+        Args:
+            node_id: Start of the zone
+            max_hops: Maximum path length followed (unlimited by default)
+
+        Returns:
+            Node IDs in breadth-first order, starting with `node_id`
+        """
+        start = self.index[node_id]
+        seen = np.zeros(self.node_count, dtype=bool)
+        seen[start] = True
+        order = [start]
+        queue = deque([(start, 0)])
+        while queue:
+            i, hops = queue.popleft()
+            if max_hops is not None and hops >= max_hops:
+                continue
+            for t in self.targets[self.indptr[i]:self.indptr[i + 1]]:
+                if not seen[t]:
+                    seen[t] = True
+                    order.append(int(t))
+                    queue.append((int(t), hops + 1))
+        return [self.node_ids[i] for i in order]
+
+    def zone_balance(self, node_flows: np.ndarray, zone: Iterable[UUID]) -> ZoneBalance:
+        """
+        Inflow versus outflow of a connected part of the network.
+
+        Water enters the zone at its entry nodes (members with no upstream
+        member) and leaves at its exit nodes (members with no downstream
+        member), so for a single edge this is the edge's own balance and
+        for a chain it is first versus last node, whatever the hops between.
+
+        Args:
+            node_flows: Flow total per node, in `node_ids` order
+            zone: Member node IDs (unknown IDs are ignored)
+
+        Returns:
+            The zone's balance
+        """
+        member = np.zeros(self.node_count, dtype=bool)
+        member[[self.index[node_id] for node_id in zone if node_id in self.index]] = True
+        internal = member[self.sources] & member[self.targets]
+        has_upstream = np.bincount(self.targets[internal], minlength=self.node_count) > 0
+        has_downstream = np.bincount(self.sources[internal], minlength=self.node_count) > 0
+        entries = np.flatnonzero(member & ~has_upstream)
+        exits = np.flatnonzero(member & ~has_downstream)
+        return ZoneBalance(
+            inflow=float(node_flows[entries].sum()),
+            outflow=float(node_flows[exits].sum()),
+            entry_nodes=tuple(self.node_ids[i] for i in entries),
+            exit_nodes=tuple(self.node_ids[i] for i in exits),
+        )
@@ -7,6 +7,8 @@ from typing import Optional
 from google.cloud import bigquery
 from google.oauth2 import service_account
 
+from src.infrastructure.bigquery.arrow_stream import ArrowQueryReader
+
 
 class BigQueryClient:
     """Wrapper for BigQuery client with project configuration."""
@@ -24,6 +26,14 @@ class BigQueryClient:
         
         # Initialize client
         self.client = self._create_client()
+        self._arrow: Optional[ArrowQueryReader] = None
+        
+    @property
+    def arrow(self) -> ArrowQueryReader:
+        """Streaming Arrow reader over this client (Storage Read API when available)."""
+        if self._arrow is None:
+            self._arrow = ArrowQueryReader(self.client)
+        return self._arrow
         
     def _create_client(self) -> Optional[bigquery.Client]:
         """Create BigQuery client with proper authentication."""
@@ -0,0 +1,124 @@
+"""
+Offline fake of the BigQuery client that serves Parquet files.
+
+Each query is answered with the Parquet file (or in-memory table)
+registered for the first table name found in its SQL; an empty name
+matches any query. The SQL itself is not evaluated. Results are
+streamed in fixed-size record batches through the same RowIterator methods
+ArrowQueryReader and `to_dataframe()` callers use, so extraction pipelines
+can be exercised and benchmarked without network access.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+Source = Union[str, Path, pa.Table, pd.DataFrame]
+
+
+class FakeRowIterator:
+    """Result of a fake query, mirroring `google.cloud.bigquery.table.RowIterator`."""
+
+    def __init__(self, source: Union[Path, pa.Table], batch_size: int):
+        self.source = source
+        self.batch_size = batch_size
+
+    @property
+    def total_rows(self) -> int:
+        if isinstance(self.source, pa.Table):
+            return self.source.num_rows
+        return pq.ParquetFile(self.source).metadata.num_rows
+
+    @property
+    def schema(self) -> pa.Schema:
+        if isinstance(self.source, pa.Table):
+            return self.source.schema
+        return pq.ParquetFile(self.source).schema_arrow
+
+    def to_arrow_iterable(
+        self,
+        bqstorage_client: Any = None,
+        max_queue_size: Optional[int] = None,
+        max_stream_count: Optional[int] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream the result in record batches of `batch_size` rows."""
+        if isinstance(self.source, pa.Table):
+            yield from self.source.to_batches(max_chunksize=self.batch_size)
+        else:
+            yield from pq.ParquetFile(self.source).iter_batches(batch_size=self.batch_size)
+
+    def to_arrow(self, bqstorage_client: Any = None) -> pa.Table:
+        if isinstance(self.source, pa.Table):
+            return self.source
+        return pq.read_table(self.source)
+
+    def to_dataframe(self, bqstorage_client: Any = None) -> pd.DataFrame:
+        return self.to_arrow().to_pandas()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Rows as dicts (BigQuery Row objects also support key access)."""
+        for batch in self.to_arrow_iterable():
+            yield from batch.to_pylist()
+
+
+class FakeQueryJob:
+    """Mirrors the parts of `bigquery.QueryJob` used by callers."""
+
+    def __init__(self, rows: FakeRowIterator):
+        self._rows = rows
+
+    def result(self, page_size: Optional[int] = None, **kwargs: Any) -> FakeRowIterator:
+        return self._rows
+
+    def to_dataframe(self, **kwargs: Any) -> pd.DataFrame:
+        return self._rows.to_dataframe()
+
+    def to_arrow(self, **kwargs: Any) -> pa.Table:
+        return self._rows.to_arrow()
+
+
+class ParquetBigQueryFake:
+    """Stand-in for `bigquery.Client` answering queries from Parquet files."""
+
+    def __init__(
+        self,
+        tables: Mapping[str, Source],
+        batch_size: int = 65536,
+        project: str = "fake-project"
+    ):
+        """
+        Initialize the fake.
+
+        Args:
+            tables: Table name (as it appears in the SQL) to a Parquet file
+                path, or an Arrow table / DataFrame served from memory
+            batch_size: Rows per streamed record batch
+            project: Reported project id
+        """
+        # Longest names first so "dataset.table" wins over "table"
+        self.tables = dict(sorted(
+            ((name, self._source(source)) for name, source in tables.items()),
+            key=lambda item: -len(item[0])
+        ))
+        self.batch_size = batch_size
+        self.project = project
+        self.queries: List[Tuple[str, Any]] = []
+
+    def query(self, query: str, job_config: Any = None, **kwargs: Any) -> FakeQueryJob:
+        self.queries.append((query, job_config))
+        for name, source in self.tables.items():
+            if name in query:
+                return FakeQueryJob(FakeRowIterator(source, self.batch_size))
+        raise KeyError(f"No table registered for query: {query[:200]}")
+
+    @staticmethod
+    def _source(source: Source) -> Union[Path, pa.Table]:
+        if isinstance(source, pd.DataFrame):
+            return pa.Table.from_pandas(source, preserve_index=False)
+        if isinstance(source, pa.Table):
+            return source
+        return Path(source)
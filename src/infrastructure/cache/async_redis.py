@@ -0,0 +1,142 @@
+"""
+Non-blocking Redis access layer shared by the async services.
+
+Wraps `redis.asyncio` with a bounded, shared connection pool and a few
+pipelining helpers, so handlers await Redis instead of blocking the event
+loop on a network round-trip. Pass `client=FakeAsyncRedis()` to run
+against the in-process backend in tests.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRedisClient:
+    """
+    Async Redis client with connection pooling and pipelining helpers.
+
+    Any command not defined here (get, setex, zadd, ...) is forwarded to
+    the underlying `redis.asyncio.Redis` client and must be awaited.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        db: Optional[int] = None,
+        max_connections: int = 50,
+        pool_timeout: float = 5.0,
+        client: Optional[Any] = None,
+    ):
+        """
+        Initialize the client. No connection is opened until first use.
+
+        Args:
+            host: Redis host (defaults to REDIS_HOST)
+            port: Redis port (defaults to REDIS_PORT)
+            db: Redis database (defaults to REDIS_DB)
+            max_connections: Size of the shared connection pool
+            pool_timeout: Seconds to wait for a free pooled connection
+            client: Pre-built async client, e.g. FakeAsyncRedis for tests
+        """
+        self.host = host or os.getenv("REDIS_HOST", "localhost")
+        self.port = port or int(os.getenv("REDIS_PORT", 6379))
+        self.db = db if db is not None else int(os.getenv("REDIS_DB", 0))
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        """The underlying async client, created lazily."""
+        if self._client is None:
+            import redis.asyncio as aioredis
+
+            pool = aioredis.BlockingConnectionPool(
+                host=self.host,
+                port=self.port,
+                db=self.db,
+                max_connections=self.max_connections,
+                timeout=self.pool_timeout,
+                decode_responses=True,
+            )
+            self._client = aioredis.Redis(connection_pool=pool)
+            logger.info(
+                f"Async Redis pool created: {self.host}:{self.port}/{self.db} "
+                f"(max {self.max_connections} connections)"
+            )
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the wrapper itself
+        return getattr(self.client, name)
+
+    def pipeline(self, transaction: bool = False) -> Any:
+        """Return a pipeline; queue commands on it and `await execute()`."""
+        return self.client.pipeline(transaction=transaction)
+
+    # ====================================
+    # Pipelining helpers
+    # ====================================
+
+    async def hgetall_many(self, keys: Iterable[str]) -> List[Dict[str, str]]:
+        """HGETALL several keys in one round-trip, in the order given."""
+        keys = list(keys)
+        if not keys:
+            return []
+        pipe = self.pipeline()
+        for key in keys:
+            pipe.hgetall(key)
+        return await pipe.execute()
+
+    async def hset_many(
+        self, mappings: Mapping[str, Mapping[str, Any]], ttl: Optional[int] = None
+    ) -> None:
+        """HSET several hashes (and optionally EXPIRE them) in one round-trip."""
+        if not mappings:
+            return
+        pipe = self.pipeline()
+        for key, mapping in mappings.items():
+            pipe.hset(key, mapping=dict(mapping))
+            if ttl:
+                pipe.expire(key, ttl)
+        await pipe.execute()
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        """GET a JSON-encoded value, returning None when missing."""
+        value = await self.client.get(key)
+        return json.loads(value) if value else None
+
+    async def set_json(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """SET a value as JSON, with an optional TTL in seconds."""
+        payload = json.dumps(value, default=str)
+        if ttl:
+            await self.client.setex(key, ttl, payload)
+        else:
+            await self.client.set(key, payload)
+
+    async def close(self) -> None:
+        """Close the client and release pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_clients: Dict[Tuple[str, int, int], AsyncRedisClient] = {}
+
+
+def get_async_redis(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    db: Optional[int] = None,
+) -> AsyncRedisClient:
+    """Get the shared async client for a Redis server, creating it on first use."""
+    client = AsyncRedisClient(host=host, port=port, db=db)
+    key = (client.host, client.port, client.db)
+    if key not in _clients:
+        _clients[key] = client
+    return _clients[key]
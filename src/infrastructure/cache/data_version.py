@@ -0,0 +1,156 @@
+"""
+Shared data version for HTTP cache validators.
+
+A Redis hash records two counters with the time each last changed:
+
+- ingest: bumped whenever new readings arrive;
+- generation: bumped after loads that can change past data (readings
+  older than the settle window, ETL syncs, backfills, rollup
+  invalidation).
+
+PostgresManager records every committed readings write (see record_write),
+so all loaders move the version, whatever job runs them.
+
+Responses for closed historical ranges depend on the generation only;
+responses for ranges still open also depend on the ingest counter. The API
+reads the hash at most once per `ttl_seconds`, so validating a cached
+response costs no database query and usually no Redis round-trip.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from src.infrastructure.cache.async_redis import AsyncRedisClient, get_async_redis
+
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_KEY = "data:version"
+# Late readings may still land in a range for this long after it ends
+DEFAULT_SETTLE = timedelta(hours=1)
+
+
+@dataclass(frozen=True)
+class VersionStamp:
+    """Data version as read from Redis (times in epoch seconds)."""
+
+    ingest: int = 0
+    ingest_at: float = 0.0
+    generation: int = 0
+    generation_at: float = 0.0
+
+    @classmethod
+    def from_hash(cls, values: dict) -> "VersionStamp":
+        return cls(
+            ingest=int(values.get("ingest", 0)),
+            ingest_at=float(values.get("ingest_at", 0)),
+            generation=int(values.get("generation", 0)),
+            generation_at=float(values.get("generation_at", 0)),
+        )
+
+
+def record_ingest(pipe: Any, at: Optional[float] = None) -> None:
+    """Queue the ingest bump on a pipeline already writing a batch."""
+    pipe.hincrby(DATA_VERSION_KEY, "ingest", 1)
+    pipe.hset(DATA_VERSION_KEY, mapping={"ingest_at": at or time.time()})
+
+
+def record_generation(pipe: Any, at: Optional[float] = None) -> None:
+    """Queue the generation bump on a pipeline."""
+    pipe.hincrby(DATA_VERSION_KEY, "generation", 1)
+    pipe.hset(DATA_VERSION_KEY, mapping={"generation_at": at or time.time()})
+
+
+async def bump_generation(redis: AsyncRedisClient) -> None:
+    """Mark past data as changed, e.g. after a backfill or corrected load."""
+    pipe = redis.pipeline()
+    record_generation(pipe)
+    await pipe.execute()
+
+
+async def record_write(
+    redis: AsyncRedisClient,
+    oldest: datetime,
+    settle: timedelta = DEFAULT_SETTLE,
+    now: Optional[float] = None
+) -> None:
+    """
+    Move the version after rows were written.
+
+    Args:
+        redis: Async Redis client holding the version hash
+        oldest: Earliest timestamp among the written rows (naive means UTC)
+        settle: Rows older than this may fall in ranges already served as
+            closed, so they bump the generation; newer rows only bump ingest
+        now: Current epoch seconds, injectable for tests
+    """
+    now = now if now is not None else time.time()
+    if oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    pipe = redis.pipeline()
+    if oldest.timestamp() < now - settle.total_seconds():
+        record_generation(pipe, at=now)
+    else:
+        record_ingest(pipe, at=now)
+    await pipe.execute()
+
+
+class DataVersion:
+    """Reads the shared data version, caching it briefly in-process."""
+
+    def __init__(
+        self,
+        redis: AsyncRedisClient,
+        ttl_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the reader.
+
+        Args:
+            redis: Async Redis client holding the version hash
+            ttl_seconds: How long a read version is reused
+            clock: Monotonic clock, injectable for tests
+        """
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._stamp: Optional[VersionStamp] = None
+        self._read_at = float("-inf")
+
+    async def current(self) -> Optional[VersionStamp]:
+        """
+        Get the current data version.
+
+        Returns:
+            The version, or None while Redis is unreachable (callers should
+            then skip caching, as changes could go unnoticed)
+        """
+        now = self.clock()
+        if now - self._read_at < self.ttl_seconds:
+            return self._stamp
+        try:
+            self._stamp = VersionStamp.from_hash(await self.redis.hgetall(DATA_VERSION_KEY))
+        except Exception as e:
+            logger.warning(f"Data version unavailable, response caching paused: {e}")
+            self._stamp = None
+        self._read_at = now
+        return self._stamp
+
+    async def bump_generation(self) -> None:
+        await bump_generation(self.redis)
+        self._read_at = float("-inf")
+
+
+# Process-wide reader used by the response cache
+_data_version: Optional[DataVersion] = None
+
+
+def get_data_version() -> DataVersion:
+    """Get or create the process-wide data version reader."""
+    global _data_version
+    if _data_version is None:
+        _data_version = DataVersion(get_async_redis())
+    return _data_version
@@ -0,0 +1,335 @@
+"""
+In-process fake of the `redis.asyncio` client for tests and benchmarks.
+
+Implements the subset of commands used by the cache layer with Redis
+semantics for return values (decoded strings). An optional per-command
+latency simulates network round-trips without blocking the event loop.
+"""
+
+import asyncio
+import fnmatch
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _encode(value: Any) -> str:
+    """Encode a value the way redis-py does before sending it."""
+    if isinstance(value, bytes):
+        return value.decode()
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+class FakeAsyncRedis:
+    """In-memory stand-in for `redis.asyncio.Redis(decode_responses=True)`."""
+
+    def __init__(self, latency_seconds: float = 0.0):
+        """
+        Initialize an empty fake.
+
+        Args:
+            latency_seconds: Simulated round-trip time per command or pipeline
+        """
+        self.latency_seconds = latency_seconds
+        self.round_trips = 0
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._pubsubs: List["FakePubSub"] = []
+
+    # ====================================
+    # Internals
+    # ====================================
+
+    async def _round_trip(self) -> None:
+        self.round_trips += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+    def _alive(self, key: str) -> bool:
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def _get(self, key: str, factory: type) -> Any:
+        if not self._alive(key):
+            self._data[key] = factory()
+        return self._data[key]
+
+    def _apply(self, name: str, args: Tuple, kwargs: Dict) -> Any:
+        return getattr(self, f"_cmd_{name}")(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        handler = f"_cmd_{name}"
+        if name.startswith("_") or not hasattr(type(self), handler):
+            raise AttributeError(name)
+
+        async def command(*args: Any, **kwargs: Any) -> Any:
+            await self._round_trip()
+            return self._apply(name, args, kwargs)
+
+        return command
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def pubsub(self) -> "FakePubSub":
+        return FakePubSub(self)
+
+    async def aclose(self) -> None:
+        pass
+
+    # ====================================
+    # Commands
+    # ====================================
+
+    def _cmd_ping(self) -> bool:
+        return True
+
+    def _cmd_info(self) -> Dict[str, Any]:
+        return {"used_memory_human": "0B", "redis_version": "fake"}
+
+    def _cmd_dbsize(self) -> int:
+        return sum(1 for key in list(self._data) if self._alive(key))
+
+    def _cmd_flushdb(self) -> bool:
+        self._data.clear()
+        self._expires.clear()
+        return True
+
+    def _cmd_exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._alive(key))
+
+    def _cmd_delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._alive(key):
+                del self._data[key]
+                self._expires.pop(key, None)
+                removed += 1
+        return removed
+
+    def _cmd_keys(self, pattern: str = "*") -> List[str]:
+        return [
+            key for key in list(self._data)
+            if self._alive(key) and fnmatch.fnmatchcase(key, pattern)
+        ]
+
+    def _cmd_expire(self, key: str, seconds: int) -> bool:
+        if not self._alive(key):
+            return False
+        self._expires[key] = time.monotonic() + seconds
+        return True
+
+    def _cmd_ttl(self, key: str) -> int:
+        if not self._alive(key):
+            return -2
+        expires = self._expires.get(key)
+        return -1 if expires is None else int(expires - time.monotonic() + 0.5)
+
+    def _cmd_get(self, key: str) -> Optional[str]:
+        return self._data[key] if self._alive(key) else None
+
+    def _cmd_mget(self, keys: Any, *more: str) -> List[Optional[str]]:
+        keys = [keys, *more] if isinstance(keys, str) else [*keys, *more]
+        return [self._cmd_get(key) for key in keys]
+
+    def _cmd_set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        self._data[key] = _encode(value)
+        self._expires.pop(key, None)
+        if ex:
+            self._cmd_expire(key, ex)
+        return True
+
+    def _cmd_setex(self, key: str, seconds: int, value: Any) -> bool:
+        return self._cmd_set(key, value, ex=seconds)
+
+    def _cmd_incrbyfloat(self, key: str, amount: float = 1.0) -> float:
+        value = float(self._cmd_get(key) or 0) + float(amount)
+        self._data[key] = repr(value)
+        return value
+
+    def _cmd_hset(
+        self,
+        key: str,
+        field: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        hash_ = self._get(key, dict)
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        added = sum(1 for f in items if f not in hash_)
+        hash_.update({_encode(f): _encode(v) for f, v in items.items()})
+        return added
+
+    def _cmd_hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        hash_ = self._get(key, dict)
+        value = int(hash_.get(_encode(field), 0)) + int(amount)
+        hash_[_encode(field)] = _encode(value)
+        return value
+
+    def _cmd_hget(self, key: str, field: str) -> Optional[str]:
+        return self._data[key].get(field) if self._alive(key) else None
+
+    def _cmd_hgetall(self, key: str) -> Dict[str, str]:
+        return dict(self._data[key]) if self._alive(key) else {}
+
+    def _cmd_lpush(self, key: str, *values: Any) -> int:
+        list_ = self._get(key, list)
+        for value in values:
+            list_.insert(0, _encode(value))
+        return len(list_)
+
+    def _cmd_rpush(self, key: str, *values: Any) -> int:
+        list_ = self._get(key, list)
+        list_.extend(_encode(v) for v in values)
+        return len(list_)
+
+    def _cmd_lrange(self, key: str, start: int, end: int) -> List[str]:
+        if not self._alive(key):
+            return []
+        list_ = self._data[key]
+        return list_[start:] if end == -1 else list_[start:end + 1]
+
+    def _cmd_ltrim(self, key: str, start: int, end: int) -> bool:
+        if self._alive(key):
+            self._data[key] = self._cmd_lrange(key, start, end)
+        return True
+
+    def _cmd_sadd(self, key: str, *members: Any) -> int:
+        set_ = self._get(key, set)
+        before = len(set_)
+        set_.update(_encode(m) for m in members)
+        return len(set_) - before
+
+    def _cmd_srem(self, key: str, *members: Any) -> int:
+        if not self._alive(key):
+            return 0
+        set_ = self._data[key]
+        before = len(set_)
+        set_.difference_update(_encode(m) for m in members)
+        return before - len(set_)
+
+    def _cmd_smembers(self, key: str) -> set:
+        return set(self._data[key]) if self._alive(key) else set()
+
+    def _cmd_zadd(self, key: str, mapping: Dict[Any, float]) -> int:
+        zset = self._get(key, dict)
+        added = sum(1 for m in mapping if _encode(m) not in zset)
+        zset.update({_encode(m): float(s) for m, s in mapping.items()})
+        return added
+
+    def _cmd_zrangebyscore(
+        self, key: str, min: Any, max: Any, withscores: bool = False
+    ) -> List[Any]:
+        if not self._alive(key):
+            return []
+        low, high = float(min), float(max)
+        items = sorted(
+            ((m, s) for m, s in self._data[key].items() if low <= s <= high),
+            key=lambda item: (item[1], item[0]),
+        )
+        return items if withscores else [m for m, _ in items]
+
+    def _cmd_zremrangebyscore(self, key: str, min: Any, max: Any) -> int:
+        if not self._alive(key):
+            return 0
+        low, high = float(min), float(max)
+        zset = self._data[key]
+        doomed = [m for m, s in zset.items() if low <= s <= high]
+        for member in doomed:
+            del zset[member]
+        return len(doomed)
+
+    def _cmd_zcard(self, key: str) -> int:
+        return len(self._data[key]) if self._alive(key) else 0
+
+    def _cmd_publish(self, channel: str, message: Any) -> int:
+        receivers = [p for p in self._pubsubs if channel in p.channels]
+        for pubsub in receivers:
+            pubsub._deliver(channel, _encode(message))
+        return len(receivers)
+
+
+class FakePipeline:
+    """Pipeline for FakeAsyncRedis: commands queue, `execute` runs them."""
+
+    def __init__(self, backend: FakeAsyncRedis):
+        self.backend = backend
+        self._commands: List[Tuple[str, Tuple, Dict]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or not hasattr(FakeAsyncRedis, f"_cmd_{name}"):
+            raise AttributeError(name)
+
+        def queue(*args: Any, **kwargs: Any) -> "FakePipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    async def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        if not commands:
+            return []
+        await self.backend._round_trip()
+        return [self.backend._apply(name, args, kwargs) for name, args, kwargs in commands]
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._commands = []
+
+
+class FakePubSub:
+    """Pub/sub connection for FakeAsyncRedis, following `redis.asyncio.client.PubSub`."""
+
+    def __init__(self, backend: FakeAsyncRedis):
+        self.backend = backend
+        self.channels: set = set()
+        self._messages: asyncio.Queue = asyncio.Queue()
+
+    def _deliver(self, channel: str, data: str) -> None:
+        self._messages.put_nowait({"type": "message", "pattern": None, "channel": channel, "data": data})
+
+    async def subscribe(self, *channels: str) -> None:
+        await self.backend._round_trip()
+        if self not in self.backend._pubsubs:
+            self.backend._pubsubs.append(self)
+        for channel in channels:
+            self.channels.add(channel)
+            self._messages.put_nowait(
+                {"type": "subscribe", "pattern": None, "channel": channel, "data": len(self.channels)}
+            )
+
+    async def unsubscribe(self, *channels: str) -> None:
+        self.channels.difference_update(channels or set(self.channels))
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: Optional[float] = 0.0
+    ) -> Optional[Dict[str, Any]]:
+        while True:
+            if not self._messages.empty():
+                message = self._messages.get_nowait()
+            elif timeout == 0:
+                return None
+            else:
+                try:
+                    message = await asyncio.wait_for(self._messages.get(), timeout)
+                except asyncio.TimeoutError:
+                    return None
+            if not (ignore_subscribe_messages and message["type"] == "subscribe"):
+                return message
+
+    async def aclose(self) -> None:
+        self.channels.clear()
+        if self in self.backend._pubsubs:
+            self.backend._pubsubs.remove(self)
@@ -7,6 +7,7 @@ to avoid repeated BigQuery queries and improve dashboard performance.
 
 import json
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import redis
@@ -14,8 +15,24 @@ from redis import Redis
 import pandas as pd
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.infrastructure.bigquery.arrow_stream import ArrowQueryReader
+from src.infrastructure.cache.async_redis import AsyncRedisClient, get_async_redis
+from src.infrastructure.cache.bulk_loader import (
+    RedisBulkLoader,
+    isoformat_column,
+    numeric_column,
+    string_column,
+)
+
 logger = logging.getLogger(__name__)
 
+# Float metrics cached per node and time range
+METRIC_COLUMNS = [
+    "avg_flow", "min_flow", "max_flow", "stddev_flow",
+    "avg_pressure", "min_pressure", "max_pressure", "uptime_percentage"
+]
+
 
 class RedisCacheManager:
     """Manages Redis cache for water infrastructure data."""
@@ -32,7 +49,12 @@ class RedisCacheManager:
             db=redis_db,
             decode_responses=True
         )
+        # Non-blocking client sharing one connection pool per server, for async callers
+        self.async_client: AsyncRedisClient = get_async_redis(redis_host, redis_port, redis_db)
         self.ttl_seconds = ttl_hours * 3600
+        self.last_load_stats: Dict[str, float] = {}
+        # Created on first query so the Storage read client is reused
+        self._arrow_reader: Optional[ArrowQueryReader] = None
         
     def initialize_cache(self, force_refresh: bool = False) -> None:
         """Initialize cache with pre-processed data from BigQuery."""
@@ -44,6 +66,8 @@ class RedisCacheManager:
             return
             
         # Load data in parallel
+        started = time.perf_counter()
+        keys_loaded = 0
         with ThreadPoolExecutor(max_workers=8) as executor:
             futures = []
             
@@ -57,15 +81,24 @@ class RedisCacheManager:
             # Wait for all tasks to complete
             for future in as_completed(futures):
                 try:
-                    future.result()
+                    keys_loaded += future.result() or 0
                 except Exception as e:
                     logger.error(f"Error during cache initialization: {e}")
         
         # Mark cache as initialized
         self.redis_client.setex("cache:initialized", self.ttl_seconds, "true")
-        logger.info("Cache initialization complete!")
+        elapsed = time.perf_counter() - started
+        self.last_load_stats = {
+            "keys": keys_loaded,
+            "seconds": round(elapsed, 3),
+            "keys_per_second": round(keys_loaded / elapsed, 1) if elapsed > 0 else 0.0
+        }
+        logger.info(
+            f"Cache initialization complete: {keys_loaded} keys in {elapsed:.2f}s "
+            f"({self.last_load_stats['keys_per_second']:,.0f} keys/s)"
+        )
     
-    def _cache_node_metadata(self) -> None:
+    def _cache_node_metadata(self) -> int:
         """Cache node metadata and mappings."""
         logger.info("Caching node metadata...")
         
@@ -79,28 +112,22 @@ class RedisCacheManager:
         FROM `abbanoa-464816.water_infrastructure.sensor_readings_ml`
         """
         
-        df = self.bigquery_client.query(query).to_dataframe()
+        df = self._read_dataframe(query)
         
-        # Store each node's metadata
-        for _, row in df.iterrows():
-            key = f"node:{row['node_id']}:metadata"
-            value = {
-                "node_id": row["node_id"],
-                "node_name": row["node_name"],
-                "node_type": row["node_type"],
-                "district_id": row["district_id"]
-            }
-            self.redis_client.hset(key, mapping=value)
-            self.redis_client.expire(key, self.ttl_seconds)
+        # Store each node's metadata and the list of all node IDs
+        loader = self._bulk_loader()
+        fields = {
+            column: string_column(df[column])
+            for column in ["node_id", "node_name", "node_type", "district_id"]
+        }
+        loader.write_hashes([f"node:{n}:metadata" for n in fields["node_id"]], fields)
+        loader.replace_list("nodes:all", fields["node_id"])
+        loader.flush()
         
-        # Store list of all node IDs
-        node_ids = df["node_id"].tolist()
-        self.redis_client.lpush("nodes:all", *node_ids)
-        self.redis_client.expire("nodes:all", self.ttl_seconds)
-        
-        logger.info(f"Cached metadata for {len(node_ids)} nodes")
+        loader.log_summary(f"Cached metadata for {len(df)} nodes")
+        return loader.keys_written
     
-    def _cache_latest_readings(self) -> None:
+    def _cache_latest_readings(self) -> int:
         """Cache latest sensor readings for each node."""
         logger.info("Caching latest readings...")
         
@@ -122,24 +149,20 @@ class RedisCacheManager:
         WHERE rn = 1
         """
         
-        df = self.bigquery_client.query(query).to_dataframe()
+        df = self._read_dataframe(query)
         
         # Cache latest reading for each node
-        for _, row in df.iterrows():
-            key = f"node:{row['node_id']}:latest"
-            value = {
-                "timestamp": row["timestamp"].isoformat(),
-                "flow_rate": float(row["flow_rate"]) if pd.notna(row["flow_rate"]) else 0,
-                "pressure": float(row["pressure"]) if pd.notna(row["pressure"]) else 0,
-                "temperature": float(row["temperature"]) if pd.notna(row["temperature"]) else 0,
-                "volume": float(row["volume"]) if pd.notna(row["volume"]) else 0
-            }
-            self.redis_client.hset(key, mapping={k: str(v) for k, v in value.items()})
-            self.redis_client.expire(key, self.ttl_seconds)
+        loader = self._bulk_loader()
+        fields = {"timestamp": isoformat_column(df["timestamp"])}
+        for column in ["flow_rate", "pressure", "temperature", "volume"]:
+            fields[column] = numeric_column(df[column])
+        loader.write_hashes([f"node:{n}:latest" for n in df["node_id"]], fields)
+        loader.flush()
         
-        logger.info(f"Cached latest readings for {len(df)} nodes")
+        loader.log_summary(f"Cached latest readings for {len(df)} nodes")
+        return loader.keys_written
     
-    def _cache_aggregated_metrics(self) -> None:
+    def _cache_aggregated_metrics(self) -> int:
         """Cache pre-aggregated metrics for different time ranges."""
         logger.info("Caching aggregated metrics...")
         
@@ -148,6 +171,7 @@ class RedisCacheManager:
             ("3d", 72), ("7d", 168), ("30d", 720)
         ]
         
+        loader = self._bulk_loader()
         for range_name, hours in time_ranges:
             query = f"""
             SELECT 
@@ -166,39 +190,33 @@ class RedisCacheManager:
             GROUP BY node_id
             """
             
-            df = self.bigquery_client.query(query).to_dataframe()
+            df = self._read_dataframe(query)
             
             # Store aggregated metrics for each node
-            for _, row in df.iterrows():
-                key = f"node:{row['node_id']}:metrics:{range_name}"
-                metrics = {
-                    "reading_count": int(row["reading_count"]),
-                    "avg_flow": float(row["avg_flow"]) if pd.notna(row["avg_flow"]) else 0,
-                    "min_flow": float(row["min_flow"]) if pd.notna(row["min_flow"]) else 0,
-                    "max_flow": float(row["max_flow"]) if pd.notna(row["max_flow"]) else 0,
-                    "stddev_flow": float(row["stddev_flow"]) if pd.notna(row["stddev_flow"]) else 0,
-                    "avg_pressure": float(row["avg_pressure"]) if pd.notna(row["avg_pressure"]) else 0,
-                    "min_pressure": float(row["min_pressure"]) if pd.notna(row["min_pressure"]) else 0,
-                    "max_pressure": float(row["max_pressure"]) if pd.notna(row["max_pressure"]) else 0,
-                    "uptime_percentage": float(row["uptime_percentage"]) if pd.notna(row["uptime_percentage"]) else 0
-                }
-                self.redis_client.hset(key, mapping={k: str(v) for k, v in metrics.items()})
-                self.redis_client.expire(key, self.ttl_seconds)
+            fields = {"reading_count": string_column(df["reading_count"].fillna(0).astype(int))}
+            for column in METRIC_COLUMNS:
+                fields[column] = numeric_column(df[column])
+            loader.write_hashes(
+                [f"node:{n}:metrics:{range_name}" for n in df["node_id"]], fields
+            )
             
             # Store system-wide metrics
-            system_key = f"system:metrics:{range_name}"
             system_metrics = {
                 "total_nodes": len(df),
-                "active_nodes": len(df[df["uptime_percentage"] > 0.1]),
+                "active_nodes": int((df["uptime_percentage"] > 0.1).sum()),
                 "total_flow": float(df["avg_flow"].sum()),
                 "avg_pressure": float(df["avg_pressure"].mean()) if not df.empty else 0
             }
-            self.redis_client.hset(system_key, mapping={k: str(v) for k, v in system_metrics.items()})
-            self.redis_client.expire(system_key, self.ttl_seconds)
+            loader.write_hashes(
+                [f"system:metrics:{range_name}"],
+                {k: [str(v)] for k, v in system_metrics.items()}
+            )
+        loader.flush()
         
-        logger.info("Cached aggregated metrics for all time ranges")
+        loader.log_summary("Cached aggregated metrics for all time ranges")
+        return loader.keys_written
     
-    def _cache_anomalies(self) -> None:
+    def _cache_anomalies(self) -> int:
         """Cache detected anomalies."""
         logger.info("Caching anomalies...")
         
@@ -245,28 +263,27 @@ class RedisCacheManager:
         LIMIT 1000
         """
         
-        df = self.bigquery_client.query(query).to_dataframe()
+        df = self._read_dataframe(query)
         
         # Store anomalies
-        anomalies = []
-        for _, row in df.iterrows():
-            anomaly = {
-                "node_id": row["node_id"],
-                "timestamp": row["timestamp"].isoformat(),
-                "anomaly_type": row["anomaly_type"],
-                "flow_rate": float(row["flow_rate"]) if pd.notna(row["flow_rate"]) else 0,
-                "pressure": float(row["pressure"]) if pd.notna(row["pressure"]) else 0
-            }
-            anomalies.append(json.dumps(anomaly))
+        records = pd.DataFrame({
+            "node_id": df["node_id"],
+            "timestamp": isoformat_column(df["timestamp"]),
+            "anomaly_type": df["anomaly_type"],
+            "flow_rate": pd.to_numeric(df["flow_rate"], errors="coerce").fillna(0).astype(float),
+            "pressure": pd.to_numeric(df["pressure"], errors="coerce").fillna(0).astype(float)
+        })
+        anomalies = [json.dumps(record) for record in records.to_dict(orient="records")]
         
+        loader = self._bulk_loader()
         if anomalies:
-            self.redis_client.lpush("anomalies:recent", *anomalies)
-            self.redis_client.ltrim("anomalies:recent", 0, 999)  # Keep only latest 1000
-            self.redis_client.expire("anomalies:recent", self.ttl_seconds)
+            loader.replace_list("anomalies:recent", anomalies[:1000])  # Keep only latest 1000
+            loader.flush()
         
-        logger.info(f"Cached {len(anomalies)} anomalies")
+        loader.log_summary(f"Cached {len(anomalies)} anomalies")
+        return loader.keys_written
     
-    def _cache_time_series_data(self) -> None:
+    def _cache_time_series_data(self) -> int:
         """Cache time series data for quick chart rendering."""
         logger.info("Caching time series data...")
         
@@ -283,24 +300,41 @@ class RedisCacheManager:
         ORDER BY hour DESC
         """
         
-        df = self.bigquery_client.query(query).to_dataframe()
+        df = self._read_dataframe(query)
         
-        # Group by node and store time series
-        for node_id in df["node_id"].unique():
-            node_data = df[df["node_id"] == node_id].sort_values("hour")
-            
+        # Group once by node and store time series
+        df = df.assign(
+            timestamp=df["hour"].dt.strftime("%Y-%m-%d %H:%M:%S"),
+            avg_flow=df["avg_flow"].fillna(0),
+            avg_pressure=df["avg_pressure"].fillna(0)
+        ).sort_values("hour", kind="stable")
+        
+        keys, payloads = [], []
+        for node_id, node_data in df.groupby("node_id", sort=False):
             # Store as JSON time series
-            time_series = {
-                "timestamps": node_data["hour"].dt.strftime("%Y-%m-%d %H:%M:%S").tolist(),
-                "flow_rates": node_data["avg_flow"].fillna(0).tolist(),
-                "pressures": node_data["avg_pressure"].fillna(0).tolist()
-            }
+            keys.append(f"node:{node_id}:timeseries:7d")
+            payloads.append(json.dumps({
+                "timestamps": node_data["timestamp"].tolist(),
+                "flow_rates": node_data["avg_flow"].tolist(),
+                "pressures": node_data["avg_pressure"].tolist()
+            }))
             
-            key = f"node:{node_id}:timeseries:7d"
-            self.redis_client.set(key, json.dumps(time_series))
-            self.redis_client.expire(key, self.ttl_seconds)
+        loader = self._bulk_loader()
+        loader.write_strings(keys, payloads)
+        loader.flush()
         
-        logger.info(f"Cached time series data for {df['node_id'].nunique()} nodes")
+        loader.log_summary(f"Cached time series data for {len(keys)} nodes")
+        return loader.keys_written
+    
+    def _bulk_loader(self) -> RedisBulkLoader:
+        """Create a pipelined loader writing keys with the cache TTL."""
+        return RedisBulkLoader(self.redis_client, ttl_seconds=self.ttl_seconds)
+
+    def _read_dataframe(self, query: str) -> pd.DataFrame:
+        """Read a query result over the Arrow extraction path."""
+        if self._arrow_reader is None or self._arrow_reader.client is not self.bigquery_client:
+            self._arrow_reader = ArrowQueryReader(self.bigquery_client)
+        return self._arrow_reader.read_dataframe(query)
     
     # Getter methods for dashboard
     def get_latest_reading(self, node_id: str) -> Dict[str, Any]:
@@ -344,4 +378,20 @@ class RedisCacheManager:
         data = self.redis_client.get(key)
         if data:
             return json.loads(data)
-        return {"timestamps": [], "flow_rates": [], "pressures": []}
\ No newline at end of file
+        return {"timestamps": [], "flow_rates": [], "pressures": []}
+    
+    # Async methods for event-loop callers (API handlers, ETL jobs)
+    async def initialize(self) -> None:
+        """Verify the async connection, raising if Redis is unreachable."""
+        await self.async_client.ping()
+        
+    async def get_hash(self, key: str) -> Dict[str, str]:
+        """Get a hash without blocking the event loop."""
+        return await self.async_client.hgetall(key)
+        
+    async def set_hash(self, key: str, mapping: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Set a hash (stringified values) and its TTL in one round-trip."""
+        await self.async_client.hset_many(
+            {key: {k: str(v) for k, v in mapping.items()}},
+            ttl=ttl or self.ttl_seconds
+        )
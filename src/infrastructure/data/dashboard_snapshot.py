@@ -0,0 +1,468 @@
+"""
+Dashboard summary snapshot service.
+
+Maintains the `/api/v1/dashboard/summary` payload in memory so requests are
+served without touching PostgreSQL. The 24-hour window is kept as hourly
+per-node buckets that are updated incrementally as new readings land; a
+periodic full rebuild corrects for late or backfilled data. The rendered
+snapshot is mirrored to Redis so other workers can serve it immediately
+after a restart.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+
+logger = logging.getLogger(__name__)
+
+# Pump power formula: Power (kW) = Flow (m³/h) × Pressure (bar) × 2.75 / 100
+PUMP_POWER_FACTOR = 2.75
+THEORETICAL_POWER_FACTOR = 2.78
+ENERGY_PRICE_EUR_KWH = 0.20
+DEFAULT_PUMP_EFFICIENCY = 70.0
+
+
+@dataclass
+class _HourBucket:
+    """Partial 24h aggregates for one node and one hour."""
+
+    flow_sum: float = 0.0
+    flow_count: int = 0
+    flow_max: Optional[float] = None
+    pressure_sum: float = 0.0
+    pressure_count: int = 0
+    pressure_max: Optional[float] = None
+    pressure_min: Optional[float] = None
+
+    def add(self, flow_rate: Optional[float], pressure: Optional[float]) -> None:
+        """Fold a single reading into the bucket."""
+        if flow_rate is not None:
+            self.flow_sum += flow_rate
+            self.flow_count += 1
+            if self.flow_max is None or flow_rate > self.flow_max:
+                self.flow_max = flow_rate
+        if pressure is not None:
+            self.pressure_sum += pressure
+            self.pressure_count += 1
+            if self.pressure_max is None or pressure > self.pressure_max:
+                self.pressure_max = pressure
+            if self.pressure_min is None or pressure < self.pressure_min:
+                self.pressure_min = pressure
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert DECIMAL/None values coming from asyncpg to float."""
+    return float(value) if value is not None else None
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    """Treat naive timestamps as UTC so they compare with timestamptz values."""
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+def _hour_key(timestamp: datetime) -> int:
+    """Return the epoch hour a timestamp falls into."""
+    return int(timestamp.timestamp()) // 3600
+
+
+class DashboardSnapshotService:
+    """
+    Builds and serves the dashboard summary from an in-memory snapshot.
+
+    Refreshes are coalesced: concurrent callers of `refresh()` share the
+    in-flight database round-trip instead of issuing their own.
+    """
+
+    REDIS_KEY = "dashboard:summary"
+
+    def __init__(
+        self,
+        pool: Any,
+        redis_client: Optional[AsyncRedisClient] = None,
+        window_hours: int = 24,
+        poll_interval_seconds: float = 10.0,
+        full_refresh_interval_seconds: float = 900.0,
+        redis_ttl_seconds: int = 300,
+    ):
+        """
+        Initialize the snapshot service.
+
+        Args:
+            pool: asyncpg pool (anything exposing `acquire()`)
+            redis_client: Optional async Redis client used to mirror the snapshot
+            window_hours: Length of the rolling aggregation window
+            poll_interval_seconds: How often to pull newly landed readings
+            full_refresh_interval_seconds: How often to rebuild from scratch
+            redis_ttl_seconds: TTL of the mirrored snapshot in Redis
+        """
+        self.pool = pool
+        self.redis_client = redis_client
+        self.window_hours = window_hours
+        self.poll_interval_seconds = poll_interval_seconds
+        self.full_refresh_interval_seconds = full_refresh_interval_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+
+        self._nodes: Dict[str, str] = {}
+        self._buckets: Dict[str, Dict[int, _HourBucket]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._watermark: Optional[datetime] = None
+        self._summary: Optional[Dict[str, Any]] = None
+
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_is_full = False
+        self._last_full_refresh: Optional[datetime] = None
+        self._runner: Optional[asyncio.Task] = None
+
+        self.refresh_count = 0
+        self.last_refresh: Optional[datetime] = None
+
+    # ====================================
+    # Lifecycle
+    # ====================================
+
+    async def start(self) -> None:
+        """Load the initial snapshot and start the background refresher."""
+        await self._load_from_redis()
+        try:
+            await self.refresh(full=True)
+        except Exception as e:
+            logger.error(f"Initial dashboard snapshot build failed: {e}")
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background refresher."""
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+    async def _run(self) -> None:
+        """Background loop pulling new readings into the snapshot."""
+        while True:
+            try:
+                await asyncio.sleep(self.poll_interval_seconds)
+                await self.refresh(full=self._full_refresh_due())
+            except asyncio.CancelledError:
+                logger.info("Dashboard snapshot refresher cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Dashboard snapshot refresh error: {e}")
+
+    def _full_refresh_due(self) -> bool:
+        if self._last_full_refresh is None:
+            return True
+        elapsed = datetime.now(timezone.utc) - self._last_full_refresh
+        return elapsed.total_seconds() >= self.full_refresh_interval_seconds
+
+    # ====================================
+    # Read path
+    # ====================================
+
+    async def get_summary(self) -> Dict[str, Any]:
+        """Return the current dashboard summary."""
+        if self._summary is None:
+            await self.refresh(full=True)
+        return self._summary
+
+    # ====================================
+    # Refresh (coalesced)
+    # ====================================
+
+    async def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Refresh the snapshot from PostgreSQL.
+
+        Callers arriving while a refresh is running wait for that refresh
+        instead of starting another one. A full refresh requested during an
+        incremental one runs after it completes.
+        """
+        while self._refresh_task is not None and not self._refresh_task.done():
+            in_flight_is_full = self._refresh_is_full
+            await asyncio.shield(self._refresh_task)
+            if in_flight_is_full or not full:
+                return self._summary
+
+        if self._watermark is None:
+            full = True
+        self._refresh_is_full = full
+        self._refresh_task = asyncio.ensure_future(self._do_refresh(full))
+        await asyncio.shield(self._refresh_task)
+        return self._summary
+
+    async def _do_refresh(self, full: bool) -> None:
+        async with self.pool.acquire() as conn:
+            if full:
+                await self._load_full(conn)
+            else:
+                await self._load_incremental(conn)
+
+        self._summary = self._build_summary()
+        self.refresh_count += 1
+        self.last_refresh = datetime.now(timezone.utc)
+        await self._store_in_redis()
+
+    async def _load_full(self, conn: Any) -> None:
+        """Rebuild nodes, hourly buckets and latest readings from scratch."""
+        window = f"{self.window_hours} hours"
+
+        node_rows = await conn.fetch("""
+            SELECT node_id, node_name
+            FROM water_infrastructure.nodes
+            WHERE is_active = true
+        """)
+
+        bucket_rows = await conn.fetch(f"""
+            SELECT
+                sr.node_id,
+                date_trunc('hour', sr.timestamp) as hour,
+                SUM(sr.flow_rate) as flow_sum,
+                COUNT(sr.flow_rate) as flow_count,
+                MAX(sr.flow_rate) as flow_max,
+                SUM(sr.pressure) as pressure_sum,
+                COUNT(sr.pressure) as pressure_count,
+                MAX(sr.pressure) as pressure_max,
+                MIN(sr.pressure) as pressure_min,
+                MAX(sr.timestamp) as last_timestamp
+            FROM water_infrastructure.sensor_readings sr
+            JOIN water_infrastructure.nodes n ON sr.node_id = n.node_id
+            WHERE sr.timestamp > NOW() - INTERVAL '{window}'
+            AND n.is_active = true
+            GROUP BY sr.node_id, date_trunc('hour', sr.timestamp)
+        """)
+
+        latest_rows = await conn.fetch(f"""
+            SELECT
+                lr.node_id,
+                lr.flow_rate,
+                lr.pressure,
+                lr.timestamp
+            FROM water_infrastructure.latest_readings lr
+            JOIN water_infrastructure.nodes n ON lr.node_id = n.node_id
+            WHERE lr.timestamp > NOW() - INTERVAL '{window}'
+            AND n.is_active = true
+        """)
+
+        nodes = {row['node_id']: row['node_name'] for row in node_rows}
+        buckets: Dict[str, Dict[int, _HourBucket]] = {}
+        watermark = None
+
+        for row in bucket_rows:
+            bucket = _HourBucket(
+                flow_sum=_to_float(row['flow_sum']) or 0.0,
+                flow_count=int(row['flow_count'] or 0),
+                flow_max=_to_float(row['flow_max']),
+                pressure_sum=_to_float(row['pressure_sum']) or 0.0,
+                pressure_count=int(row['pressure_count'] or 0),
+                pressure_max=_to_float(row['pressure_max']),
+                pressure_min=_to_float(row['pressure_min']),
+            )
+            buckets.setdefault(row['node_id'], {})[_hour_key(row['hour'])] = bucket
+            if watermark is None or row['last_timestamp'] > watermark:
+                watermark = row['last_timestamp']
+
+        latest = {
+            row['node_id']: {
+                'flow_rate': _to_float(row['flow_rate']),
+                'pressure': _to_float(row['pressure']),
+                'timestamp': row['timestamp'],
+            }
+            for row in latest_rows
+        }
+
+        self._nodes = nodes
+        self._buckets = buckets
+        self._latest = latest
+        self._watermark = watermark or datetime.now(timezone.utc)
+        self._last_full_refresh = datetime.now(timezone.utc)
+
+    async def _load_incremental(self, conn: Any) -> None:
+        """Pull only readings that landed after the current watermark."""
+        rows = await conn.fetch("""
+            SELECT node_id, timestamp, flow_rate, pressure
+            FROM water_infrastructure.sensor_readings
+            WHERE timestamp > $1
+            ORDER BY timestamp
+        """, self._watermark)
+        self.apply_readings(rows, rebuild=False)
+
+    # ====================================
+    # Incremental updates
+    # ====================================
+
+    def apply_readings(
+        self, readings: Iterable[Mapping[str, Any]], rebuild: bool = True
+    ) -> int:
+        """
+        Fold newly ingested readings into the snapshot.
+
+        Readings for inactive or unknown nodes are ignored, matching the
+        `is_active` filter of the full rebuild.
+
+        Returns:
+            Number of readings applied
+        """
+        applied = 0
+        for reading in readings:
+            node_id = reading['node_id']
+            if node_id not in self._nodes:
+                continue
+            timestamp = _as_utc(reading['timestamp'])
+            flow_rate = _to_float(reading.get('flow_rate'))
+            pressure = _to_float(reading.get('pressure'))
+
+            node_buckets = self._buckets.setdefault(node_id, {})
+            key = _hour_key(timestamp)
+            bucket = node_buckets.get(key)
+            if bucket is None:
+                bucket = node_buckets[key] = _HourBucket()
+            bucket.add(flow_rate, pressure)
+
+            latest = self._latest.get(node_id)
+            if latest is None or timestamp >= latest['timestamp']:
+                self._latest[node_id] = {
+                    'flow_rate': flow_rate,
+                    'pressure': pressure,
+                    'timestamp': timestamp,
+                }
+            if self._watermark is None or timestamp > self._watermark:
+                self._watermark = timestamp
+            applied += 1
+
+        if applied and rebuild:
+            self._summary = self._build_summary()
+        return applied
+
+    def _expire_buckets(self, now: datetime) -> None:
+        """Drop buckets and latest readings that fell out of the window."""
+        cutoff = now - timedelta(hours=self.window_hours)
+        # The oldest hour is kept whole; it straddles the cutoff
+        oldest_key = _hour_key(cutoff)
+        for node_id in list(self._buckets):
+            node_buckets = self._buckets[node_id]
+            for key in [k for k in node_buckets if k < oldest_key]:
+                del node_buckets[key]
+            if not node_buckets:
+                del self._buckets[node_id]
+        for node_id in [n for n, r in self._latest.items() if r['timestamp'] <= cutoff]:
+            del self._latest[node_id]
+
+    # ====================================
+    # Snapshot rendering
+    # ====================================
+
+    def _build_summary(self) -> Dict[str, Any]:
+        """Render the summary payload from the in-memory state."""
+        self._expire_buckets(datetime.now(timezone.utc))
+
+        flow_sum = 0.0
+        flow_count = 0
+        pressure_sum = 0.0
+        pressure_count = 0
+        for node_buckets in self._buckets.values():
+            for bucket in node_buckets.values():
+                flow_sum += bucket.flow_sum
+                flow_count += bucket.flow_count
+                pressure_sum += bucket.pressure_sum
+                pressure_count += bucket.pressure_count
+
+        avg_flow = flow_sum / flow_count if flow_count else 0.0
+        avg_pressure = pressure_sum / pressure_count if pressure_count else 0.0
+
+        total_power_kw = 0.0
+        energy_nodes: List[Dict[str, Any]] = []
+        nodes: List[Dict[str, Any]] = []
+
+        for node_id in sorted(self._nodes):
+            node_name = self._nodes[node_id]
+            latest = self._latest.get(node_id)
+            flow_rate = (latest and latest['flow_rate']) or 0.0
+            pressure = (latest and latest['pressure']) or 0.0
+            power_kw = 0.0
+
+            if flow_rate > 0 and pressure > 0:
+                power_kw = (flow_rate * pressure * PUMP_POWER_FACTOR) / 100
+                total_power_kw += power_kw
+                energy_nodes.append({
+                    'node_id': node_id,
+                    'node_name': node_name,
+                    'flow_rate': flow_rate,
+                    'pressure': pressure,
+                    'power_kw': round(power_kw, 2),
+                    'energy_cost_per_hour': round(power_kw * ENERGY_PRICE_EUR_KWH, 2)
+                })
+
+            nodes.append({
+                "id": node_id,
+                "name": node_name,
+                "flow_rate": flow_rate,
+                "pressure": pressure,
+                "reservoir_level": 0,
+                "power_consumption_kw": round(power_kw, 2),
+                "last_update": latest['timestamp'].isoformat() if latest else None
+            })
+
+        daily_energy_kwh = total_power_kw * 24
+        monthly_energy_kwh = daily_energy_kwh * 30
+        daily_cost = daily_energy_kwh * ENERGY_PRICE_EUR_KWH
+        monthly_cost = monthly_energy_kwh * ENERGY_PRICE_EUR_KWH
+
+        if avg_flow and avg_pressure:
+            theoretical_power = (avg_flow * avg_pressure * THEORETICAL_POWER_FACTOR) / 100
+            pump_efficiency = (theoretical_power / total_power_kw * 100) if total_power_kw > 0 else 0
+        else:
+            pump_efficiency = DEFAULT_PUMP_EFFICIENCY
+
+        return {
+            "kpis": {
+                "total_flow": avg_flow,
+                "average_pressure": avg_pressure,
+                "system_efficiency": 92.5,  # Placeholder
+                "active_alerts": 3,  # Placeholder
+                "water_quality_index": 95.8,  # Placeholder
+                "energy_consumption": {
+                    "current_power_kw": round(total_power_kw, 2),
+                    "daily_consumption_kwh": round(daily_energy_kwh, 2),
+                    "monthly_consumption_kwh": round(monthly_energy_kwh, 2),
+                    "daily_cost_eur": round(daily_cost, 2),
+                    "monthly_cost_eur": round(monthly_cost, 2),
+                    "pump_efficiency_percent": round(pump_efficiency, 1),
+                    "cost_per_cubic_meter": round(daily_cost / (avg_flow * 24) if avg_flow > 0 else 0, 3)
+                }
+            },
+            "nodes": nodes,
+            "energy_analysis": energy_nodes
+        }
+
+    # ====================================
+    # Redis mirror
+    # ====================================
+
+    async def _store_in_redis(self) -> None:
+        if self.redis_client is None or self._summary is None:
+            return
+        try:
+            await self.redis_client.set_json(
+                self.REDIS_KEY, self._summary, ttl=self.redis_ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store dashboard snapshot in Redis: {e}")
+
+    async def _load_from_redis(self) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            cached = await self.redis_client.get_json(self.REDIS_KEY)
+            if cached:
+                self._summary = cached
+                logger.info("Loaded dashboard snapshot from Redis")
+        except Exception as e:
+            logger.warning(f"Failed to load dashboard snapshot from Redis: {e}")
@@ -17,11 +17,22 @@ from enum import Enum
 
 from google.cloud import bigquery
 from src.infrastructure.database.postgres_manager import get_postgres_manager, PostgresManager
+from src.infrastructure.cache.data_version import record_ingest
 from src.infrastructure.cache.redis_cache_manager import RedisCacheManager
 from src.infrastructure.bigquery.bigquery_client import BigQueryClient
+from src.infrastructure.data.ingest import (
+    IngestQueue,
+    RollingNodeStats,
+    batch_frame,
+    detect_flow_anomalies,
+)
+from src.infrastructure.data.live_feed import LIVE_CHANNEL, encode_batch
 
 logger = logging.getLogger(__name__)
 
+# Redis set of node IDs that have a node:{id}:latest hash
+LATEST_INDEX_KEY = "nodes:latest"
+
 
 class DataTier(Enum):
     """Data storage tiers."""
@@ -46,6 +57,7 @@ class HybridDataService:
     ):
         """Initialize hybrid data service."""
         self.redis_manager = redis_manager or RedisCacheManager()
+        self.redis = self.redis_manager.async_client
         self.postgres_manager = None
         self.bigquery_client = BigQueryClient()
         self.cache_ttl_hours = cache_ttl_hours
@@ -53,7 +65,20 @@ class HybridDataService:
         # Write buffer for batch operations
         self.write_buffer = []
         self.buffer_size = 1000
+        self.max_buffer_readings = 500_000
+        self.flush_batch_size = 50_000
+        self.flush_retries = 3
+        self.flush_retry_delay = 1.0
         self.last_flush = datetime.now()
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # ETL job rows are aggregated over this interval
+        self.etl_log_interval = timedelta(minutes=15)
+        self._etl_stats = self._new_etl_stats()
+        
+        # Real-time anomaly statistics and micro-batching queue
+        self.recent_stats = RollingNodeStats(window_minutes=60)
+        self.ingest_queue = IngestQueue(self.write_sensor_readings)
         
     async def initialize(self) -> None:
         """Initialize all data tier connections."""
@@ -72,8 +97,8 @@ class HybridDataService:
         )
         await self.postgres_manager.initialize()
         
-        # Initialize Redis cache
-        self.redis_manager.initialize_cache()
+        # Initialize Redis cache (blocking BigQuery warm-up, run off the event loop)
+        await asyncio.to_thread(self.redis_manager.initialize_cache)
         
         # Start background tasks (only if not in Streamlit context)
         try:
@@ -92,6 +117,15 @@ class HybridDataService:
         
         logger.info("Hybrid data service initialized")
         
+    async def close(self) -> None:
+        """Drain queued readings, flush them to PostgreSQL and log ETL stats."""
+        await self.ingest_queue.stop(drain=True)
+        if self._flush_task and not self._flush_task.done():
+            await self._flush_task
+        await self._flush_write_buffer()
+        if self.postgres_manager:
+            await self._log_etl_stats(force=True)
+        
     # ====================================
     # Write Operations (Write-Through Cache)
     # ====================================
@@ -102,91 +136,265 @@ class HybridDataService:
         
         Flow: Redis → Buffer → PostgreSQL → BigQuery (daily)
         """
-        node_id = reading['node_id']
-        timestamp = reading['timestamp']
+        await self.write_sensor_readings([reading])
         
-        # 1. Write to Redis immediately
-        await self._write_to_redis(reading)
-        
-        # 2. Add to write buffer
-        self.write_buffer.append(reading)
+    async def enqueue_sensor_reading(self, reading: Dict[str, Any]) -> None:
+        """
+        Queue a reading for micro-batched ingestion.
+
+        Waits while the ingest queue is full, so producers are slowed down
+        instead of memory growing without bound.
+        """
+        self.ingest_queue.start()
+        await self.ingest_queue.put(reading)
         
-        # 3. Flush buffer if needed
-        if len(self.write_buffer) >= self.buffer_size or \
-           (datetime.now() - self.last_flush) > timedelta(minutes=5):
-            await self._flush_write_buffer()
+    async def write_sensor_readings(self, readings: List[Dict[str, Any]]) -> int:
+        """
+        Write a batch of sensor readings to the hot tier.
+
+        All Redis updates for the batch (latest values, time series, trims,
+        real-time metrics, detected anomalies and the live feed
+        announcement) go out in one pipeline.
+        Anomalies are checked against per-node statistics kept in memory,
+        and readings are buffered for a background COPY into PostgreSQL.
+
+        Returns:
+            Number of readings written
+        """
+        if not readings:
+            return 0
             
-        # 4. Update real-time metrics
-        await self._update_realtime_metrics(reading)
-        
-        # 5. Check for anomalies
-        await self._check_anomalies(reading)
-        
-    async def _write_to_redis(self, reading: Dict[str, Any]) -> None:
-        """Write reading to Redis cache."""
-        node_id = reading['node_id']
-        
-        # Store latest reading
-        self.redis_manager.redis_client.hset(
-            f"node:{node_id}:latest",
-            mapping={
-                "timestamp": reading['timestamp'].isoformat(),
-                "flow_rate": reading.get('flow_rate', 0),
-                "pressure": reading.get('pressure', 0),
-                "temperature": reading.get('temperature', 0)
+        frame, epochs = batch_frame(readings)
+        await self._prime_recent_stats(frame['node_id'].unique())
+        
+        # Check against the window as it was before this batch
+        stats = self.recent_stats.snapshot(frame['node_id'].unique())
+        anomalies = detect_flow_anomalies(frame, stats)
+        self.recent_stats.update(frame)
+        
+        latest = PostgresManager._latest_by_node(readings)
+        anomaly_records = self._anomaly_records(readings, anomalies)
+        await self._write_batch_to_redis(readings, epochs, latest, anomalies, anomaly_records)
+        self._buffer_for_flush(readings)
+        return len(readings)
+        
+    @staticmethod
+    def _anomaly_records(readings: List[Dict[str, Any]], anomalies: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Anomaly rows as stored in Redis and announced to live subscribers."""
+        if anomalies.empty:
+            return []
+        return [
+            {
+                'timestamp': readings[position]['timestamp'],
+                'node_id': node_id,
+                'anomaly_type': anomaly_type,
+                'severity': 'warning',
+                'measurement_type': 'flow_rate',
+                'actual_value': actual,
+                'expected_value': expected,
+                'deviation_percentage': None if pd.isna(deviation) else deviation
             }
-        )
-        
-        # Add to time series (last 24h)
-        score = reading['timestamp'].timestamp()
-        value = json.dumps({
-            "flow_rate": reading.get('flow_rate', 0),
-            "pressure": reading.get('pressure', 0),
-            "temperature": reading.get('temperature', 0)
-        })
-        
-        self.redis_manager.redis_client.zadd(
-            f"node:{node_id}:timeseries",
-            {value: score}
-        )
+            for position, node_id, actual, expected, anomaly_type, deviation in zip(
+                anomalies.index, anomalies['node_id'], anomalies['flow_rate'],
+                anomalies['expected_value'], anomalies['anomaly_type'],
+                anomalies['deviation_percentage']
+            )
+        ]
         
+    async def _write_batch_to_redis(
+        self,
+        readings: List[Dict[str, Any]],
+        epochs: List[float],
+        latest: Dict[str, Dict[str, Any]],
+        anomalies: pd.DataFrame,
+        anomaly_records: List[Dict[str, Any]]
+    ) -> None:
+        """Write a batch to Redis in a single pipelined round-trip."""
+        pipe = self.redis.pipeline()
+        
+        series: Dict[str, Dict[str, float]] = {}
+        total_flow = 0.0
+        for reading, score in zip(readings, epochs):
+            flow_rate = reading.get('flow_rate', 0)
+            pressure = reading.get('pressure', 0)
+            temperature = reading.get('temperature', 0)
+            value = json.dumps({
+                "flow_rate": flow_rate,
+                "pressure": pressure,
+                "temperature": temperature
+            })
+            series.setdefault(reading['node_id'], {})[value] = score
+            total_flow += flow_rate or 0
+            
         # Trim old data (keep 24h)
         cutoff = (datetime.now() - timedelta(hours=24)).timestamp()
-        self.redis_manager.redis_client.zremrangebyscore(
-            f"node:{node_id}:timeseries",
-            0, cutoff
-        )
+        for node_id, values in series.items():
+            reading = latest[node_id]
+            pipe.hset(
+                f"node:{node_id}:latest",
+                mapping={
+                    "timestamp": reading['timestamp'].isoformat(),
+                    "flow_rate": reading.get('flow_rate', 0),
+                    "pressure": reading.get('pressure', 0),
+                    "temperature": reading.get('temperature', 0)
+                }
+            )
+            pipe.zadd(f"node:{node_id}:timeseries", values)
+            pipe.zremrangebyscore(f"node:{node_id}:timeseries", 0, cutoff)
+            
+        pipe.sadd(LATEST_INDEX_KEY, *series)
+        
+        # Update real-time metrics
+        pipe.incrbyfloat('system:total_flow', total_flow)
+        pipe.sadd('system:active_nodes', *series)
+        # New data for open-range response validators
+        record_ingest(pipe)
+        
+        if anomaly_records:
+            pipe.zadd("anomalies:recent", {
+                json.dumps(record, default=str): epoch
+                for record, epoch in zip(anomaly_records, anomalies['epoch'])
+            })
+            # TODO: Queue anomalies for PostgreSQL insert
+            
+        # Announced to stream subscribers with the same round-trip
+        message = encode_batch(latest, anomaly_records)
+        if message is not None:
+            pipe.publish(LIVE_CHANNEL, message)
+            
+        await pipe.execute()
         
+    async def _prime_recent_stats(self, node_ids) -> None:
+        """Seed rolling statistics for nodes first seen since startup."""
+        unseen = [node_id for node_id in node_ids if node_id not in self.recent_stats]
+        if not unseen:
+            return
+            
+        end_time = datetime.now()
+        start_time = end_time - timedelta(minutes=self.recent_stats.window_minutes)
+        try:
+            pipe = self.redis.pipeline()
+            for node_id in unseen:
+                pipe.zrangebyscore(
+                    f"node:{node_id}:timeseries",
+                    start_time.timestamp(),
+                    end_time.timestamp(),
+                    withscores=True
+                )
+            results = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not prime recent stats from Redis: {e}")
+            return
+            
+        node_col, epoch_col, flow_col = [], [], []
+        for node_id, items in zip(unseen, results):
+            for value, score in items or []:
+                node_col.append(node_id)
+                epoch_col.append(score)
+                flow_col.append(json.loads(value).get('flow_rate'))
+        if node_col:
+            self.recent_stats.update(pd.DataFrame({
+                "node_id": node_col,
+                "epoch": epoch_col,
+                "flow_rate": pd.to_numeric(pd.Series(flow_col, dtype=object), errors="coerce")
+            }))
+            
+    def _buffer_for_flush(self, readings: List[Dict[str, Any]]) -> None:
+        """Buffer readings for PostgreSQL and schedule a flush when due."""
+        self.write_buffer.extend(readings)
+        
+        overflow = len(self.write_buffer) - self.max_buffer_readings
+        if overflow > 0:
+            # PostgreSQL is not keeping up; the readings remain in the hot tier
+            del self.write_buffer[:overflow]
+            self._etl_stats['records_failed'] += overflow
+            logger.error(f"Write buffer full, dropped {overflow} oldest readings")
+            
+        if len(self.write_buffer) >= self.buffer_size or \
+           (datetime.now() - self.last_flush) > timedelta(minutes=5):
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_write_buffer())
+                
     async def _flush_write_buffer(self) -> None:
-        """Flush write buffer to PostgreSQL."""
-        if not self.write_buffer:
+        """Flush write buffer to PostgreSQL in large COPY batches."""
+        if not self.write_buffer or not self.postgres_manager:
             return
             
+        # New writes go to a fresh buffer while this batch is copied
+        pending, self.write_buffer = self.write_buffer, []
+        started_at = datetime.now()
+        written = 0
+        
         try:
-            # Batch insert to PostgreSQL
-            await self.postgres_manager.insert_sensor_readings_batch(
-                self.write_buffer
-            )
+            while written < len(pending):
+                chunk = pending[written:written + self.flush_batch_size]
+                await self._copy_with_retry(chunk)
+                written += len(chunk)
+                
+            logger.info(f"Flushed {written} readings to PostgreSQL")
+            self.last_flush = datetime.now()
             
-            # Log ETL job
+        except Exception as e:
+            logger.error(f"Failed to flush write buffer: {e}")
+            # Keep unwritten readings for retry, ahead of newer ones
+            self.write_buffer[:0] = pending[written:]
+            overflow = len(self.write_buffer) - self.max_buffer_readings
+            if overflow > 0:
+                del self.write_buffer[:overflow]
+                self._etl_stats['records_failed'] += overflow
+                
+        finally:
+            self._record_etl_progress(started_at, written)
+            await self._log_etl_stats()
+            
+    async def _copy_with_retry(self, chunk: List[Dict[str, Any]]) -> None:
+        """COPY a chunk into PostgreSQL, retrying with exponential backoff."""
+        for attempt in range(1, self.flush_retries + 1):
+            try:
+                await self.postgres_manager.insert_sensor_readings_batch(chunk)
+                return
+            except Exception as e:
+                if attempt == self.flush_retries:
+                    raise
+                delay = self.flush_retry_delay * 2 ** (attempt - 1)
+                logger.warning(
+                    f"COPY of {len(chunk)} readings failed (attempt {attempt}): {e}; "
+                    f"retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                
+    def _record_etl_progress(self, started_at: datetime, written: int) -> None:
+        if self._etl_stats['started_at'] is None:
+            self._etl_stats['started_at'] = started_at
+        self._etl_stats['records_processed'] += written
+        self._etl_stats['flushes'] += 1
+        
+    async def _log_etl_stats(self, force: bool = False) -> None:
+        """Log one etl_jobs row per interval rather than one per flush."""
+        started_at = self._etl_stats['started_at']
+        if started_at is None:
+            return
+        if not force and datetime.now() - started_at < self.etl_log_interval:
+            return
+            
+        stats, self._etl_stats = self._etl_stats, self._new_etl_stats()
+        try:
             await self.postgres_manager.log_etl_job({
                 "job_name": "sensor_reading_batch_insert",
                 "job_type": "write_through",
-                "status": "completed",
-                "started_at": self.last_flush,
+                "status": "completed" if not stats['records_failed'] else "failed",
+                "started_at": started_at,
                 "completed_at": datetime.now(),
-                "records_processed": len(self.write_buffer)
+                "records_processed": stats['records_processed'],
+                "records_failed": stats['records_failed'],
+                "metadata": {"flushes": stats['flushes']}
             })
-            
-            logger.info(f"Flushed {len(self.write_buffer)} readings to PostgreSQL")
-            
-            # Clear buffer
-            self.write_buffer = []
-            self.last_flush = datetime.now()
-            
         except Exception as e:
-            logger.error(f"Failed to flush write buffer: {e}")
-            # Keep buffer for retry
+            logger.error(f"Failed to log ETL job: {e}")
+            
+    @staticmethod
+    def _new_etl_stats() -> Dict[str, Any]:
+        return {'started_at': None, 'records_processed': 0, 'records_failed': 0, 'flushes': 0}
             
     # ====================================
     # Read Operations (Tiered Queries)
@@ -213,7 +421,7 @@ class HybridDataService:
         data = await self._query_postgres(node_id, start_time, end_time, interval)
         if data is not None and not data.empty:
             # Cache in Redis for next time
-            self._cache_dataframe(cache_key, data)
+            await self._cache_dataframe(cache_key, data)
             return data
         
         # Try Redis for very recent data as fallback
@@ -229,113 +437,100 @@ class HybridDataService:
         self,
         node_ids: Optional[List[str]] = None
     ) -> Dict[str, Dict[str, Any]]:
-        """Get latest readings for nodes."""
-        # Always check Redis first for latest data
-        latest_readings = {}
-        
+        """
+        Get latest readings for nodes.
+
+        All nodes are read from Redis in one pipelined round-trip; nodes
+        missing from the cache are fetched from the PostgreSQL latest-reading
+        index in a single query and written back in one pipeline.
+        """
         if node_ids is None:
-            # Get all nodes
-            node_ids = self.redis_manager.redis_client.lrange("nodes:all", 0, -1)
+            # Nodes known to the cache warm-up plus nodes seen on the write path
+            pipe = self.redis.pipeline()
+            pipe.lrange("nodes:all", 0, -1)
+            pipe.smembers(LATEST_INDEX_KEY)
+            listed, indexed = await pipe.execute()
+            node_ids = list(dict.fromkeys(
+                list(listed) + sorted(indexed)
+            ))
+            
+        if not node_ids:
+            return {}
             
-        for node_id in node_ids:
-            # Try Redis
-            latest = self.redis_manager.redis_client.hgetall(f"node:{node_id}:latest")
+        cached = await self.redis.hgetall_many(
+            f"node:{node_id}:latest" for node_id in node_ids
+        )
+        
+        latest_readings = {}
+        missing = []
+        for node_id, latest in zip(node_ids, cached):
             if latest:
-                latest_readings[node_id] = {
-                    k.decode() if isinstance(k, bytes) else k: 
-                    v.decode() if isinstance(v, bytes) else v 
-                    for k, v in latest.items()
-                }
+                latest_readings[node_id] = latest
             else:
-                # Fallback to PostgreSQL
-                pg_latest = await self.postgres_manager.get_latest_readings([node_id])
-                if node_id in pg_latest:
-                    latest_readings[node_id] = pg_latest[node_id]
+                missing.append(node_id)
+                
+        if missing and self.postgres_manager:
+            # Fallback to PostgreSQL latest-reading index
+            pg_latest = await self.postgres_manager.get_latest_readings(missing)
+            if pg_latest:
+                pipe = self.redis.pipeline()
+                for node_id, reading in pg_latest.items():
+                    latest_readings[node_id] = reading
                     # Cache in Redis
-                    self.redis_manager.redis_client.hset(
+                    pipe.hset(
                         f"node:{node_id}:latest",
-                        mapping=pg_latest[node_id]
+                        mapping={
+                            k: v.isoformat() if isinstance(v, datetime) else str(v)
+                            for k, v in reading.items()
+                            if v is not None and k != 'node_id'
+                        }
                     )
+                    pipe.sadd(LATEST_INDEX_KEY, node_id)
+                await pipe.execute()
                     
         return latest_readings
         
+    async def get_readings_frame(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        node_ids: Optional[List[str]] = None,
+        raise_errors: bool = False
+    ) -> pd.DataFrame:
+        """
+        Get readings for many nodes over a time range as one columnar frame.
+        
+        A single PostgreSQL query replaces one get_node_data call per node.
+        Failures yield an empty frame unless `raise_errors` is set, for
+        callers that must tell an outage apart from a range without rows.
+        """
+        try:
+            if not self.postgres_manager or not self.postgres_manager.pool:
+                raise RuntimeError("PostgreSQL manager not available")
+            return await self.postgres_manager.get_readings_frame(start_time, end_time, node_ids)
+        except Exception as e:
+            logger.error(f"PostgreSQL readings query failed: {e}")
+            if raise_errors:
+                raise
+            return pd.DataFrame()
+            
     async def get_system_metrics(self, time_range: str = "24h") -> Dict[str, Any]:
         """Get system-wide metrics."""
         cache_key = f"system:metrics:{time_range}"
         
         # Check Redis cache
-        cached = self.redis_manager.redis_client.get(cache_key)
+        cached = await self.redis.get_json(cache_key)
         if cached:
-            return json.loads(cached)
+            return cached
             
         # Query PostgreSQL
         metrics = await self.postgres_manager.get_system_metrics(time_range)
         
         # Cache for 5 minutes
-        self.redis_manager.redis_client.setex(
-            cache_key,
-            300,  # 5 minutes
-            json.dumps(metrics, default=str)
-        )
+        await self.redis.set_json(cache_key, metrics, ttl=300)
         
         return metrics
         
-    # ====================================
-    # Anomaly Detection
-    # ====================================
-    
-    async def _check_anomalies(self, reading: Dict[str, Any]) -> None:
-        """Check for anomalies in real-time."""
-        node_id = reading['node_id']
-        
-        # Get recent average from Redis
-        recent_data = await self._get_recent_stats(node_id)
-        
-        if recent_data:
-            # Simple threshold-based detection
-            flow_rate = reading.get('flow_rate', 0)
-            avg_flow = recent_data.get('avg_flow', 0)
-            std_flow = recent_data.get('std_flow', 1)
-            
-            # Check for anomalies (3-sigma rule)
-            if abs(flow_rate - avg_flow) > 3 * std_flow:
-                anomaly = {
-                    'timestamp': reading['timestamp'],
-                    'node_id': node_id,
-                    'anomaly_type': 'flow_spike' if flow_rate > avg_flow else 'flow_drop',
-                    'severity': 'warning',
-                    'measurement_type': 'flow_rate',
-                    'actual_value': flow_rate,
-                    'expected_value': avg_flow,
-                    'deviation_percentage': abs((flow_rate - avg_flow) / avg_flow * 100)
-                }
-                
-                # Store in Redis
-                self.redis_manager.redis_client.zadd(
-                    "anomalies:recent",
-                    {json.dumps(anomaly, default=str): reading['timestamp'].timestamp()}
-                )
-                
-                # Queue for PostgreSQL insert
-                # TODO: Implement anomaly queue
-                
-    async def _get_recent_stats(self, node_id: str) -> Optional[Dict[str, float]]:
-        """Get recent statistics for anomaly detection."""
-        # Get last hour of data from Redis
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=1)
-        
-        data = await self._query_redis_timeseries(node_id, start_time, end_time)
-        
-        if data is not None and len(data) > 10:
-            return {
-                'avg_flow': data['flow_rate'].mean(),
-                'std_flow': data['flow_rate'].std(),
-                'avg_pressure': data['pressure'].mean(),
-                'std_pressure': data['pressure'].std()
-            }
-        return None
-        
     # ====================================
     # Helper Methods
     # ====================================
@@ -360,7 +555,7 @@ class HybridDataService:
         """Query time series data from Redis."""
         try:
             # Get data from sorted set
-            data = self.redis_manager.redis_client.zrangebyscore(
+            data = await self.redis.zrangebyscore(
                 f"node:{node_id}:timeseries",
                 start_time.timestamp(),
                 end_time.timestamp()
@@ -435,19 +630,19 @@ class HybridDataService:
                 ]
             )
             
-            df = self.bigquery_client.client.query(query, job_config=job_config).to_dataframe()
+            df = self.bigquery_client.arrow.read_dataframe(query, job_config)
             return df
             
         except Exception as e:
             logger.error(f"BigQuery query failed: {e}")
             return pd.DataFrame()
             
-    def _cache_dataframe(self, key: str, df: pd.DataFrame) -> None:
+    async def _cache_dataframe(self, key: str, df: pd.DataFrame) -> None:
         """Cache DataFrame in Redis."""
         try:
             # Convert to JSON for caching
             data = df.to_json(orient='records', date_format='iso')
-            self.redis_manager.redis_client.setex(
+            await self.redis.setex(
                 key,
                 3600,  # 1 hour TTL
                 data
@@ -455,15 +650,6 @@ class HybridDataService:
         except Exception as e:
             logger.error(f"Failed to cache dataframe: {e}")
             
-    async def _update_realtime_metrics(self, reading: Dict[str, Any]) -> None:
-        """Update real-time metrics in Redis."""
-        # Update system flow total
-        flow_rate = reading.get('flow_rate', 0)
-        self.redis_manager.redis_client.incrbyfloat('system:total_flow', flow_rate)
-        
-        # Update node count
-        self.redis_manager.redis_client.sadd('system:active_nodes', reading['node_id'])
-        
     # ====================================
     # Background Tasks
     # ====================================
@@ -0,0 +1,298 @@
+"""
+Micro-batched ingestion helpers for the hot tier.
+
+Provides the rolling per-node statistics used for real-time anomaly checks
+and a bounded ingest queue that groups single readings into batches for
+HybridDataService.write_sensor_readings.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Queued by IngestQueue.stop: the consumer writes its batch and exits
+_STOP = object()
+
+
+class RollingNodeStats:
+    """
+    Per-node flow statistics over a rolling window of minute buckets.
+
+    Each bucket stores (count, sum, sum of squares), so mean and standard
+    deviation over the window are derived without keeping raw readings.
+    """
+
+    def __init__(self, window_minutes: int = 60):
+        """Initialize with the length of the rolling window."""
+        self.window_minutes = window_minutes
+        self._buckets: Dict[str, "OrderedDict[int, List[float]]"] = {}
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._buckets
+
+    def snapshot(self, node_ids: Iterable[str]) -> pd.DataFrame:
+        """
+        Return count, mean and sample std per node over the current window.
+
+        Nodes without any data get a count of zero.
+        """
+        rows = []
+        for node_id in node_ids:
+            n = s = ss = 0.0
+            for count, total, squares in self._buckets.get(node_id, {}).values():
+                n += count
+                s += total
+                ss += squares
+            rows.append((node_id, n, s, ss))
+
+        stats = pd.DataFrame(rows, columns=["node_id", "count", "sum", "sumsq"])
+        stats = stats.set_index("node_id")
+        count = stats["count"]
+        stats["mean"] = np.where(count > 0, stats["sum"] / count.where(count > 0, 1), np.nan)
+        variance = (stats["sumsq"] - stats["sum"] ** 2 / count.where(count > 0, 1)) / (
+            count - 1
+        ).where(count > 1, 1)
+        stats["std"] = np.where(count > 1, np.sqrt(variance.clip(lower=0)), np.nan)
+        return stats[["count", "mean", "std"]]
+
+    def update(self, frame: pd.DataFrame) -> None:
+        """
+        Fold a batch into the window.
+
+        Args:
+            frame: DataFrame with node_id, epoch (seconds) and flow_rate columns
+        """
+        values = frame.dropna(subset=["flow_rate"])
+        if values.empty:
+            return
+
+        grouped = (
+            values.assign(
+                minute=(values["epoch"] // 60).astype("int64"),
+                squares=values["flow_rate"] ** 2,
+            )
+            .groupby(["node_id", "minute"], sort=True)
+            .agg(count=("flow_rate", "size"), total=("flow_rate", "sum"), squares=("squares", "sum"))
+        )
+
+        for (node_id, minute), count, total, squares in zip(
+            grouped.index, grouped["count"], grouped["total"], grouped["squares"]
+        ):
+            buckets = self._buckets.setdefault(node_id, OrderedDict())
+            bucket = buckets.get(minute)
+            if bucket is None:
+                buckets[minute] = [float(count), float(total), float(squares)]
+                # Buckets normally arrive in order; keep the dict sorted otherwise
+                if len(buckets) > 1 and next(reversed(buckets)) != minute:
+                    self._buckets[node_id] = OrderedDict(sorted(buckets.items()))
+            else:
+                bucket[0] += count
+                bucket[1] += total
+                bucket[2] += squares
+
+        for node_id in grouped.index.get_level_values(0).unique():
+            self._expire(node_id)
+
+    def _expire(self, node_id: str) -> None:
+        buckets = self._buckets[node_id]
+        newest = next(reversed(buckets))
+        cutoff = newest - self.window_minutes
+        while buckets and next(iter(buckets)) <= cutoff:
+            buckets.popitem(last=False)
+
+
+def detect_flow_anomalies(
+    frame: pd.DataFrame,
+    stats: pd.DataFrame,
+    min_count: int = 10,
+    sigma: float = 3.0,
+) -> pd.DataFrame:
+    """
+    Flag readings deviating more than `sigma` standard deviations from the
+    node's recent mean.
+
+    Args:
+        frame: Batch with node_id and flow_rate columns
+        stats: Output of RollingNodeStats.snapshot for the batch nodes
+        min_count: Minimum window size before a node is checked
+        sigma: Deviation threshold in standard deviations
+
+    Returns:
+        The flagged rows with expected_value, anomaly_type and
+        deviation_percentage columns added
+    """
+    count = frame["node_id"].map(stats["count"]).to_numpy(dtype=float)
+    mean = frame["node_id"].map(stats["mean"]).to_numpy(dtype=float)
+    std = frame["node_id"].map(stats["std"]).fillna(1.0).to_numpy(dtype=float)
+    flow = frame["flow_rate"].to_numpy(dtype=float)
+
+    with np.errstate(invalid="ignore"):
+        mask = (count > min_count) & (np.abs(flow - mean) > sigma * std)
+    flagged = frame.loc[mask].copy()
+    if flagged.empty:
+        return flagged
+
+    expected = mean[mask]
+    actual = flow[mask]
+    flagged["expected_value"] = expected
+    flagged["anomaly_type"] = np.where(actual > expected, "flow_spike", "flow_drop")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = np.abs((actual - expected) / expected * 100)
+    flagged["deviation_percentage"] = np.where(np.isfinite(deviation), deviation, np.nan)
+    return flagged
+
+
+class IngestQueue:
+    """
+    Bounded queue that groups single readings into batches.
+
+    Producers block on `put` when the queue is full, which applies
+    backpressure instead of growing memory without limit. A consumer task
+    drains up to `max_batch_size` readings at a time, waiting at most
+    `max_delay_seconds` for a batch to fill.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+        max_batch_size: int = 5000,
+        max_delay_seconds: float = 0.05,
+        max_queue_size: int = 100_000,
+    ):
+        """
+        Initialize the ingest queue.
+
+        Args:
+            writer: Coroutine function receiving each batch
+            max_batch_size: Maximum readings handed to the writer at once
+            max_delay_seconds: Maximum time a reading waits for its batch
+            max_queue_size: Maximum queued readings before producers block
+        """
+        self.writer = writer
+        self.max_batch_size = max_batch_size
+        self.max_delay_seconds = max_delay_seconds
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._consumer: Optional[asyncio.Task] = None
+
+        self.batches_written = 0
+        self.readings_written = 0
+        self.batches_failed = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of readings waiting to be written."""
+        return self._queue.qsize()
+
+    async def put(self, reading: Dict[str, Any]) -> None:
+        """Enqueue a reading, waiting while the queue is full."""
+        await self._queue.put(reading)
+
+    def put_nowait(self, reading: Dict[str, Any]) -> None:
+        """Enqueue a reading; raises asyncio.QueueFull when the queue is full."""
+        self._queue.put_nowait(reading)
+
+    def start(self) -> None:
+        """Start the consumer task."""
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.create_task(self._run())
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop the consumer once the batch it holds is written.
+
+        Args:
+            drain: Also write every reading still queued; otherwise they
+                are discarded
+        """
+        if not drain:
+            discarded = 0
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                discarded += 1
+            if discarded:
+                logger.warning(f"Ingest queue stopped, {discarded} queued readings discarded")
+        if self._consumer is not None and not self._consumer.done():
+            await self._queue.put(_STOP)
+            await self._consumer
+        self._consumer = None
+        # Readings put during shutdown, or left by a failed consumer
+        while drain and not self._queue.empty():
+            batch: List[Dict[str, Any]] = []
+            self._take_batch(batch)
+            await self._write(batch)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            batch: List[Dict[str, Any]] = []
+            stopping = first is _STOP or self._take_batch(batch, first)
+            deadline = loop.time() + self.max_delay_seconds
+            while not stopping and len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    reading = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                stopping = reading is _STOP or self._take_batch(batch, reading)
+            await self._write(batch)
+
+    def _take_batch(
+        self, batch: List[Dict[str, Any]], first: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Move already-queued readings into `batch` without waiting.
+
+        Returns:
+            True if the stop marker was reached
+        """
+        if first is not None:
+            batch.append(first)
+        while len(batch) < self.max_batch_size:
+            try:
+                reading = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if reading is _STOP:
+                return True
+            batch.append(reading)
+        return False
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            await self.writer(batch)
+            self.batches_written += 1
+            self.readings_written += len(batch)
+        except Exception as e:
+            self.batches_failed += 1
+            logger.error(f"Failed to write ingest batch of {len(batch)} readings: {e}")
+
+
+def batch_frame(readings: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, List[float]]:
+    """
+    Build the columnar view of a batch used for statistics.
+
+    Returns:
+        The frame (node_id, epoch, flow_rate) and the epoch list, which
+        callers reuse as sorted-set scores
+    """
+    epochs = [r['timestamp'].timestamp() for r in readings]
+    frame = pd.DataFrame({
+        "node_id": [r['node_id'] for r in readings],
+        "epoch": epochs,
+        "flow_rate": pd.to_numeric(
+            pd.Series([r.get('flow_rate') for r in readings], dtype=object), errors="coerce"
+        ),
+    })
+    return frame, epochs
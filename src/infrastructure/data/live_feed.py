@@ -0,0 +1,437 @@
+"""
+Live feed of latest readings and anomalies for push clients.
+
+Writers announce every ingested batch once on a Redis channel: PostgresManager
+after committing readings, and HybridDataService in the pipeline that writes
+the hot tier. Ingestion usually runs in a different process from the API,
+so each API process runs a LiveFeedRelay that subscribes to the channel and
+hands batches to its LiveBroadcaster. The broadcaster numbers each event,
+keeps recent events in a ring so clients can resume from the last sequence
+number they saw, and fans events out to subscriber queues. Events are
+JSON-encoded once at publish time, whatever the number of subscribers.
+
+Publishing never waits for subscribers. Each one has a bounded queue and
+a subscriber that lets it fill up is dropped; it can reconnect and resume
+from its last sequence number. Open dashboards therefore add no database
+queries and cannot slow down ingestion.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVENT_SNAPSHOT = "snapshot"
+EVENT_READINGS = "readings"
+EVENT_ANOMALIES = "anomalies"
+
+# Fields of the latest reading tracked per node
+READING_FIELDS = ("flow_rate", "pressure", "temperature")
+
+DEFAULT_HISTORY_SIZE = 1000
+DEFAULT_QUEUE_SIZE = 100
+
+# Redis channel on which writers announce ingested batches
+LIVE_CHANNEL = "live:batches"
+RELAY_RETRY_SECONDS = 1.0
+
+
+def _json_default(value: Any) -> str:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+@dataclass(frozen=True)
+class LiveEvent:
+    """One numbered event, with its wire encodings prepared once."""
+
+    seq: int
+    type: str
+    data: Dict[str, Any]
+    message: str
+    sse: str
+
+    @classmethod
+    def create(cls, seq: int, event_type: str, data: Dict[str, Any]) -> "LiveEvent":
+        message = json.dumps({"seq": seq, "type": event_type, "data": data}, default=_json_default)
+        return cls(
+            seq=seq,
+            type=event_type,
+            data=data,
+            message=message,
+            sse=f"id: {seq}\nevent: {event_type}\ndata: {message}\n\n",
+        )
+
+
+class LiveSubscription:
+    """A subscriber's bounded queue of events."""
+
+    def __init__(self, broadcaster: "LiveBroadcaster", queue_size: int):
+        self._broadcaster = broadcaster
+        # One slot is reserved for the end-of-stream marker
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size + 1)
+        self._capacity = queue_size
+        self.dropped = False
+        self.closed = False
+        self.last_seq = 0
+
+    def offer(self, event: LiveEvent) -> bool:
+        """Queue an event without waiting; False if the subscriber is too far behind."""
+        if self._queue.qsize() >= self._capacity:
+            return False
+        self._queue.put_nowait(event)
+        return True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[LiveEvent]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait; raises asyncio.TimeoutError when exceeded
+
+        Returns:
+            The next event, or None once the subscription has ended
+        """
+        if self.closed and self._queue.empty():
+            return None
+        if timeout is None:
+            event = await self._queue.get()
+        else:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        if event is None:
+            self.closed = True
+            return None
+        self.last_seq = event.seq
+        return event
+
+    def close(self) -> None:
+        """Unsubscribe; events already queued are still returned by `get`."""
+        if self.closed:
+            return
+        self.closed = True
+        self._broadcaster.unsubscribe(self)
+        self._queue.put_nowait(None)
+
+    def _drop(self) -> None:
+        """End a subscriber that fell behind; queued events are discarded."""
+        self.dropped = True
+        self.closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> LiveEvent:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class LiveBroadcaster:
+    """
+    Fans out latest-reading deltas and anomalies to many subscribers.
+
+    Must be used from a single event loop (publish from the relay,
+    subscribe from request handlers).
+    """
+
+    def __init__(
+        self,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE
+    ):
+        """
+        Initialize the broadcaster.
+
+        Args:
+            history_size: Events kept for clients resuming from a sequence number
+            queue_size: Events a subscriber may lag behind before it is dropped
+        """
+        self.queue_size = queue_size
+        self.seq = 0
+        self.history: Deque[LiveEvent] = deque(maxlen=history_size)
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Set[LiveSubscription] = set()
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0, "resumed": 0, "snapshots": 0}
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> LiveEvent:
+        """Number an event, remember it for resuming clients and fan it out."""
+        self.seq += 1
+        event = LiveEvent.create(self.seq, event_type, data)
+        self.history.append(event)
+        self.stats["published"] += 1
+
+        slow = [subscriber for subscriber in self._subscribers if not subscriber.offer(event)]
+        self.stats["delivered"] += len(self._subscribers) - len(slow)
+        for subscriber in slow:
+            self._subscribers.discard(subscriber)
+            subscriber._drop()
+        if slow:
+            self.stats["dropped"] += len(slow)
+            logger.warning(f"Dropped {len(slow)} slow live feed subscriber(s) at seq {event.seq}")
+        return event
+
+    def publish_batch(
+        self,
+        latest_readings: Dict[str, Dict[str, Any]],
+        anomalies: Iterable[Dict[str, Any]] = ()
+    ) -> List[LiveEvent]:
+        """
+        Publish one ingested batch.
+
+        Each node's reading is reduced to the fields that changed since
+        its previous one; nodes without new readings, or whose readings are
+        older than the last one published, are left out.
+
+        Args:
+            latest_readings: Latest reading of the batch per node ID
+            anomalies: Anomalies detected in the batch
+
+        Returns:
+            The events published (at most one readings and one anomalies event)
+        """
+        deltas = {}
+        for node_id, reading in latest_readings.items():
+            current = {"timestamp": reading.get("timestamp")}
+            current.update((name, reading.get(name)) for name in READING_FIELDS)
+            previous = self.latest.get(node_id, {})
+            if previous and current["timestamp"] < previous["timestamp"]:
+                continue
+            delta = {name: value for name, value in current.items() if previous.get(name) != value}
+            if delta:
+                deltas[node_id] = delta
+                self.latest[node_id] = {**previous, **current}
+
+        events = []
+        if deltas:
+            events.append(self.publish(EVENT_READINGS, {"nodes": deltas}))
+        anomalies = list(anomalies)
+        if anomalies:
+            events.append(self.publish(EVENT_ANOMALIES, {"anomalies": anomalies}))
+        return events
+
+    def subscribe(self, last_seq: Optional[int] = None) -> LiveSubscription:
+        """
+        Start a subscription.
+
+        A client resuming from a sequence number still in history gets the
+        events it missed. New clients, and clients whose position is no
+        longer (or not yet) in history, get a snapshot of every node's
+        latest reading first, numbered with the current sequence number.
+
+        Args:
+            last_seq: Last sequence number the client received, if resuming
+
+        Returns:
+            The subscription; close it when the client goes away
+        """
+        subscription = LiveSubscription(self, self.queue_size)
+        oldest = self.history[0].seq if self.history else self.seq + 1
+        if last_seq is not None and oldest - 1 <= last_seq <= self.seq:
+            missed = [event for event in self.history if event.seq > last_seq]
+            if len(missed) > self.queue_size:
+                self._send_snapshot(subscription)
+            else:
+                for event in missed:
+                    subscription.offer(event)
+                self.stats["resumed"] += 1
+        else:
+            self._send_snapshot(subscription)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LiveSubscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def snapshot_stats(self) -> Dict[str, Any]:
+        """Counters plus current sequence number, subscribers and tracked nodes."""
+        return {
+            **self.stats,
+            "seq": self.seq,
+            "subscribers": len(self._subscribers),
+            "nodes": len(self.latest),
+        }
+
+    def _send_snapshot(self, subscription: LiveSubscription) -> None:
+        self.stats["snapshots"] += 1
+        subscription.offer(LiveEvent.create(
+            self.seq, EVENT_SNAPSHOT, {"nodes": {node_id: dict(state) for node_id, state in self.latest.items()}}
+        ))
+
+
+def _utc(value: Any) -> Optional[datetime]:
+    """Timestamp as an aware UTC datetime; naive values are taken as UTC."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def encode_batch(
+    latest_readings: Dict[str, Dict[str, Any]],
+    anomalies: Iterable[Dict[str, Any]] = ()
+) -> Optional[str]:
+    """
+    Encode a batch for LIVE_CHANNEL.
+
+    Only the fields the broadcaster tracks are kept; timestamps are sent as
+    UTC so batches from different writers compare in order.
+
+    Args:
+        latest_readings: Latest reading of the batch per node ID
+        anomalies: Anomalies detected in the batch
+
+    Returns:
+        The message, or None when there is nothing to announce
+    """
+    nodes = {}
+    for node_id, reading in latest_readings.items():
+        timestamp = _utc(reading.get("timestamp"))
+        if timestamp is None:
+            continue
+        state: Dict[str, Any] = {"timestamp": timestamp.isoformat()}
+        for name in READING_FIELDS:
+            value = reading.get(name)
+            # NaN is not valid JSON for browser clients
+            state[name] = None if value is None or value != value else float(value)
+        nodes[str(node_id)] = state
+    anomalies = list(anomalies)
+    if not nodes and not anomalies:
+        return None
+    return json.dumps({"nodes": nodes, "anomalies": anomalies}, default=_json_default)
+
+
+def decode_batch(message: str) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """Decode a LIVE_CHANNEL message into latest readings and anomalies."""
+    batch = json.loads(message)
+    latest = {
+        node_id: {**state, "timestamp": _utc(state["timestamp"])}
+        for node_id, state in batch.get("nodes", {}).items()
+    }
+    return latest, batch.get("anomalies", [])
+
+
+async def announce_batch(
+    redis,
+    latest_readings: Dict[str, Dict[str, Any]],
+    anomalies: Iterable[Dict[str, Any]] = ()
+) -> None:
+    """
+    Publish a batch on LIVE_CHANNEL.
+
+    Args:
+        redis: Async Redis client
+        latest_readings: Latest reading of the batch per node ID
+        anomalies: Anomalies detected in the batch
+    """
+    message = encode_batch(latest_readings, anomalies)
+    if message is None:
+        return
+    await redis.publish(LIVE_CHANNEL, message)
+
+
+class LiveFeedRelay:
+    """
+    Feeds batches announced on LIVE_CHANNEL into a process's broadcaster.
+
+    Redis pub/sub is fire-and-forget: batches announced while the relay is
+    reconnecting are missed, and clients catch up from the next batch that
+    touches a node.
+    """
+
+    def __init__(
+        self,
+        redis,
+        broadcaster: Optional[LiveBroadcaster] = None,
+        channel: str = LIVE_CHANNEL,
+        retry_seconds: float = RELAY_RETRY_SECONDS
+    ):
+        """
+        Initialize the relay.
+
+        Args:
+            redis: Async Redis client to subscribe with
+            broadcaster: Broadcaster to publish to (defaults to the process-wide one)
+            channel: Channel to subscribe to
+            retry_seconds: Delay before resubscribing after a Redis error
+        """
+        self.redis = redis
+        self.broadcaster = broadcaster or get_live_broadcaster()
+        self.channel = channel
+        self.retry_seconds = retry_seconds
+        self.stats = {"received": 0, "invalid": 0, "reconnects": 0}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the subscriber task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the subscriber task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        self.relay(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["reconnects"] += 1
+                logger.warning(f"Live feed relay lost its subscription to {self.channel}: {e}")
+                await asyncio.sleep(self.retry_seconds)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def relay(self, message: str) -> List[LiveEvent]:
+        """Publish one channel message to the broadcaster."""
+        try:
+            latest, anomalies = decode_batch(message)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self.stats["invalid"] += 1
+            logger.warning(f"Ignoring malformed live feed message: {e}")
+            return []
+        self.stats["received"] += 1
+        return self.broadcaster.publish_batch(latest, anomalies)
+
+
+# Process-wide broadcaster shared by the relay and the stream endpoints
+_live_broadcaster: Optional[LiveBroadcaster] = None
+
+
+def get_live_broadcaster() -> LiveBroadcaster:
+    """Get or create the process-wide live broadcaster."""
+    global _live_broadcaster
+    if _live_broadcaster is None:
+        _live_broadcaster = LiveBroadcaster()
+    return _live_broadcaster
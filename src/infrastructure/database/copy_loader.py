@@ -0,0 +1,159 @@
+"""
+Columnar conversion of sensor reading frames into COPY records.
+
+Turns a DataFrame (or anything with `to_pandas()`, such as an Arrow table)
+into the tuples asyncpg's binary COPY expects, column by column: NaN
+becomes NULL through a single mask per column, timestamps are converted
+in one pass, and the `raw_data` JSON is rendered once per distinct
+metadata value instead of once per row.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Column order of water_infrastructure.sensor_readings used for COPY
+SENSOR_READING_COLUMNS = [
+    'timestamp', 'node_id', 'temperature', 'flow_rate',
+    'pressure', 'total_flow', 'quality_score',
+    'is_interpolated', 'raw_data'
+]
+
+MEASUREMENT_COLUMNS = ['temperature', 'flow_rate', 'pressure', 'total_flow']
+
+# Per-row raw_data columns recorded by the collection jobs, with defaults
+DISTRICT_METADATA = {'district_id': 'unknown', 'district_name': 'Unknown'}
+
+
+def as_frame(data: Any) -> pd.DataFrame:
+    """Accept a DataFrame or an Arrow table (any object with `to_pandas`)."""
+    if isinstance(data, pd.DataFrame):
+        return data
+    if hasattr(data, "to_pandas"):
+        return data.to_pandas()
+    raise TypeError(f"Expected a DataFrame or Arrow table, got {type(data).__name__}")
+
+
+def nullable_floats(values: Any, fill: Optional[float] = None) -> np.ndarray:
+    """Convert a column to an object array of floats with NaN replaced by `fill`."""
+    floats = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+    result = floats.astype(object)
+    result[np.isnan(floats)] = fill
+    return result
+
+
+def raw_data_column(
+    frame: pd.DataFrame,
+    source_metadata: Optional[Mapping[str, Any]] = None,
+    metadata_columns: Optional[Mapping[str, Any]] = None,
+) -> np.ndarray:
+    """
+    Render the raw_data JSON for every row.
+
+    Args:
+        frame: The readings frame
+        source_metadata: Values shared by the whole batch (e.g. source name)
+        metadata_columns: Per-row columns to include, mapped to the default
+            used when the column is absent or null
+
+    Returns:
+        Object array of JSON strings, one per row
+    """
+    base = dict(source_metadata or {})
+    if not metadata_columns:
+        return np.full(len(frame), json.dumps(base), dtype=object)
+
+    names = list(metadata_columns)
+    values = pd.DataFrame({
+        name: (
+            frame[name].astype(object).where(frame[name].notna(), default)
+            if name in frame.columns else default
+        )
+        for name, default in metadata_columns.items()
+    }, index=frame.index)
+
+    # Metadata is low-cardinality (district per node), so encode once per combination
+    codes = np.zeros(len(values), dtype=np.int64)
+    for name in names:
+        column_codes, column_uniques = pd.factorize(values[name])
+        codes = codes * len(column_uniques) + column_codes
+    _, first_rows, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    payloads = np.array([
+        json.dumps({**base, **dict(zip(names, combination))}, default=str)
+        for combination in values.iloc[first_rows].itertuples(index=False)
+    ], dtype=object)
+    return payloads[inverse]
+
+
+def frame_to_copy_records(
+    data: Any,
+    source_metadata: Optional[Mapping[str, Any]] = None,
+    metadata_columns: Optional[Mapping[str, Any]] = None,
+    default_quality_score: float = 1.0,
+    is_interpolated: bool = False,
+) -> List[Tuple]:
+    """
+    Convert a readings frame to COPY records in SENSOR_READING_COLUMNS order.
+
+    The frame needs timestamp and node_id; missing measurement columns are
+    written as NULL. Rows without a timestamp or node_id are dropped.
+
+    Args:
+        data: DataFrame or Arrow table of readings
+        source_metadata: raw_data values shared by the whole batch
+        metadata_columns: Per-row raw_data columns and their defaults
+        default_quality_score: Used where quality_score is null or absent
+        is_interpolated: Value of is_interpolated for every row
+    """
+    frame = as_frame(data)
+    if frame.empty:
+        return []
+
+    valid = frame['timestamp'].notna() & frame['node_id'].notna()
+    if not valid.all():
+        logger.warning(f"Dropping {int((~valid).sum())} readings without timestamp or node_id")
+        frame = frame.loc[valid]
+
+    rows = len(frame)
+    timestamps = pd.DatetimeIndex(pd.to_datetime(frame['timestamp'], utc=True)).to_pydatetime()
+    node_ids = frame['node_id'].astype(str).to_numpy(dtype=object)
+    measurements = [
+        nullable_floats(frame[column]) if column in frame.columns else np.full(rows, None, dtype=object)
+        for column in MEASUREMENT_COLUMNS
+    ]
+    quality = (
+        nullable_floats(frame['quality_score'], fill=default_quality_score)
+        if 'quality_score' in frame.columns
+        else np.full(rows, default_quality_score, dtype=object)
+    )
+    raw_data = raw_data_column(frame, source_metadata, metadata_columns)
+
+    return list(zip(
+        timestamps, node_ids, *measurements, quality,
+        np.full(rows, is_interpolated, dtype=object), raw_data
+    ))
+
+
+def latest_readings(data: Any, default_quality_score: float = 1.0) -> List[Dict[str, Any]]:
+    """
+    Reduce a readings frame to the newest reading per node.
+
+    Returns reading dicts (as taken by the latest-reading index update),
+    with nulls already normalised like the COPY records.
+    """
+    frame = as_frame(data)
+    frame = frame.loc[frame['timestamp'].notna() & frame['node_id'].notna()].reset_index(drop=True)
+    if frame.empty:
+        return []
+
+    timestamps = pd.to_datetime(frame['timestamp'], utc=True)
+    newest = timestamps.groupby(frame['node_id'].astype(str)).idxmax()
+    records = frame_to_copy_records(
+        frame.loc[newest.to_numpy()], default_quality_score=default_quality_score
+    )
+    return [dict(zip(SENSOR_READING_COLUMNS[:7], record[:7])) for record in records]
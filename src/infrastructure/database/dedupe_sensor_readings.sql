@@ -0,0 +1,26 @@
+-- Migration: remove duplicate sensor readings and enforce uniqueness
+-- Run once on databases created before idx_sensor_readings_node_time was unique.
+-- Keeps the best-quality row of each (node_id, timestamp).
+
+SET search_path TO water_infrastructure, public;
+
+BEGIN;
+
+-- ctid is only unique within a chunk, so match on tableoid as well
+DELETE FROM sensor_readings s
+USING (
+    SELECT tableoid, ctid,
+           row_number() OVER (
+               PARTITION BY node_id, timestamp
+               ORDER BY quality_score DESC NULLS LAST
+           ) AS rn
+    FROM sensor_readings
+) d
+WHERE s.tableoid = d.tableoid
+  AND s.ctid = d.ctid
+  AND d.rn > 1;
+
+DROP INDEX IF EXISTS idx_sensor_readings_node_time;
+CREATE UNIQUE INDEX idx_sensor_readings_node_time ON sensor_readings(node_id, timestamp DESC);
+
+COMMIT;
@@ -0,0 +1,101 @@
+"""
+Cache of the nodes known to exist in PostgreSQL.
+
+Loading jobs must upsert every node a batch references before inserting
+its readings. The registry remembers what each node was last written
+with, so a batch only costs one `drop_duplicates('node_id')` plus a dict
+lookup per node, and only new or changed nodes reach the database, in a
+single `upsert_nodes_bulk` statement.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Builds the upsert_node dict for one node from its first row in a batch
+NodeBuilder = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def _signature(node: Dict[str, Any]) -> Tuple:
+    """Attributes compared to decide whether a node changed."""
+    metadata = node.get('metadata') or {}
+    if isinstance(metadata, str):
+        metadata = json.loads(metadata)
+    return (
+        node.get('node_name'),
+        node.get('node_type'),
+        node.get('location_name'),
+        node.get('is_active', True),
+        json.dumps(metadata, sort_keys=True, default=str)
+    )
+
+
+class NodeRegistry:
+    """Tracks existing nodes and upserts only new or changed ones."""
+
+    def __init__(self, postgres_manager):
+        """
+        Initialize the registry.
+
+        Args:
+            postgres_manager: PostgresManager used to load and upsert nodes
+        """
+        self.postgres_manager = postgres_manager
+        self._nodes: Optional[Dict[str, Tuple]] = None
+        self._lock = asyncio.Lock()
+
+    def __contains__(self, node_id: Any) -> bool:
+        return self._nodes is not None and str(node_id) in self._nodes
+
+    async def load(self) -> None:
+        """Seed the registry with the nodes already in the database."""
+        nodes = await self.postgres_manager.get_all_nodes()
+        self._nodes = {str(node['node_id']): _signature(node) for node in nodes}
+        logger.debug(f"Node registry loaded {len(self._nodes)} nodes")
+
+    async def ensure_nodes(self, df: pd.DataFrame, build: NodeBuilder) -> int:
+        """
+        Make sure every node referenced by `df` exists with current attributes.
+
+        Args:
+            df: Readings with a node_id column
+            build: Returns the node dict for a node's first row in `df`
+
+        Returns:
+            Number of nodes written to the database
+        """
+        if df.empty:
+            return 0
+        first_rows = df.dropna(subset=['node_id']).drop_duplicates('node_id')
+        return await self.ensure(build(row) for row in first_rows.to_dict('records'))
+
+    async def ensure(self, nodes) -> int:
+        """Upsert the nodes in `nodes` that are new or changed; returns how many."""
+        async with self._lock:
+            if self._nodes is None:
+                await self.load()
+
+            pending: List[Dict[str, Any]] = []
+            for node in nodes:
+                node_id = str(node['node_id'])
+                signature = _signature(node)
+                if self._nodes.get(node_id) != signature:
+                    pending.append({**node, 'node_id': node_id})
+                    self._nodes[node_id] = signature
+            if not pending:
+                return 0
+
+            try:
+                await self.postgres_manager.upsert_nodes_bulk(pending)
+            except Exception:
+                # Forget them so the next batch retries
+                for node in pending:
+                    self._nodes.pop(node['node_id'], None)
+                raise
+            logger.info(f"Upserted {len(pending)} new or changed nodes")
+            return len(pending)
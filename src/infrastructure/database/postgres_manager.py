@@ -15,8 +15,24 @@ import asyncpg
 import pandas as pd
 from asyncpg.pool import Pool
 
+from src.infrastructure.cache.async_redis import AsyncRedisClient, get_async_redis
+from src.infrastructure.cache.data_version import record_write
+from src.infrastructure.data.live_feed import announce_batch
+
+from src.infrastructure.database.copy_loader import (
+    SENSOR_READING_COLUMNS,
+    frame_to_copy_records,
+    latest_readings,
+)
+
 logger = logging.getLogger(__name__)
 
+# Columns returned by get_readings_frame
+READING_FRAME_COLUMNS = [
+    'timestamp', 'node_id', 'flow_rate', 'pressure',
+    'temperature', 'total_flow', 'quality_score'
+]
+
 
 class PostgresManager:
     """Manages PostgreSQL/TimescaleDB connections and operations."""
@@ -29,7 +45,8 @@ class PostgresManager:
         user: Optional[str] = None,
         password: Optional[str] = None,
         min_pool_size: int = 10,
-        max_pool_size: int = 20
+        max_pool_size: int = 20,
+        redis: Optional[AsyncRedisClient] = None
     ):
         """
         Initialize PostgreSQL manager with connection parameters.
@@ -42,6 +59,8 @@ class PostgresManager:
             password: Database password
             min_pool_size: Minimum pool connections
             max_pool_size: Maximum pool connections
+            redis: Where committed writes are announced (the shared data
+                version and the live feed channel); None skips announcing
         """
         self.host = host or os.getenv("POSTGRES_HOST", "localhost")
         self.port = port or int(os.getenv("POSTGRES_PORT", 5432))
@@ -51,6 +70,7 @@ class PostgresManager:
         self.min_pool_size = min_pool_size
         self.max_pool_size = max_pool_size
         self.pool: Optional[Pool] = None
+        self.redis = redis
         
     async def initialize(self) -> None:
         """Initialize connection pool."""
@@ -128,6 +148,57 @@ class PostgresManager:
             json.dumps(node_data.get('metadata', {}))
             )
             
+    async def upsert_nodes_bulk(self, nodes: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update many nodes in one statement.
+        
+        Existing nodes whose attributes are unchanged are left untouched.
+        
+        Args:
+            nodes: Node dicts as taken by upsert_node
+            
+        Returns:
+            Number of nodes inserted or updated
+        """
+        # Last entry wins; sorted so concurrent calls lock rows in the same order
+        by_id = {str(node['node_id']): node for node in nodes}
+        if not by_id:
+            return 0
+        node_ids = sorted(by_id)
+        rows = [by_id[node_id] for node_id in node_ids]
+        
+        async with self.acquire() as conn:
+            status = await conn.execute("""
+                INSERT INTO water_infrastructure.nodes 
+                    (node_id, node_name, node_type, location_name, is_active, metadata)
+                SELECT * FROM unnest(
+                    $1::varchar[], $2::varchar[], $3::varchar[],
+                    $4::varchar[], $5::boolean[], $6::jsonb[]
+                )
+                ON CONFLICT (node_id) 
+                DO UPDATE SET
+                    node_name = EXCLUDED.node_name,
+                    node_type = EXCLUDED.node_type,
+                    location_name = EXCLUDED.location_name,
+                    is_active = EXCLUDED.is_active,
+                    metadata = EXCLUDED.metadata,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (nodes.node_name, nodes.node_type, nodes.location_name,
+                       nodes.is_active, nodes.metadata)
+                    IS DISTINCT FROM
+                      (EXCLUDED.node_name, EXCLUDED.node_type, EXCLUDED.location_name,
+                       EXCLUDED.is_active, EXCLUDED.metadata)
+            """,
+            node_ids,
+            [row['node_name'] for row in rows],
+            [row['node_type'] for row in rows],
+            [row.get('location_name') for row in rows],
+            [row.get('is_active', True) for row in rows],
+            [json.dumps(row.get('metadata', {}), default=str) for row in rows]
+            )
+            # Status is "INSERT 0 <rows>"
+            return int(status.split()[-1])
+            
     async def get_all_nodes(self) -> List[Dict[str, Any]]:
         """Get all active nodes."""
         async with self.acquire() as conn:
@@ -145,8 +216,26 @@ class PostgresManager:
     # Sensor Reading Operations
     # ====================================
     
-    async def insert_sensor_readings_batch(self, readings: List[Dict[str, Any]]) -> int:
-        """Batch insert sensor readings."""
+    async def insert_sensor_readings_batch(
+        self,
+        readings: List[Dict[str, Any]],
+        overwrite: bool = False
+    ) -> int:
+        """
+        Batch insert sensor readings, skipping (node_id, timestamp) duplicates.
+
+        The latest-reading index is advanced in the same transaction so
+        readers never see a reading in one table but not the other. Nodes
+        whose latest reading advanced are announced to the live feed after
+        commit.
+        
+        Args:
+            readings: Reading dicts
+            overwrite: Replace existing rows instead of skipping them
+            
+        Returns:
+            Number of readings written
+        """
         if not readings:
             return 0
             
@@ -154,6 +243,7 @@ class PostgresManager:
             # Prepare data for COPY
             records = []
             for reading in readings:
+                raw_data = reading.get('raw_data')
                 records.append((
                     reading['timestamp'],
                     reading['node_id'],
@@ -163,35 +253,265 @@ class PostgresManager:
                     reading.get('total_flow'),
                     reading.get('quality_score', 1.0),
                     reading.get('is_interpolated', False),
-                    json.dumps(reading.get('raw_data', {}))
+                    json.dumps(raw_data) if raw_data else '{}'
                 ))
                 
-            # Use COPY for efficient batch insert
-            result = await conn.copy_records_to_table(
-                'sensor_readings',
-                records=records,
-                columns=['timestamp', 'node_id', 'temperature', 'flow_rate', 
-                        'pressure', 'total_flow', 'quality_score', 
-                        'is_interpolated', 'raw_data'],
-                schema_name='water_infrastructure'
+            async with conn.transaction():
+                written = await self._merge_sensor_records(conn, records, overwrite)
+                advanced = await self._update_latest_readings(conn, readings)
+            
+        self._log_merge(len(records), written, overwrite)
+        if written:
+            await self.record_data_change(min(r['timestamp'] for r in readings))
+        await self.announce_latest(advanced)
+        return written
+            
+    async def insert_sensor_readings_frame(
+        self,
+        data: Any,
+        source_metadata: Optional[Dict[str, Any]] = None,
+        metadata_columns: Optional[Dict[str, Any]] = None,
+        default_quality_score: float = 1.0,
+        overwrite: bool = False,
+        watermark_source: Optional[str] = None
+    ) -> int:
+        """
+        Batch insert sensor readings from a DataFrame or Arrow table.
+        
+        Rows are converted column-wise straight to COPY records (see
+        copy_loader), skipping the per-row dicts of insert_sensor_readings_batch.
+        Like that method, (node_id, timestamp) duplicates are skipped.
+        
+        Args:
+            data: Readings with timestamp, node_id and measurement columns
+            source_metadata: raw_data values shared by the whole batch
+            metadata_columns: Per-row raw_data columns and their defaults
+            default_quality_score: Used where quality_score is missing
+            overwrite: Replace existing rows instead of skipping them
+            watermark_source: When set, advance this source's per-node sync
+                watermarks to the newest reading in the batch, in the same
+                transaction as the insert
+            
+        Returns:
+            Number of readings written
+        """
+        records = frame_to_copy_records(
+            data,
+            source_metadata=source_metadata,
+            metadata_columns=metadata_columns,
+            default_quality_score=default_quality_score
+        )
+        if not records:
+            return 0
+        latest = latest_readings(data, default_quality_score=default_quality_score)
+        
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                written = await self._merge_sensor_records(conn, records, overwrite)
+                if watermark_source:
+                    await self._advance_watermarks(
+                        conn,
+                        watermark_source,
+                        {r['node_id']: r['timestamp'] for r in latest}
+                    )
+                advanced = await self._update_latest_readings(conn, latest)
+                
+        self._log_merge(len(records), written, overwrite)
+        if written:
+            await self.record_data_change(min(record[0] for record in records))
+        await self.announce_latest(advanced)
+        return written
+        
+    async def _merge_sensor_records(
+        self,
+        conn,
+        records: List[Tuple],
+        overwrite: bool = False
+    ) -> int:
+        """
+        COPY records into a staging table and merge them into sensor_readings.
+
+        Must run inside a transaction; the staging table is emptied on commit.
+        Rows already present for the same (node_id, timestamp) are skipped,
+        or replaced when `overwrite` is set.
+
+        Returns:
+            Number of rows inserted (plus rows updated when overwriting)
+        """
+        await conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS sensor_readings_staging
+                (LIKE water_infrastructure.sensor_readings INCLUDING DEFAULTS)
+                ON COMMIT DELETE ROWS
+        """)
+        await conn.copy_records_to_table(
+            'sensor_readings_staging',
+            records=records,
+            columns=SENSOR_READING_COLUMNS
+        )
+        
+        columns = ", ".join(SENSOR_READING_COLUMNS)
+        if overwrite:
+            conflict = "DO UPDATE SET " + ", ".join(
+                f"{column} = EXCLUDED.{column}"
+                for column in SENSOR_READING_COLUMNS if column not in ('timestamp', 'node_id')
             )
+        else:
+            conflict = "DO NOTHING"
+        
+        # DISTINCT ON drops duplicates within the batch itself
+        status = await conn.execute(f"""
+            INSERT INTO water_infrastructure.sensor_readings ({columns})
+            SELECT DISTINCT ON (node_id, timestamp) {columns}
+            FROM sensor_readings_staging
+            ORDER BY node_id, timestamp
+            ON CONFLICT (node_id, timestamp) {conflict}
+        """)
+        # Status is "INSERT 0 <rows>"
+        return int(status.split()[-1])
+        
+    async def record_data_change(self, oldest: datetime) -> None:
+        """
+        Announce committed rows so cached API responses are revalidated.
+
+        Rows older than the settle window bump the data generation (they may
+        land in ranges already served as closed); newer rows bump ingest.
+        Failures are logged only, as the rows are already committed.
+
+        Args:
+            oldest: Earliest timestamp among the written rows
+        """
+        if self.redis is None:
+            return
+        try:
+            await record_write(self.redis, oldest)
+        except Exception as e:
+            logger.warning(f"Failed to record data version change: {e}")
             
-            logger.info(f"Inserted {len(records)} sensor readings")
-            return len(records)
+    async def announce_latest(self, latest: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Publish advanced latest readings to the live feed channel.
+
+        API processes relay the channel to their stream subscribers (see
+        live_feed). Failures are logged only, as the rows are already
+        committed.
+
+        Args:
+            latest: New latest reading per node ID
+        """
+        if self.redis is None or not latest:
+            return
+        try:
+            await announce_batch(self.redis, latest)
+        except Exception as e:
+            logger.warning(f"Failed to announce latest readings: {e}")
+            
+    @staticmethod
+    def _log_merge(submitted: int, written: int, overwrite: bool) -> None:
+        action = "upserted" if overwrite else "inserted"
+        logger.info(
+            f"Sensor readings: {written} {action}, "
+            f"{submitted - written} skipped as duplicates"
+        )
+            
+    @staticmethod
+    def _latest_by_node(readings: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Reduce a batch to the newest reading per node."""
+        latest: Dict[str, Dict[str, Any]] = {}
+        for reading in readings:
+            current = latest.get(reading['node_id'])
+            if current is None or reading['timestamp'] > current['timestamp']:
+                latest[reading['node_id']] = reading
+        return latest
+        
+    async def _update_latest_readings(
+        self,
+        conn,
+        readings: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Advance the latest-reading index with the newest reading per node.
+
+        Returns:
+            The readings that advanced the index, by node ID
+        """
+        latest = self._latest_by_node(readings)
+        # Sorted so concurrent batches lock index rows in the same order
+        node_ids = sorted(latest)
+        rows = [latest[node_id] for node_id in node_ids]
+        
+        advanced = await conn.fetch("""
+            INSERT INTO water_infrastructure.latest_readings
+                (node_id, timestamp, temperature, flow_rate, pressure,
+                 total_flow, quality_score, updated_at)
+            SELECT u.*, CURRENT_TIMESTAMP
+            FROM unnest(
+                $1::varchar[], $2::timestamptz[], $3::float8[], $4::float8[],
+                $5::float8[], $6::float8[], $7::float8[]
+            ) AS u
+            ON CONFLICT (node_id) DO UPDATE SET
+                timestamp = EXCLUDED.timestamp,
+                temperature = EXCLUDED.temperature,
+                flow_rate = EXCLUDED.flow_rate,
+                pressure = EXCLUDED.pressure,
+                total_flow = EXCLUDED.total_flow,
+                quality_score = EXCLUDED.quality_score,
+                updated_at = EXCLUDED.updated_at
+            WHERE latest_readings.timestamp < EXCLUDED.timestamp
+            RETURNING node_id
+        """,
+        node_ids,
+        [r['timestamp'] for r in rows],
+        [r.get('temperature') for r in rows],
+        [r.get('flow_rate') for r in rows],
+        [r.get('pressure') for r in rows],
+        [r.get('total_flow') for r in rows],
+        [r.get('quality_score', 1.0) for r in rows]
+        )
+        return {row['node_id']: latest[row['node_id']] for row in advanced}
+        
+    async def rebuild_latest_readings(self) -> int:
+        """
+        Rebuild the latest-reading index from the hypertable.
+
+        Only needed after bulk loads that bypass insert_sensor_readings_batch.
+        """
+        async with self.acquire() as conn:
+            result = await conn.execute("""
+                INSERT INTO water_infrastructure.latest_readings
+                    (node_id, timestamp, temperature, flow_rate, pressure,
+                     total_flow, quality_score, updated_at)
+                SELECT DISTINCT ON (node_id)
+                    node_id, timestamp, temperature, flow_rate, pressure,
+                    total_flow, quality_score, CURRENT_TIMESTAMP
+                FROM water_infrastructure.sensor_readings
+                ORDER BY node_id, timestamp DESC
+                ON CONFLICT (node_id) DO UPDATE SET
+                    timestamp = EXCLUDED.timestamp,
+                    temperature = EXCLUDED.temperature,
+                    flow_rate = EXCLUDED.flow_rate,
+                    pressure = EXCLUDED.pressure,
+                    total_flow = EXCLUDED.total_flow,
+                    quality_score = EXCLUDED.quality_score,
+                    updated_at = EXCLUDED.updated_at
+                WHERE latest_readings.timestamp < EXCLUDED.timestamp
+            """)
+            # asyncpg returns the command tag, e.g. "INSERT 0 42"
+            return int(result.split()[-1])
             
     async def get_latest_readings(self, node_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
-        """Get latest reading for each node."""
+        """
+        Get latest reading for each node.
+
+        Served from the latest_readings index (one row per node), so the
+        cost is O(nodes) rather than a scan of the last 24h of readings.
+        """
         async with self.acquire() as conn:
             query = """
-                WITH latest AS (
-                    SELECT DISTINCT ON (node_id)
-                        node_id, timestamp, temperature, flow_rate, pressure, quality_score
-                    FROM water_infrastructure.sensor_readings
-                    WHERE timestamp > CURRENT_TIMESTAMP - INTERVAL '24 hours'
-                    {}
-                    ORDER BY node_id, timestamp DESC
-                )
-                SELECT * FROM latest
+                SELECT
+                    node_id, timestamp, temperature, flow_rate, pressure, quality_score
+                FROM water_infrastructure.latest_readings
+                WHERE timestamp > CURRENT_TIMESTAMP - INTERVAL '24 hours'
+                {}
             """
             
             if node_ids:
@@ -203,6 +523,56 @@ class PostgresManager:
                 
             return {row['node_id']: dict(row) for row in rows}
             
+    async def get_latest_node_metrics(
+        self,
+        node_ids: Optional[List[str]] = None,
+        time_window: str = "1hour"
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the latest computed metrics window of many nodes in one query.
+        
+        A lateral lookup per node walks the (node_id, time_window,
+        window_start) primary key backwards and stops at the first row.
+        
+        Args:
+            node_ids: Nodes to include (all nodes when None)
+            time_window: Metrics window: 5min, 1hour, 1day
+            
+        Returns:
+            One dict per node with metrics, ordered by node_id; nodes
+            without metrics for the window are omitted
+        """
+        query = """
+            SELECT
+                n.node_id,
+                n.node_name,
+                cm.window_end AS timestamp,
+                cm.avg_flow_rate::float8 AS flow_rate,
+                cm.avg_pressure::float8 AS pressure,
+                cm.avg_temperature::float8 AS temperature,
+                COALESCE(cm.quality_score * 100, 95.0)::float8 AS efficiency,
+                cm.anomaly_count
+            FROM water_infrastructure.nodes n
+            CROSS JOIN LATERAL (
+                SELECT window_end, avg_flow_rate, avg_pressure, avg_temperature,
+                       quality_score, anomaly_count
+                FROM water_infrastructure.computed_metrics
+                WHERE node_id = n.node_id
+                AND time_window = $1
+                ORDER BY window_start DESC
+                LIMIT 1
+            ) cm
+            {}
+            ORDER BY n.node_id
+        """
+        async with self.acquire() as conn:
+            if node_ids:
+                rows = await conn.fetch(query.format("WHERE n.node_id = ANY($2)"), time_window, node_ids)
+            else:
+                rows = await conn.fetch(query.format(""), time_window)
+                
+        return [dict(row) for row in rows]
+        
     async def get_time_series_data(
         self, 
         node_id: str, 
@@ -232,6 +602,50 @@ class PostgresManager:
                 return pd.DataFrame([dict(row) for row in rows])
             return pd.DataFrame()
             
+    async def get_readings_frame(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        node_ids: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Get the readings of many nodes over a time range in one query.
+        
+        Args:
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+            node_ids: Nodes to include (all nodes when None)
+            
+        Returns:
+            DataFrame with READING_FRAME_COLUMNS, sorted by node and time,
+            with numeric columns as float64
+        """
+        query = """
+            SELECT
+                timestamp,
+                node_id,
+                flow_rate::float8,
+                pressure::float8,
+                temperature::float8,
+                total_flow::float8,
+                quality_score::float8
+            FROM water_infrastructure.sensor_readings
+            WHERE timestamp BETWEEN $1 AND $2
+            {}
+            ORDER BY node_id, timestamp
+        """
+        async with self.acquire() as conn:
+            if node_ids:
+                rows = await conn.fetch(query.format("AND node_id = ANY($3)"), start_time, end_time, node_ids)
+            else:
+                rows = await conn.fetch(query.format(""), start_time, end_time)
+                
+        # Columnar build; no per-row dicts
+        frame = pd.DataFrame([tuple(row) for row in rows], columns=READING_FRAME_COLUMNS)
+        numeric = READING_FRAME_COLUMNS[2:]
+        frame[numeric] = frame[numeric].astype('float64')
+        return frame
+        
     # ====================================
     # Anomaly Operations
     # ====================================
@@ -427,6 +841,78 @@ class PostgresManager:
                 SET {', '.join(set_clauses)}
                 WHERE job_id = ${len(values)}
             """, *values)
+            
+    # ====================================
+    # Sync Watermarks
+    # ====================================
+    
+    async def get_watermarks(self, source: str) -> Dict[str, datetime]:
+        """Get the sync watermark of every node for a source."""
+        async with self.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT node_id, watermark
+                FROM water_infrastructure.sync_watermarks
+                WHERE source = $1
+            """, source)
+            return {row['node_id']: row['watermark'] for row in rows}
+            
+    async def set_watermark(self, source: str, timestamp: datetime, node_id: str = '*') -> None:
+        """Advance a single watermark (source-level unless node_id is given)."""
+        async with self.acquire() as conn:
+            await self._advance_watermarks(conn, source, {node_id: timestamp})
+            
+    async def _advance_watermarks(
+        self,
+        conn,
+        source: str,
+        watermarks: Dict[str, datetime]
+    ) -> None:
+        """Move watermarks forward; a watermark never moves backwards."""
+        if not watermarks:
+            return
+        # Sorted so concurrent batches lock watermark rows in the same order
+        node_ids = sorted(watermarks)
+        
+        await conn.execute("""
+            INSERT INTO water_infrastructure.sync_watermarks
+                (source, node_id, watermark, updated_at)
+            SELECT $1, u.node_id, u.watermark, CURRENT_TIMESTAMP
+            FROM unnest($2::varchar[], $3::timestamptz[]) AS u(node_id, watermark)
+            ON CONFLICT (source, node_id) DO UPDATE SET
+                watermark = EXCLUDED.watermark,
+                updated_at = EXCLUDED.updated_at
+            WHERE sync_watermarks.watermark < EXCLUDED.watermark
+        """,
+        source,
+        node_ids,
+        [watermarks[node_id] for node_id in node_ids]
+        )
+        
+    # ====================================
+    # Backfill Checkpoints
+    # ====================================
+    
+    async def get_completed_partitions(self, job_name: str) -> set:
+        """Get the keys of the backfill partitions completed for a job."""
+        async with self.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT partition_key
+                FROM water_infrastructure.backfill_checkpoints
+                WHERE job_name = $1
+            """, job_name)
+            return {row['partition_key'] for row in rows}
+            
+    async def mark_partition_complete(self, job_name: str, partition_key: str, rows_loaded: int) -> None:
+        """Checkpoint a completed backfill partition."""
+        async with self.acquire() as conn:
+            await conn.execute("""
+                INSERT INTO water_infrastructure.backfill_checkpoints
+                    (job_name, partition_key, rows_loaded, completed_at)
+                VALUES ($1, $2, $3, CURRENT_TIMESTAMP)
+                ON CONFLICT (job_name, partition_key) DO UPDATE SET
+                    rows_loaded = EXCLUDED.rows_loaded,
+                    completed_at = EXCLUDED.completed_at
+            """, job_name, partition_key, rows_loaded)
 
 
 # Singleton instance
@@ -437,6 +923,6 @@ async def get_postgres_manager() -> PostgresManager:
     """Get or create PostgreSQL manager singleton."""
     global _postgres_manager
     if _postgres_manager is None:
-        _postgres_manager = PostgresManager()
+        _postgres_manager = PostgresManager(redis=get_async_redis())
         await _postgres_manager.initialize()
     return _postgres_manager
\ No newline at end of file
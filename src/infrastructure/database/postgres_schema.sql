@@ -59,10 +59,39 @@ SELECT create_hypertable('sensor_readings', 'timestamp',
 );
 
 -- Create indexes for common queries
-CREATE INDEX idx_sensor_readings_node_time ON sensor_readings(node_id, timestamp DESC);
+-- Unique so re-ingested readings are skipped by ON CONFLICT (see
+-- PostgresManager._merge_sensor_records); existing databases are migrated
+-- with dedupe_sensor_readings.sql.
+CREATE UNIQUE INDEX idx_sensor_readings_node_time ON sensor_readings(node_id, timestamp DESC);
 CREATE INDEX idx_sensor_readings_flow ON sensor_readings(flow_rate) WHERE flow_rate IS NOT NULL;
 CREATE INDEX idx_sensor_readings_pressure ON sensor_readings(pressure) WHERE pressure IS NOT NULL;
 
+-- Latest reading per node, maintained on write by insert_sensor_readings_batch.
+-- Lets "latest readings for all nodes" read one row per node instead of
+-- running DISTINCT ON over the hypertable.
+CREATE TABLE IF NOT EXISTS latest_readings (
+    node_id VARCHAR(50) PRIMARY KEY,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    temperature DECIMAL(5, 2),
+    flow_rate DECIMAL(10, 2),
+    pressure DECIMAL(6, 2),
+    total_flow DECIMAL(12, 2),
+    quality_score DECIMAL(3, 2),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (node_id) REFERENCES nodes(node_id)
+);
+
+CREATE INDEX idx_latest_readings_time ON latest_readings(timestamp DESC);
+
+-- Seed the index from existing readings
+INSERT INTO latest_readings
+    (node_id, timestamp, temperature, flow_rate, pressure, total_flow, quality_score)
+SELECT DISTINCT ON (node_id)
+    node_id, timestamp, temperature, flow_rate, pressure, total_flow, quality_score
+FROM sensor_readings
+ORDER BY node_id, timestamp DESC
+ON CONFLICT (node_id) DO NOTHING;
+
 -- ====================================
 -- ML and Analytics Tables
 -- ====================================
@@ -231,6 +260,27 @@ CREATE TABLE IF NOT EXISTS etl_jobs (
 
 CREATE INDEX idx_etl_jobs_status ON etl_jobs(status, started_at DESC);
 
+-- Sync high-watermarks: newest timestamp loaded per source and node.
+-- Advanced in the same transaction as the readings they cover, so an
+-- interrupted sync resumes exactly where it stopped. Source-level
+-- watermarks use node_id '*'.
+CREATE TABLE IF NOT EXISTS sync_watermarks (
+    source VARCHAR(100) NOT NULL,
+    node_id VARCHAR(50) NOT NULL,
+    watermark TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, node_id)
+);
+
+-- Completed backfill partitions, so interrupted backfills can resume
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    job_name VARCHAR(100) NOT NULL,
+    partition_key VARCHAR(500) NOT NULL,
+    rows_loaded INTEGER NOT NULL DEFAULT 0,
+    completed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_name, partition_key)
+);
+
 -- Cache sync tracking
 CREATE TABLE IF NOT EXISTS cache_sync_log (
     sync_id SERIAL PRIMARY KEY,
@@ -7,18 +7,27 @@ to PostgreSQL/TimescaleDB (warm storage) as part of the hybrid architecture.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
 import pandas as pd
 from google.cloud import bigquery
 import asyncpg
 
 from src.infrastructure.database.postgres_manager import get_postgres_manager
 from src.infrastructure.bigquery.bigquery_client import BigQueryClient
+from src.infrastructure.cache.data_version import bump_generation
 from src.infrastructure.cache.redis_cache_manager import RedisCacheManager
+from src.infrastructure.etl.partitioned_backfill import (
+    BigQueryPartitionExtractor,
+    PartitionedBackfill,
+    plan_partitions,
+)
 
 logger = logging.getLogger(__name__)
 
+# Watermark source name for readings synced from sensor_readings_ml
+WATERMARK_SOURCE = 'bigquery.sensor_readings_ml'
+
 
 class BigQueryToPostgresETL:
     """ETL pipeline for BigQuery to PostgreSQL data synchronization."""
@@ -46,6 +55,7 @@ class BigQueryToPostgresETL:
             'total_records': 0,
             'processed_records': 0,
             'failed_records': 0,
+            'skipped_records': 0,
             'start_time': None,
             'end_time': None
         }
@@ -90,19 +100,6 @@ class BigQueryToPostgresETL:
             end_time = datetime.now()
             start_time = end_time - timedelta(hours=hours_back)
             
-            # Check if data already exists (unless force refresh)
-            if not force_refresh:
-                existing_count = await self._check_existing_data(start_time, end_time)
-                if existing_count > 0:
-                    logger.info(f"Found {existing_count} existing records, skipping sync")
-                    await self.postgres_manager.update_etl_job(job_id, {
-                        'status': 'completed',
-                        'completed_at': datetime.now(),
-                        'records_processed': 0,
-                        'metadata': {'skipped': True, 'existing_records': existing_count}
-                    })
-                    return self.stats
-                    
             # Sync node metadata first
             await self._sync_nodes()
             
@@ -115,7 +112,7 @@ class BigQueryToPostgresETL:
             for i in range(0, len(node_ids), self.max_workers):
                 batch = node_ids[i:i + self.max_workers]
                 for node_id in batch:
-                    task = self._sync_node_data(node_id, start_time, end_time)
+                    task = self._sync_node_data(node_id, start_time, end_time, overwrite=force_refresh)
                     tasks.append(task)
                     
                 # Wait for batch to complete
@@ -134,11 +131,15 @@ class BigQueryToPostgresETL:
                 'records_failed': self.stats['failed_records'],
                 'metadata': {
                     'duration_seconds': duration,
-                    'records_per_second': self.stats['processed_records'] / duration if duration > 0 else 0
+                    'records_per_second': self.stats['processed_records'] / duration if duration > 0 else 0,
+                    'records_skipped': self.stats['skipped_records']
                 }
             })
             
-            logger.info(f"ETL sync completed: {self.stats['processed_records']} records in {duration:.2f}s")
+            logger.info(
+                f"ETL sync completed: {self.stats['processed_records']} records in {duration:.2f}s "
+                f"({self.stats['skipped_records']} already present)"
+            )
             
             # Refresh cache after sync
             await self._refresh_cache()
@@ -155,19 +156,186 @@ class BigQueryToPostgresETL:
                 })
             raise
             
+    async def sync_incremental(
+        self,
+        initial_hours_back: int = 24,
+        max_lookback_hours: int = 168
+    ) -> Dict[str, Any]:
+        """
+        Sync only the readings newer than each node's persisted watermark.
+        
+        All nodes are fetched in one BigQuery query. Its constant lower
+        bound is the oldest watermark, so BigQuery only scans partitions
+        that can contain new rows. Watermarks advance in the same
+        transaction as the rows they cover, so a restart resumes where the
+        last committed batch stopped.
+        
+        The lower bound never reaches back more than `max_lookback_hours`,
+        so one node that stopped reporting cannot widen every run's scan.
+        Nodes whose watermark is older than that are left out of the main
+        query and caught up in a second query covering at most
+        `max_lookback_hours` past their oldest watermark per run.
+        
+        Args:
+            initial_hours_back: Look-back used when no watermark exists yet
+            max_lookback_hours: Longest range a single query scans
+            
+        Returns:
+            Statistics for this run
+        """
+        run_stats = {
+            'processed_records': 0,
+            'skipped_records': 0,
+            'fetched_records': 0,
+            'nodes_advanced': 0,
+            'nodes_catching_up': 0,
+            'start_time': datetime.now(),
+            'end_time': None
+        }
+        
+        now = datetime.now(timezone.utc)
+        max_lookback = timedelta(hours=max_lookback_hours)
+        cutoff = now - max_lookback
+        watermarks = await self.postgres_manager.get_watermarks(WATERMARK_SOURCE)
+        live = {node_id: mark for node_id, mark in watermarks.items() if mark >= cutoff}
+        stale = {node_id: mark for node_id, mark in watermarks.items() if mark < cutoff}
+        if live:
+            floor = min(live.values())
+        elif stale:
+            floor = cutoff
+        else:
+            floor = now - timedelta(hours=initial_hours_back)
+            
+        nodes = set()
+        query, job_config = self._incremental_query(live, floor, exclude=sorted(stale))
+        await self._load_incremental(query, job_config, run_stats, nodes)
+        
+        if stale:
+            catch_up_floor = min(stale.values())
+            until = min(catch_up_floor + max_lookback, now)
+            query, job_config = self._incremental_query(stale, catch_up_floor, until=until)
+            await self._load_incremental(query, job_config, run_stats, nodes)
+            # Everything up to `until` has been read for these nodes, so
+            # silent ones move forward too instead of being scanned again
+            for node_id in stale:
+                await self.postgres_manager.set_watermark(WATERMARK_SOURCE, until, node_id)
+            run_stats['nodes_catching_up'] = len(stale)
+            logger.info(
+                f"Incremental sync: caught {len(stale)} lagging nodes up from "
+                f"{catch_up_floor.isoformat()} to {until.isoformat()}"
+            )
+            
+        if nodes:
+            run_stats['nodes_advanced'] = len(nodes)
+            await self._refresh_cache()
+            
+        run_stats['end_time'] = datetime.now()
+        self.stats['processed_records'] += run_stats['processed_records']
+        self.stats['skipped_records'] += run_stats['skipped_records']
+        
+        logger.info(
+            f"Incremental sync: {run_stats['processed_records']} new records for "
+            f"{run_stats['nodes_advanced']} nodes since {floor.isoformat()}"
+        )
+        return run_stats
+        
+    async def _load_incremental(
+        self,
+        query: str,
+        job_config: bigquery.QueryJobConfig,
+        run_stats: Dict[str, Any],
+        nodes: set
+    ) -> None:
+        """Stream an incremental query into PostgreSQL, advancing watermarks."""
+        # Streamed as Arrow batches; rows arrive ordered by node and time, so
+        # each committed batch leaves every node's watermark at a point with
+        # nothing missing before it
+        for batch_df in self.bigquery_client.arrow.frames(
+            query, job_config, rows_per_frame=self.batch_size
+        ):
+            inserted = await self.postgres_manager.insert_sensor_readings_frame(
+                batch_df, default_quality_score=1.0, watermark_source=WATERMARK_SOURCE
+            )
+            run_stats['fetched_records'] += len(batch_df)
+            run_stats['processed_records'] += inserted
+            run_stats['skipped_records'] += len(batch_df) - inserted
+            nodes.update(batch_df['node_id'].unique())
+        
+    def _incremental_query(
+        self,
+        watermarks: Dict[str, datetime],
+        floor: datetime,
+        exclude: Sequence[str] = (),
+        until: Optional[datetime] = None
+    ) -> Tuple[str, bigquery.QueryJobConfig]:
+        """
+        Build the single query for rows past each node's watermark.
+        
+        Nodes without a watermark (new since the last sync) start at `floor`;
+        nodes in `exclude` are skipped. With `until`, only the nodes in
+        `watermarks` are read, up to and including `until`.
+        """
+        node_ids = sorted(watermarks)
+        parameters = [
+            bigquery.ScalarQueryParameter("floor", "TIMESTAMP", floor),
+            bigquery.ArrayQueryParameter("node_ids", "STRING", node_ids),
+            bigquery.ArrayQueryParameter(
+                "watermarks", "TIMESTAMP", [watermarks[node_id] for node_id in node_ids]
+            ),
+        ]
+        filters = ""
+        if until is not None:
+            filters += "AND r.timestamp <= @until AND r.node_id IN UNNEST(@node_ids)"
+            parameters.append(bigquery.ScalarQueryParameter("until", "TIMESTAMP", until))
+        elif exclude:
+            filters += "AND r.node_id NOT IN UNNEST(@excluded)"
+            parameters.append(bigquery.ArrayQueryParameter("excluded", "STRING", list(exclude)))
+            
+        query = f"""
+        WITH watermarks AS (
+            SELECT node_id, @watermarks[OFFSET(i)] AS watermark
+            FROM UNNEST(@node_ids) AS node_id WITH OFFSET i
+        )
+        SELECT 
+            r.timestamp,
+            r.node_id,
+            r.temperature,
+            r.flow_rate,
+            r.pressure,
+            r.volume as total_flow,
+            r.data_quality_score as quality_score
+        FROM `{self.bigquery_client.project_id}.{self.bigquery_client.dataset_id}.sensor_readings_ml` r
+        LEFT JOIN watermarks w ON r.node_id = w.node_id
+        WHERE r.timestamp > @floor
+        AND r.timestamp > COALESCE(w.watermark, @floor)
+        AND r.node_id IS NOT NULL
+        {filters}
+        ORDER BY r.node_id, r.timestamp
+        """
+        return query, bigquery.QueryJobConfig(query_parameters=parameters)
+        
     async def sync_historical_data(
         self,
         start_date: datetime,
         end_date: datetime,
-        node_ids: Optional[List[str]] = None
+        node_ids: Optional[List[str]] = None,
+        processes: Optional[int] = None,
+        writers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Sync historical data for specific date range.
         
+        The range is split into (day, node-group) partitions that are
+        queried in worker processes and loaded by concurrent COPY writers.
+        Completed partitions are checkpointed, so re-running the same range
+        resumes an interrupted sync.
+        
         Args:
             start_date: Start date for sync
             end_date: End date for sync
             node_ids: Specific nodes to sync (None for all)
+            processes: Extraction worker processes (default max_workers)
+            writers: Concurrent COPY writers (default max_workers)
             
         Returns:
             ETL execution statistics
@@ -179,20 +347,48 @@ class BigQueryToPostgresETL:
         if node_ids is None:
             nodes = await self.postgres_manager.get_all_nodes()
             node_ids = [node['node_id'] for node in nodes]
+        if not node_ids:
+            self.stats['end_time'] = datetime.now()
+            return self.stats
             
-        # Process date range in daily chunks
-        current_date = start_date
-        while current_date < end_date:
-            next_date = min(current_date + timedelta(days=1), end_date)
-            
-            logger.info(f"Processing {current_date.date()}")
-            
-            # Process all nodes for this date
-            for node_id in node_ids:
-                await self._sync_node_data(node_id, current_date, next_date)
-                
-            current_date = next_date
-            
+        processes = processes or self.max_workers
+        partitions = plan_partitions(
+            'sensor_readings_ml', start_date, end_date,
+            groups=processes, node_ids=node_ids
+        )
+        extractor = BigQueryPartitionExtractor(
+            f"""
+            SELECT 
+                timestamp,
+                node_id,
+                temperature,
+                flow_rate,
+                pressure,
+                volume as total_flow,
+                data_quality_score as quality_score
+            FROM `{self.bigquery_client.project_id}.{self.bigquery_client.dataset_id}.sensor_readings_ml`
+            WHERE timestamp >= @start AND timestamp < @end
+            {{partition_filter}}
+            ORDER BY node_id, timestamp
+            """,
+            self.bigquery_client.project_id,
+            self.bigquery_client.dataset_id
+        )
+        runner = PartitionedBackfill(
+            self.postgres_manager,
+            extractor,
+            job_name=f'historical_sync_{start_date.date()}_{end_date.date()}',
+            processes=processes,
+            writers=writers or self.max_workers,
+            batch_size=self.batch_size,
+            load_options={'default_quality_score': 1.0}
+        )
+        run_stats = await runner.run(partitions)
+        
+        self.stats['processed_records'] += run_stats['rows_loaded']
+        self.stats['skipped_records'] += run_stats['rows_skipped']
+        self.stats['failed_records'] += run_stats['partitions_failed']
+        self.stats['partitions'] = run_stats
         self.stats['end_time'] = datetime.now()
         return self.stats
         
@@ -211,27 +407,35 @@ class BigQueryToPostgresETL:
         WHERE node_id IS NOT NULL
         """
         
-        df = self.bigquery_client.client.query(query).to_dataframe()
+        df = self.bigquery_client.arrow.read_dataframe(query)
         
-        for _, row in df.iterrows():
-            node_data = {
+        nodes = [
+            {
                 'node_id': row['node_id'],
                 'node_name': row.get('node_name') or f"Node {row['node_id']}",
                 'node_type': row.get('node_type') or 'sensor',
                 'location_name': row['location_name'],
-                'is_active': row['is_active']
+                'is_active': bool(row['is_active'])
             }
-            await self.postgres_manager.upsert_node(node_data)
+            for row in df.drop_duplicates('node_id').to_dict('records')
+        ]
+        changed = await self.postgres_manager.upsert_nodes_bulk(nodes)
             
-        logger.info(f"Synced {len(df)} nodes")
+        logger.info(f"Synced {len(nodes)} nodes ({changed} new or changed)")
         
     async def _sync_node_data(
         self,
         node_id: str,
         start_time: datetime,
-        end_time: datetime
+        end_time: datetime,
+        overwrite: bool = False
     ) -> None:
-        """Sync data for a specific node and time range."""
+        """
+        Sync data for a specific node and time range.
+        
+        Readings already in PostgreSQL are skipped (or replaced when
+        `overwrite` is set), so overlapping windows can be re-synced safely.
+        """
         try:
             # Query BigQuery
             query = f"""
@@ -257,53 +461,26 @@ class BigQueryToPostgresETL:
                 ]
             )
             
-            df = self.bigquery_client.client.query(query, job_config=job_config).to_dataframe()
-            
-            if df.empty:
-                return
-                
-            # Process in batches
-            for i in range(0, len(df), self.batch_size):
-                batch_df = df.iloc[i:i + self.batch_size]
-                
-                # Convert to records
-                readings = []
-                for _, row in batch_df.iterrows():
-                    reading = {
-                        'timestamp': row['timestamp'].to_pydatetime(),
-                        'node_id': row['node_id'],
-                        'temperature': float(row['temperature']) if pd.notna(row['temperature']) else None,
-                        'flow_rate': float(row['flow_rate']) if pd.notna(row['flow_rate']) else None,
-                        'pressure': float(row['pressure']) if pd.notna(row['pressure']) else None,
-                        'total_flow': float(row['total_flow']) if pd.notna(row['total_flow']) else None,
-                        'quality_score': float(row['quality_score']) if pd.notna(row['quality_score']) else 1.0
-                    }
-                    readings.append(reading)
-                    
-                # Insert to PostgreSQL
-                inserted = await self.postgres_manager.insert_sensor_readings_batch(readings)
+            # Stream Arrow batches instead of materializing the whole result
+            synced = 0
+            for batch_df in self.bigquery_client.arrow.frames(
+                query, job_config, rows_per_frame=self.batch_size
+            ):
+                # Insert to PostgreSQL (columnar COPY, no per-row dicts)
+                inserted = await self.postgres_manager.insert_sensor_readings_frame(
+                    batch_df, default_quality_score=1.0, overwrite=overwrite
+                )
                 self.stats['processed_records'] += inserted
+                self.stats['skipped_records'] += len(batch_df) - inserted
+                synced += len(batch_df)
                 
-            logger.info(f"Synced {len(df)} records for node {node_id}")
+            if synced:
+                logger.info(f"Synced {synced} records for node {node_id}")
             
         except Exception as e:
             logger.error(f"Failed to sync node {node_id}: {e}")
             self.stats['failed_records'] += 1
             
-    async def _check_existing_data(
-        self,
-        start_time: datetime,
-        end_time: datetime
-    ) -> int:
-        """Check if data already exists in PostgreSQL."""
-        async with self.postgres_manager.acquire() as conn:
-            count = await conn.fetchval("""
-                SELECT COUNT(*)
-                FROM water_infrastructure.sensor_readings
-                WHERE timestamp BETWEEN $1 AND $2
-            """, start_time, end_time)
-            return count
-            
     async def _refresh_cache(self) -> None:
         """Refresh Redis cache after ETL completion."""
         logger.info("Refreshing Redis cache")
@@ -312,23 +489,26 @@ class BigQueryToPostgresETL:
             # Get latest readings for all nodes
             latest_readings = await self.postgres_manager.get_latest_readings()
             
-            # Update Redis
-            for node_id, reading in latest_readings.items():
-                self.redis_manager.redis_client.hset(
-                    f"node:{node_id}:latest",
-                    mapping={
-                        "timestamp": reading['timestamp'].isoformat(),
-                        "flow_rate": reading.get('flow_rate', 0),
-                        "pressure": reading.get('pressure', 0),
-                        "temperature": reading.get('temperature', 0)
-                    }
-                )
+            # Update Redis in one pipelined round-trip
+            redis = self.redis_manager.async_client
+            await redis.hset_many({
+                f"node:{node_id}:latest": {
+                    "timestamp": reading['timestamp'].isoformat(),
+                    "flow_rate": reading.get('flow_rate') or 0,
+                    "pressure": reading.get('pressure') or 0,
+                    "temperature": reading.get('temperature') or 0
+                }
+                for node_id, reading in latest_readings.items()
+            })
                 
             # Clear aggregated metrics to force recalculation
             for pattern in ["system:metrics:*", "node:*:metrics:*"]:
-                keys = self.redis_manager.redis_client.keys(pattern)
+                keys = await redis.keys(pattern)
                 if keys:
-                    self.redis_manager.redis_client.delete(*keys)
+                    await redis.delete(*keys)
+                    
+            # Synced rows may fall in closed ranges: revalidate cached API responses
+            await bump_generation(redis)
                     
             logger.info("Cache refresh completed")
             
@@ -170,12 +170,11 @@ class ETLScheduler:
                 })
                 
     async def _sync_recent_data(self) -> None:
-        """Sync recent data (last hour)."""
+        """Sync readings added since the last run (per-node watermarks)."""
         logger.debug("Starting real-time sync")
         
         try:
-            # Sync last 2 hours (with overlap)
-            stats = await self.etl_pipeline.sync_recent_data(hours_back=2)
+            stats = await self.etl_pipeline.sync_incremental(initial_hours_back=2)
             
             if stats['processed_records'] > 0:
                 logger.info(f"Real-time sync: {stats['processed_records']} new records")
@@ -191,29 +190,31 @@ class ETLScheduler:
             # Get system metrics for all time ranges
             time_ranges = ["1h", "6h", "24h", "3d", "7d", "30d"]
             
+            redis = self.redis_manager.async_client
+            pipe = redis.pipeline()
             for time_range in time_ranges:
                 metrics = await self.postgres_manager.get_system_metrics(time_range)
                 
                 # Cache in Redis
-                self.redis_manager.redis_client.setex(
+                pipe.setex(
                     f"system:metrics:{time_range}",
                     3600,  # 1 hour TTL
                     str(metrics)
                 )
+            await pipe.execute()
                 
             # Refresh latest readings
             latest_readings = await self.postgres_manager.get_latest_readings()
             
-            for node_id, reading in latest_readings.items():
-                self.redis_manager.redis_client.hset(
-                    f"node:{node_id}:latest",
-                    mapping={
-                        "timestamp": reading['timestamp'].isoformat(),
-                        "flow_rate": str(reading.get('flow_rate', 0)),
-                        "pressure": str(reading.get('pressure', 0)),
-                        "temperature": str(reading.get('temperature', 0))
-                    }
-                )
+            await redis.hset_many({
+                f"node:{node_id}:latest": {
+                    "timestamp": reading['timestamp'].isoformat(),
+                    "flow_rate": str(reading.get('flow_rate', 0)),
+                    "pressure": str(reading.get('pressure', 0)),
+                    "temperature": str(reading.get('temperature', 0))
+                }
+                for node_id, reading in latest_readings.items()
+            })
                 
             logger.debug("Cache refresh completed")
             
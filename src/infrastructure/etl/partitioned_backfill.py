@@ -0,0 +1,366 @@
+"""
+Partitioned, resumable historical backfill.
+
+A date range is split into (day, node-group) partitions. Partitions are
+extracted and parsed in a process pool and loaded by a bounded number of
+concurrent COPY writers. Each completed partition is checkpointed in
+PostgreSQL, so an interrupted run resumes with the partitions it had not
+finished; a partition interrupted mid-load is simply loaded again, which
+the (node_id, timestamp) upsert makes safe.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from google.cloud import bigquery
+
+logger = logging.getLogger(__name__)
+
+# An extractor runs in a worker process and returns the partition's readings
+Extractor = Callable[["BackfillPartition"], Optional[pd.DataFrame]]
+
+
+@dataclass(frozen=True)
+class BackfillPartition:
+    """One unit of backfill work: a time slice of one source for one node group."""
+
+    source: str
+    start: datetime
+    end: datetime
+    group: int = 0
+    groups: int = 1
+    node_ids: Tuple[str, ...] = ()
+
+    @property
+    def key(self) -> str:
+        """
+        Stable, fixed-length checkpoint key.
+
+        Explicit node groups are identified by a digest of their sorted
+        node list rather than their position, so the key fits the
+        checkpoint column however many nodes a group holds and does not
+        depend on how many groups the run was split into. Hash-bucket
+        groups are defined by their bucket, so keep group/groups.
+        """
+        prefix = f"{self.source}:{self.start.isoformat()}:{self.end.isoformat()}"
+        if self.node_ids:
+            digest = hashlib.sha256(",".join(sorted(self.node_ids)).encode()).hexdigest()
+            return f"{prefix}:nodes:{digest}"
+        return f"{prefix}:{self.group}/{self.groups}"
+
+
+def day_bounds(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """
+    Widen a range to whole UTC days.
+
+    Partition keys embed their bounds, so planning from whole days keeps
+    them identical across reruns planned at different times. Aware
+    datetimes are converted to UTC; naive ones are taken as UTC and stay
+    naive.
+
+    Returns:
+        The start floored and the end ceiled to UTC midnight
+    """
+    def midnight(value: datetime) -> datetime:
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    floor, ceil = midnight(start), midnight(end)
+    if ceil < end:
+        ceil += timedelta(days=1)
+    return floor, ceil
+
+
+def plan_partitions(
+    source: str,
+    start: datetime,
+    end: datetime,
+    groups: int = 1,
+    node_ids: Optional[Sequence[str]] = None,
+    partition_days: int = 1
+) -> List[BackfillPartition]:
+    """
+    Split a range into (day, node-group) partitions.
+
+    The range is widened to whole UTC days (see day_bounds) and sliced on
+    calendar days, so a rerun plans the same partitions as the run it
+    resumes. With `node_ids`, each group holds an explicit slice of the sorted node
+    list. Without them, nodes are assigned to `groups` hash buckets by the
+    extractor, so nodes need not be known in advance.
+
+    Args:
+        source: Source name (part of the checkpoint key)
+        start: Range start (inclusive)
+        end: Range end (exclusive)
+        groups: Number of node groups per time slice
+        node_ids: Explicit nodes to split into `groups` groups
+        partition_days: Length of each time slice in days
+    """
+    start, end = day_bounds(start, end)
+    if node_ids:
+        nodes = sorted(node_ids)
+        size = -(-len(nodes) // groups)
+        node_groups = [tuple(nodes[i:i + size]) for i in range(0, len(nodes), size)]
+    else:
+        node_groups = [()] * groups
+
+    partitions = []
+    slice_start = start
+    while slice_start < end:
+        slice_end = min(slice_start + timedelta(days=partition_days), end)
+        for group, members in enumerate(node_groups):
+            partitions.append(BackfillPartition(
+                source=source,
+                start=slice_start,
+                end=slice_end,
+                group=group,
+                groups=len(node_groups),
+                node_ids=members
+            ))
+        slice_start = slice_end
+    return partitions
+
+
+# Arrow reader per worker process
+_readers: Dict[Tuple[str, str], Any] = {}
+
+
+class BigQueryPartitionExtractor:
+    """
+    Picklable extractor that runs a query for one partition.
+
+    The query must filter on `@start` / `@end` and contain a
+    `{partition_filter}` placeholder, which is replaced with the
+    node-group filter. Each worker process creates its own client and
+    reads the result over the Arrow path (see bigquery.arrow_stream).
+    """
+
+    def __init__(self, query: str, project_id: str, dataset_id: str):
+        self.query = query
+        self.project_id = project_id
+        self.dataset_id = dataset_id
+
+    def __call__(self, partition: BackfillPartition) -> Optional[pd.DataFrame]:
+        query, job_config = self.build(partition)
+        df = self._reader().read_dataframe(query, job_config)
+        return df if not df.empty else None
+
+    def build(self, partition: BackfillPartition) -> Tuple[str, bigquery.QueryJobConfig]:
+        """Render the query and parameters for a partition."""
+        parameters = [
+            bigquery.ScalarQueryParameter("start", "TIMESTAMP", partition.start),
+            bigquery.ScalarQueryParameter("end", "TIMESTAMP", partition.end),
+        ]
+        if partition.node_ids:
+            partition_filter = "AND node_id IN UNNEST(@node_ids)"
+            parameters.append(
+                bigquery.ArrayQueryParameter("node_ids", "STRING", list(partition.node_ids))
+            )
+        elif partition.groups > 1:
+            partition_filter = "AND MOD(ABS(FARM_FINGERPRINT(node_id)), @groups) = @group"
+            parameters += [
+                bigquery.ScalarQueryParameter("groups", "INT64", partition.groups),
+                bigquery.ScalarQueryParameter("group", "INT64", partition.group),
+            ]
+        else:
+            partition_filter = ""
+
+        query = self.query.format(partition_filter=partition_filter)
+        return query, bigquery.QueryJobConfig(query_parameters=parameters)
+
+    def _reader(self):
+        key = (self.project_id, self.dataset_id)
+        if key not in _readers:
+            # Imported here: only worker processes need an authenticated client
+            from src.infrastructure.bigquery.bigquery_client import BigQueryClient
+            _readers[key] = BigQueryClient(self.project_id, self.dataset_id).arrow
+        return _readers[key]
+
+
+class PartitionedBackfill:
+    """
+    Runs backfill partitions through a process pool and concurrent writers.
+
+    Extraction is bounded to `processes * 2` partitions in flight and the
+    hand-off queue to `writers * 2` frames, so memory stays flat over long
+    ranges. Completed partitions are checkpointed under `job_name`.
+    """
+
+    def __init__(
+        self,
+        postgres_manager,
+        extract: Extractor,
+        job_name: str,
+        processes: int = 4,
+        writers: int = 4,
+        batch_size: int = 50000,
+        load_options: Optional[Dict[str, Any]] = None,
+        executor: Optional[Executor] = None,
+        before_load: Optional[Callable[[pd.DataFrame], Awaitable[None]]] = None,
+        progress_every: int = 10
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            postgres_manager: PostgresManager used for COPY and checkpoints
+            extract: Picklable function returning a partition's readings
+            job_name: Checkpoint namespace; reuse it to resume a run
+            processes: Extraction worker processes
+            writers: Concurrent COPY writers (each holds one connection)
+            batch_size: Rows per COPY batch
+            load_options: Extra keyword arguments for insert_sensor_readings_frame
+            executor: Executor to use instead of a new process pool
+            before_load: Awaited with each partition's frame before loading
+                (e.g. to upsert referenced nodes)
+            progress_every: Log progress every N completed partitions
+        """
+        self.postgres_manager = postgres_manager
+        self.extract = extract
+        self.job_name = job_name
+        self.processes = processes
+        self.writers = writers
+        self.batch_size = batch_size
+        self.load_options = load_options or {}
+        self.executor = executor
+        self.before_load = before_load
+        self.progress_every = progress_every
+
+        self.stats = {
+            'partitions_total': 0,
+            'partitions_resumed': 0,
+            'partitions_completed': 0,
+            'partitions_failed': 0,
+            'rows_loaded': 0,
+            'rows_skipped': 0,
+            'rows_per_second': 0.0,
+            'elapsed_seconds': 0.0
+        }
+        self._started = 0.0
+
+    async def run(self, partitions: Iterable[BackfillPartition]) -> Dict[str, Any]:
+        """
+        Backfill every partition not already checkpointed.
+
+        Returns:
+            Progress and throughput statistics
+        """
+        partitions = list(partitions)
+        completed = await self.postgres_manager.get_completed_partitions(self.job_name)
+        pending = [p for p in partitions if p.key not in completed]
+
+        self.stats['partitions_total'] = len(partitions)
+        self.stats['partitions_resumed'] = len(partitions) - len(pending)
+        self._started = time.perf_counter()
+        if self.stats['partitions_resumed']:
+            logger.info(
+                f"Backfill {self.job_name}: resuming, {self.stats['partitions_resumed']} "
+                f"of {len(partitions)} partitions already complete"
+            )
+        if not pending:
+            return self.stats
+
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.processes)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.writers * 2)
+        writers = [asyncio.create_task(self._writer(queue)) for _ in range(self.writers)]
+
+        try:
+            await self._extract_all(executor, pending, queue)
+            for _ in writers:
+                await queue.put(None)
+            await asyncio.gather(*writers)
+        finally:
+            for task in writers:
+                task.cancel()
+            if self.executor is None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        self._update_rates()
+        self._log_progress()
+        return self.stats
+
+    async def _extract_all(
+        self,
+        executor: Executor,
+        pending: List[BackfillPartition],
+        queue: asyncio.Queue
+    ) -> None:
+        """Extract partitions in the pool, keeping a bounded number in flight."""
+        loop = asyncio.get_running_loop()
+        in_flight: Dict[asyncio.Future, BackfillPartition] = {}
+        remaining = iter(pending)
+
+        def submit_next() -> None:
+            partition = next(remaining, None)
+            if partition is not None:
+                in_flight[loop.run_in_executor(executor, self.extract, partition)] = partition
+
+        for _ in range(self.processes * 2):
+            submit_next()
+
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                partition = in_flight.pop(future)
+                submit_next()
+                try:
+                    df = future.result()
+                except Exception as e:
+                    logger.error(f"Backfill {self.job_name}: extracting {partition.key} failed: {e}")
+                    self.stats['partitions_failed'] += 1
+                    continue
+                await queue.put((partition, df))
+
+    async def _writer(self, queue: asyncio.Queue) -> None:
+        """Load extracted partitions and checkpoint them."""
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            partition, df = item
+            try:
+                rows = 0 if df is None else len(df)
+                loaded = 0
+                if rows and self.before_load is not None:
+                    await self.before_load(df)
+                for i in range(0, rows, self.batch_size):
+                    loaded += await self.postgres_manager.insert_sensor_readings_frame(
+                        df.iloc[i:i + self.batch_size], **self.load_options
+                    )
+                await self.postgres_manager.mark_partition_complete(
+                    self.job_name, partition.key, loaded
+                )
+                self.stats['partitions_completed'] += 1
+                self.stats['rows_loaded'] += loaded
+                self.stats['rows_skipped'] += rows - loaded
+                if self.stats['partitions_completed'] % self.progress_every == 0:
+                    self._update_rates()
+                    self._log_progress()
+            except Exception as e:
+                logger.error(f"Backfill {self.job_name}: loading {partition.key} failed: {e}")
+                self.stats['partitions_failed'] += 1
+
+    def _update_rates(self) -> None:
+        elapsed = time.perf_counter() - self._started
+        self.stats['elapsed_seconds'] = elapsed
+        self.stats['rows_per_second'] = self.stats['rows_loaded'] / elapsed if elapsed > 0 else 0.0
+
+    def _log_progress(self) -> None:
+        stats = self.stats
+        done = stats['partitions_resumed'] + stats['partitions_completed']
+        remaining = stats['partitions_total'] - done - stats['partitions_failed']
+        rate = stats['partitions_completed'] / stats['elapsed_seconds'] if stats['elapsed_seconds'] else 0
+        eta = f", ETA {remaining / rate:.0f}s" if rate and remaining > 0 else ""
+        logger.info(
+            f"Backfill {self.job_name}: {done}/{stats['partitions_total']} partitions, "
+            f"{stats['rows_loaded']} rows ({stats['rows_per_second']:,.0f} rows/s), "
+            f"{stats['partitions_failed']} failed{eta}"
+        )
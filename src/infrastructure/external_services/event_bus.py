@@ -1,18 +1,42 @@
 """Event bus implementation for domain events."""
 
 import asyncio
+import logging
+import time
 from collections import defaultdict
-from typing import Callable, Dict, List, Type
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Type
 
 from src.application.interfaces.event_bus import IEventBus
 from src.domain.events.base import DomainEvent
 
+logger = logging.getLogger(__name__)
+
+# Concurrent deliveries of InMemoryEventBus.publish_batch
+DEFAULT_PUBLISH_CONCURRENCY = 100
+
+
+def _handler_name(handler: Callable) -> str:
+    return getattr(handler, "__qualname__", None) or repr(handler)
+
+
+def default_ordering_key(event: DomainEvent) -> Any:
+    """Events about the same node are delivered in order; others in any order."""
+    node_id = getattr(event, "node_id", None)
+    return node_id if node_id is not None else event.aggregate_id
+
 
 class InMemoryEventBus(IEventBus):
     """In-memory implementation of event bus."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_PUBLISH_CONCURRENCY,
+        ordering_key: Callable[[DomainEvent], Any] = default_ordering_key
+    ) -> None:
         self._handlers: Dict[Type[DomainEvent], List[Callable]] = defaultdict(list)
+        self.max_concurrency = max_concurrency
+        self.ordering_key = ordering_key
 
     async def publish(self, event: DomainEvent) -> None:
         """Publish a domain event to all registered handlers."""
@@ -25,9 +49,26 @@ class InMemoryEventBus(IEventBus):
             await asyncio.gather(*tasks, return_exceptions=True)
 
     async def publish_batch(self, events: List[DomainEvent]) -> None:
-        """Publish multiple domain events."""
-        tasks = [self.publish(event) for event in events]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        """
+        Publish multiple domain events, at most `max_concurrency` at a time.
+
+        Events with the same ordering key (the node by default) are
+        published one after another in batch order; different keys are
+        published concurrently.
+        """
+        by_key: Dict[Any, List[DomainEvent]] = defaultdict(list)
+        for event in events:
+            if self._handlers.get(type(event)):
+                by_key[self.ordering_key(event)].append(event)
+        remaining = iter(by_key.values())
+
+        # A fixed set of workers share the keys instead of one task per event
+        async def worker() -> None:
+            for keyed in remaining:
+                for event in keyed:
+                    await self.publish(event)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_concurrency, len(by_key)))))
 
     def subscribe(
         self, event_type: Type[DomainEvent], handler: Callable[[DomainEvent], None]
@@ -54,8 +95,261 @@ class InMemoryEventBus(IEventBus):
                 await handler(event)
             else:
                 # Run sync handler in thread pool to avoid blocking
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 await loop.run_in_executor(None, handler, event)
-        except Exception as e:
+        except Exception:
             # Log error but don't propagate - other handlers should still execute
-            print(f"Error in event handler: {e}")
+            logger.exception(f"Error in event handler {_handler_name(handler)} for {event.event_type}")
+
+
+def _call_each(handler: Callable, events: List[DomainEvent]) -> int:
+    """Call a sync handler once per event; returns the number of failures."""
+    failed = 0
+    for event in events:
+        try:
+            handler(event)
+        except Exception:
+            failed += 1
+            logger.exception(f"Error in event handler {_handler_name(handler)} for {event.event_type}")
+    return failed
+
+
+@dataclass
+class _Subscription:
+    """A handler with its lanes (one queue and worker each) and metrics."""
+
+    event_type: Type[DomainEvent]
+    handler: Callable
+    batch: bool
+    workers: int
+    queue_size: int
+    max_batch_size: int
+    ordering_key: Callable[[DomainEvent], Any]
+    lanes: List[asyncio.Queue] = field(default_factory=list)
+    tasks: List[asyncio.Task] = field(default_factory=list)
+    stats: Dict[str, float] = field(default_factory=lambda: {
+        "delivered": 0, "failed": 0, "calls": 0,
+        "handler_seconds_total": 0.0, "handler_seconds_max": 0.0,
+    })
+
+    def lane_for(self, event: DomainEvent) -> asyncio.Queue:
+        if self.workers == 1:
+            return self.lanes[0]
+        return self.lanes[hash(self.ordering_key(event)) % self.workers]
+
+
+class QueuedEventBus(InMemoryEventBus):
+    """
+    Event bus delivering through bounded per-handler queues.
+
+    Each subscription gets `workers` lanes, each a bounded queue drained by
+    one worker task, so the number of tasks is fixed whatever the number of
+    events. Events with the same ordering key (the node by default) always
+    use the same lane and reach the handler in publish order. `publish`
+    returns once the event is queued and waits while a lane is full, which
+    pushes back on fast publishers. Handlers subscribed with `batch=True`
+    receive lists of up to `max_batch_size` queued events in one call.
+
+    Workers start on the first publish, in the publisher's event loop.
+    Call `drain` to wait for delivery and `stop` before the loop ends;
+    events still queued when a loop closes are lost.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        queue_size: int = 10_000,
+        max_batch_size: int = 500,
+        ordering_key: Callable[[DomainEvent], Any] = default_ordering_key
+    ) -> None:
+        """
+        Initialize the bus.
+
+        Args:
+            workers: Default lanes per subscription
+            queue_size: Default capacity of each lane
+            max_batch_size: Default maximum events per handler call
+            ordering_key: Default key deciding the lane of an event
+        """
+        super().__init__()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_batch_size = max_batch_size
+        self.ordering_key = ordering_key
+        self._subscriptions: Dict[Type[DomainEvent], List[_Subscription]] = defaultdict(list)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(
+        self,
+        event_type: Type[DomainEvent],
+        handler: Callable,
+        batch: bool = False,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+        ordering_key: Optional[Callable[[DomainEvent], Any]] = None
+    ) -> None:
+        """
+        Subscribe to a specific event type.
+
+        Args:
+            event_type: Event class to deliver
+            handler: Sync or async callable taking an event, or a list of
+                events when `batch` is set
+            batch: Deliver lists of queued events instead of single events
+            workers: Lanes (concurrent deliveries) for this handler
+            queue_size: Capacity of each lane
+            max_batch_size: Maximum events per handler call
+            ordering_key: Key deciding the lane of an event
+        """
+        subscription = _Subscription(
+            event_type=event_type,
+            handler=handler,
+            batch=batch,
+            workers=workers or self.workers,
+            queue_size=queue_size or self.queue_size,
+            max_batch_size=max_batch_size or self.max_batch_size,
+            ordering_key=ordering_key or self.ordering_key,
+        )
+        self._subscriptions[event_type].append(subscription)
+        self._handlers[event_type].append(handler)
+        if self._loop is not None:
+            self._start(subscription)
+
+    def unsubscribe(self, event_type: Type[DomainEvent], handler: Callable) -> None:
+        """Unsubscribe from a specific event type; queued events for it are discarded."""
+        super().unsubscribe(event_type, handler)
+        for subscription in list(self._subscriptions.get(event_type, [])):
+            if subscription.handler == handler:
+                self._subscriptions[event_type].remove(subscription)
+                for task in subscription.tasks:
+                    task.cancel()
+                break
+
+    async def publish(self, event: DomainEvent) -> None:
+        """Queue an event for every handler of its type, waiting while a lane is full."""
+        subscriptions = self._subscriptions.get(type(event))
+        if not subscriptions:
+            return
+        self._ensure_started()
+        for subscription in subscriptions:
+            await subscription.lane_for(event).put(event)
+
+    async def publish_batch(self, events: List[DomainEvent]) -> None:
+        """Queue multiple events in order."""
+        for event in events:
+            await self.publish(event)
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been handled."""
+        await asyncio.gather(*(
+            lane.join()
+            for subscriptions in self._subscriptions.values()
+            for subscription in subscriptions
+            for lane in subscription.lanes
+        ))
+
+    async def stop(self) -> None:
+        """Deliver queued events, then stop the workers."""
+        if self._loop is None:
+            return
+        await self.drain()
+        tasks = [task for subscriptions in self._subscriptions.values()
+                 for subscription in subscriptions for task in subscription.tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Dispatch metrics per handler.
+
+        Returns:
+            Dictionary keyed by "<EventType>:<handler>" with queue depth,
+            delivered/failed event counts, handler calls and handler latency
+        """
+        result = {}
+        for event_type, subscriptions in self._subscriptions.items():
+            for subscription in subscriptions:
+                stats = subscription.stats
+                calls = stats["calls"]
+                result[f"{event_type.__name__}:{_handler_name(subscription.handler)}"] = {
+                    "queue_depth": sum(lane.qsize() for lane in subscription.lanes),
+                    "workers": subscription.workers,
+                    "delivered": int(stats["delivered"]),
+                    "failed": int(stats["failed"]),
+                    "handler_calls": int(calls),
+                    "handler_ms_avg": stats["handler_seconds_total"] / calls * 1000 if calls else 0.0,
+                    "handler_ms_max": stats["handler_seconds_max"] * 1000,
+                }
+        return result
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # First publish, or a new loop (the previous one's workers are gone)
+        self._loop = loop
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                self._start(subscription)
+
+    def _start(self, subscription: _Subscription) -> None:
+        subscription.lanes = [asyncio.Queue(maxsize=subscription.queue_size) for _ in range(subscription.workers)]
+        subscription.tasks = [
+            asyncio.create_task(self._work(subscription, lane)) for lane in subscription.lanes
+        ]
+
+    async def _work(self, subscription: _Subscription, lane: asyncio.Queue) -> None:
+        # Async per-event handlers take one event at a time so the lane bound
+        # holds; batch and sync handlers take what is queued, up to a batch
+        grouped = subscription.batch or not asyncio.iscoroutinefunction(subscription.handler)
+        limit = subscription.max_batch_size if grouped else 1
+        while True:
+            events = [await lane.get()]
+            while len(events) < limit:
+                try:
+                    events.append(lane.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._deliver(subscription, events)
+            finally:
+                for _ in events:
+                    lane.task_done()
+
+    async def _deliver(self, subscription: _Subscription, events: List[DomainEvent]) -> None:
+        handler = subscription.handler
+        is_async = asyncio.iscoroutinefunction(handler)
+        stats = subscription.stats
+        started = time.perf_counter()
+        failed = 0
+        calls = 1 if subscription.batch or not is_async else len(events)
+
+        if subscription.batch:
+            try:
+                if is_async:
+                    await handler(events)
+                else:
+                    await asyncio.get_running_loop().run_in_executor(None, handler, events)
+            except Exception:
+                failed = len(events)
+                logger.exception(f"Error in batch event handler {_handler_name(handler)}")
+        elif is_async:
+            for event in events:
+                try:
+                    await handler(event)
+                except Exception:
+                    failed += 1
+                    logger.exception(f"Error in event handler {_handler_name(handler)} for {event.event_type}")
+        else:
+            # One executor hop for the whole group, keeping their order
+            failed = await asyncio.get_running_loop().run_in_executor(None, _call_each, handler, events)
+
+        elapsed = time.perf_counter() - started
+        stats["calls"] += calls
+        stats["delivered"] += len(events) - failed
+        stats["failed"] += failed
+        stats["handler_seconds_total"] += elapsed
+        stats["handler_seconds_max"] = max(stats["handler_seconds_max"], elapsed / calls)
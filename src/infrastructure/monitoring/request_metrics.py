@@ -0,0 +1,211 @@
+"""
+In-process request metrics for the API services.
+
+Each request costs one deque append and one histogram bucket increment.
+Recent requests are kept in a fixed-size ring buffer for windowed rates
+and percentiles; per-route latency histograms accumulate since start-up.
+Process CPU and memory are sampled when a snapshot is taken.
+"""
+
+import bisect
+import logging
+import os
+import resource
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import psutil
+except ImportError:  # CPU from process time, memory as peak RSS
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+DEFAULT_CAPACITY = 10000
+# Requests with an unmatched route share one key, so scans cannot grow the route table
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass
+class RouteStats:
+    """Cumulative latency histogram and error count for one route."""
+
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS_MS))
+
+    def record(self, duration_ms: float, error: bool) -> None:
+        self.count += 1
+        self.errors += error
+        self.total_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (capped at the max seen)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": 100.0 * self.errors / self.count if self.count else 0.0,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": self.max_ms,
+            "histogram": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+            },
+        }
+
+
+class RequestMetrics:
+    """
+    Request latency, error and in-flight tracking.
+
+    Updated from the event loop only (by InstrumentationMiddleware), so no
+    locking is needed.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, clock: Callable[[], float] = time.time):
+        """
+        Initialize the metrics store.
+
+        Args:
+            capacity: Recent requests kept for windowed statistics
+            clock: Wall clock in seconds, injectable for tests
+        """
+        self.clock = clock
+        self.started_at = clock()
+        self.in_flight = 0
+        self._recent: Deque[Tuple[float, float, bool]] = deque(maxlen=capacity)
+        self._routes: Dict[Tuple[str, str], RouteStats] = {}
+        self._cpu_sample = (time.monotonic(), time.process_time())
+        self._process = psutil.Process(os.getpid()) if psutil else None
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, duration_ms: float) -> None:
+        """Record a completed request; 5xx responses count as errors."""
+        self.in_flight -= 1
+        error = status >= 500
+        self._recent.append((self.clock(), duration_ms, error))
+        stats = self._routes.get((method, route))
+        if stats is None:
+            stats = self._routes[(method, route)] = RouteStats()
+        stats.record(duration_ms, error)
+
+    def window(self, seconds: float = 300) -> Dict[str, Any]:
+        """
+        Request statistics over the last `seconds` (bounded by the ring buffer).
+
+        Returns:
+            Dict with requests, errors, error_rate (%), throughput_rps,
+            mean/p50/p95/p99 latency in ms and in_flight
+        """
+        now = self.clock()
+        cutoff = now - seconds
+        durations = []
+        errors = 0
+        for timestamp, duration_ms, error in reversed(self._recent):
+            if timestamp < cutoff:
+                break
+            durations.append(duration_ms)
+            errors += error
+
+        # Rate over the part of the window the process has been up
+        span = max(min(seconds, now - self.started_at), 1e-9)
+        result = {
+            "window_seconds": seconds,
+            "requests": len(durations),
+            "errors": errors,
+            "error_rate": 100.0 * errors / len(durations) if durations else 0.0,
+            "throughput_rps": len(durations) / span,
+            "in_flight": self.in_flight,
+        }
+        if durations:
+            values = np.asarray(durations)
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            result.update(mean_ms=float(values.mean()), p50_ms=float(p50), p95_ms=float(p95), p99_ms=float(p99))
+        else:
+            result.update(mean_ms=0.0, p50_ms=0.0, p95_ms=0.0, p99_ms=0.0)
+        return result
+
+    def routes(self) -> Dict[str, Dict[str, Any]]:
+        """Cumulative per-route statistics keyed by "METHOD path"."""
+        return {
+            f"{method} {route}": stats.as_dict()
+            for (method, route), stats in sorted(self._routes.items())
+        }
+
+    def process(self) -> Dict[str, Optional[float]]:
+        """CPU (% of one core since the last sample) and memory of this process."""
+        if self._process is not None:
+            memory = self._process.memory_info()
+            return {
+                "cpu_percent": self._process.cpu_percent(interval=None),
+                "memory_percent": self._process.memory_percent(),
+                "rss_mb": memory.rss / 2**20,
+                "threads": self._process.num_threads(),
+            }
+
+        wall, cpu = time.monotonic(), time.process_time()
+        last_wall, last_cpu = self._cpu_sample
+        self._cpu_sample = (wall, cpu)
+        elapsed = wall - last_wall
+        # ru_maxrss is the peak RSS in KiB on Linux
+        return {
+            "cpu_percent": 100.0 * (cpu - last_cpu) / elapsed if elapsed > 0 else 0.0,
+            "memory_percent": None,
+            "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "threads": None,
+        }
+
+    def snapshot(self, window_seconds: float = 300) -> Dict[str, Any]:
+        """Window, per-route and process metrics in one payload."""
+        return {
+            "timestamp": self.clock(),
+            "uptime_seconds": self.clock() - self.started_at,
+            "window": self.window(window_seconds),
+            "routes": self.routes(),
+            "process": self.process(),
+        }
+
+    def reset(self) -> None:
+        self._recent.clear()
+        self._routes.clear()
+        self.started_at = self.clock()
+
+
+# Global metrics shared by the middleware, the metrics endpoint and the KPIs
+_request_metrics: Optional[RequestMetrics] = None
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Get or create the process-wide request metrics."""
+    global _request_metrics
+    if _request_metrics is None:
+        _request_metrics = RequestMetrics()
+    return _request_metrics
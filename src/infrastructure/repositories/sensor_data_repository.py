@@ -1,7 +1,8 @@
 """Repository for accessing sensor_data table in BigQuery."""
 
+import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from uuid import UUID
 
 from google.cloud import bigquery
@@ -17,10 +18,25 @@ from src.domain.value_objects.measurements import (
 from src.domain.value_objects.sensor_type import SensorType
 from src.infrastructure.persistence.bigquery_config import BigQueryConnection
 
+logger = logging.getLogger(__name__)
+
 
 class SensorDataRepository(ISensorReadingRepository):
     """Repository implementation for sensor_data table."""
 
+    # Map UUID to actual numeric node_id used in BigQuery
+    # Updated mappings based on actual data in the database
+    NODE_MAPPING = {
+        "00000000-0000-0000-0000-000000000001": "281492",  # Primary node with most data
+        "00000000-0000-0000-0000-000000000002": "211514",  # Secondary node
+        "00000000-0000-0000-0000-000000000003": "288400",  # Third node
+        "00000000-0000-0000-0000-000000000004": "288399",  # Fourth node
+        "00000000-0000-0000-0000-000000000005": "215542",  # Fifth node
+        "00000000-0000-0000-0000-000000000006": "273933",  # Sixth node
+        "00000000-0000-0000-0000-000000000007": "215600",  # Seventh node
+        "00000000-0000-0000-0000-000000000008": "287156",  # Eighth node
+    }
+
     def __init__(self, connection: BigQueryConnection) -> None:
         self.connection = connection
         self.dataset_id = connection.config.dataset_id
@@ -105,14 +121,28 @@ class SensorDataRepository(ISensorReadingRepository):
             volume=volume,
         )
 
-    async def get_by_node_id(
+    def _query_readings(
         self,
-        node_id: UUID,
+        node_filter: str,
+        params: List[Any],
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
         limit: Optional[int] = None,
     ) -> List[SensorReading]:
-        """Get sensor readings from the ML sensor readings table."""
+        """
+        Query high-quality readings from the ML sensor readings table.
+
+        Args:
+            node_filter: Condition on node_id (with its parameters in
+                `params`), or an empty string for every node
+            params: Query parameters used by `node_filter`
+            start_time: Earliest timestamp (inclusive)
+            end_time: Latest timestamp (inclusive)
+            limit: Maximum number of rows
+
+        Returns:
+            Readings, newest first; rows without valid measurements are skipped
+        """
         query = f"""
         SELECT 
             timestamp,
@@ -126,28 +156,9 @@ class SensorDataRepository(ISensorReadingRepository):
         WHERE 1=1
         """
 
-        params = []
-
-        # Map UUID to actual numeric node_id used in BigQuery
-        # Updated mappings based on actual data in the database
-        node_mapping = {
-            "00000000-0000-0000-0000-000000000001": "281492",  # Primary node with most data
-            "00000000-0000-0000-0000-000000000002": "211514",  # Secondary node
-            "00000000-0000-0000-0000-000000000003": "288400",  # Third node
-            "00000000-0000-0000-0000-000000000004": "288399",  # Fourth node
-            "00000000-0000-0000-0000-000000000005": "215542",  # Fifth node
-            "00000000-0000-0000-0000-000000000006": "273933",  # Sixth node
-            "00000000-0000-0000-0000-000000000007": "215600",  # Seventh node
-            "00000000-0000-0000-0000-000000000008": "287156",  # Eighth node
-        }
-
-        if str(node_id) in node_mapping:
-            query += " AND node_id = @node_id"
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    "node_id", "STRING", node_mapping[str(node_id)]
-                )
-            )
+        params = list(params)
+        if node_filter:
+            query += f" AND {node_filter}"
 
         if start_time:
             query += " AND timestamp >= @start_time"
@@ -180,15 +191,69 @@ class SensorDataRepository(ISensorReadingRepository):
         readings = []
         for row in results:
             try:
-                reading = self._create_sensor_reading_from_row(row)
-                readings.append(reading)
+                readings.append(self._create_sensor_reading_from_row(row))
             except Exception as e:
                 # Skip invalid readings but log the error
-                print(f"Warning: Skipping invalid reading: {e}")
-                continue
+                logger.warning(f"Skipping invalid reading: {e}")
 
         return readings
 
+    async def get_by_node_id(
+        self,
+        node_id: UUID,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[SensorReading]:
+        """Get sensor readings from the ML sensor readings table."""
+        # Map UUID to actual numeric node_id used in BigQuery
+        if str(node_id) in self.NODE_MAPPING:
+            node_filter = "node_id = @node_id"
+            params = [
+                bigquery.ScalarQueryParameter(
+                    "node_id", "STRING", self.NODE_MAPPING[str(node_id)]
+                )
+            ]
+        else:
+            node_filter, params = "", []
+
+        return self._query_readings(node_filter, params, start_time, end_time, limit)
+
+    async def get_by_node_ids(
+        self,
+        node_ids: Iterable[UUID],
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[UUID, List[SensorReading]]:
+        """Get sensor readings for several mapped nodes with one query."""
+        node_ids = list(dict.fromkeys(node_ids))
+        if not node_ids:
+            return {}
+
+        # An unmapped node reads the whole table, so keep per-node semantics
+        if any(str(node_id) not in self.NODE_MAPPING for node_id in node_ids):
+            return await super().get_by_node_ids(node_ids, start_time, end_time)
+
+        readings = self._query_readings(
+            "node_id IN UNNEST(@node_ids)",
+            [
+                bigquery.ArrayQueryParameter(
+                    "node_ids",
+                    "STRING",
+                    [self.NODE_MAPPING[str(node_id)] for node_id in node_ids],
+                )
+            ],
+            start_time,
+            end_time,
+        )
+
+        results: Dict[UUID, List[SensorReading]] = {node_id: [] for node_id in node_ids}
+        for reading in readings:
+            if reading.node_id in results:
+                results[reading.node_id].append(reading)
+
+        return results
+
     async def get_latest_by_node(self, node_id: UUID) -> Optional[SensorReading]:
         """Get the latest reading for a node."""
         readings = await self.get_by_node_id(node_id, limit=1)
@@ -265,7 +330,7 @@ class SensorDataRepository(ISensorReadingRepository):
                 readings.append(reading)
             except Exception as e:
                 # Skip invalid readings but log the error
-                print(f"Warning: Skipping invalid anomaly reading: {e}")
+                logger.warning(f"Skipping invalid anomaly reading: {e}")
                 continue
 
         return readings
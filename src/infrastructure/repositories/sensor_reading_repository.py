@@ -1,7 +1,7 @@
 """BigQuery implementation of sensor reading repository."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Union
 from uuid import UUID
 
 from google.cloud import bigquery
@@ -87,14 +87,77 @@ class BigQuerySensorReadingRepository(ISensorReadingRepository):
         limit: Optional[int] = None,
     ) -> List[SensorReading]:
         """Get sensor readings for a specific node."""
+        return self._query_readings(
+            "node_id = @node_id",
+            bigquery.ScalarQueryParameter("node_id", "STRING", str(node_id)),
+            start_time,
+            end_time,
+            limit,
+        )
+
+    async def get_by_node_ids(
+        self,
+        node_ids: Iterable[UUID],
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[UUID, List[SensorReading]]:
+        """Get sensor readings for several nodes with one query."""
+        results: Dict[UUID, List[SensorReading]] = {
+            node_id: [] for node_id in node_ids
+        }
+        if not results:
+            return results
+
+        readings = self._query_readings(
+            "node_id IN UNNEST(@node_ids)",
+            bigquery.ArrayQueryParameter(
+                "node_ids", "STRING", [str(node_id) for node_id in results]
+            ),
+            start_time,
+            end_time,
+        )
+        for reading in readings:
+            if reading.node_id in results:
+                results[reading.node_id].append(reading)
+
+        return results
+
+    async def get_latest_by_node(self, node_id: UUID) -> Optional[SensorReading]:
+        """Get the latest sensor reading for a node."""
+        readings = await self.get_by_node_id(node_id, limit=1)
+        return readings[0] if readings else None
+
+    async def delete_by_id(self, reading_id: UUID) -> None:
+        """Delete a sensor reading by ID."""
+        query = f"""
+        DELETE FROM `{self.connection.config.dataset_ref}.{self.TABLE_NAME}`
+        WHERE id = @reading_id
+        """
+
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("reading_id", "STRING", str(reading_id))
+            ]
+        )
+
+        query_job = self.connection.client.query(query, job_config=job_config)
+        query_job.result()  # Wait for query to complete
+
+    def _query_readings(
+        self,
+        node_filter: str,
+        node_parameter: Union[bigquery.ScalarQueryParameter, bigquery.ArrayQueryParameter],
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[SensorReading]:
+        """Query readings matching a node_id condition, newest first."""
         query = f"""
         SELECT * FROM `{self.connection.config.dataset_ref}.{self.TABLE_NAME}`
-        WHERE node_id = @node_id
+        WHERE {node_filter}
         """
 
-        query_parameters = [
-            bigquery.ScalarQueryParameter("node_id", "STRING", str(node_id))
-        ]
+        query_parameters = [node_parameter]
 
         if start_time:
             query += " AND timestamp >= @start_time"
@@ -124,27 +187,6 @@ class BigQuerySensorReadingRepository(ISensorReadingRepository):
 
         return readings
 
-    async def get_latest_by_node(self, node_id: UUID) -> Optional[SensorReading]:
-        """Get the latest sensor reading for a node."""
-        readings = await self.get_by_node_id(node_id, limit=1)
-        return readings[0] if readings else None
-
-    async def delete_by_id(self, reading_id: UUID) -> None:
-        """Delete a sensor reading by ID."""
-        query = f"""
-        DELETE FROM `{self.connection.config.dataset_ref}.{self.TABLE_NAME}`
-        WHERE id = @reading_id
-        """
-
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("reading_id", "STRING", str(reading_id))
-            ]
-        )
-
-        query_job = self.connection.client.query(query, job_config=job_config)
-        query_job.result()  # Wait for query to complete
-
     def _entity_to_row(self, reading: SensorReading) -> dict:
         """Convert entity to BigQuery row."""
         row = {
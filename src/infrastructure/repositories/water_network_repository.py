@@ -216,8 +216,9 @@ class BigQueryWaterNetworkRepository(IWaterNetworkRepository):
             # Parse connections
             if row.connections:
                 connections_list = json.loads(row.connections)
-                for conn in connections_list:
-                    network._connections.add((UUID(conn["from"]), UUID(conn["to"])))
+                network.restore_connections(
+                    [(UUID(conn["from"]), UUID(conn["to"])) for conn in connections_list]
+                )
 
             # Set timestamps
             network._created_at = row.created_at
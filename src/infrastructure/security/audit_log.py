@@ -0,0 +1,249 @@
+"""
+Batched audit-log writer.
+
+Audited actions (logins, user and settings changes) used to INSERT their
+audit row on the request path. AuditLogWriter instead queues entries in
+memory and a background task writes them with one binary COPY per batch,
+flushing when `max_batch_size` entries are waiting or the oldest has
+waited `max_delay_seconds`. Queued entries are flushed on shutdown.
+
+The queue is bounded. When it is full, the "block" policy makes the
+audited request wait for room (nothing is lost, latency grows only under
+sustained overload) and the "drop" policy discards the new entry and
+counts it. If a batch COPY fails, its entries are retried one by one so a
+single bad row does not lose the others.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Column order of water_infrastructure.audit_logs used for COPY
+AUDIT_LOG_COLUMNS = [
+    'user_id', 'action', 'entity_type', 'entity_id', 'old_values',
+    'new_values', 'ip_address', 'success', 'error_message', 'created_at'
+]
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP = "drop"
+
+AuditRecord = Tuple[Any, ...]
+
+# Queued by `stop` behind the pending entries
+_STOP = object()
+
+
+def _json_value(value: Optional[dict]) -> Optional[str]:
+    return None if value is None else json.dumps(value, default=str)
+
+
+def audit_record(
+    user_id: Any,
+    action: str,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    old_values: Optional[dict] = None,
+    new_values: Optional[dict] = None,
+    ip_address: Optional[str] = None,
+    success: bool = True,
+    error_message: Optional[str] = None,
+    created_at: Optional[datetime] = None
+) -> AuditRecord:
+    """
+    Build an audit_logs row in AUDIT_LOG_COLUMNS order.
+
+    The time is taken when the action happens, not when the batch is written.
+    """
+    return (
+        str(user_id) if user_id is not None else None,
+        action,
+        entity_type,
+        str(entity_id) if entity_id is not None else None,
+        _json_value(old_values),
+        _json_value(new_values),
+        ip_address,
+        success,
+        error_message,
+        created_at or datetime.now(timezone.utc),
+    )
+
+
+class AuditLogWriter:
+    """Bounded queue of audit entries written to PostgreSQL in batches."""
+
+    def __init__(
+        self,
+        max_batch_size: int = 500,
+        max_delay_seconds: float = 1.0,
+        max_queue_size: int = 10_000,
+        overflow: str = OVERFLOW_BLOCK
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            max_batch_size: Maximum entries written with one COPY
+            max_delay_seconds: Maximum time an entry waits for its batch
+            max_queue_size: Maximum queued entries
+            overflow: OVERFLOW_BLOCK to wait for room, OVERFLOW_DROP to discard
+        """
+        if overflow not in (OVERFLOW_BLOCK, OVERFLOW_DROP):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.max_batch_size = max_batch_size
+        self.max_delay_seconds = max_delay_seconds
+        self.overflow = overflow
+        self.pool = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._consumer: Optional[asyncio.Task] = None
+        self.stats = {"written": 0, "batches": 0, "dropped": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._consumer is not None and not self._consumer.done()
+
+    @property
+    def depth(self) -> int:
+        """Number of entries waiting to be written."""
+        return self._queue.qsize()
+
+    def start(self, pool) -> None:
+        """
+        Start writing queued entries.
+
+        Args:
+            pool: asyncpg pool used for the COPYs
+        """
+        self.pool = pool
+        if not self.running:
+            self._consumer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task once every queued entry is written."""
+        if self.running:
+            await self._queue.put(_STOP)
+            await self._consumer
+        self._consumer = None
+        # Entries submitted during shutdown, or left by a failed consumer
+        while not self._queue.empty():
+            batch: List[AuditRecord] = []
+            self._take_batch(batch)
+            await self.write(batch)
+
+    async def submit(self, record: AuditRecord) -> bool:
+        """
+        Queue an audit entry.
+
+        Args:
+            record: Row built by audit_record
+
+        Returns:
+            False if the entry was dropped because the queue is full
+        """
+        if self.overflow == OVERFLOW_BLOCK:
+            await self._queue.put(record)
+            return True
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            if self.stats["dropped"] == 1 or self.stats["dropped"] % 1000 == 0:
+                logger.error(f"Audit log queue full, {self.stats['dropped']} entries dropped so far")
+            return False
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            batch: List[AuditRecord] = []
+            stopping = first is _STOP or self._take_batch(batch, first)
+            deadline = loop.time() + self.max_delay_seconds
+            while not stopping and len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                stopping = entry is _STOP or self._take_batch(batch, entry)
+            await self.write(batch)
+
+    def _take_batch(self, batch: List[AuditRecord], first: Optional[AuditRecord] = None) -> bool:
+        """
+        Move already-queued entries into `batch` without waiting.
+
+        Returns:
+            True if the stop marker was reached
+        """
+        if first is not None:
+            batch.append(first)
+        while len(batch) < self.max_batch_size:
+            try:
+                entry = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if entry is _STOP:
+                return True
+            batch.append(entry)
+        return False
+
+    async def write(self, batch: List[AuditRecord], pool=None) -> None:
+        """
+        Write entries now: one COPY, or a plain INSERT for a single entry.
+
+        Args:
+            batch: Rows built by audit_record
+            pool: asyncpg pool (the one given to `start` by default)
+        """
+        pool = pool or self.pool
+        if not batch:
+            return
+        if len(batch) == 1:
+            await self._write_rows(batch, pool)
+            return
+        try:
+            async with pool.acquire() as conn:
+                await conn.copy_records_to_table(
+                    'audit_logs',
+                    schema_name='water_infrastructure',
+                    columns=AUDIT_LOG_COLUMNS,
+                    records=batch
+                )
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            logger.warning(f"Audit log COPY of {len(batch)} entries failed, retrying row by row: {e}")
+            await self._write_rows(batch, pool)
+
+    async def _write_rows(self, batch: List[AuditRecord], pool) -> None:
+        placeholders = ", ".join(f"${i}" for i in range(1, len(AUDIT_LOG_COLUMNS) + 1))
+        query = f"""
+            INSERT INTO water_infrastructure.audit_logs ({', '.join(AUDIT_LOG_COLUMNS)})
+            VALUES ({placeholders})
+        """
+        for record in batch:
+            try:
+                async with pool.acquire() as conn:
+                    await conn.execute(query, *record)
+                self.stats["written"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Failed to log audit: {e} ({record[1]})")
+
+
+# Process-wide writer used by the user routes
+_audit_writer: Optional[AuditLogWriter] = None
+
+
+def get_audit_writer() -> AuditLogWriter:
+    """Get or create the process-wide audit log writer."""
+    global _audit_writer
+    if _audit_writer is None:
+        _audit_writer = AuditLogWriter()
+    return _audit_writer
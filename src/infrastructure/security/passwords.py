@@ -0,0 +1,100 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow (100-300ms per hash at the default cost), and
+calling it inside an async handler stalls every other request served by
+that worker. PasswordHasher runs hashing and verification in a small,
+fixed thread pool instead; bcrypt releases the GIL while it works, so the
+loop keeps serving requests during a login burst, and the pool size caps
+how much CPU logins can take from the rest of the API.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUNDS = 12
+
+
+def _default_workers() -> int:
+    return int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+def hash_password(password: str, rounds: int = DEFAULT_ROUNDS) -> str:
+    """Hash a password using bcrypt (blocking)."""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    """Verify a password against a bcrypt hash (blocking)."""
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    except ValueError:
+        # Malformed or missing stored hash
+        return False
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded worker pool."""
+
+    def __init__(self, max_workers: Optional[int] = None, rounds: int = DEFAULT_ROUNDS):
+        """
+        Initialize the hasher.
+
+        Args:
+            max_workers: Concurrent hashes (PASSWORD_HASH_WORKERS, at most 4 by default)
+            rounds: bcrypt cost factor for new hashes
+        """
+        self.max_workers = max_workers or _default_workers()
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password without blocking the event loop.
+
+        Args:
+            password: Plain-text password
+
+        Returns:
+            bcrypt hash
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed: Optional[str]) -> bool:
+        """
+        Verify a password without blocking the event loop.
+
+        Args:
+            password: Plain-text password
+            hashed: Stored bcrypt hash
+
+        Returns:
+            True if the password matches
+        """
+        if not hashed:
+            return False
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, verify_password, password, hashed)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+# Process-wide hasher shared by the user routes
+_password_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get or create the process-wide password hasher."""
+    global _password_hasher
+    if _password_hasher is None:
+        _password_hasher = PasswordHasher()
+    return _password_hasher
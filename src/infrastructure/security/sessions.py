@@ -0,0 +1,176 @@
+"""
+Session tokens and the in-process session cache.
+
+Session tokens are random, so they need no salt or slow hash: they are
+stored as an HMAC-SHA256 digest keyed with SESSION_TOKEN_SECRET. The digest
+is deterministic, so validating a token is one lookup on the indexed
+`user_sessions.token_hash` column, and a leaked sessions table cannot be
+replayed without the key.
+
+Validated sessions are kept in memory for a short TTL, so most
+authenticated requests do no database query at all. Logout and user
+suspension revoke entries immediately in this process; other workers
+notice once their cached entry expires.
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_TTL_SECONDS = 60.0
+DEFAULT_MAX_SESSIONS = 10_000
+
+_token_secret: Optional[bytes] = None
+
+
+def _secret() -> bytes:
+    global _token_secret
+    if _token_secret is None:
+        configured = os.getenv("SESSION_TOKEN_SECRET")
+        if configured:
+            _token_secret = configured.encode('utf-8')
+        else:
+            logger.warning(
+                "SESSION_TOKEN_SECRET not set; using a per-process key, "
+                "sessions will not survive restarts or be shared between workers"
+            )
+            _token_secret = secrets.token_bytes(32)
+    return _token_secret
+
+
+def generate_token() -> str:
+    """Generate a secure random session token."""
+    return secrets.token_urlsafe(32)
+
+
+def token_digest(token: str, secret: Optional[bytes] = None) -> str:
+    """
+    Digest a session token for storage and lookup.
+
+    Args:
+        token: Token handed to the client
+        secret: HMAC key (SESSION_TOKEN_SECRET by default)
+
+    Returns:
+        Hex HMAC-SHA256 of the token
+    """
+    return hmac.new(secret or _secret(), token.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+@dataclass(frozen=True)
+class SessionInfo:
+    """An authenticated session and the user it belongs to."""
+
+    user_id: str
+    email: str
+    name: str
+    role: str
+    expires_at: datetime
+    permissions: Tuple[str, ...] = field(default_factory=tuple)
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        return self.expires_at <= (now or datetime.now(timezone.utc))
+
+
+class SessionCache:
+    """Bounded TTL cache of validated sessions keyed by token digest."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_SESSION_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_SESSIONS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: How long a validated session is trusted without the database
+            max_entries: Sessions kept (least recently used evicted first)
+            clock: Monotonic clock, injectable for tests
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, SessionInfo]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self.stats = {"hits": 0, "misses": 0, "revoked": 0}
+
+    def get(self, digest: str) -> Optional[SessionInfo]:
+        """
+        Get a cached session.
+
+        Args:
+            digest: Token digest
+
+        Returns:
+            The session, or None if unknown, stale or expired
+        """
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        cached_at, session = entry
+        if self.clock() - cached_at >= self.ttl_seconds or session.is_expired():
+            self._remove(digest)
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.stats["hits"] += 1
+        return session
+
+    def put(self, digest: str, session: SessionInfo) -> None:
+        self._remove(digest)
+        self._entries[digest] = (self.clock(), session)
+        self._by_user.setdefault(session.user_id, set()).add(digest)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def revoke(self, digest: str) -> None:
+        """Forget one session, e.g. on logout."""
+        if self._remove(digest):
+            self.stats["revoked"] += 1
+
+    def revoke_user(self, user_id: str) -> None:
+        """Forget every session of a user, e.g. when the account is suspended."""
+        for digest in list(self._by_user.get(str(user_id), ())):
+            self.revoke(digest)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+
+    def _remove(self, digest: str) -> bool:
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return False
+        digests = self._by_user.get(entry[1].user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_user[entry[1].user_id]
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide session cache used by the user routes
+_session_cache: Optional[SessionCache] = None
+
+
+def get_session_cache() -> SessionCache:
+    """Get or create the process-wide session cache."""
+    global _session_cache
+    if _session_cache is None:
+        _session_cache = SessionCache()
+    return _session_cache
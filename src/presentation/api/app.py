@@ -20,6 +20,8 @@ from src.presentation.api.endpoints.network_router import router as network_rout
 from src.presentation.api.endpoints.anomaly_router import router as anomaly_router
 from src.presentation.api.endpoints.dashboard_router import router as dashboard_router
 from src.presentation.api.middleware.error_handler import ErrorHandlerMiddleware, register_error_handlers
+from src.presentation.api.middleware.instrumentation import instrument_app
+from src.presentation.api.middleware.response_cache import enable_response_cache
 
 
 # API models
@@ -64,6 +66,10 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Validators, 304s and a body cache for ranged GETs; added first so CORS
+# and instrumentation still wrap cached responses
+enable_response_cache(app)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -79,6 +85,9 @@ app.add_middleware(ErrorHandlerMiddleware)
 # Register error handlers
 register_error_handlers(app)
 
+# Request metrics (per-route latency, errors, in-flight) served on /api/v1/metrics
+instrument_app(app)
+
 # Initialize DI container
 container = Container()
 container.config.bigquery.project_id.from_env(
@@ -14,6 +14,13 @@ from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 import logging
 
+from src.infrastructure.cache.async_redis import AsyncRedisClient, get_async_redis
+from src.infrastructure.data.dashboard_snapshot import DashboardSnapshotService
+from src.infrastructure.security.audit_log import get_audit_writer
+from src.presentation.api.columnar import ResponseFormat, columnar_response, record_columns
+from src.presentation.api.middleware.instrumentation import instrument_app
+from src.presentation.api.middleware.response_cache import enable_response_cache
+
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
@@ -23,6 +30,10 @@ app = FastAPI(
     version="1.0.0-local",
 )
 
+# Validators, 304s and a body cache for ranged GETs; added first so CORS
+# and instrumentation still wrap cached responses
+enable_response_cache(app)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +43,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics (per-route latency, errors, in-flight) served on /api/v1/metrics
+instrument_app(app)
+
 # PostgreSQL connection details from environment
 POSTGRES_CONFIG = {
     "host": os.getenv("POSTGRES_HOST", "localhost"),
@@ -44,13 +58,34 @@ POSTGRES_CONFIG = {
 # Connection pool
 pool: asyncpg.Pool = None
 
+# Dashboard summary snapshot (built in the background, served from memory)
+snapshot_service: Optional[DashboardSnapshotService] = None
+
+
+async def _create_redis_client() -> Optional[AsyncRedisClient]:
+    """Create an optional Redis client used to share snapshots across workers."""
+    try:
+        client = get_async_redis()
+        await client.ping()
+        return client
+    except Exception as e:
+        logger.warning(f"Redis not available for dashboard snapshots: {e}")
+        return None
+
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database connection pool on startup."""
-    global pool
+    global pool, snapshot_service
     pool = await asyncpg.create_pool(**POSTGRES_CONFIG)
     app.state.pool = pool  # Store pool in app state for dependency injection
+
+    snapshot_service = DashboardSnapshotService(pool, redis_client=await _create_redis_client())
+    await snapshot_service.start()
+    app.state.snapshot_service = snapshot_service
+    
+    # Audit entries are queued by the user routes and written in batches
+    get_audit_writer().start(pool)
     
     # Include user routes
     try:
@@ -66,6 +101,10 @@ async def startup_event():
 async def shutdown_event():
     """Close database connection pool on shutdown."""
     global pool
+    if snapshot_service:
+        await snapshot_service.stop()
+    # Flush queued audit entries while the pool is still open
+    await get_audit_writer().stop()
     if pool:
         await pool.close()
 
@@ -136,111 +175,13 @@ async def list_nodes():
 
 @app.get("/api/v1/dashboard/summary")
 async def get_dashboard_summary():
-    """Get dashboard summary with KPIs including energy metrics."""
+    """Get dashboard summary with KPIs including energy metrics.
+
+    Served from the in-memory snapshot maintained by DashboardSnapshotService;
+    no database work happens on the request path once the snapshot is built.
+    """
     try:
-        async with pool.acquire() as conn:
-            # Get latest readings
-            latest_readings = await conn.fetch("""
-                SELECT 
-                    AVG(sr.flow_rate) as avg_flow,
-                    AVG(sr.pressure) as avg_pressure,
-                    MAX(sr.flow_rate) as max_flow,
-                    MAX(sr.pressure) as max_pressure,
-                    MIN(sr.pressure) as min_pressure,
-                    COUNT(DISTINCT sr.node_id) as active_nodes
-                FROM water_infrastructure.sensor_readings sr
-                JOIN water_infrastructure.nodes n ON sr.node_id = n.node_id
-                WHERE sr.timestamp > NOW() - INTERVAL '24 hours'
-                AND n.is_active = true
-            """)
-            
-            row = latest_readings[0] if latest_readings else None
-            
-            # Get all nodes with their latest readings for energy calculations
-            nodes_data = await conn.fetch("""
-                SELECT DISTINCT ON (n.node_id)
-                    n.node_id,
-                    n.node_name,
-                    COALESCE(sr.flow_rate, 0.0) as flow_rate,
-                    COALESCE(sr.pressure, 0.0) as pressure,
-                    0.0 as reservoir_level,
-                    sr.timestamp
-                FROM water_infrastructure.nodes n
-                LEFT JOIN water_infrastructure.sensor_readings sr 
-                    ON sr.node_id = n.node_id
-                    AND sr.timestamp > NOW() - INTERVAL '24 hours'
-                WHERE n.is_active = true
-                ORDER BY n.node_id, sr.timestamp DESC NULLS LAST
-            """)
-            
-            # Calculate energy consumption based on pump formula
-            # Power (kW) = Flow (m³/h) × Pressure (bar) × 2.75 / 100
-            total_power_kw = 0
-            energy_nodes = []
-            
-            for node in nodes_data:
-                flow_rate = float(node['flow_rate']) if node['flow_rate'] else 0.0
-                pressure = float(node['pressure']) if node['pressure'] else 0.0
-                
-                if flow_rate > 0 and pressure > 0:
-                    # Calculate power for this node
-                    power_kw = (flow_rate * pressure * 2.75) / 100
-                    total_power_kw += power_kw
-                    
-                    energy_nodes.append({
-                        'node_id': node['node_id'],
-                        'node_name': node['node_name'],
-                        'flow_rate': flow_rate,
-                        'pressure': pressure,
-                        'power_kw': round(power_kw, 2),
-                        'energy_cost_per_hour': round(power_kw * 0.20, 2)  # €0.20/kWh
-                    })
-            
-            # Calculate daily and monthly projections
-            daily_energy_kwh = total_power_kw * 24
-            monthly_energy_kwh = daily_energy_kwh * 30
-            daily_cost = daily_energy_kwh * 0.20  # €0.20/kWh average
-            monthly_cost = monthly_energy_kwh * 0.20
-            
-            # Calculate efficiency metrics
-            if row and row['avg_flow'] and row['avg_pressure']:
-                # Theoretical minimum power
-                avg_flow = float(row['avg_flow'])
-                avg_pressure = float(row['avg_pressure'])
-                theoretical_power = (avg_flow * avg_pressure * 2.78) / 100
-                # Actual efficiency
-                pump_efficiency = (theoretical_power / total_power_kw * 100) if total_power_kw > 0 else 0
-            else:
-                pump_efficiency = 70.0  # Default efficiency when no data
-            
-            return {
-                "kpis": {
-                    "total_flow": float(row["avg_flow"]) if row and row["avg_flow"] else 0,
-                    "average_pressure": float(row["avg_pressure"]) if row and row["avg_pressure"] else 0,
-                    "system_efficiency": 92.5,  # Placeholder
-                    "active_alerts": 3,  # Placeholder
-                    "water_quality_index": 95.8,  # Placeholder
-                    "energy_consumption": {
-                        "current_power_kw": round(total_power_kw, 2),
-                        "daily_consumption_kwh": round(daily_energy_kwh, 2),
-                        "monthly_consumption_kwh": round(monthly_energy_kwh, 2),
-                        "daily_cost_eur": round(daily_cost, 2),
-                        "monthly_cost_eur": round(monthly_cost, 2),
-                        "pump_efficiency_percent": round(pump_efficiency, 1),
-                        "cost_per_cubic_meter": round(daily_cost / (float(row['avg_flow']) * 24) if row and row['avg_flow'] and float(row['avg_flow']) > 0 else 0, 3)
-                    }
-                },
-                "nodes": [{
-                    "id": node["node_id"],
-                    "name": node["node_name"],
-                    "flow_rate": float(node["flow_rate"]) if node["flow_rate"] else 0,
-                    "pressure": float(node["pressure"]) if node["pressure"] else 0,
-                    "reservoir_level": float(node["reservoir_level"]) if node["reservoir_level"] else 0,
-                    "power_consumption_kw": node.get('power_kw', 0),
-                    "last_update": node["timestamp"].isoformat() if node["timestamp"] else None
-                } for node in nodes_data],
-                "energy_analysis": energy_nodes
-            }
+        return await snapshot_service.get_summary()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -324,7 +265,8 @@ async def get_node_readings(
     node_id: str,
     start_time: Optional[str] = Query(None, description="Start time for readings (ISO format)"),
     end_time: Optional[str] = Query(None, description="End time for readings (ISO format)"),
-    max_points: int = Query(500, description="Maximum number of data points to return")
+    max_points: int = Query(500, description="Maximum number of data points to return"),
+    response_format: ResponseFormat = Query(ResponseFormat.ROWS, alias="format", description="rows, columnar (arrays with epoch-ms timestamps) or arrow (IPC stream)")
 ):
     """Get sensor readings for a specific node with intelligent data aggregation based on time range."""
     try:
@@ -408,6 +350,12 @@ async def get_node_readings(
             
             rows = await conn.fetch(query, *params)
             
+            if response_format != ResponseFormat.ROWS:
+                return columnar_response(
+                    record_columns(rows, ["timestamp", "flow_rate", "pressure", "temperature"]),
+                    response_format
+                )
+            
             readings = []
             for row in rows:
                 readings.append({
@@ -428,7 +376,8 @@ async def get_node_readings(
 async def get_efficiency_trends(
     start_time: Optional[str] = Query(None, description="Start time (ISO format)"),
     end_time: Optional[str] = Query(None, description="End time (ISO format)"),
-    aggregation: str = Query("weekly", description="Aggregation level: daily, weekly, monthly")
+    aggregation: str = Query("weekly", description="Aggregation level: daily, weekly, monthly"),
+    response_format: ResponseFormat = Query(ResponseFormat.ROWS, alias="format", description="rows, columnar (arrays with epoch-ms timestamps) or arrow (IPC stream)")
 ):
     """Get efficiency trends based on real sensor data."""
     try:
@@ -501,6 +450,7 @@ async def get_efficiency_trends(
             FROM time_series
         )
         SELECT 
+            period_start,
             to_char(period_start, '{date_format}') as timestamp,
             energy_efficiency,
             water_loss,
@@ -513,6 +463,18 @@ async def get_efficiency_trends(
         async with pool.acquire() as connection:
             rows = await connection.fetch(query, start_dt, end_dt)
             
+            if response_format != ResponseFormat.ROWS:
+                return columnar_response(
+                    record_columns(rows, {
+                        "timestamp": "period_start",
+                        "energyEfficiency": "energy_efficiency",
+                        "waterLoss": "water_loss",
+                        "pumpEfficiency": "pump_efficiency",
+                        "operationalCost": "operational_cost",
+                    }),
+                    response_format
+                )
+            
             return [
                 {
                     "timestamp": row["timestamp"],
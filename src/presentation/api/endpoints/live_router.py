@@ -0,0 +1,106 @@
+"""
+Live stream API endpoints.
+
+Pushes latest-reading deltas and anomalies from the live feed (relayed
+from the ingesting processes over Redis) over Server-Sent Events or a
+WebSocket, so dashboards stop polling. Each
+event carries its sequence number; reconnecting clients send the last one
+they received (the SSE `Last-Event-ID` header or `since`) to resume.
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Header, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from src.infrastructure.data.live_feed import LiveBroadcaster, LiveSubscription, get_live_broadcaster
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/stream", tags=["live"])
+
+# Idle SSE streams send a comment this often so proxies keep them open
+# and disconnected clients are noticed
+HEARTBEAT_SECONDS = 15.0
+# Reconnect delay suggested to SSE clients, in milliseconds
+RETRY_MS = 1000
+# WebSocket close code for dropped slow consumers ("try again later")
+WS_TRY_AGAIN_LATER = 1013
+
+
+def _broadcaster(app) -> LiveBroadcaster:
+    return getattr(app.state, "live_broadcaster", None) or get_live_broadcaster()
+
+
+def _resume_from(since: Optional[int], last_event_id: Optional[str]) -> Optional[int]:
+    """Sequence number to resume from; the query parameter wins over the header."""
+    if since is not None:
+        return since
+    if last_event_id and last_event_id.strip().isdigit():
+        return int(last_event_id)
+    return None
+
+
+async def _sse_frames(
+    request: Request,
+    subscription: LiveSubscription,
+    heartbeat: float
+) -> AsyncIterator[str]:
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            try:
+                event = await subscription.get(timeout=heartbeat)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                # Dropped as a slow consumer; the client reconnects and resumes
+                break
+            yield event.sse
+    finally:
+        subscription.close()
+
+
+@router.get("/readings")
+async def stream_readings(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="Resume after this sequence number"),
+    last_event_id: Optional[str] = Header(None)
+):
+    """Server-Sent Events stream of latest-reading deltas and anomalies."""
+    subscription = _broadcaster(request.app).subscribe(_resume_from(since, last_event_id))
+    return StreamingResponse(
+        _sse_frames(request, subscription, HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def stream_readings_ws(
+    websocket: WebSocket,
+    since: Optional[int] = Query(None, ge=0)
+):
+    """WebSocket stream of the same events, one JSON message per event."""
+    await websocket.accept()
+    subscription = _broadcaster(websocket.app).subscribe(since)
+    try:
+        async for event in subscription:
+            await websocket.send_text(event.message)
+        if subscription.dropped:
+            await websocket.close(code=WS_TRY_AGAIN_LATER)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
+
+@router.get("/stats")
+async def stream_stats(request: Request):
+    """Sequence number, subscriber count and delivery counters of the live feed."""
+    return _broadcaster(request.app).snapshot_stats()
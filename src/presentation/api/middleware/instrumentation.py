@@ -0,0 +1,85 @@
+"""Request instrumentation middleware and metrics endpoint for the API."""
+
+import logging
+import time
+from typing import Optional
+
+from fastapi import APIRouter, FastAPI, Query, Request
+
+from src.infrastructure.monitoring.request_metrics import (
+    UNMATCHED_ROUTE,
+    RequestMetrics,
+    get_request_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentationMiddleware:
+    """
+    Records latency, status and in-flight count of every HTTP request.
+
+    A plain ASGI middleware (no request/response wrapping), keyed by the
+    matched route template so path parameters do not multiply routes.
+    """
+
+    def __init__(self, app, metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.metrics = metrics or get_request_metrics()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.request_started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            self.metrics.request_finished(
+                scope["method"], route, status, (time.perf_counter() - start) * 1000
+            )
+
+
+router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/api/v1/metrics")
+async def get_metrics(
+    request: Request,
+    window_seconds: int = Query(300, ge=1, le=86400, description="Window for rates and percentiles")
+):
+    """Request latency, error, in-flight and process resource metrics."""
+    metrics = getattr(request.app.state, "request_metrics", None) or get_request_metrics()
+    return metrics.snapshot(window_seconds)
+
+
+def instrument_app(app: FastAPI, metrics: Optional[RequestMetrics] = None) -> RequestMetrics:
+    """
+    Add request instrumentation and the metrics endpoint to an app.
+
+    Call after the app's other middleware so latency covers all of it.
+
+    Args:
+        app: FastAPI application
+        metrics: Metrics store (the process-wide one by default)
+
+    Returns:
+        The metrics store used
+    """
+    metrics = metrics or get_request_metrics()
+    app.state.request_metrics = metrics
+    app.add_middleware(InstrumentationMiddleware, metrics=metrics)
+    app.include_router(router)
+    return metrics
@@ -0,0 +1,278 @@
+"""
+Conditional caching for time-series responses.
+
+Applies to GET requests that name an explicit time range (an end time or
+date in the query). Their ETag is derived from the path, the normalized
+query string and the shared data version (see data_version):
+
+- ranges that ended before `settle` ago are closed: their ETag changes
+  only when past data is reloaded, and they are served with a long
+  `Cache-Control: max-age`;
+- ranges still open also follow the ingest counter and are sent with
+  `Cache-Control: no-cache`, so clients revalidate on every use.
+
+`If-None-Match` / `If-Modified-Since` are answered with 304 before the
+endpoint runs. Bodies are also kept in a bounded in-process LRU keyed the
+same way, so a repeated request from another client skips the endpoint
+too. Requests without a range, streams and excluded paths pass through.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI
+
+from src.infrastructure.cache.data_version import (
+    DEFAULT_SETTLE,
+    DataVersion,
+    VersionStamp,
+    get_data_version,
+)
+
+logger = logging.getLogger(__name__)
+
+# Query parameters holding the end of the requested range
+END_PARAMETERS = ("end_time", "end_date", "end")
+# Streams, auth and process metrics are never cached
+DEFAULT_EXCLUDED_PREFIXES = ("/api/v1/stream", "/api/v1/metrics", "/api/v1/auth", "/health")
+DEFAULT_CLOSED_MAX_AGE = 86400
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body with the data version it was built from."""
+
+    version: str
+    status: int
+    headers: Headers
+    body: bytes
+
+
+class ResponseCache:
+    """Bounded LRU of response bodies plus hit/miss counters."""
+
+    def __init__(self, max_entries: int = 512, max_body_bytes: int = 4 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Responses kept (least recently used evicted first)
+            max_body_bytes: Larger responses are validated but not stored
+        """
+        self.max_entries = max_entries
+        self.max_body_bytes = max_body_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.stats = {"hits": 0, "not_modified": 0, "misses": 0, "stored": 0, "bypassed": 0}
+
+    def get(self, key: str, version: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_body_bytes:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.stats["stored"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _parse_end(value: str) -> Optional[datetime]:
+    """End of a range as an aware datetime; a bare date covers that whole day."""
+    value = value.strip().replace("Z", "+00:00")
+    # An unencoded "+" in an offset arrives as a space
+    for candidate in (value, value.replace(" ", "+")):
+        try:
+            moment = datetime.fromisoformat(candidate)
+            break
+        except ValueError:
+            continue
+    else:
+        return None
+    if len(value) <= 10:
+        moment += timedelta(days=1)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware adding validators, 304s and a body cache for ranged GETs."""
+
+    def __init__(
+        self,
+        app,
+        cache: Optional[ResponseCache] = None,
+        data_version: Optional[DataVersion] = None,
+        excluded_prefixes: Sequence[str] = DEFAULT_EXCLUDED_PREFIXES,
+        settle: timedelta = DEFAULT_SETTLE,
+        closed_max_age: int = DEFAULT_CLOSED_MAX_AGE,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)
+    ):
+        self.app = app
+        self.cache = cache if cache is not None else ResponseCache()
+        self.data_version = data_version
+        self.excluded_prefixes = tuple(excluded_prefixes)
+        self.settle = settle
+        self.closed_max_age = closed_max_age
+        self.clock = clock
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or scope["path"].startswith(self.excluded_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        query = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+        end = next((_parse_end(value) for name, value in query if name in END_PARAMETERS), None)
+        stamp = await self._stamp() if end is not None else None
+        if stamp is None:
+            self.cache.stats["bypassed"] += 1
+            await self.app(scope, receive, send)
+            return
+
+        closed = end <= self.clock() - self.settle
+        version = f"g{stamp.generation}" if closed else f"g{stamp.generation}.i{stamp.ingest}"
+        changed_at = stamp.generation_at if closed else max(stamp.generation_at, stamp.ingest_at)
+        authorization = _header(scope, b"authorization")
+        key = "\n".join([
+            scope["path"],
+            "&".join(f"{name}={value}" for name, value in query),
+            hashlib.sha1(authorization.encode()).hexdigest() if authorization else "",
+        ])
+        etag = f'W/"{hashlib.sha1(f"{key}|{version}".encode()).hexdigest()[:24]}"'
+        validators = self._validator_headers(etag, changed_at, closed, private=bool(authorization))
+
+        if self._not_modified(scope, etag, changed_at):
+            self.cache.stats["not_modified"] += 1
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        entry = self.cache.get(key, version)
+        if entry is not None:
+            self.cache.stats["hits"] += 1
+            await send({"type": "http.response.start", "status": entry.status, "headers": entry.headers + validators})
+            await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else entry.body})
+            return
+
+        self.cache.stats["misses"] += 1
+        await self._call_and_store(scope, receive, send, key, version, validators)
+
+    async def _stamp(self) -> Optional[VersionStamp]:
+        return await (self.data_version or get_data_version()).current()
+
+    def _validator_headers(self, etag: str, changed_at: float, closed: bool, private: bool) -> Headers:
+        scope = "private" if private else "public"
+        cache_control = f"{scope}, max-age={self.closed_max_age}" if closed else f"{scope}, no-cache"
+        headers = [(b"etag", etag.encode()), (b"cache-control", cache_control.encode())]
+        if changed_at:
+            last_modified = format_datetime(datetime.fromtimestamp(int(changed_at), timezone.utc), usegmt=True)
+            headers.append((b"last-modified", last_modified.encode()))
+        return headers
+
+    def _not_modified(self, scope, etag: str, changed_at: float) -> bool:
+        if_none_match = _header(scope, b"if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip() for tag in if_none_match.split(",")}
+            # Weak comparison: W/"x" and "x" match
+            return "*" in tags or etag in tags or etag[2:] in tags
+        if_modified_since = _header(scope, b"if-modified-since")
+        if if_modified_since and changed_at:
+            try:
+                return int(changed_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    async def _call_and_store(self, scope, receive, send, key: str, version: str, validators: Headers):
+        """Run the endpoint, adding validators to a 200 and keeping its body."""
+        start: Dict = {}
+        headers: Headers = []
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def capture(message):
+            nonlocal passthrough
+            if message["type"] == "http.response.start":
+                headers.extend(message.get("headers", []))
+                content_type = next((value for name, value in headers if name == b"content-type"), b"")
+                if message["status"] != 200 or content_type.startswith(b"text/event-stream"):
+                    passthrough = True
+                    await send(message)
+                    return
+                start.update(message, headers=headers + validators)
+                return
+            if passthrough:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            if scope["method"] == "GET":
+                self.cache.put(key, CachedResponse(
+                    version=version,
+                    status=start["status"],
+                    headers=headers,
+                    body=body,
+                ))
+
+        await self.app(scope, receive, capture)
+
+
+def enable_response_cache(
+    app: FastAPI,
+    cache: Optional[ResponseCache] = None,
+    data_version: Optional[DataVersion] = None,
+    **options
+) -> ResponseCache:
+    """
+    Add conditional caching of ranged GET responses to an app.
+
+    Add it before CORS and instrumentation middleware so those still run
+    for cached and 304 responses.
+
+    Args:
+        app: FastAPI application
+        cache: Response store (a new one by default)
+        data_version: Data version reader (the process-wide one by default)
+        **options: Further ResponseCacheMiddleware options
+
+    Returns:
+        The response store used
+    """
+    cache = cache if cache is not None else ResponseCache()
+    app.state.response_cache = cache
+    app.add_middleware(ResponseCacheMiddleware, cache=cache, data_version=data_version, **options)
+    return cache
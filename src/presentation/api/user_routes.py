@@ -1,13 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi import APIRouter, HTTPException, Query, Depends, Header, Request
 from pydantic import BaseModel, EmailStr
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 import asyncpg
-import bcrypt
-import secrets
 import uuid
 import logging
 
+from src.infrastructure.security.audit_log import audit_record, get_audit_writer
+from src.infrastructure.security.passwords import get_password_hasher
+from src.infrastructure.security.sessions import (
+    SessionInfo,
+    generate_token,
+    get_session_cache,
+    token_digest,
+)
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1")
@@ -62,35 +69,85 @@ async def get_db_pool(request: Request):
     return request.app.state.pool
 
 # Helper functions
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+def _bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+async def load_session(pool: asyncpg.Pool, token: str) -> Optional[SessionInfo]:
+    """Resolve a session token: in-memory cache first, then one indexed lookup"""
+    digest = token_digest(token)
+    cache = get_session_cache()
+    session = cache.get(digest)
+    if session is not None:
+        return session
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT u.id, u.email, u.name, u.role, s.expires_at,
+                   COALESCE(ARRAY(
+                       SELECT permission FROM water_infrastructure.user_permissions p
+                       WHERE p.user_id = u.id
+                   ), '{}') AS permissions
+            FROM water_infrastructure.user_sessions s
+            JOIN water_infrastructure.users u ON u.id = s.user_id
+            WHERE s.token_hash = $1 AND s.expires_at > NOW() AND u.status = 'active'
+        """, digest)
+    
+    if not row:
+        return None
+    session = SessionInfo(
+        user_id=str(row['id']),
+        email=row['email'],
+        name=row['name'],
+        role=row['role'],
+        expires_at=row['expires_at'],
+        permissions=tuple(row['permissions']),
+    )
+    cache.put(digest, session)
+    return session
+
+async def get_optional_session(
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    authorization: Optional[str] = Header(None)
+) -> Optional[SessionInfo]:
+    """Session of the bearer token, or None if no valid token was sent"""
+    token = _bearer_token(authorization)
+    if token is None:
+        return None
+    return await load_session(pool, token)
 
-def verify_password(password: str, hashed: str) -> bool:
-    """Verify a password against a hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def get_current_session(
+    session: Optional[SessionInfo] = Depends(get_optional_session)
+) -> SessionInfo:
+    """Session of the bearer token; 401 if missing, expired or revoked"""
+    if session is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+    return session
 
-def generate_token() -> str:
-    """Generate a secure random token"""
-    return secrets.token_urlsafe(32)
+async def revoke_user_sessions(conn, user_id: str):
+    """End every session of a user, here and in the database"""
+    await conn.execute("""
+        DELETE FROM water_infrastructure.user_sessions WHERE user_id = $1
+    """, uuid.UUID(user_id))
+    get_session_cache().revoke_user(user_id)
 
 async def log_audit(pool: asyncpg.Pool, user_id: Optional[str], action: str, 
                    entity_type: Optional[str] = None, entity_id: Optional[str] = None,
                    old_values: Optional[dict] = None, new_values: Optional[dict] = None,
                    ip_address: Optional[str] = None, success: bool = True, 
                    error_message: Optional[str] = None):
-    """Log an audit entry"""
-    try:
-        async with pool.acquire() as conn:
-            await conn.execute("""
-                INSERT INTO water_infrastructure.audit_logs 
-                (user_id, action, entity_type, entity_id, old_values, new_values, 
-                 ip_address, success, error_message)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-            """, user_id, action, entity_type, entity_id, 
-                old_values, new_values, ip_address, success, error_message)
-    except Exception as e:
-        logger.error(f"Failed to log audit: {e}")
+    """Log an audit entry (queued for the batched writer once it is started)"""
+    record = audit_record(user_id, action, entity_type, entity_id, old_values, new_values,
+                          ip_address, success, error_message)
+    writer = get_audit_writer()
+    if writer.running:
+        await writer.submit(record)
+    else:
+        await writer.write([record], pool)
 
 # Authentication endpoints
 @router.post("/auth/login")
@@ -107,7 +164,12 @@ async def login(
             FROM water_infrastructure.users
             WHERE email = $1
         """, credentials.email)
-        
+    
+    # Verify in the hashing pool, without holding a database connection
+    password_ok = bool(user) and await get_password_hasher().verify(
+        credentials.password, user['password_hash'])
+    
+    async with pool.acquire() as conn:
         if not user:
             await log_audit(pool, None, "Login Failed - User Not Found", 
                           ip_address=request.client.host, success=False)
@@ -126,7 +188,7 @@ async def login(
             raise HTTPException(status_code=401, detail="Account is not active")
         
         # Verify password
-        if not verify_password(credentials.password, user['password_hash']):
+        if not password_ok:
             # Increment failed attempts
             failed_attempts = user['failed_login_attempts'] + 1
             locked_until = None
@@ -154,7 +216,7 @@ async def login(
         
         # Create session
         token = generate_token()
-        token_hash = bcrypt.hashpw(token.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        token_hash = token_digest(token)
         expires_at = datetime.now(timezone.utc) + timedelta(hours=8)
         
         await conn.execute("""
@@ -173,6 +235,15 @@ async def login(
         await log_audit(pool, user['id'], "User Login", 
                        ip_address=request.client.host, success=True)
         
+        get_session_cache().put(token_hash, SessionInfo(
+            user_id=str(user['id']),
+            email=user['email'],
+            name=user['name'],
+            role=user['role'],
+            expires_at=expires_at,
+            permissions=tuple(p['permission'] for p in permissions),
+        ))
+        
         return {
             "token": token,
             "user": {
@@ -184,6 +255,46 @@ async def login(
             }
         }
 
+@router.post("/auth/logout")
+async def logout(
+    request: Request,
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    authorization: Optional[str] = Header(None)
+):
+    """End the session of the bearer token"""
+    token = _bearer_token(authorization)
+    if token is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+    
+    digest = token_digest(token)
+    get_session_cache().revoke(digest)
+    async with pool.acquire() as conn:
+        user_id = await conn.fetchval("""
+            DELETE FROM water_infrastructure.user_sessions
+            WHERE token_hash = $1
+            RETURNING user_id
+        """, digest)
+    
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+    
+    await log_audit(pool, user_id, "User Logout", ip_address=request.client.host)
+    return {"message": "Logged out"}
+
+@router.get("/auth/session")
+async def get_session(session: SessionInfo = Depends(get_current_session)):
+    """Validate the bearer token and return its user"""
+    return {
+        "user": {
+            "id": session.user_id,
+            "email": session.email,
+            "name": session.name,
+            "role": session.role,
+            "permissions": list(session.permissions)
+        },
+        "expires_at": session.expires_at
+    }
+
 # User management endpoints
 @router.get("/users")
 async def get_users(
@@ -287,7 +398,7 @@ async def create_user(
             raise HTTPException(status_code=400, detail="Email already registered")
         
         # Hash password
-        password_hash = hash_password(user_data.password)
+        password_hash = await get_password_hasher().hash(user_data.password)
         
         try:
             # Create user
@@ -376,6 +487,10 @@ async def update_user(
         
         await conn.execute(query, *params)
         
+        # Cached sessions carry the role; drop them when access changes
+        if 'role' in update_dict or update_dict.get('status', 'active') != 'active':
+            await revoke_user_sessions(conn, user_id)
+        
         await log_audit(pool, user_id, "User Updated", "user", user_id,
                        old_values={k: current_user[k] for k in update_dict.keys()},
                        new_values=update_dict,
@@ -405,6 +520,7 @@ async def delete_user(
             SET status = 'suspended'
             WHERE id = $1
         """, uuid.UUID(user_id))
+        await revoke_user_sessions(conn, user_id)
         
         await log_audit(pool, user_id, "User Deleted", "user", user_id,
                        ip_address=request.client.host)
@@ -612,18 +728,19 @@ async def update_system_config(
 @router.get("/profile")
 async def get_current_user_profile(
     request: Request,
-    pool: asyncpg.Pool = Depends(get_db_pool)
+    pool: asyncpg.Pool = Depends(get_db_pool),
+    session: Optional[SessionInfo] = Depends(get_optional_session)
 ):
-    """Get current user profile (mock for demo)"""
-    # In production, this would get the user from the session token
-    # For demo, return Giovanni Rossi
+    """Get current user profile (demo user without a session token)"""
+    # For demo, requests without a session return Giovanni Rossi
+    email = session.email if session else 'giovanni.rossi@roccavina.it'
     async with pool.acquire() as conn:
         user = await conn.fetchrow("""
             SELECT id, email, name, role, department, phone, location, bio,
                    status, two_factor_enabled, last_login, created_at
             FROM water_infrastructure.users
-            WHERE email = 'giovanni.rossi@roccavina.it'
-        """)
+            WHERE email = $1
+        """, email)
         
         if user:
             permissions = await conn.fetch("""
@@ -11,6 +11,7 @@ import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 from src.infrastructure.cache.cache_initializer import get_cache_manager
+from src.presentation.streamlit.utils.live_feed_client import get_live_feed_client
 from src.presentation.streamlit.utils.node_mappings import ALL_NODE_MAPPINGS, get_node_display_name
 
 
@@ -20,6 +21,8 @@ class OverviewTab:
     def __init__(self):
         """Initialize the overview tab with Redis cache manager."""
         self.cache_manager = get_cache_manager()
+        # Latest readings pushed by the API, shared by all sessions
+        self.live_feed = get_live_feed_client()
     
     def render(self, time_range: str, selected_nodes: List[str]) -> None:
         """
@@ -186,8 +189,11 @@ class OverviewTab:
                 node_id = ALL_NODE_MAPPINGS.get(node_name)
                 
                 if node_id and not node_id.startswith("00000000"):
-                    # Get latest reading from cache
-                    latest = self.cache_manager.get_latest_reading(node_id)
+                    # Pushed latest reading, falling back to the cache before the first push
+                    latest = (
+                        self.live_feed.get_latest_reading(node_id)
+                        or self.cache_manager.get_latest_reading(node_id)
+                    )
                     
                     if latest:
                         flow = latest.get("flow_rate", 0)
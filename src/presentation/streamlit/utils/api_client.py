@@ -7,7 +7,7 @@ in the dashboard.
 """
 
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import requests
 from requests.adapters import HTTPAdapter
@@ -15,6 +15,8 @@ from requests.packages.urllib3.util.retry import Retry
 import streamlit as st
 import pandas as pd
 
+from src.presentation.api import columnar
+
 
 class APIClient:
     """Client for interacting with the Processing Services API."""
@@ -94,14 +96,31 @@ class APIClient:
         return result or []
         
     @st.cache_data(ttl=30)  # Cache for 30 seconds
-    def get_node_metrics(_self, node_id: str, time_window: str = "1hour") -> Optional[Dict[str, Any]]:
-        """Get latest metrics for a specific node."""
+    def get_nodes_metrics(
+        _self,
+        node_ids: Optional[Tuple[str, ...]] = None,
+        time_window: str = "1hour"
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get latest metrics for many nodes (all when None) in one request, keyed by node_id."""
+        params = {"time_window": time_window}
+        if node_ids:
+            params["node_ids"] = list(node_ids)
+            
         result = _self._make_request(
-            "GET", 
-            f"/api/v1/nodes/{node_id}/metrics",
-            params={"time_window": time_window}
+            "GET",
+            "/api/v1/nodes/metrics",
+            params=params
         )
-        return result
+        return {metrics["node_id"]: metrics for metrics in result or []}
+        
+    def get_node_metrics(self, node_id: str, time_window: str = "1hour") -> Optional[Dict[str, Any]]:
+        """
+        Get latest metrics for a specific node.
+        
+        Served from the cached all-nodes batch, so rendering N nodes costs
+        one request instead of N.
+        """
+        return self.get_nodes_metrics(None, time_window).get(node_id)
         
     @st.cache_data(ttl=300)  # Cache for 5 minutes
     def get_node_history(
@@ -112,7 +131,8 @@ class APIClient:
         time_window: str = "1hour"
     ) -> pd.DataFrame:
         """Get historical metrics for a node."""
-        params = {"time_window": time_window}
+        # Columnar: one array per field, window_start as epoch-ms "timestamps"
+        params = {"time_window": time_window, "format": "columnar"}
         
         if start_time:
             params["start_time"] = start_time.isoformat()
@@ -126,11 +146,7 @@ class APIClient:
         )
         
         if result:
-            df = pd.DataFrame(result)
-            if not df.empty:
-                df['window_start'] = pd.to_datetime(df['window_start'])
-                df['window_end'] = pd.to_datetime(df['window_end'])
-            return df
+            return columnar.columnar_to_frame(result, "window_start", ["window_end"])
         return pd.DataFrame()
         
     @st.cache_data(ttl=60)
@@ -0,0 +1,155 @@
+"""
+Live feed client for the dashboard.
+
+Keeps one Server-Sent Events connection to the API's live stream per
+Streamlit server process and applies the pushed latest-reading deltas and
+anomalies to an in-memory state that every session reads. Dashboards then
+render the latest values without polling the API. After a disconnect the
+client reconnects with the last sequence number it applied and receives
+only what it missed.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+import requests
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+STREAM_PATH = "/api/v1/stream/readings"
+# The server sends a keepalive every 15s, so a silent connection is dead
+READ_TIMEOUT_SECONDS = 60
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+
+def parse_sse(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the data of each Server-Sent Event in a stream of lines.
+
+    Comments and fields other than `data` are ignored; multi-line data is
+    joined with newlines as the SSE format specifies.
+    """
+    data: List[str] = []
+    for line in lines:
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+
+
+class LiveFeedClient:
+    """Follows the live stream in a background thread."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        anomaly_limit: int = 100
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: Base URL for the API (defaults to environment variable or localhost)
+            session: HTTP session used for the stream
+            anomaly_limit: Number of recent anomalies kept
+        """
+        self.base_url = base_url or os.getenv("API_BASE_URL", "http://localhost:8000")
+        self.session = session or requests.Session()
+        self.last_seq: Optional[int] = None
+        self.connected = False
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._anomalies: Deque[Dict[str, Any]] = deque(maxlen=anomaly_limit)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start following the stream (no-op if already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.session.close()
+
+    def apply(self, message: Dict[str, Any]) -> None:
+        """Apply one stream message to the local state."""
+        data = message.get("data", {})
+        with self._lock:
+            if message["type"] == "snapshot":
+                self._latest = {node_id: dict(state) for node_id, state in data.get("nodes", {}).items()}
+            elif message["type"] == "readings":
+                for node_id, delta in data.get("nodes", {}).items():
+                    self._latest.setdefault(node_id, {}).update(delta)
+            elif message["type"] == "anomalies":
+                self._anomalies.extendleft(data.get("anomalies", []))
+            self.last_seq = message["seq"]
+
+    def get_latest_reading(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """Latest pushed reading of a node, if one was received."""
+        with self._lock:
+            state = self._latest.get(node_id)
+            return dict(state) if state else None
+
+    def get_latest_readings(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {node_id: dict(state) for node_id, state in self._latest.items()}
+
+    def get_recent_anomalies(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent pushed anomalies, newest first."""
+        with self._lock:
+            return list(self._anomalies)[:limit]
+
+    # ====================================
+    # Stream handling
+    # ====================================
+
+    def _run(self) -> None:
+        delay = 1.0
+        while not self._stop.is_set():
+            try:
+                self._follow()
+                delay = 1.0
+            except (requests.RequestException, ValueError, KeyError) as e:
+                logger.warning(f"Live feed disconnected, retrying in {delay:.0f}s: {e}")
+                delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+            finally:
+                self.connected = False
+            self._stop.wait(delay)
+
+    def _follow(self) -> None:
+        """Read the stream until it ends; the server ends it for slow consumers."""
+        headers = {"Accept": "text/event-stream"}
+        if self.last_seq is not None:
+            headers["Last-Event-ID"] = str(self.last_seq)
+        with self.session.get(
+            f"{self.base_url}{STREAM_PATH}",
+            headers=headers,
+            stream=True,
+            timeout=(5, READ_TIMEOUT_SECONDS)
+        ) as response:
+            response.raise_for_status()
+            self.connected = True
+            for data in parse_sse(response.iter_lines(decode_unicode=True)):
+                self.apply(json.loads(data))
+                if self._stop.is_set():
+                    return
+
+
+@st.cache_resource
+def get_live_feed_client() -> LiveFeedClient:
+    """Get the live feed client shared by all sessions of this server."""
+    client = LiveFeedClient()
+    client.start()
+    return client
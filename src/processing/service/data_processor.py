@@ -187,7 +187,7 @@ class DataProcessor:
             ]
         )
         
-        return self.bigquery_client.client.query(query, job_config=job_config).to_dataframe()
+        return self.bigquery_client.arrow.read_dataframe(query, job_config)
         
     def _compute_metrics(self, df: pd.DataFrame, node_id: str, window: str) -> List[Dict[str, Any]]:
         """Compute aggregated metrics for a time window."""
@@ -303,6 +303,9 @@ class DataProcessor:
                 ],
                 schema_name='water_infrastructure'
             )
+        await self.postgres_manager.record_data_change(
+            min(m['window_start'] for m in metrics)
+        )
             
     async def _get_nodes_with_data(
         self, 
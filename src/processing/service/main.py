@@ -23,6 +23,9 @@ from src.processing.service.scheduler import ProcessingScheduler
 from src.infrastructure.database.postgres_manager import get_postgres_manager
 from src.infrastructure.bigquery.bigquery_client import BigQueryClient
 
+# Watermark source for the processing cycle (a single source-level watermark)
+WATERMARK_SOURCE = 'processing_service'
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -232,7 +235,12 @@ class ProcessingService:
         }
         
     async def _get_last_processed_timestamp(self) -> Optional[datetime]:
-        """Get the last processed timestamp from database."""
+        """Get the last processed timestamp from the persisted watermark."""
+        watermarks = await self.postgres_manager.get_watermarks(WATERMARK_SOURCE)
+        if '*' in watermarks:
+            return watermarks['*']
+            
+        # First run: fall back to the newest computed window
         async with self.postgres_manager.acquire() as conn:
             result = await conn.fetchval("""
                 SELECT MAX(window_end) 
@@ -241,10 +249,8 @@ class ProcessingService:
             return result
             
     async def _save_last_processed_timestamp(self, timestamp: datetime):
-        """Save the last processed timestamp."""
-        # This could be stored in a dedicated table or Redis
-        # For now, we rely on the computed_metrics table
-        pass
+        """Persist the last processed timestamp so restarts resume from it."""
+        await self.postgres_manager.set_watermark(WATERMARK_SOURCE, timestamp)
         
     async def _create_processing_job(self) -> str:
         """Create a new processing job record."""
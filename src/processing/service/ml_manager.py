@@ -261,7 +261,7 @@ class MLModelManager:
             self.bigquery_client.client.query_parameter("sample_rate", "FLOAT64", sample_rate),
         ]
         
-        return self.bigquery_client.client.query(query, job_config=job_config).to_dataframe()
+        return self.bigquery_client.arrow.read_dataframe(query, job_config)
         
     def _prepare_flow_prediction_features(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
         """Prepare features for flow prediction model."""
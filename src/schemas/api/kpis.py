@@ -96,6 +96,8 @@ class SystemPerformanceKPIs(BaseModel):
     error_rate: float = Field(..., description="Error rate percentage")
     availability: float = Field(..., description="System availability percentage")
     reliability_score: float = Field(..., description="Reliability score")
+    cpu_utilization: Optional[float] = Field(None, description="API process CPU utilization percentage")
+    memory_utilization: Optional[float] = Field(None, description="API process memory utilization percentage")
 
 
 class NetworkEfficiencyKPIs(BaseModel):
@@ -217,6 +219,7 @@ class KPIDashboard(BaseModel):
     dashboard_id: str = Field(..., description="Dashboard identifier")
     title: str = Field(..., description="Dashboard title")
     last_updated: str = Field(..., description="Last update timestamp")
+    overall_health_score: float = Field(..., description="Overall health score across categories")
     system_performance: SystemPerformanceKPIs = Field(..., description="System performance KPIs")
     network_efficiency: NetworkEfficiencyKPIs = Field(..., description="Network efficiency KPIs")
     quality: QualityKPIs = Field(..., description="Quality KPIs")
@@ -229,6 +232,11 @@ class KPIDashboard(BaseModel):
     top_performing_metrics: List[str] = Field(..., description="Top performing metrics")
     improvement_needed: List[str] = Field(..., description="Metrics needing improvement")
 
+    @property
+    def quality_metrics(self) -> QualityKPIs:
+        """Alias of `quality`."""
+        return self.quality
+
 
 class KPIReport(BaseModel):
     """KPI report data."""
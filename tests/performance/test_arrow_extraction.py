@@ -0,0 +1,86 @@
+"""
+Benchmark for Arrow-native BigQuery extraction.
+
+Streams a Parquet file through ParquetBigQueryFake and ArrowQueryReader
+into a stand-in loader, measuring rows/s and the largest frame held at
+once, and times BigQuery-style row iteration into a DataFrame (what
+`to_dataframe()` on row objects amounts to) on a sample for comparison.
+Set ARROW_BENCH_ROWS to change the table size.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.infrastructure.bigquery.arrow_stream import ArrowQueryReader
+from src.infrastructure.bigquery.fake_bigquery import ParquetBigQueryFake
+
+ROWS = int(os.getenv("ARROW_BENCH_ROWS", 2_000_000))
+FRAME_ROWS = 100_000
+SAMPLE_ROWS = 100_000
+
+
+def write_readings(path, rows: int, nodes: int = 500) -> None:
+    rng = np.random.default_rng(5)
+    node = rng.integers(0, nodes, rows)
+    table = pa.table({
+        "timestamp": pd.Timestamp("2024-01-01", tz="UTC")
+        + pd.to_timedelta(np.arange(rows) * 30, unit="s"),
+        "node_id": np.char.add("NODE_", node.astype(str)),
+        "temperature": rng.normal(18, 2, rows),
+        "flow_rate": rng.normal(20, 5, rows),
+        "pressure": rng.normal(3, 0.3, rows),
+        "total_flow": rng.random(rows) * 1000,
+        "quality_score": rng.random(rows),
+    })
+    pq.write_table(table, path, row_group_size=FRAME_ROWS)
+
+
+@pytest.mark.performance
+class TestArrowExtraction:
+    """Benchmark streamed Arrow extraction against row iteration."""
+
+    @pytest.fixture
+    def parquet_file(self, tmp_path):
+        path = tmp_path / "sensor_readings.parquet"
+        write_readings(path, ROWS)
+        return path
+
+    def test_streamed_frames_rows_per_second(self, parquet_file):
+        """Frames stream at bounded size; throughput beats row iteration."""
+        fake = ParquetBigQueryFake({"sensor_readings": parquet_file}, batch_size=50_000)
+        reader = ArrowQueryReader(fake)
+
+        loaded = largest = 0
+        start = time.perf_counter()
+        for frame in reader.frames("SELECT * FROM sensor_readings", rows_per_frame=FRAME_ROWS):
+            loaded += len(frame)
+            largest = max(largest, len(frame))
+        arrow_elapsed = time.perf_counter() - start
+
+        sample = ParquetBigQueryFake({"": parquet_file}, batch_size=50_000)
+        start = time.perf_counter()
+        rows = []
+        for row in sample.query("SELECT 1").result():
+            rows.append(row)
+            if len(rows) == SAMPLE_ROWS:
+                break
+        pd.DataFrame(rows)
+        row_elapsed = (time.perf_counter() - start) * ROWS / SAMPLE_ROWS
+
+        rate = loaded / arrow_elapsed
+        print(
+            f"\nArrow frames: {loaded:,} rows in {arrow_elapsed:.2f}s = {rate:,.0f} rows/s, "
+            f"largest frame {largest:,} rows; "
+            f"row iteration (extrapolated): {row_elapsed:.2f}s "
+            f"({row_elapsed / arrow_elapsed:.1f}x slower)"
+        )
+
+        assert loaded == ROWS
+        assert largest <= FRAME_ROWS
+        assert arrow_elapsed < row_elapsed
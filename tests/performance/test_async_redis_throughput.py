@@ -0,0 +1,113 @@
+"""
+API throughput under concurrent load with blocking vs non-blocking Redis.
+
+Both variants serve the network metrics endpoint from a Redis hash with
+the same simulated round-trip latency. The blocking variant reproduces
+the previous handler, which called the synchronous client inside an async
+route and stalled the event loop for every request.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from src.api import main as api_main
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+from src.infrastructure.cache.fake_redis import FakeAsyncRedis
+from src.infrastructure.cache.redis_cache_manager import RedisCacheManager
+
+LATENCY_SECONDS = 0.01
+CONCURRENT_REQUESTS = 200
+METRICS = {
+    "active_nodes": "12",
+    "total_flow": "431.5",
+    "avg_pressure": "3.2",
+    "total_volume": "9120.0",
+    "anomaly_count": "4",
+}
+
+
+class BlockingRedis:
+    """Synchronous client stand-in that blocks for each round-trip."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def hgetall(self, key):
+        time.sleep(LATENCY_SECONDS)
+        return dict(self.data.get(key, {}))
+
+
+def blocking_app() -> FastAPI:
+    app = FastAPI()
+    redis_client = BlockingRedis({"system:metrics:24h": METRICS})
+
+    @app.get("/api/v1/network/metrics")
+    async def get_network_metrics(time_range: str = "24h"):
+        cached = redis_client.hgetall(f"system:metrics:{time_range}")
+        return {k: float(v) for k, v in cached.items()}
+
+    return app
+
+
+async def measure(app: FastAPI) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.get("/api/v1/network/metrics", params={"time_range": "24h"})
+            for _ in range(CONCURRENT_REQUESTS)
+        ])
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses)
+    return CONCURRENT_REQUESTS / elapsed
+
+
+@pytest.mark.performance
+class TestAsyncRedisThroughput:
+    """Compare API throughput with and without the async Redis layer."""
+
+    @pytest_asyncio.fixture
+    async def redis_backend(self):
+        backend = FakeAsyncRedis(latency_seconds=LATENCY_SECONDS)
+        manager = RedisCacheManager()
+        manager.async_client = AsyncRedisClient(client=backend)
+        await manager.async_client.hset("system:metrics:24h", mapping=METRICS)
+        api_main.app.state.redis = manager
+        api_main.app.state.postgres = AsyncMock()
+        yield backend
+        del api_main.app.state.redis
+        del api_main.app.state.postgres
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_do_not_serialize_on_redis(self, redis_backend):
+        """Awaited Redis calls overlap instead of queueing on the event loop."""
+        blocking_rps = await measure(blocking_app())
+        async_rps = await measure(api_main.app)
+
+        print(
+            f"\n{CONCURRENT_REQUESTS} concurrent requests, {LATENCY_SECONDS * 1000:.0f}ms Redis latency: "
+            f"blocking {blocking_rps:,.0f} req/s, async {async_rps:,.0f} req/s"
+        )
+
+        # A blocking client caps throughput at one request per round-trip
+        assert blocking_rps < 1.2 / LATENCY_SECONDS
+        assert async_rps > 3 * blocking_rps
+        api_main.app.state.postgres.get_system_metrics.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cached_metrics_are_decoded(self, redis_backend):
+        """The handler reads the hash with string keys from the decoded client."""
+        transport = httpx.ASGITransport(app=api_main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/v1/network/metrics")
+
+        body = response.json()
+        assert body["active_nodes"] == 12
+        assert body["total_flow"] == 431.5
+        assert body["anomaly_count"] == 4
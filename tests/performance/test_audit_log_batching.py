@@ -0,0 +1,80 @@
+"""
+Benchmark of audited request latency with inline and batched audit writes.
+
+Simulates 1000 concurrent audited actions against a pool whose every
+round-trip takes 2ms, first inserting each entry on the request path and
+then queueing it for AuditLogWriter, comparing request latency and the
+number of database round-trips.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.infrastructure.security.audit_log import AuditLogWriter, audit_record
+
+ACTIONS = 1000
+ROUND_TRIP = 0.002
+POOL_SIZE = 10
+
+
+class SlowPool:
+    """Pool stand-in with a fixed connection count and round-trip time."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self._slots = asyncio.Semaphore(POOL_SIZE)
+
+    @asynccontextmanager
+    async def acquire(self):
+        async with self._slots:
+            yield self
+
+    async def execute(self, query, *args):
+        self.round_trips += 1
+        await asyncio.sleep(ROUND_TRIP)
+
+    async def copy_records_to_table(self, table, schema_name, columns, records):
+        self.round_trips += 1
+        await asyncio.sleep(ROUND_TRIP)
+
+
+async def timed_requests(audit) -> float:
+    """Run ACTIONS concurrent requests and return the mean request latency."""
+    async def request(i):
+        start = time.perf_counter()
+        await audit(audit_record(None, "User Login", ip_address=f"10.0.{i // 256}.{i % 256}"))
+        return time.perf_counter() - start
+
+    latencies = await asyncio.gather(*(request(i) for i in range(ACTIONS)))
+    return sum(latencies) / len(latencies)
+
+
+@pytest.mark.performance
+class TestAuditLogBatching:
+    """Benchmark audit writes on and off the request path."""
+
+    @pytest.mark.asyncio
+    async def test_batched_writes(self):
+        """Queued entries add no round-trip to requests and share one COPY per batch."""
+        inline_pool = SlowPool()
+        writer = AuditLogWriter()
+        inline_latency = await timed_requests(lambda record: writer.write([record], inline_pool))
+
+        batched_pool = SlowPool()
+        writer.start(batched_pool)
+        batched_latency = await timed_requests(writer.submit)
+        await writer.stop()
+
+        print(
+            f"\n{ACTIONS} audited requests: inline {inline_latency * 1000:.1f}ms mean latency, "
+            f"{inline_pool.round_trips} round-trips; batched {batched_latency * 1000:.3f}ms, "
+            f"{batched_pool.round_trips} round-trips"
+        )
+
+        assert inline_pool.round_trips == ACTIONS
+        assert batched_pool.round_trips <= ACTIONS // writer.max_batch_size + 1
+        assert writer.stats["written"] == 2 * ACTIONS
+        assert batched_latency * 100 < inline_latency
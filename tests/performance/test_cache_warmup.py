@@ -0,0 +1,76 @@
+"""
+Benchmark for the Redis cache warm-up.
+
+Runs RedisCacheManager's warm-up over synthetic BigQuery results with a
+pipeline stand-in that only counts commands, so the measurement covers
+frame conversion and pipeline building without network latency.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure.bigquery.fake_bigquery import ParquetBigQueryFake
+from src.infrastructure.cache.redis_cache_manager import METRIC_COLUMNS, RedisCacheManager
+
+
+class CountingPipeline:
+    """Pipeline stand-in counting queued commands and executes."""
+
+    def __init__(self):
+        self.commands = 0
+        self.executes = 0
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands += 1
+            return self
+        return command
+
+    def execute(self):
+        self.executes += 1
+        return []
+
+
+@pytest.mark.performance
+class TestCacheWarmup:
+    """Benchmark keys/sec of the cache warm-up."""
+
+    NODES = 20_000
+
+    @pytest.fixture
+    def manager(self):
+        rng = np.random.default_rng(7)
+        node_ids = [f"NODE_{i:05d}" for i in range(self.NODES)]
+        metrics = pd.DataFrame({
+            "node_id": node_ids,
+            "reading_count": rng.integers(1, 1000, self.NODES),
+            **{column: rng.random(self.NODES) for column in METRIC_COLUMNS},
+        })
+
+        manager = RedisCacheManager()
+        manager.redis_client = MagicMock()
+        manager.redis_client.pipeline.return_value = CountingPipeline()
+        manager.bigquery_client = ParquetBigQueryFake({"": metrics})
+        return manager
+
+    def test_aggregated_metrics_keys_per_second(self, manager):
+        """Six time ranges of per-node metric hashes load in chunked pipelines."""
+        start = time.perf_counter()
+        keys = manager._cache_aggregated_metrics()
+        elapsed = time.perf_counter() - start
+
+        pipe = manager.redis_client.pipeline.return_value
+        rate = keys / elapsed
+        print(
+            f"\nWarm-up: {keys} keys in {elapsed:.2f}s = {rate:,.0f} keys/s, "
+            f"{pipe.executes} round-trips"
+        )
+
+        assert keys == 6 * (self.NODES + 1)
+        # HSET + EXPIRE per key, flushed every 5000 commands
+        assert pipe.executes == -(-pipe.commands // 5000)
+        assert rate > 20_000
@@ -0,0 +1,85 @@
+"""
+Benchmark of row versus columnar time-series responses.
+
+Serializes 10k readings the way the row endpoints do (a dict per row with
+isoformat/float per field, then FastAPI's encoder) and with the columnar
+JSON and Arrow formats, comparing encode time and payload size.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.presentation.api.columnar import ResponseFormat, columnar_response, record_columns
+
+POINTS = 10_000
+FIELDS = ["timestamp", "flow_rate", "pressure", "temperature"]
+
+
+def make_records(count: int = POINTS) -> list:
+    rng = np.random.default_rng(3)
+    start = datetime(2024, 11, 1, tzinfo=timezone.utc)
+    flow, pressure, temperature = rng.uniform(0, 50, (3, count))
+    return [
+        {
+            "timestamp": start + timedelta(seconds=30 * i),
+            "flow_rate": float(flow[i]),
+            "pressure": float(pressure[i]),
+            "temperature": None if i % 100 == 0 else float(temperature[i]),
+        }
+        for i in range(count)
+    ]
+
+
+def rows_body(records: list) -> bytes:
+    readings = [
+        {
+            "timestamp": row["timestamp"].isoformat(),
+            "flow_rate": float(row["flow_rate"]) if row["flow_rate"] else None,
+            "pressure": float(row["pressure"]) if row["pressure"] else None,
+            "temperature": float(row["temperature"]) if row["temperature"] else None,
+        }
+        for row in records
+    ]
+    return JSONResponse(jsonable_encoder(readings)).body
+
+
+def best_of(function, repeats: int = 5):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+@pytest.mark.performance
+class TestColumnarResponseSize:
+    """Benchmark response encoding for a 10k-point series."""
+
+    def test_columnar_is_smaller_and_faster(self):
+        """Columnar JSON and Arrow encode several times faster into smaller payloads."""
+        records = make_records()
+
+        rows_time, rows = best_of(lambda: rows_body(records))
+        columnar_time, columnar = best_of(
+            lambda: columnar_response(record_columns(records, FIELDS), ResponseFormat.COLUMNAR).body
+        )
+        arrow_time, arrow = best_of(
+            lambda: columnar_response(record_columns(records, FIELDS), ResponseFormat.ARROW).body
+        )
+
+        print(
+            f"\n{POINTS} points: rows {len(rows) / 1024:.0f} KiB in {rows_time * 1000:.1f}ms, "
+            f"columnar {len(columnar) / 1024:.0f} KiB in {columnar_time * 1000:.1f}ms "
+            f"({rows_time / columnar_time:.1f}x faster, {len(rows) / len(columnar):.1f}x smaller), "
+            f"arrow {len(arrow) / 1024:.0f} KiB in {arrow_time * 1000:.1f}ms"
+        )
+
+        assert rows_time / columnar_time >= 3
+        assert len(rows) / len(columnar) >= 1.5
+        assert len(arrow) < len(columnar)
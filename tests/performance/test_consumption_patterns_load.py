@@ -0,0 +1,66 @@
+"""
+Benchmark for the single-pass consumption analytics.
+
+Computes every section of /api/v1/consumption/patterns from a synthetic
+frame of 30-minute readings. Set CONSUMPTION_BENCH_ROWS to change the size.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.services.consumption_service import analyze_consumption
+
+ROWS = int(os.getenv("CONSUMPTION_BENCH_ROWS", 1_000_000))
+
+
+def make_readings(rows: int, nodes: int) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    per_node = rows // nodes
+    timestamps = pd.date_range("2024-01-01", periods=per_node, freq="30min", tz="UTC")
+    frame = pd.DataFrame({
+        "timestamp": np.tile(timestamps, nodes),
+        "node_id": np.repeat(np.arange(nodes).astype(str), per_node).astype(object),
+        "flow_rate": rng.gamma(4, 5, per_node * nodes),
+        "quality_score": rng.uniform(0.7, 1.0, per_node * nodes),
+    })
+    frame["consumption_m3h"] = frame["flow_rate"] * 3.6
+    frame["volume_m3"] = frame["consumption_m3h"] * 0.5
+    return frame
+
+
+@pytest.mark.performance
+class TestConsumptionAnalyticsPerformance:
+    """Benchmark the consumption patterns computation."""
+
+    def test_one_million_readings(self):
+        """All sections over 1M readings in one pass."""
+        frame = make_readings(ROWS, nodes=250)
+
+        start = time.perf_counter()
+        analysis = analyze_consumption(frame)
+        elapsed = time.perf_counter() - start
+
+        print(f"\nConsumption patterns: {len(frame):,} readings in {elapsed * 1000:.0f} ms "
+              f"({len(frame) / elapsed:,.0f} rows/s)")
+
+        assert len(analysis.hourly_patterns) == 24
+        assert len(analysis.node_consumption) == 250
+        assert len(analysis.heatmap_data) == 24 * 7
+        assert elapsed < 2.0
+
+    def test_ninety_days_all_nodes_sub_second(self):
+        """90 days of every configured node stays well under a second."""
+        frame = make_readings(90 * 48 * 8, nodes=8)
+
+        start = time.perf_counter()
+        analysis = analyze_consumption(frame)
+        elapsed = time.perf_counter() - start
+
+        print(f"\n90 days x 8 nodes ({len(frame):,} readings): {elapsed * 1000:.0f} ms")
+
+        assert len(analysis.daily_trends) == 90
+        assert elapsed < 1.0
@@ -0,0 +1,87 @@
+"""
+Benchmark for the consumption rollup cache.
+
+Serves 30-day and 365-day ranges for eight nodes with closed days cached
+and compares them with aggregating a year of readings directly. Warm
+requests only read the partial first day and today, so their cost must not
+grow with the readings in range.
+"""
+
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.services.consumption_analytics import NODE_NAMES, ConsumptionAggregates
+from src.api.services.consumption_rollup import ConsumptionRollupCache
+from src.api.services.consumption_service import analyze_consumption
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+from src.infrastructure.cache.fake_redis import FakeAsyncRedis
+
+NODES = list(NODE_NAMES)
+NOW = datetime(2025, 1, 1, 12, 0)
+
+
+def make_readings(days: int) -> pd.DataFrame:
+    rng = np.random.default_rng(13)
+    timestamps = pd.date_range(NOW - timedelta(days=days), NOW, freq="30min")
+    return pd.DataFrame({
+        "timestamp": np.tile(timestamps, len(NODES)),
+        "node_id": np.repeat(NODES, len(timestamps)).astype(object),
+        "flow_rate": rng.gamma(4, 5, len(timestamps) * len(NODES)),
+        "quality_score": rng.uniform(0.7, 1.0, len(timestamps) * len(NODES)),
+    })
+
+
+def make_hybrid_service(readings: pd.DataFrame) -> MagicMock:
+    async def get_readings_frame(start_time, end_time, node_ids=None, raise_errors=False):
+        rows = readings[readings["timestamp"].between(start_time, end_time)]
+        return rows.reset_index(drop=True)
+
+    service = MagicMock()
+    service.get_readings_frame = MagicMock(side_effect=get_readings_frame)
+    return service
+
+
+@pytest.mark.performance
+class TestConsumptionRollupPerformance:
+    """Benchmark long-range consumption requests from cached rollups."""
+
+    @pytest.mark.asyncio
+    async def test_warm_long_ranges(self):
+        """A warm 365-day request reads no closed-day readings and stays fast."""
+        readings = make_readings(366)
+        service = make_hybrid_service(readings)
+        cache = ConsumptionRollupCache(AsyncRedisClient(client=FakeAsyncRedis()), clock=lambda: NOW)
+
+        start = time.perf_counter()
+        await cache.load(service, NOW - timedelta(days=365), NOW)
+        cold = time.perf_counter() - start
+
+        timings = {}
+        for days in (30, 365):
+            service.get_readings_frame.reset_mock()
+            start = time.perf_counter()
+            aggregates = await cache.load(service, NOW - timedelta(days=days), NOW)
+            analyze_consumption(aggregates)
+            timings[days] = time.perf_counter() - start
+            # Only the partial first day and today are read from the data tier
+            assert service.get_readings_frame.call_count == 2
+
+        start = time.perf_counter()
+        analyze_consumption(ConsumptionAggregates.from_readings(
+            readings.assign(consumption_m3h=readings["flow_rate"] * 3.6,
+                            volume_m3=readings["flow_rate"] * 1.8)
+        ))
+        direct = time.perf_counter() - start
+
+        print(
+            f"\nConsumption rollups ({len(readings):,} readings/year): cold 365d {cold * 1000:.0f} ms, "
+            f"warm 30d {timings[30] * 1000:.0f} ms, warm 365d {timings[365] * 1000:.0f} ms, "
+            f"direct 365d {direct * 1000:.0f} ms"
+        )
+
+        assert timings[365] < 1.0
@@ -0,0 +1,151 @@
+"""
+Load tests for the dashboard summary snapshot service.
+
+Simulates 200 concurrent dashboard clients polling the summary and checks
+that requests are served from memory and that concurrent refreshes are
+coalesced into a single database round-trip.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from src.infrastructure.data.dashboard_snapshot import DashboardSnapshotService
+
+
+class FakeConnection:
+    """Minimal asyncpg connection answering the snapshot queries."""
+
+    def __init__(self, pool: "FakePool"):
+        self.pool = pool
+
+    async def fetch(self, query: str, *args: Any) -> List[Dict[str, Any]]:
+        self.pool.query_count += 1
+        await asyncio.sleep(self.pool.latency_seconds)
+        if "FROM water_infrastructure.nodes\n" in query:
+            return [
+                {"node_id": node_id, "node_name": f"Node {node_id}"}
+                for node_id in self.pool.node_ids
+            ]
+        if "date_trunc('hour'" in query:
+            return self.pool.bucket_rows
+        if "latest_readings" in query:
+            return self.pool.latest_rows
+        # Incremental pull
+        return [r for r in self.pool.new_rows if r["timestamp"] > args[0]]
+
+
+class FakePool:
+    """In-process stand-in for an asyncpg pool with configurable latency."""
+
+    def __init__(self, node_count: int = 50, latency_seconds: float = 0.02):
+        self.latency_seconds = latency_seconds
+        self.query_count = 0
+        self.node_ids = [f"NODE_{i:03d}" for i in range(node_count)]
+        now = datetime.now(timezone.utc)
+        self.bucket_rows = [
+            {
+                "node_id": node_id,
+                "hour": now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=h),
+                "flow_sum": 120.0,
+                "flow_count": 12,
+                "flow_max": 15.0,
+                "pressure_sum": 36.0,
+                "pressure_count": 12,
+                "pressure_max": 3.5,
+                "pressure_min": 2.5,
+                "last_timestamp": now - timedelta(minutes=5),
+            }
+            for node_id in self.node_ids
+            for h in range(24)
+        ]
+        self.latest_rows = [
+            {
+                "node_id": node_id,
+                "flow_rate": 10.0,
+                "pressure": 3.0,
+                "timestamp": now - timedelta(minutes=5),
+            }
+            for node_id in self.node_ids
+        ]
+        self.new_rows: List[Dict[str, Any]] = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+
+@pytest.mark.performance
+class TestDashboardSnapshotLoad:
+    """Load tests for DashboardSnapshotService."""
+
+    @pytest.fixture
+    def pool(self):
+        return FakePool()
+
+    @pytest.fixture
+    def service(self, pool):
+        return DashboardSnapshotService(pool)
+
+    @pytest.mark.asyncio
+    async def test_200_concurrent_clients(self, service, pool):
+        """Measure requests/sec with 200 concurrent dashboard clients."""
+        await service.refresh(full=True)
+        queries_after_build = pool.query_count
+
+        clients = 200
+        requests_per_client = 50
+
+        async def client():
+            for _ in range(requests_per_client):
+                summary = await service.get_summary()
+                assert summary["nodes"]
+                await asyncio.sleep(0)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+        total = clients * requests_per_client
+        rps = total / elapsed
+        print(f"\nDashboard snapshot: {total} requests, {clients} clients, {rps:,.0f} req/s")
+
+        # No database work on the request path
+        assert pool.query_count == queries_after_build
+        assert rps > 5000
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_are_coalesced(self, service, pool):
+        """Concurrent refresh calls share one database round-trip."""
+        await asyncio.gather(*(service.refresh(full=True) for _ in range(200)))
+
+        # One full rebuild issues three queries
+        assert pool.query_count == 3
+        assert service.refresh_count == 1
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_applies_new_readings(self, service, pool):
+        """New readings past the watermark update the snapshot."""
+        await service.refresh(full=True)
+        before = await service.get_summary()
+
+        pool.new_rows = [
+            {
+                "node_id": "NODE_000",
+                "timestamp": datetime.now(timezone.utc),
+                "flow_rate": 40.0,
+                "pressure": 4.0,
+            }
+        ]
+        await service.refresh()
+        after = await service.get_summary()
+
+        node = next(n for n in after["nodes"] if n["id"] == "NODE_000")
+        assert node["flow_rate"] == 40.0
+        assert after["kpis"]["total_flow"] > before["kpis"]["total_flow"]
+        # Incremental refresh is a single query
+        assert pool.query_count == 4
@@ -0,0 +1,91 @@
+"""
+Benchmark of event bus dispatch for 100k events.
+
+Publishes 100k AnomalyDetectedEvents to one async handler through the
+direct bus with unbounded concurrency (how publish_batch used to behave:
+one task per event), the direct bus with its default bound, and the queued
+bus delivering single events and batches, reporting events per second and
+the peak number of tasks alive.
+"""
+
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+
+from src.domain.events.sensor_events import AnomalyDetectedEvent
+from src.infrastructure.external_services.event_bus import InMemoryEventBus, QueuedEventBus
+
+EVENTS = 100_000
+NODES = 200
+
+
+def make_events() -> list:
+    nodes = [uuid4() for _ in range(NODES)]
+    return [
+        AnomalyDetectedEvent(
+            node_id=nodes[i % NODES],
+            sensor_type="flow",
+            anomaly_type="spike",
+            severity="high",
+            measurement_value=float(i),
+            threshold=1.0,
+            description="benchmark",
+        )
+        for i in range(EVENTS)
+    ]
+
+
+async def run(bus, events: list, batch: bool = False) -> tuple:
+    """Publish and wait for delivery; returns (seconds, peak tasks, delivered)."""
+    delivered = 0
+    peak_tasks = 0
+
+    async def handler(event):
+        nonlocal delivered, peak_tasks
+        delivered += 1
+        if delivered % 1000 == 0:
+            peak_tasks = max(peak_tasks, len(asyncio.all_tasks()))
+
+    async def batch_handler(batch_events):
+        nonlocal delivered, peak_tasks
+        delivered += len(batch_events)
+        peak_tasks = max(peak_tasks, len(asyncio.all_tasks()))
+
+    if batch:
+        bus.subscribe(AnomalyDetectedEvent, batch_handler, batch=True)
+    else:
+        bus.subscribe(AnomalyDetectedEvent, handler)
+
+    start = time.perf_counter()
+    await bus.publish_batch(events)
+    if isinstance(bus, QueuedEventBus):
+        await bus.stop()
+    return time.perf_counter() - start, peak_tasks, delivered
+
+
+@pytest.mark.performance
+class TestEventBusThroughput:
+    """Benchmark dispatch of 100k events."""
+
+    @pytest.mark.asyncio
+    async def test_queued_bus_throughput(self):
+        """The queued bus keeps a fixed task count and batches raise throughput."""
+        events = make_events()
+        results = {
+            # Every event its own key: no per-node ordering, one task per event
+            "unbounded": await run(InMemoryEventBus(max_concurrency=EVENTS, ordering_key=id), events),
+            "bounded": await run(InMemoryEventBus(), events),
+            "queued": await run(QueuedEventBus(workers=4), events),
+            "queued batch": await run(QueuedEventBus(workers=4), events, batch=True),
+        }
+
+        print(f"\n{EVENTS} events:")
+        for name, (seconds, peak_tasks, delivered) in results.items():
+            print(f"  {name:<13} {EVENTS / seconds:>10,.0f} events/s, peak {peak_tasks} tasks")
+
+        assert all(delivered == EVENTS for _, _, delivered in results.values())
+        assert results["queued"][1] < 20
+        assert results["unbounded"][1] > EVENTS / 2
+        assert results["queued batch"][0] * 3 < results["unbounded"][0]
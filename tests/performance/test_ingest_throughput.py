@@ -0,0 +1,105 @@
+"""
+Throughput benchmark for micro-batched hot-tier ingestion.
+
+Feeds batches through HybridDataService.write_sensor_readings with an
+in-process Redis backend, so the measurement covers the Python side of
+ingestion (statistics, anomaly checks, pipeline building and buffering)
+on a single core without network latency.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+from src.infrastructure.cache.fake_redis import FakeAsyncRedis
+from src.infrastructure.data.hybrid_data_service import HybridDataService
+
+
+def make_readings(count: int, nodes: int = 50):
+    start = datetime.now(timezone.utc) - timedelta(hours=1)
+    return [
+        {
+            "node_id": f"NODE_{i % nodes:03d}",
+            "timestamp": start + timedelta(milliseconds=i * 50),
+            "flow_rate": 10.0 + (i % 17) * 0.5,
+            "pressure": 3.0 + (i % 5) * 0.1,
+            "temperature": 18.0,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.performance
+class TestIngestThroughput:
+    """Benchmark hot-tier ingestion throughput."""
+
+    @pytest.fixture
+    def service(self):
+        redis_manager = MagicMock()
+        redis_manager.async_client = AsyncRedisClient(client=FakeAsyncRedis())
+        with patch("src.infrastructure.data.hybrid_data_service.BigQueryClient"):
+            service = HybridDataService(redis_manager=redis_manager)
+        service.postgres_manager = AsyncMock()
+        # Measure the hot tier only; PostgreSQL flushes are exercised separately
+        service.buffer_size = 10**9
+        service.max_buffer_readings = 10**9
+        return service
+
+    @pytest.mark.asyncio
+    async def test_sustained_hot_tier_throughput(self, service):
+        """Sustained readings/sec through write_sensor_readings."""
+        batch_size = 5000
+        readings = make_readings(200_000)
+
+        start = time.perf_counter()
+        for offset in range(0, len(readings), batch_size):
+            await service.write_sensor_readings(readings[offset:offset + batch_size])
+        elapsed = time.perf_counter() - start
+
+        rate = len(readings) / elapsed
+        redis = service.redis.client
+        print(
+            f"\nIngest: {len(readings)} readings in {elapsed:.2f}s = {rate:,.0f} readings/s, "
+            f"{redis.round_trips} Redis round-trips"
+        )
+
+        # One write pipeline per batch, plus one stats-priming pipeline
+        assert redis.round_trips == len(readings) // batch_size + 1
+        assert len(service.write_buffer) == len(readings)
+        assert rate > 20_000
+
+    @pytest.mark.asyncio
+    async def test_flush_copies_in_large_chunks_and_logs_once(self, service):
+        """Flushes COPY in chunks and aggregate ETL job logging."""
+        service.flush_batch_size = 10_000
+        service.write_buffer = make_readings(25_000)
+
+        await service._flush_write_buffer()
+
+        calls = service.postgres_manager.insert_sensor_readings_batch.await_args_list
+        assert [len(c.args[0]) for c in calls] == [10_000, 10_000, 5_000]
+        assert service.write_buffer == []
+        # Within the logging interval nothing is written to etl_jobs yet
+        service.postgres_manager.log_etl_job.assert_not_awaited()
+
+        await service._log_etl_stats(force=True)
+        job = service.postgres_manager.log_etl_job.await_args.args[0]
+        assert job["records_processed"] == 25_000
+        assert job["metadata"] == {"flushes": 1}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried_and_bounded(self, service):
+        """Failed COPYs are retried, then kept in a bounded buffer."""
+        service.flush_retry_delay = 0
+        service.max_buffer_readings = 1_000
+        service.postgres_manager.insert_sensor_readings_batch.side_effect = Exception("down")
+        service.write_buffer = make_readings(1_500)
+
+        await service._flush_write_buffer()
+
+        assert service.postgres_manager.insert_sensor_readings_batch.await_count == service.flush_retries
+        assert len(service.write_buffer) == 1_000
+        assert service._etl_stats["records_failed"] == 500
@@ -0,0 +1,84 @@
+"""
+Benchmark for the shared KPI computation.
+
+Serves a KPI dashboard request plus every per-category request from a
+synthetic readings frame and checks the data is fetched and scanned once.
+Set KPI_BENCH_ROWS to change the frame size.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.services.kpis.kpi_engine import KPIEngine, compute_kpis
+from src.api.services.kpis.kpis_orchestrator import KPI_CATEGORIES, KPIOrchestrator
+
+ROWS = int(os.getenv("KPI_BENCH_ROWS", 1_000_000))
+NODES = 500
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    per_node = rows // NODES
+    timestamps = pd.date_range(START, periods=per_node, freq="30min")
+    return pd.DataFrame({
+        "timestamp": np.tile(timestamps, NODES),
+        "node_id": np.repeat(np.char.add("NODE_", np.arange(NODES).astype(str)), per_node).astype(object),
+        "flow_rate": rng.normal(20, 5, per_node * NODES),
+        "pressure": rng.normal(4, 1, per_node * NODES),
+        "temperature": rng.normal(15, 4, per_node * NODES),
+        "total_flow": 0.0,
+        "quality_score": rng.random(per_node * NODES),
+    })
+
+
+@pytest.mark.performance
+class TestKPIDashboardLoad:
+    """Benchmark the single-fetch KPI dashboard."""
+
+    @pytest.mark.asyncio
+    async def test_dashboard_and_categories_scan_once(self):
+        """One fetch and one vectorized pass serve the dashboard and all categories."""
+        frame = make_frame(ROWS)
+        end = START + timedelta(minutes=30 * (ROWS // NODES))
+        hybrid_service = MagicMock()
+        hybrid_service.get_readings_frame = AsyncMock(return_value=frame)
+        orchestrator = KPIOrchestrator(KPIEngine())
+
+        start = time.perf_counter()
+        await orchestrator.generate_kpi_dashboard(hybrid_service, START, end)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for category in KPI_CATEGORIES:
+            await orchestrator.calculate_category_kpis(hybrid_service, category, START, end)
+        cached = time.perf_counter() - start
+
+        print(
+            f"\nKPI dashboard over {len(frame):,} readings: {first * 1000:.0f} ms; "
+            f"{len(KPI_CATEGORIES)} category requests afterwards: {cached * 1000:.2f} ms"
+        )
+
+        hybrid_service.get_readings_frame.assert_awaited_once()
+        assert cached < first / 10
+
+    def test_vectorized_pass_rows_per_second(self):
+        """All seven categories are computed in one pass over the frame."""
+        frame = make_frame(ROWS)
+        end = START + timedelta(minutes=30 * (ROWS // NODES))
+
+        start = time.perf_counter()
+        results = compute_kpis(frame, START, end)
+        elapsed = time.perf_counter() - start
+
+        rate = len(frame) / elapsed
+        print(f"\nKPI pass: {len(frame):,} readings in {elapsed:.2f}s = {rate:,.0f} rows/s")
+
+        assert results.node_count == NODES
+        assert rate > 500_000
@@ -0,0 +1,77 @@
+"""
+Fan-out benchmark for the live feed.
+
+Publishes ingested batches to many concurrent subscribers, some of which
+never read, and measures publish cost and end-to-end delivery. Subscribers
+are served from memory, so none of this touches a database.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.infrastructure.data.live_feed import LiveBroadcaster
+
+
+def make_batch(batch: int, nodes: int) -> dict:
+    timestamp = datetime(2024, 11, 1) + timedelta(seconds=30 * batch)
+    return {
+        f"NODE_{node:03d}": {
+            "timestamp": timestamp,
+            "flow_rate": 10.0 + (batch + node) % 17 * 0.5,
+            "pressure": 3.0 + (batch * node) % 5 * 0.1,
+            "temperature": 18.0,
+        }
+        for node in range(nodes)
+    }
+
+
+@pytest.mark.performance
+class TestLiveFeedFanout:
+    """Benchmark broadcasting to many dashboards."""
+
+    @pytest.mark.asyncio
+    async def test_fanout_to_many_subscribers(self):
+        """Publish cost per subscriber stays small and slow consumers are shed."""
+        subscribers, stalled, batches, nodes = 1000, 20, 200, 300
+        broadcaster = LiveBroadcaster(queue_size=50)
+        batch_data = [make_batch(batch, nodes) for batch in range(batches)]
+
+        async def consume(subscription):
+            received = 0
+            async for event in subscription:
+                received += 1
+                if event.seq == batches:
+                    break
+            return received
+
+        readers = [broadcaster.subscribe(last_seq=0) for _ in range(subscribers)]
+        idle = [broadcaster.subscribe(last_seq=0) for _ in range(stalled)]
+        tasks = [asyncio.create_task(consume(subscription)) for subscription in readers]
+
+        publish_time = 0.0
+        start = time.perf_counter()
+        for data in batch_data:
+            begin = time.perf_counter()
+            broadcaster.publish_batch(data)
+            publish_time += time.perf_counter() - begin
+            # Let consumers run between batches, as ingestion would
+            await asyncio.sleep(0)
+        received = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+        per_publish_ms = publish_time / batches * 1000
+        print(
+            f"\n{subscribers} subscribers x {batches} batches of {nodes} nodes: "
+            f"{elapsed:.2f}s total, {per_publish_ms:.2f}ms per publish "
+            f"({per_publish_ms * 1000 / subscribers:.2f}us per subscriber), "
+            f"{broadcaster.stats['dropped']} stalled subscribers dropped"
+        )
+
+        assert received == [batches] * subscribers
+        assert all(subscription.dropped for subscription in idle)
+        assert broadcaster.stats["dropped"] == stalled
+        # Encoding happens once per event, so fan-out is a queue append per subscriber
+        assert per_publish_ms < 50
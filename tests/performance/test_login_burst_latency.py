@@ -0,0 +1,72 @@
+"""
+Benchmark of event-loop responsiveness during a burst of logins.
+
+Verifies 20 bcrypt passwords concurrently, once inline in the coroutine
+(as the login handler used to) and once through the bounded hashing pool,
+while a ticker coroutine stands in for dashboard traffic and records how
+late it gets scheduled.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.infrastructure.security.passwords import PasswordHasher, hash_password, verify_password
+
+LOGINS = 20
+ROUNDS = 10
+TICK = 0.005
+
+
+async def max_loop_lag(burst) -> tuple:
+    """Run a burst and return (worst ticker delay, burst duration) in seconds."""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK * 2)
+    start = time.perf_counter()
+    await burst()
+    duration = time.perf_counter() - start
+    done.set()
+    await task
+    return max(lags), duration
+
+
+@pytest.mark.performance
+class TestLoginBurstLatency:
+    """Benchmark loop stalls caused by password verification."""
+
+    @pytest.mark.asyncio
+    async def test_pool_keeps_loop_responsive(self):
+        """Pooled verification keeps scheduling delay far below one bcrypt check."""
+        hashed = hash_password("s3cret", rounds=ROUNDS)
+        hasher = PasswordHasher(max_workers=4, rounds=ROUNDS)
+
+        async def inline_login():
+            assert verify_password("s3cret", hashed)
+
+        async def inline_burst():
+            await asyncio.gather(*(inline_login() for _ in range(LOGINS)))
+
+        async def pooled_burst():
+            results = await asyncio.gather(*(hasher.verify("s3cret", hashed) for _ in range(LOGINS)))
+            assert all(results)
+
+        inline_lag, inline_time = await max_loop_lag(inline_burst)
+        pooled_lag, pooled_time = await max_loop_lag(pooled_burst)
+        hasher.shutdown()
+
+        print(
+            f"\n{LOGINS} logins: inline max loop lag {inline_lag * 1000:.1f}ms ({inline_time * 1000:.0f}ms total), "
+            f"pooled max loop lag {pooled_lag * 1000:.1f}ms ({pooled_time * 1000:.0f}ms total)"
+        )
+
+        assert pooled_lag * 5 < inline_lag
@@ -0,0 +1,183 @@
+"""
+Benchmark of loading a network's readings in the network use cases.
+
+Runs CalculateNetworkEfficiencyUseCase.detect_leakage_zones on a 500-node
+network against a reading repository with 2ms of simulated latency per
+query, loading readings node after node (how the use cases used to),
+through the bounded concurrent default of get_by_node_ids and through a
+single bulk query. Also times the node membership filter with a list
+rebuilt per node versus a set.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.application.interfaces.repositories import (
+    IMonitoringNodeRepository,
+    ISensorReadingRepository,
+)
+from src.application.use_cases.calculate_network_efficiency import (
+    CalculateNetworkEfficiencyUseCase,
+)
+from src.domain.entities.monitoring_node import MonitoringNode
+from src.domain.entities.sensor_reading import SensorReading
+from src.domain.entities.water_network import WaterNetwork
+from src.domain.services.network_efficiency_service import NetworkEfficiencyService
+from src.domain.value_objects.location import NodeLocation
+from src.domain.value_objects.measurements import FlowRate
+from src.domain.value_objects.sensor_type import SensorType
+
+NODES = 500
+OTHER_NODES = 500
+READINGS = 24
+LATENCY = 0.002
+START = datetime(2024, 11, 1)
+END = START + timedelta(days=1)
+
+
+class LatencyReadingRepository(ISensorReadingRepository):
+    """In-memory readings with a fixed latency per query."""
+
+    def __init__(self, readings: dict) -> None:
+        self.readings = readings
+        self.queries = 0
+
+    async def add(self, reading):
+        pass
+
+    async def get_by_id(self, reading_id):
+        return None
+
+    async def get_by_node_id(self, node_id, start_time=None, end_time=None, limit=None):
+        self.queries += 1
+        await asyncio.sleep(LATENCY)
+        return list(self.readings.get(node_id, []))
+
+    async def get_latest_by_node(self, node_id):
+        return None
+
+    async def delete_by_id(self, reading_id):
+        pass
+
+
+class SequentialReadingRepository(LatencyReadingRepository):
+    """Loads node after node, as the use cases used to."""
+
+    async def get_by_node_ids(self, node_ids, start_time=None, end_time=None):
+        return {
+            node_id: await self.get_by_node_id(node_id, start_time, end_time)
+            for node_id in node_ids
+        }
+
+
+class BulkReadingRepository(LatencyReadingRepository):
+    """Loads every node with one query."""
+
+    async def get_by_node_ids(self, node_ids, start_time=None, end_time=None):
+        self.queries += 1
+        await asyncio.sleep(LATENCY)
+        return {node_id: list(self.readings.get(node_id, [])) for node_id in node_ids}
+
+
+class ListNodeRepository(IMonitoringNodeRepository):
+    """Returns fresh copies of a fixed node list."""
+
+    def __init__(self, nodes: list) -> None:
+        self.nodes = nodes
+
+    async def add(self, node):
+        pass
+
+    async def get_by_id(self, node_id):
+        return None
+
+    async def get_by_name(self, name):
+        return None
+
+    async def get_all(self, active_only=False, node_type=None, location=None):
+        return [
+            MonitoringNode(id=node.id, name=node.name, location=node.location, node_type=node.node_type)
+            for node in self.nodes
+        ]
+
+    async def update(self, node):
+        pass
+
+    async def delete_by_id(self, node_id):
+        pass
+
+
+def build() -> tuple:
+    network = WaterNetwork(name="Benchmark", region="Sardinia")
+    nodes = [
+        MonitoringNode(name=f"node-{i}", location=NodeLocation(site_name=f"site-{i}", area="Test"), node_type="junction")
+        for i in range(NODES + OTHER_NODES)
+    ]
+    for node in nodes[:NODES]:
+        network.add_node(node)
+    for i in range(NODES - 1):
+        network.connect_nodes(nodes[i].id, nodes[i + 1].id)
+    readings = {
+        node.id: [
+            SensorReading(
+                node_id=node.id,
+                sensor_type=SensorType.FLOW_METER,
+                timestamp=START + timedelta(hours=h),
+                flow_rate=FlowRate(100.0 - i * 0.1),
+            )
+            for h in range(READINGS)
+        ]
+        for i, node in enumerate(nodes[:NODES])
+    }
+    return network, nodes, readings
+
+
+async def run(network, nodes, repository) -> tuple:
+    use_case = CalculateNetworkEfficiencyUseCase(
+        water_network_repository=AsyncMock(get_by_id=AsyncMock(return_value=network)),
+        monitoring_node_repository=ListNodeRepository(nodes),
+        sensor_reading_repository=repository,
+        network_efficiency_service=NetworkEfficiencyService(),
+        event_bus=AsyncMock(),
+    )
+    start = time.perf_counter()
+    leaks = await use_case.detect_leakage_zones(network.id, START, END, loss_threshold=0.0)
+    return time.perf_counter() - start, len(leaks), repository.queries
+
+
+@pytest.mark.performance
+class TestNetworkBulkLoading:
+    """Benchmark network-level reading loads."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_loading(self):
+        """Bulk loading takes about one query's time instead of one per node."""
+        network, nodes, readings = build()
+        results = {
+            "sequential": await run(network, nodes, SequentialReadingRepository(readings)),
+            "bounded concurrent": await run(network, nodes, LatencyReadingRepository(readings)),
+            "one query": await run(network, nodes, BulkReadingRepository(readings)),
+        }
+
+        start = time.perf_counter()
+        by_list = [node for node in nodes if node.id in [n.id for n in network.nodes]]
+        list_time = time.perf_counter() - start
+        start = time.perf_counter()
+        member_ids = {node.id for node in network.nodes}
+        by_set = [node for node in nodes if node.id in member_ids]
+        set_time = time.perf_counter() - start
+
+        print(f"\n{NODES}-node network, {LATENCY * 1000:.0f}ms per query:")
+        for name, (seconds, _, queries) in results.items():
+            print(f"  {name:<18} {seconds * 1000:>7.0f}ms, {queries} queries")
+        print(f"  membership filter: list {list_time * 1000:.0f}ms, set {set_time * 1000:.2f}ms")
+
+        assert len({leaks for _, leaks, _ in results.values()}) == 1
+        assert results["one query"][2] == 1
+        assert by_list == by_set
+        assert results["bounded concurrent"][0] * 4 < results["sequential"][0]
+        assert results["one query"][0] < results["bounded concurrent"][0]
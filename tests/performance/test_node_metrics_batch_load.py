@@ -0,0 +1,103 @@
+"""
+Load test for the batch node metrics endpoint.
+
+Renders a dashboard page for 100 nodes against a simulated database (one
+round-trip of latency per query, a small connection pool) the old way, one
+/nodes/{id}/metrics request per node, and the new way, one /nodes/metrics
+request, and compares page-render latency under concurrent users.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import httpx
+import pytest
+
+from src.api.main import app
+
+NODES = [f"NODE_{i:03d}" for i in range(100)]
+USERS = 10
+ROUND_TRIP_SECONDS = 0.002
+
+
+class SimulatedPostgres:
+    """PostgresManager stand-in: pooled connections, fixed round-trip per query."""
+
+    def __init__(self, pool_size: int = 10):
+        self.pool = asyncio.Semaphore(pool_size)
+        self.queries = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        async with self.pool:
+            yield self
+
+    async def get_latest_node_metrics(self, node_ids: Optional[List[str]] = None, time_window: str = "1hour"):
+        async with self.acquire():
+            self.queries += 1
+            await asyncio.sleep(ROUND_TRIP_SECONDS)
+            return [
+                {
+                    "node_id": node_id,
+                    "node_name": node_id.title(),
+                    "timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                    "flow_rate": 10.0,
+                    "pressure": 3.0,
+                    "temperature": 15.0,
+                    "efficiency": 96.0,
+                    "anomaly_count": 0,
+                }
+                for node_id in (node_ids or NODES)
+            ]
+
+
+async def render_per_node(client: httpx.AsyncClient) -> float:
+    """Old page render: one request per node, in turn."""
+    start = time.perf_counter()
+    for node_id in NODES:
+        response = await client.get(f"/api/v1/nodes/{node_id}/metrics")
+        assert response.status_code == 200
+    return time.perf_counter() - start
+
+
+async def render_batch(client: httpx.AsyncClient) -> float:
+    """New page render: one request for all nodes."""
+    start = time.perf_counter()
+    response = await client.get("/api/v1/nodes/metrics")
+    assert len(response.json()) == len(NODES)
+    return time.perf_counter() - start
+
+
+@pytest.mark.performance
+class TestNodeMetricsBatchLoad:
+    """Compare per-node fan-out with the batch endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_page_render_latency(self):
+        """The batch endpoint renders a 100-node page an order of magnitude faster."""
+        postgres = SimulatedPostgres()
+        app.state.postgres = postgres
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+                results = {}
+                for name, render in (("per-node", render_per_node), ("batch", render_batch)):
+                    postgres.queries = 0
+                    start = time.perf_counter()
+                    latencies = await asyncio.gather(*(render(client) for _ in range(USERS)))
+                    results[name] = (max(latencies), time.perf_counter() - start, postgres.queries)
+        finally:
+            del app.state.postgres
+
+        for name, (worst, total, queries) in results.items():
+            print(
+                f"\n{name}: {USERS} users x {len(NODES)} nodes, worst page {worst * 1000:.0f} ms, "
+                f"total {total * 1000:.0f} ms, {queries} queries"
+            )
+
+        assert results["batch"][2] == USERS
+        assert results["per-node"][2] == USERS * len(NODES)
+        assert results["batch"][0] < results["per-node"][0] / 10
@@ -0,0 +1,70 @@
+"""
+Benchmark of time-window queries on a node with 1M readings.
+
+Loads a million minute-spaced readings into one MonitoringNode and runs
+repeated one-day window queries the way get_readings_in_range used to
+(a list comprehension over every reading) and through the time-indexed
+store (two binary searches returning a view).
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.domain.entities.monitoring_node import MonitoringNode
+from src.domain.entities.sensor_reading import SensorReading
+from src.domain.value_objects.location import NodeLocation
+from src.domain.value_objects.measurements import FlowRate
+from src.domain.value_objects.sensor_type import SensorType
+
+READINGS = 1_000_000
+WINDOWS = 50
+START = datetime(2023, 1, 1)
+
+
+def build_node() -> MonitoringNode:
+    node = MonitoringNode(name="meter", location=NodeLocation(site_name="site", area="Test"), node_type="junction")
+    node.add_readings(
+        SensorReading(
+            node_id=node.id,
+            sensor_type=SensorType.FLOW_METER,
+            timestamp=START + timedelta(minutes=i),
+            flow_rate=FlowRate(1.0),
+        )
+        for i in range(READINGS)
+    )
+    return node
+
+
+@pytest.mark.performance
+class TestReadingStoreWindows:
+    """Benchmark time-window queries."""
+
+    def test_indexed_windows(self):
+        """Binary-search windows match the full scan and are much faster."""
+        node = build_node()
+        readings = node.readings
+        rng = np.random.default_rng(5)
+        windows = [
+            (START + timedelta(minutes=int(offset)), START + timedelta(minutes=int(offset) + 1440))
+            for offset in rng.integers(0, READINGS - 1440, WINDOWS)
+        ]
+
+        start = time.perf_counter()
+        expected = [[r for r in readings if lo <= r.timestamp <= hi] for lo, hi in windows]
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [node.get_readings_in_range(lo, hi) for lo, hi in windows]
+        indexed_time = time.perf_counter() - start
+
+        print(
+            f"\n{READINGS} readings, {WINDOWS} one-day windows: full scan {scan_time * 1000:.0f}ms, "
+            f"indexed {indexed_time * 1000:.2f}ms ({scan_time / indexed_time:,.0f}x)"
+        )
+
+        assert results == expected
+        assert all(len(result) == 1441 for result in results)
+        assert scan_time / indexed_time >= 100
@@ -0,0 +1,115 @@
+"""
+Load test for conditional caching of historical ranges.
+
+Dashboards re-request the same closed history windows. Replays those
+requests against /nodes/{id}/history with a simulated database query and
+compares recomputing every time with the server-side body cache and with
+clients revalidating through If-None-Match.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+import src.infrastructure.cache.data_version as data_version
+from src.api.main import app
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+from src.infrastructure.cache.data_version import DataVersion
+from src.infrastructure.cache.fake_redis import FakeAsyncRedis
+
+NODES = [f"NODE_{i:02d}" for i in range(20)]
+REQUESTS_PER_NODE = 10
+QUERY_SECONDS = 0.01
+START = datetime(2024, 10, 1, tzinfo=timezone.utc)
+
+
+class SimulatedPostgres:
+    """Connection pool whose history query takes a fixed time."""
+
+    def __init__(self, pool_size: int = 10):
+        self.pool = asyncio.Semaphore(pool_size)
+        self.queries = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        async with self.pool:
+            yield self
+
+    async def fetch(self, query, node_id, time_window, start_time, end_time):
+        self.queries += 1
+        await asyncio.sleep(QUERY_SECONDS)
+        return [
+            {
+                "window_start": START + timedelta(hours=hour),
+                "window_end": START + timedelta(hours=hour + 1),
+                "avg_flow_rate": 10.0 + hour % 7,
+                "avg_pressure": 3.0,
+                "avg_temperature": 15.0,
+                "total_volume": 36.0,
+                "anomaly_count": 0,
+                "quality_score": 0.99,
+            }
+            for hour in range(24 * 7)
+        ]
+
+
+@pytest.mark.performance
+class TestResponseCacheLoad:
+    """Compare recomputed, cached and revalidated historical requests."""
+
+    @pytest.fixture
+    def postgres(self, monkeypatch):
+        monkeypatch.setattr(
+            data_version, "_data_version", DataVersion(AsyncRedisClient(client=FakeAsyncRedis()))
+        )
+        app.state.postgres = SimulatedPostgres()
+        app.state.response_cache.clear()
+        yield app.state.postgres
+        del app.state.postgres
+
+    async def replay(self, client, params, revalidate: bool = False) -> float:
+        etags = {}
+
+        async def dashboard(node_id):
+            for _ in range(REQUESTS_PER_NODE):
+                headers = {"If-None-Match": etags[node_id]} if revalidate and node_id in etags else {}
+                response = await client.get(f"/api/v1/nodes/{node_id}/history", params=params, headers=headers)
+                assert response.status_code in (200, 304)
+                etags[node_id] = response.headers.get("etag", "")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(dashboard(node_id) for node_id in NODES))
+        return time.perf_counter() - start
+
+    @pytest.mark.asyncio
+    async def test_closed_ranges_skip_the_database(self, postgres):
+        """Repeated closed-range requests cost one query per distinct range."""
+        closed = {"start_time": START.isoformat(), "end_time": (START + timedelta(days=7)).isoformat()}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Without an end time requests bypass the cache and always query
+            uncached = await self.replay(client, {"start_time": START.isoformat()})
+            uncached_queries, postgres.queries = postgres.queries, 0
+
+            cached = await self.replay(client, closed)
+            cached_queries, postgres.queries = postgres.queries, 0
+
+            app.state.response_cache.clear()
+            revalidated = await self.replay(client, closed, revalidate=True)
+            revalidated_queries = postgres.queries
+
+        total = len(NODES) * REQUESTS_PER_NODE
+        print(
+            f"\n{total} history requests: recomputed {uncached * 1000:.0f}ms ({uncached_queries} queries), "
+            f"body cache {cached * 1000:.0f}ms ({cached_queries} queries), "
+            f"If-None-Match {revalidated * 1000:.0f}ms ({revalidated_queries} queries, "
+            f"{app.state.response_cache.stats['not_modified']} not modified)"
+        )
+
+        assert uncached_queries == total
+        assert cached_queries == revalidated_queries == len(NODES)
+        assert cached < uncached / 2
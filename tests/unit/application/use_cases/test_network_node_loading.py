@@ -0,0 +1,291 @@
+"""
+Unit tests for loading network nodes and readings in bulk.
+
+Covers the bounded-concurrency defaults on the repository interfaces, the
+single-query BigQuery override and the network use cases loading every
+node's readings with one repository call.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List, Optional
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.application.interfaces.repositories import (
+    IMonitoringNodeRepository,
+    ISensorReadingRepository,
+    gather_bounded,
+)
+from src.application.use_cases.calculate_network_efficiency import (
+    CalculateNetworkEfficiencyUseCase,
+)
+from src.application.use_cases.detect_network_anomalies import (
+    DetectNetworkAnomaliesUseCase,
+)
+from src.domain.entities.monitoring_node import MonitoringNode
+from src.domain.entities.sensor_reading import SensorReading
+from src.domain.entities.water_network import WaterNetwork
+from src.domain.services.network_efficiency_service import NetworkEfficiencyService
+from src.domain.value_objects.location import NodeLocation
+from src.domain.value_objects.measurements import FlowRate
+from src.domain.value_objects.sensor_type import SensorType
+
+START = datetime(2024, 11, 1)
+END = START + timedelta(days=1)
+
+
+def make_node(name: str, node_type: str = "junction") -> MonitoringNode:
+    return MonitoringNode(name=name, location=NodeLocation(site_name=name, area="Test"), node_type=node_type)
+
+
+def make_readings(node_id: UUID, flow: float, count: int = 12) -> List[SensorReading]:
+    return [
+        SensorReading(
+            node_id=node_id,
+            sensor_type=SensorType.FLOW_METER,
+            timestamp=START + timedelta(hours=i),
+            flow_rate=FlowRate(flow),
+        )
+        for i in range(count)
+    ]
+
+
+class FakeReadingRepository(ISensorReadingRepository):
+    """Reading repository that only implements per-node lookups."""
+
+    def __init__(self, readings: dict, delay: float = 0.0) -> None:
+        self.readings = readings
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def add(self, reading: SensorReading) -> None:
+        pass
+
+    async def get_by_id(self, reading_id: UUID) -> Optional[SensorReading]:
+        return None
+
+    async def get_by_node_id(self, node_id, start_time=None, end_time=None, limit=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return [
+            r for r in self.readings.get(node_id, [])
+            if (start_time is None or r.timestamp >= start_time)
+            and (end_time is None or r.timestamp <= end_time)
+        ]
+
+    async def get_latest_by_node(self, node_id: UUID) -> Optional[SensorReading]:
+        return None
+
+    async def delete_by_id(self, reading_id: UUID) -> None:
+        pass
+
+
+class FakeNodeRepository(IMonitoringNodeRepository):
+    """Node repository backed by a dict."""
+
+    def __init__(self, nodes: List[MonitoringNode]) -> None:
+        self.nodes = {node.id: node for node in nodes}
+
+    async def add(self, node):
+        pass
+
+    async def get_by_id(self, node_id):
+        return self.nodes.get(node_id)
+
+    async def get_by_name(self, name):
+        return None
+
+    async def get_all(self, active_only=False, node_type=None, location=None):
+        return list(self.nodes.values())
+
+    async def update(self, node):
+        pass
+
+    async def delete_by_id(self, node_id):
+        pass
+
+
+@pytest.mark.unit
+class TestBulkRepositoryDefaults:
+    """Test the bulk methods every repository inherits."""
+
+    @pytest.mark.asyncio
+    async def test_gather_bounded_limits_concurrency(self):
+        """Loads run concurrently up to the limit, once per distinct key."""
+        in_flight = peak = 0
+        keys = [uuid4() for _ in range(20)]
+
+        async def load(key):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return str(key)
+
+        results = await gather_bounded(keys + keys[:5], load, max_concurrency=4)
+
+        assert results == {key: str(key) for key in keys}
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_default_get_by_node_ids(self):
+        """Readings come back per node, including nodes without readings."""
+        a, b = uuid4(), uuid4()
+        repository = FakeReadingRepository({a: make_readings(a, 5.0)}, delay=0.001)
+
+        results = await repository.get_by_node_ids([a, b], start_time=START, end_time=START + timedelta(hours=2))
+
+        assert [len(results[a]), len(results[b])] == [3, 0]
+        assert repository.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_default_get_by_ids_skips_unknown(self):
+        """Unknown node IDs are left out."""
+        node = make_node("a")
+        repository = FakeNodeRepository([node])
+
+        assert await repository.get_by_ids([node.id, uuid4()]) == [node]
+
+
+@pytest.mark.unit
+class TestBigQueryBulkReadings:
+    """Test the single-query override."""
+
+    @pytest.mark.asyncio
+    async def test_one_query_for_all_nodes(self):
+        """All nodes are read with one IN UNNEST query and grouped by node."""
+        from src.infrastructure.repositories.sensor_reading_repository import (
+            BigQuerySensorReadingRepository,
+        )
+
+        a, b = uuid4(), uuid4()
+        rows = [
+            SimpleNamespace(
+                id=str(uuid4()), node_id=str(node_id), sensor_type="flow_meter",
+                timestamp=START, temperature=None, flow_rate=3.0, pressure=None,
+                volume=None, created_at=START, updated_at=START,
+            )
+            for node_id in (a, b, a)
+        ]
+        connection = MagicMock()
+        connection.config.dataset_ref = "project.dataset"
+        connection.client.query.return_value.result.return_value = rows
+        repository = BigQuerySensorReadingRepository(connection)
+
+        results = await repository.get_by_node_ids([a, b], start_time=START, end_time=END)
+
+        assert connection.client.query.call_count == 1
+        query, = connection.client.query.call_args.args
+        assert "IN UNNEST(@node_ids)" in query
+        assert [len(results[a]), len(results[b])] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_sensor_data_repository_shares_query_builder(self, caplog):
+        """Single and bulk lookups filter the same query; invalid rows are logged."""
+        from src.infrastructure.repositories.sensor_data_repository import (
+            SensorDataRepository,
+        )
+
+        a = UUID("00000000-0000-0000-0000-000000000001")
+        b = UUID("00000000-0000-0000-0000-000000000002")
+        rows = [
+            SimpleNamespace(
+                node_id=node_id, timestamp=START, temperature=None, flow_rate=flow,
+                pressure=None, volume=None,
+            )
+            for node_id, flow in (("281492", 3.0), ("211514", 4.0), ("211514", None))
+        ]
+        connection = MagicMock()
+        connection.config.dataset_id = "dataset"
+        connection.config.project_id = "project"
+        connection.client.query.return_value.result.return_value = rows
+        repository = SensorDataRepository(connection)
+
+        results = await repository.get_by_node_ids([a, b], start_time=START, end_time=END)
+        single = await repository.get_by_node_id(a, limit=5)
+
+        (bulk_query,), _ = connection.client.query.call_args_list[0]
+        (single_query,), kwargs = connection.client.query.call_args_list[1]
+        assert "node_id IN UNNEST(@node_ids)" in bulk_query
+        assert "AND timestamp >= @start_time" in bulk_query
+        assert "node_id = @node_id" in single_query
+        assert "LIMIT 5" in single_query
+        assert [p.name for p in kwargs["job_config"].query_parameters] == ["node_id"]
+        assert [len(results[a]), len(results[b])] == [1, 1]
+        assert len(single) == 2
+        assert "Skipping invalid reading" in caplog.text
+
+
+@pytest.mark.unit
+class TestNetworkUseCaseLoading:
+    """Test the network use cases load readings with one call."""
+
+    @pytest.fixture
+    def network(self):
+        network = WaterNetwork(name="Test", region="Sardinia")
+        source, sink = make_node("source", "source"), make_node("sink", "delivery")
+        network.add_node(source)
+        network.add_node(sink)
+        network.connect_nodes(source.id, sink.id)
+        return network, source, sink
+
+    @pytest.mark.asyncio
+    async def test_efficiency_loads_readings_in_bulk(self, network):
+        """Only the network's nodes are loaded, with one bulk readings call."""
+        network, source, sink = network
+        outsider = make_node("outsider")
+        readings = FakeReadingRepository({
+            source.id: make_readings(source.id, 10.0),
+            sink.id: make_readings(sink.id, 8.0),
+        })
+        readings.get_by_node_ids = AsyncMock(wraps=readings.get_by_node_ids)
+        use_case = CalculateNetworkEfficiencyUseCase(
+            water_network_repository=AsyncMock(get_by_id=AsyncMock(return_value=network)),
+            monitoring_node_repository=FakeNodeRepository([make_node("source"), outsider, source, sink]),
+            sensor_reading_repository=readings,
+            network_efficiency_service=NetworkEfficiencyService(),
+            event_bus=AsyncMock(),
+        )
+
+        result = await use_case.execute(network.id, START, END, include_node_details=False)
+        leaks = await use_case.detect_leakage_zones(network.id, START, END)
+
+        assert readings.get_by_node_ids.await_count == 2
+        requested = set(readings.get_by_node_ids.await_args.args[0])
+        assert requested == {source.id, sink.id}
+        assert result.total_input_volume > 0
+        assert [leak["from_node_name"] for leak in leaks] == ["source"]
+
+    @pytest.mark.asyncio
+    async def test_anomalies_load_nodes_and_readings_in_bulk(self):
+        """Requested nodes and their readings are each fetched with one call."""
+        nodes = [make_node(f"n{i}") for i in range(3)]
+        readings = FakeReadingRepository({node.id: make_readings(node.id, 4.0) for node in nodes[:2]})
+        readings.get_by_node_ids = AsyncMock(wraps=readings.get_by_node_ids)
+        node_repository = FakeNodeRepository(nodes)
+        node_repository.get_by_ids = AsyncMock(return_value=nodes)
+        detection = MagicMock()
+        detection.detect_anomalies.return_value = []
+        use_case = DetectNetworkAnomaliesUseCase(
+            sensor_reading_repository=readings,
+            monitoring_node_repository=node_repository,
+            anomaly_detection_service=detection,
+            event_bus=AsyncMock(),
+            notification_service=AsyncMock(),
+        )
+
+        await use_case.execute(node_ids=[node.id for node in nodes])
+
+        node_repository.get_by_ids.assert_awaited_once()
+        readings.get_by_node_ids.assert_awaited_once()
+        assert detection.detect_anomalies.call_count == 0
@@ -0,0 +1,119 @@
+"""Unit tests for the time-indexed reading store on MonitoringNode."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.domain.entities.monitoring_node import MonitoringNode
+from src.domain.entities.reading_store import ReadingStore, ReadingsView
+from src.domain.entities.sensor_reading import SensorReading
+from src.domain.value_objects.location import NodeLocation
+from src.domain.value_objects.measurements import FlowRate
+from src.domain.value_objects.sensor_type import SensorType
+
+START = datetime(2024, 11, 1)
+
+
+def make_node() -> MonitoringNode:
+    return MonitoringNode(name="node", location=NodeLocation(site_name="site", area="Test"), node_type="junction")
+
+
+def make_reading(node: MonitoringNode, minutes: int, flow: float = 1.0) -> SensorReading:
+    return SensorReading(
+        node_id=node.id,
+        sensor_type=SensorType.FLOW_METER,
+        timestamp=START + timedelta(minutes=minutes),
+        flow_rate=FlowRate(flow),
+    )
+
+
+class TestReadingStore:
+    """Test cases for time-window queries over node readings."""
+
+    def test_range_bounds_are_inclusive(self):
+        """Test readings exactly at either bound are included."""
+        node = make_node()
+        node.add_readings(make_reading(node, m) for m in range(0, 60, 10))
+
+        window = node.get_readings_in_range(START + timedelta(minutes=10), START + timedelta(minutes=30))
+
+        assert [r.timestamp.minute for r in window] == [10, 20, 30]
+
+    def test_out_of_order_readings_are_sorted(self):
+        """Test readings added out of order come back in time order."""
+        node = make_node()
+        for minutes in (30, 0, 20, 10):
+            node.add_reading(make_reading(node, minutes))
+
+        assert [r.timestamp.minute for r in node.readings] == [0, 10, 20, 30]
+        assert node.get_latest_reading().timestamp.minute == 30
+        assert len(node.get_readings_in_range(START, START + timedelta(minutes=15))) == 2
+
+    def test_empty_and_inverted_ranges(self):
+        """Test a window with no readings is an empty view."""
+        node = make_node()
+        assert node.get_latest_reading() is None
+        node.add_reading(make_reading(node, 0))
+
+        assert node.get_readings_in_range(START + timedelta(hours=1), START + timedelta(hours=2)) == []
+        assert len(node.get_readings_in_range(START + timedelta(hours=1), START)) == 0
+
+    def test_window_is_a_view(self):
+        """Test a window shares the stored readings and slices without copying."""
+        node = make_node()
+        readings = [make_reading(node, m) for m in range(10)]
+        node.add_readings(readings)
+
+        window = node.get_readings_in_range(START, START + timedelta(minutes=5))
+
+        assert isinstance(window, ReadingsView)
+        assert window[0] is readings[0]
+        assert window[-1] is readings[5]
+        assert isinstance(window[1:3], ReadingsView)
+        assert window[1:3] == readings[1:3]
+        assert window[::2] == readings[0:6:2]
+        with pytest.raises(IndexError):
+            window[6]
+
+    def test_view_keeps_its_snapshot(self):
+        """Test views handed out earlier are unaffected by later additions."""
+        node = make_node()
+        node.add_readings(make_reading(node, m) for m in (0, 10, 20))
+        window = node.get_readings_in_range(START, START + timedelta(hours=1))
+
+        node.add_reading(make_reading(node, 5))
+        node.add_reading(make_reading(node, 30))
+
+        assert [r.timestamp.minute for r in window] == [0, 10, 20]
+        assert len(node.get_readings_in_range(START, START + timedelta(hours=1))) == 5
+
+    def test_bulk_add_checks_node(self):
+        """Test bulk loading rejects readings for another node."""
+        node, other = make_node(), make_node()
+
+        with pytest.raises(ValueError):
+            node.add_readings([make_reading(node, 0), make_reading(other, 1)])
+        assert node.to_dict()["reading_count"] == 0
+
+    def test_aware_timestamps(self):
+        """Test timezone-aware readings are ordered and queried by instant."""
+        node = make_node()
+        utc = START.replace(tzinfo=timezone.utc)
+        cet = timezone(timedelta(hours=1))
+        for moment in (utc + timedelta(hours=2), datetime(2024, 11, 1, 1, 30, tzinfo=cet)):
+            node.add_reading(
+                SensorReading(node_id=node.id, sensor_type=SensorType.FLOW_METER, timestamp=moment, flow_rate=FlowRate(1.0))
+            )
+
+        window = node.get_readings_in_range(utc, utc + timedelta(hours=1))
+
+        assert [r.timestamp for r in window] == [utc + timedelta(minutes=30)]
+
+    def test_store_grows_past_initial_capacity(self):
+        """Test the key buffer grows with the readings."""
+        node = make_node()
+        store = ReadingStore(make_reading(node, m) for m in range(100))
+
+        assert len(store) == 100
+        assert len(store.between(START, START + timedelta(minutes=49))) == 50
+        assert store.latest().timestamp == START + timedelta(minutes=99)
@@ -0,0 +1,187 @@
+"""Unit tests for the WaterNetwork graph and flow-balance analysis."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.domain.entities.monitoring_node import MonitoringNode
+from src.domain.entities.sensor_reading import SensorReading
+from src.domain.entities.water_network import WaterNetwork
+from src.domain.services.network_efficiency_service import NetworkEfficiencyService
+from src.domain.value_objects.location import NodeLocation
+from src.domain.value_objects.measurements import FlowRate, Volume
+from src.domain.value_objects.sensor_type import SensorType
+
+START = datetime(2024, 11, 1)
+END = START + timedelta(days=1)
+
+
+def make_node(name: str, node_type: str = "junction") -> MonitoringNode:
+    return MonitoringNode(name=name, location=NodeLocation(site_name=name, area="Test"), node_type=node_type)
+
+
+def add_volume(node: MonitoringNode, volume: float) -> None:
+    node.add_reading(
+        SensorReading(
+            node_id=node.id,
+            sensor_type=SensorType.VOLUME_METER,
+            timestamp=START + timedelta(hours=1),
+            volume=Volume(volume),
+        )
+    )
+
+
+def make_network(volumes: dict, connections: list) -> tuple:
+    """Network with one node per name holding the given volume."""
+    network = WaterNetwork(name="Test", region="Sardinia")
+    nodes = {}
+    for name, volume in volumes.items():
+        nodes[name] = make_node(name)
+        network.add_node(nodes[name])
+        add_volume(nodes[name], volume)
+    for from_name, to_name in connections:
+        network.connect_nodes(nodes[from_name].id, nodes[to_name].id)
+    return network, nodes
+
+
+class TestWaterNetworkGraph:
+    """Test cases for the adjacency and array indexes."""
+
+    def test_connected_nodes_from_adjacency(self):
+        """Test connected nodes include both directions."""
+        network, nodes = make_network({"a": 1, "b": 1, "c": 1}, [("a", "b"), ("c", "a")])
+
+        assert set(network.get_connected_nodes(nodes["a"].id)) == {nodes["b"].id, nodes["c"].id}
+        assert network.get_downstream_nodes(nodes["a"].id) == [nodes["b"].id]
+        assert network.get_upstream_nodes(nodes["a"].id) == [nodes["c"].id]
+
+    def test_remove_node_drops_its_connections(self):
+        """Test removing a node removes its edges from every index."""
+        network, nodes = make_network({"a": 1, "b": 1, "c": 1}, [("a", "b"), ("b", "c")])
+
+        network.remove_node(nodes["b"].id)
+
+        assert network.get_connected_nodes(nodes["a"].id) == []
+        assert network.topology.edge_count == 0
+        assert network.to_dict()["connection_count"] == 0
+
+    def test_topology_csr_layout(self):
+        """Test edges are sorted by source with CSR offsets per node."""
+        network, nodes = make_network({"a": 1, "b": 1, "c": 1}, [("b", "c"), ("a", "c"), ("a", "b")])
+        topology = network.topology
+
+        assert topology.indptr.tolist() == [0, 2, 3, 3]
+        assert topology.sources.tolist() == [0, 0, 1]
+        assert set(topology.successors(nodes["a"].id)) == {nodes["b"].id, nodes["c"].id}
+
+    def test_topology_rebuilt_after_changes(self):
+        """Test the cached topology follows node and connection changes."""
+        network, nodes = make_network({"a": 1, "b": 1}, [])
+        before = network.topology
+
+        network.connect_nodes(nodes["a"].id, nodes["b"].id)
+
+        assert network.topology is not before
+        assert network.topology.edge_count == 1
+        assert network.topology is network.topology
+
+    def test_replace_nodes_rebuilds_topology(self):
+        """Test replacing the node map keeps connections and refreshes the index."""
+        network, nodes = make_network({"a": 1, "b": 1}, [("a", "b")])
+        before = network.topology
+
+        network.replace_nodes([nodes["b"], nodes["a"]])
+
+        assert network.topology is not before
+        assert network.topology.edges() == [(nodes["a"].id, nodes["b"].id)]
+
+    def test_restored_connections_wait_for_their_nodes(self):
+        """Test stored connections are indexed once both nodes are present."""
+        a, b = make_node("a"), make_node("b")
+        network = WaterNetwork(name="Test", region="Sardinia")
+        network.restore_connections([(a.id, b.id)])
+        assert network.topology.edge_count == 0
+
+        network.add_node(a)
+        network.add_node(b)
+
+        assert network.topology.edges() == [(a.id, b.id)]
+        assert network.get_connected_nodes(a.id) == [b.id]
+
+    def test_downstream_hops(self):
+        """Test multi-hop traversal follows edge direction."""
+        network, nodes = make_network({"a": 1, "b": 1, "c": 1, "d": 1}, [("a", "b"), ("b", "c"), ("d", "a")])
+        topology = network.topology
+
+        assert topology.downstream(nodes["a"].id) == [nodes["a"].id, nodes["b"].id, nodes["c"].id]
+        assert topology.downstream(nodes["a"].id, max_hops=1) == [nodes["a"].id, nodes["b"].id]
+
+
+class TestFlowBalance:
+    """Test cases for vectorized leak scoring and zone balance."""
+
+    @pytest.fixture
+    def service(self):
+        return NetworkEfficiencyService()
+
+    def test_leakage_zones_match_edge_balance(self, service):
+        """Test every edge losing more than the threshold is reported."""
+        network, nodes = make_network(
+            {"a": 100, "b": 80, "c": 79, "d": 0}, [("a", "b"), ("b", "c"), ("d", "c")]
+        )
+
+        leaks = service.detect_leakage_zones(network, START, END, loss_threshold=10.0)
+
+        assert leaks == [(nodes["a"].id, nodes["b"].id, pytest.approx(20.0))]
+
+    def test_flow_totals_scan_each_node_once(self, service, monkeypatch):
+        """Test node totals read each node's readings once however many edges it has."""
+        network, nodes = make_network(
+            {"hub": 100, "x": 50, "y": 40, "z": 5}, [("hub", "x"), ("hub", "y"), ("hub", "z")]
+        )
+        calls = []
+        original = MonitoringNode.get_readings_in_range
+
+        def counting(node, start, end):
+            calls.append(node.name)
+            return original(node, start, end)
+
+        monkeypatch.setattr(MonitoringNode, "get_readings_in_range", counting)
+        service.detect_leakage_zones(network, START, END)
+
+        assert sorted(calls) == ["hub", "x", "y", "z"]
+
+    def test_flow_rates_are_integrated(self, service):
+        """Test flow-rate-only readings count as 30-minute volumes."""
+        network = WaterNetwork(name="Test", region="Sardinia")
+        node = make_node("meter")
+        network.add_node(node)
+        node.add_reading(SensorReading(node_id=node.id, sensor_type=SensorType.FLOW_METER, timestamp=START, flow_rate=FlowRate(10.0)))
+
+        assert service.calculate_node_flow_totals(network, START, END).tolist() == [18.0]
+
+    def test_zone_balance_over_several_hops(self, service):
+        """Test a zone's inflow is measured at its entries and outflow at its exits."""
+        network, nodes = make_network(
+            {"in": 100, "mid": 95, "out1": 50, "out2": 30, "other": 7},
+            [("in", "mid"), ("mid", "out1"), ("mid", "out2"), ("other", "in")],
+        )
+        zone = network.topology.downstream(nodes["in"].id)
+
+        balance = service.calculate_zone_balance(network, zone, START, END)
+
+        assert balance.entry_nodes == (nodes["in"].id,)
+        assert set(balance.exit_nodes) == {nodes["out1"].id, nodes["out2"].id}
+        assert balance.inflow == 100 and balance.outflow == 80
+        assert balance.loss_percentage == pytest.approx(20.0)
+
+    def test_single_edge_zone_matches_edge_loss(self, service):
+        """Test a two-node zone balances like the edge between them."""
+        network, nodes = make_network({"a": 100, "b": 70}, [("a", "b")])
+        flows = service.calculate_node_flow_totals(network, START, END)
+
+        balance = network.topology.zone_balance(flows, [nodes["a"].id, nodes["b"].id])
+
+        assert balance.loss_percentage == pytest.approx(network.topology.edge_loss_percentages(flows)[0])
+        assert np.isnan(network.topology.edge_loss_percentages(np.zeros(2))[0])
@@ -0,0 +1,132 @@
+"""
+Unit tests for Arrow-native BigQuery extraction and the Parquet-backed fake.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.infrastructure.bigquery.arrow_stream import ArrowQueryReader
+from src.infrastructure.bigquery.fake_bigquery import ParquetBigQueryFake
+
+
+def make_readings(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=rows, freq="30s", tz="UTC"),
+        "node_id": [f"N{i % 3}" for i in range(rows)],
+        "flow_rate": [float(i) for i in range(rows)],
+    })
+
+
+@pytest.mark.unit
+class TestArrowQueryReader:
+    """Test ArrowQueryReader."""
+
+    def test_frames_have_exact_size(self):
+        """Record batches are regrouped into frames of rows_per_frame rows."""
+        fake = ParquetBigQueryFake({"sensor_readings": make_readings(25)}, batch_size=7)
+        reader = ArrowQueryReader(fake)
+
+        frames = list(reader.frames("SELECT * FROM sensor_readings", rows_per_frame=10))
+
+        assert [len(frame) for frame in frames] == [10, 10, 5]
+        assert pd.concat(frames)["flow_rate"].tolist() == [float(i) for i in range(25)]
+
+    def test_large_pages_are_split(self):
+        """A page larger than a frame spans several frames."""
+        fake = ParquetBigQueryFake({"": make_readings(25)}, batch_size=100)
+
+        frames = list(ArrowQueryReader(fake).frames("SELECT 1", rows_per_frame=10))
+
+        assert [len(frame) for frame in frames] == [10, 10, 5]
+
+    def test_read_dataframe_round_trip(self):
+        """Whole-result reads keep values and dtypes."""
+        df = make_readings(10)
+        fake = ParquetBigQueryFake({"": df}, batch_size=3)
+
+        result = ArrowQueryReader(fake).read_dataframe("SELECT 1", job_config="config")
+
+        pd.testing.assert_frame_equal(result, df, check_dtype=False)
+        assert str(result["timestamp"].dt.tz) == "UTC"
+        assert fake.queries == [("SELECT 1", "config")]
+
+    def test_empty_result_keeps_columns(self):
+        """An empty result is an empty frame with the result's columns."""
+        fake = ParquetBigQueryFake({"": make_readings(0)})
+        reader = ArrowQueryReader(fake)
+
+        result = reader.read_dataframe("SELECT 1")
+
+        assert result.empty
+        assert list(result.columns) == ["timestamp", "node_id", "flow_rate"]
+        assert reader.read_table("SELECT 1") is None
+        assert list(reader.frames("SELECT 1")) == []
+
+    def test_storage_client_passed_when_available(self):
+        """The Storage Read API client and stream limits reach the row iterator."""
+        rows = MagicMock()
+        rows.to_arrow_iterable.return_value = iter([])
+        client = MagicMock()
+        client.query.return_value.result.return_value = rows
+        storage = MagicMock()
+
+        with patch("src.infrastructure.bigquery.arrow_stream.bigquery_storage", storage):
+            reader = ArrowQueryReader(client, max_stream_count=4, max_queue_size=2)
+            list(reader.batches("SELECT 1"))
+
+        rows.to_arrow_iterable.assert_called_once_with(
+            bqstorage_client=storage.BigQueryReadClient.return_value,
+            max_stream_count=4,
+            max_queue_size=2,
+        )
+
+    def test_rest_paging_without_storage_api(self):
+        """Disabling the Storage Read API reads pages over REST."""
+        rows = MagicMock()
+        rows.to_arrow_iterable.return_value = iter([])
+        client = MagicMock()
+        client.query.return_value.result.return_value = rows
+
+        list(ArrowQueryReader(client, use_storage_api=False).batches("SELECT 1"))
+
+        rows.to_arrow_iterable.assert_called_once_with(bqstorage_client=None)
+
+
+@pytest.mark.unit
+class TestParquetBigQueryFake:
+    """Test ParquetBigQueryFake."""
+
+    def test_serves_parquet_files_by_table_name(self, tmp_path):
+        """Queries are answered from the file registered for the table they name."""
+        readings, nodes = tmp_path / "readings.parquet", tmp_path / "nodes.parquet"
+        pq.write_table(pa.Table.from_pandas(make_readings(5)), readings)
+        pq.write_table(pa.table({"node_id": ["N0", "N1"]}), nodes)
+        fake = ParquetBigQueryFake({
+            "sensor_readings": readings,
+            "project.dataset.sensor_readings_nodes": nodes,
+        })
+
+        assert len(fake.query("SELECT * FROM `project.dataset.sensor_readings`")
+                   .to_dataframe()) == 5
+        assert len(fake.query("SELECT * FROM project.dataset.sensor_readings_nodes")
+                   .to_dataframe()) == 2
+        assert fake.query("SELECT 1 FROM sensor_readings").result().total_rows == 5
+
+    def test_unknown_table(self):
+        """A query naming no registered table fails loudly."""
+        fake = ParquetBigQueryFake({"sensor_readings": make_readings(1)})
+
+        with pytest.raises(KeyError):
+            fake.query("SELECT * FROM other_table")
+
+    def test_rows_iterate_as_dicts(self):
+        """Row iteration mirrors BigQuery's key-addressable rows."""
+        fake = ParquetBigQueryFake({"": make_readings(2)}, batch_size=1)
+
+        rows = list(fake.query("SELECT 1").result())
+
+        assert [row["node_id"] for row in rows] == ["N0", "N1"]
@@ -0,0 +1,47 @@
+"""
+Unit tests for the non-blocking Redis access layer.
+"""
+
+import pytest
+
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+from src.infrastructure.cache.fake_redis import FakeAsyncRedis
+
+
+@pytest.mark.unit
+class TestAsyncRedisClient:
+    """Test the pipelining helpers against the in-process backend."""
+
+    @pytest.fixture
+    def redis(self):
+        return AsyncRedisClient(client=FakeAsyncRedis())
+
+    @pytest.mark.asyncio
+    async def test_hset_many_and_hgetall_many_use_one_round_trip_each(self, redis):
+        """Multi-key helpers are pipelined and values come back decoded."""
+        await redis.hset_many({"a": {"x": 1}, "b": {"x": 2.5}}, ttl=60)
+        assert redis.client.round_trips == 1
+
+        result = await redis.hgetall_many(["a", "b", "missing"])
+
+        assert result == [{"x": "1"}, {"x": "2.5"}, {}]
+        assert redis.client.round_trips == 2
+
+    @pytest.mark.asyncio
+    async def test_json_round_trip(self, redis):
+        """JSON helpers encode on write and decode on read."""
+        await redis.set_json("summary", {"nodes": 3}, ttl=30)
+
+        assert await redis.get_json("summary") == {"nodes": 3}
+        assert await redis.get_json("absent") is None
+
+    @pytest.mark.asyncio
+    async def test_commands_are_forwarded(self, redis):
+        """Commands without a helper pass through to the async client."""
+        await redis.zadd("series", {"a": 1.0, "b": 2.0, "c": 3.0})
+        await redis.zremrangebyscore("series", 0, 1.5)
+
+        assert await redis.zrangebyscore("series", "-inf", "+inf", withscores=True) == [
+            ("b", 2.0),
+            ("c", 3.0),
+        ]
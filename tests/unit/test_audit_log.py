@@ -0,0 +1,171 @@
+"""
+Unit tests for the batched audit-log writer.
+
+Covers batching on size and time, the flush on shutdown, the overflow
+policies, the row-by-row fallback and log_audit queueing entries.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import src.infrastructure.security.audit_log as audit_log
+from src.infrastructure.security.audit_log import (
+    AUDIT_LOG_COLUMNS,
+    OVERFLOW_DROP,
+    AuditLogWriter,
+    audit_record,
+)
+from src.presentation.api.user_routes import log_audit
+
+
+def make_pool(copy_error: Exception = None):
+    """Pool stub whose connection records COPYs and INSERTs."""
+    conn = MagicMock()
+    conn.copy_records_to_table = AsyncMock(side_effect=copy_error)
+    conn.execute = AsyncMock()
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    pool = MagicMock()
+    pool.acquire = acquire
+    return pool, conn
+
+
+def copied(conn) -> list:
+    return [call.kwargs["records"] for call in conn.copy_records_to_table.await_args_list]
+
+
+@pytest.mark.unit
+class TestAuditLogWriter:
+    """Test queueing and batched writes."""
+
+    def test_record_layout(self):
+        """Rows follow AUDIT_LOG_COLUMNS with JSON values rendered once."""
+        record = audit_record("u1", "User Updated", "user", 7, old_values={"role": "viewer"})
+
+        row = dict(zip(AUDIT_LOG_COLUMNS, record))
+        assert row["entity_id"] == "7"
+        assert json.loads(row["old_values"]) == {"role": "viewer"}
+        assert row["new_values"] is None
+        assert row["created_at"].tzinfo is not None
+
+    @pytest.mark.asyncio
+    async def test_batches_on_size(self):
+        """A full batch is written with one COPY without waiting for the delay."""
+        pool, conn = make_pool()
+        writer = AuditLogWriter(max_batch_size=3, max_delay_seconds=10)
+        writer.start(pool)
+
+        for i in range(6):
+            await writer.submit(audit_record(None, f"action {i}"))
+        await asyncio.sleep(0.01)
+
+        assert [len(batch) for batch in copied(conn)] == [3, 3]
+        assert conn.copy_records_to_table.await_args.kwargs["schema_name"] == "water_infrastructure"
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_batches_on_time(self):
+        """A partial batch is written once the oldest entry waited max_delay_seconds."""
+        pool, conn = make_pool()
+        writer = AuditLogWriter(max_batch_size=100, max_delay_seconds=0.02)
+        writer.start(pool)
+
+        await writer.submit(audit_record(None, "a"))
+        await writer.submit(audit_record(None, "b"))
+        await asyncio.sleep(0.01)
+        assert conn.copy_records_to_table.await_count == 0
+        await asyncio.sleep(0.05)
+
+        assert [len(batch) for batch in copied(conn)] == [2]
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_queue(self):
+        """Entries still queued or held in a partial batch at shutdown are written."""
+        pool, conn = make_pool()
+        writer = AuditLogWriter(max_batch_size=100, max_delay_seconds=10)
+        writer.start(pool)
+        for i in range(5):
+            await writer.submit(audit_record(None, f"action {i}"))
+        await asyncio.sleep(0.01)
+
+        await writer.stop()
+
+        assert sum(len(batch) for batch in copied(conn)) == 5
+        assert writer.stats["written"] == 5
+        assert not writer.running
+
+    @pytest.mark.asyncio
+    async def test_drop_policy(self):
+        """With the drop policy a full queue discards and counts new entries."""
+        writer = AuditLogWriter(max_queue_size=2, overflow=OVERFLOW_DROP)
+
+        results = [await writer.submit(audit_record(None, str(i))) for i in range(3)]
+
+        assert results == [True, True, False]
+        assert writer.stats["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_block_policy_waits_for_room(self):
+        """With the block policy a full queue makes the producer wait."""
+        writer = AuditLogWriter(max_queue_size=1)
+        await writer.submit(audit_record(None, "first"))
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(writer.submit(audit_record(None, "second")), 0.01)
+
+    def test_unknown_policy_rejected(self):
+        """Only the documented overflow policies are accepted."""
+        with pytest.raises(ValueError):
+            AuditLogWriter(overflow="spill")
+
+    @pytest.mark.asyncio
+    async def test_copy_failure_falls_back_to_rows(self):
+        """A failed COPY is retried row by row; bad rows are counted, not fatal."""
+        pool, conn = make_pool(copy_error=ValueError("invalid input syntax for type inet"))
+        conn.execute = AsyncMock(side_effect=[None, ValueError("bad row"), None])
+        writer = AuditLogWriter()
+
+        await writer.write([audit_record(None, str(i)) for i in range(3)], pool)
+
+        assert conn.execute.await_count == 3
+        assert writer.stats == {"written": 2, "batches": 0, "dropped": 0, "failed": 1}
+
+
+@pytest.mark.unit
+class TestLogAudit:
+    """Test log_audit in the user routes."""
+
+    @pytest.mark.asyncio
+    async def test_queued_when_writer_running(self, monkeypatch):
+        """With the writer started, audited requests do no database write."""
+        pool, conn = make_pool()
+        writer = AuditLogWriter(max_delay_seconds=10)
+        monkeypatch.setattr(audit_log, "_audit_writer", writer)
+        writer.start(pool)
+        request_pool = MagicMock()
+
+        await log_audit(request_pool, "u1", "User Login", ip_address="10.0.0.1")
+
+        request_pool.acquire.assert_not_called()
+        assert writer.depth == 1
+        await writer.stop()
+        assert copied(conn) == [] and conn.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_written_inline_without_writer(self, monkeypatch):
+        """Before the writer is started entries are inserted directly."""
+        pool, conn = make_pool()
+        monkeypatch.setattr(audit_log, "_audit_writer", AuditLogWriter())
+
+        await log_audit(pool, None, "Login Failed - User Not Found", success=False)
+
+        assert "audit_logs" in conn.execute.await_args.args[0]
+        assert conn.execute.await_args.args[2] == "Login Failed - User Not Found"
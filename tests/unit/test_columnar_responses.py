@@ -0,0 +1,168 @@
+"""
+Unit tests for the columnar response formats.
+
+Covers column preparation and encoding, the Arrow IPC variant and the
+opt-in `format` parameter of the node history endpoint.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import src.presentation.api.columnar as columnar
+from src.api.main import app
+from src.presentation.api.columnar import (
+    ARROW_STREAM_MEDIA_TYPE,
+    build_columns,
+    columnar_to_frame,
+    encode_arrow,
+    encode_columnar,
+    epoch_ms,
+    record_columns,
+)
+
+BASE = datetime(2024, 11, 1, tzinfo=timezone.utc)
+BASE_MS = 1730419200000
+
+
+def history_row(offset: int, flow_rate=12.5) -> dict:
+    return {
+        "window_start": BASE + timedelta(hours=offset),
+        "window_end": BASE + timedelta(hours=offset + 1),
+        "avg_flow_rate": flow_rate,
+        "avg_pressure": Decimal("3.10"),
+        "avg_temperature": None,
+        "total_volume": 45.0,
+        "anomaly_count": offset,
+        "quality_score": 0.98,
+    }
+
+
+@pytest.mark.unit
+class TestColumnarEncoding:
+    """Test column preparation and serialization."""
+
+    def test_epoch_ms_handles_aware_naive_and_missing(self):
+        """Aware and naive (UTC) timestamps map to epoch ms; missing ones to None."""
+        assert epoch_ms([BASE, BASE.replace(tzinfo=None)]).tolist() == [BASE_MS, BASE_MS]
+        assert epoch_ms([BASE, None]).tolist() == [BASE_MS, None]
+        assert epoch_ms(pd.Series(pd.date_range(BASE, periods=2, freq="h"))).tolist() == [
+            BASE_MS, BASE_MS + 3_600_000
+        ]
+
+    def test_record_columns_are_typed_arrays(self):
+        """Decimals and None become float/NaN, integers stay integers."""
+        columns = record_columns([history_row(0), history_row(1, flow_rate=None)], ["avg_pressure", "avg_flow_rate", "anomaly_count"])
+
+        assert columns["avg_pressure"].dtype == np.float64
+        assert np.isnan(columns["avg_flow_rate"][1])
+        assert columns["anomaly_count"].tolist() == [0, 1]
+
+    def test_record_columns_renames(self):
+        """A mapping selects record fields under new column names."""
+        columns = record_columns([history_row(0)], {"flow": "avg_flow_rate"})
+
+        assert list(columns) == ["flow"]
+
+    def test_json_layout(self):
+        """The time column becomes `timestamps`; other datetimes are epoch ms too; NaN is null."""
+        rows = [history_row(0), history_row(1, flow_rate=None)]
+        payload = json.loads(encode_columnar(build_columns(
+            record_columns(rows, ["window_start", "window_end", "avg_flow_rate", "avg_temperature"]),
+            time_column="window_start"
+        )))
+
+        assert payload == {
+            "timestamps": [BASE_MS, BASE_MS + 3_600_000],
+            "window_end": [BASE_MS + 3_600_000, BASE_MS + 7_200_000],
+            "avg_flow_rate": [12.5, None],
+            "avg_temperature": [None, None],
+        }
+
+    def test_stdlib_fallback_matches_orjson(self, monkeypatch):
+        """Without orjson the standard library produces the same document."""
+        frame = pd.DataFrame({
+            "timestamp": pd.date_range(BASE, periods=3, freq="h"),
+            "flow_rate": [1.5, np.nan, 3.0],
+            "node_id": ["A", "B", "C"],
+            "count": [1, 2, 3],
+        })
+        columns = build_columns(frame)
+        fast = json.loads(encode_columnar(columns))
+        monkeypatch.setattr(columnar, "orjson", None)
+
+        assert json.loads(encode_columnar(columns)) == fast
+
+    def test_arrow_round_trip(self):
+        """Arrow IPC payloads decode to the same frame as columnar JSON."""
+        columns = build_columns(pd.DataFrame({
+            "timestamp": pd.date_range(BASE, periods=4, freq="15min"),
+            "flow_rate": [1.0, np.nan, 2.5, 4.0],
+        }))
+
+        from_arrow = columnar_to_frame(encode_arrow(columns))
+        from_json = columnar_to_frame(json.loads(encode_columnar(columns)))
+
+        assert from_arrow["timestamp"].tolist() == from_json["timestamp"].tolist()
+        assert from_arrow["flow_rate"].isna().tolist() == [False, True, False, False]
+        assert from_arrow["flow_rate"].fillna(-1).tolist() == from_json["flow_rate"].fillna(-1).tolist()
+
+
+@pytest.mark.unit
+class TestHistoryEndpointFormats:
+    """Test the opt-in formats on the node history endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        """Provide a client whose PostgreSQL connection returns fixed history rows."""
+        conn = MagicMock()
+        conn.fetch = AsyncMock(return_value=[history_row(offset) for offset in range(3)])
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        manager = MagicMock()
+        manager.acquire = acquire
+        app.state.postgres = manager
+        yield TestClient(app)
+        del app.state.postgres
+
+    def test_rows_by_default(self, client):
+        """Without `format` the response is unchanged: one object per row."""
+        response = client.get("/api/v1/nodes/281492/history")
+
+        assert response.status_code == 200
+        assert response.json()[0]["avg_flow_rate"] == 12.5
+
+    def test_columnar(self, client):
+        """format=columnar returns one array per field with epoch-ms timestamps."""
+        response = client.get("/api/v1/nodes/281492/history", params={"format": "columnar"})
+
+        body = response.json()
+        assert body["timestamps"] == [BASE_MS + offset * 3_600_000 for offset in range(3)]
+        assert body["anomaly_count"] == [0, 1, 2]
+        assert body["avg_pressure"] == [3.1, 3.1, 3.1]
+        assert body["avg_temperature"] == [None, None, None]
+
+    def test_arrow(self, client):
+        """format=arrow returns an Arrow IPC stream."""
+        response = client.get("/api/v1/nodes/281492/history", params={"format": "arrow"})
+
+        assert response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+        frame = columnar_to_frame(response.content, time_column="window_start", datetime_columns=["window_end"])
+        assert frame["window_start"].iloc[0] == pd.Timestamp(BASE)
+        assert frame["window_end"].iloc[0] == pd.Timestamp(BASE + timedelta(hours=1))
+
+    def test_unknown_format_rejected(self, client):
+        """Only the documented formats are accepted."""
+        response = client.get("/api/v1/nodes/281492/history", params={"format": "xml"})
+
+        assert response.status_code == 422
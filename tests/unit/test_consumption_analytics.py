@@ -0,0 +1,154 @@
+"""
+Unit tests for the single-pass consumption analytics.
+
+Sections are checked against straightforward per-row pandas computations
+over the same readings.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.services.consumption_analytics import ConsumptionAggregates, is_night_hour
+from src.api.services.consumption_service import analyze_consumption, generate_daily_trends
+
+
+def make_readings(days: int = 3, nodes=("281492", "999")) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    timestamps = pd.date_range("2024-01-01", periods=days * 48, freq="30min")
+    frame = pd.DataFrame({
+        "timestamp": np.tile(timestamps, len(nodes)),
+        "node_id": np.repeat(list(nodes), len(timestamps)),
+        "flow_rate": rng.uniform(1, 50, len(timestamps) * len(nodes)),
+        "quality_score": rng.uniform(0.5, 1.0, len(timestamps) * len(nodes)),
+    })
+    frame["consumption_m3h"] = frame["flow_rate"] * 3.6
+    frame["volume_m3"] = frame["consumption_m3h"] * 0.5
+    return frame
+
+
+@pytest.mark.unit
+@pytest.mark.consumption
+class TestConsumptionAggregates:
+    """Test the grouped consumption sections."""
+
+    def test_metrics_match_row_level_computation(self):
+        """Totals, extremes and the day/night split match per-row pandas."""
+        data = make_readings()
+        metrics = ConsumptionAggregates.from_readings(data).metrics()
+
+        hours = data["timestamp"].dt.hour
+        night = data.loc[(hours >= 22) | (hours < 6), "consumption_m3h"]
+        day = data.loc[(hours >= 6) & (hours < 22), "consumption_m3h"]
+        peak = data.loc[data["consumption_m3h"].idxmax(), "timestamp"]
+
+        assert metrics.total_consumption_m3 == pytest.approx(data["volume_m3"].sum())
+        assert metrics.avg_consumption_rate == pytest.approx(data["consumption_m3h"].mean())
+        assert metrics.peak_consumption_rate == pytest.approx(data["consumption_m3h"].max())
+        assert metrics.peak_hour == peak.strftime("%H:%M")
+        assert metrics.consumption_variability == pytest.approx(
+            data["consumption_m3h"].std() / data["consumption_m3h"].mean()
+        )
+        assert metrics.night_consumption_avg == pytest.approx(night.mean())
+        assert metrics.day_consumption_avg == pytest.approx(day.mean())
+
+    def test_night_window_wraps_midnight(self):
+        """Hours 22-23 and 0-5 are night, 6-21 are day."""
+        hours = np.arange(24)
+        assert hours[is_night_hour(hours)].tolist() == [0, 1, 2, 3, 4, 5, 22, 23]
+
+    def test_hourly_patterns_match_groupby(self):
+        """Hourly means, extremes and counts match a direct groupby."""
+        data = make_readings()
+        patterns = ConsumptionAggregates.from_readings(data).hourly_patterns()
+        expected = data.groupby(data["timestamp"].dt.hour)["consumption_m3h"].agg(["mean", "max", "min", "count"])
+
+        assert [pattern.hour for pattern in patterns] == list(range(24))
+        for pattern in patterns:
+            row = expected.loc[pattern.hour]
+            assert pattern.avg_consumption == pytest.approx(row["mean"])
+            assert pattern.peak_consumption == pytest.approx(row["max"])
+            assert pattern.min_consumption == pytest.approx(row["min"])
+            assert pattern.data_points == row["count"]
+
+    def test_daily_trends_split_day_and_night_per_date(self):
+        """Each date gets its own totals and day/night averages."""
+        data = make_readings()
+        trends = generate_daily_trends(data)
+
+        assert [trend.date for trend in trends] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+        for trend in trends:
+            rows = data[data["timestamp"].dt.date.astype(str) == trend.date]
+            hours = rows["timestamp"].dt.hour
+            night = rows.loc[(hours >= 22) | (hours < 6), "consumption_m3h"].mean()
+            day = rows.loc[(hours >= 6) & (hours < 22), "consumption_m3h"].mean()
+            assert trend.total_consumption == pytest.approx(rows["volume_m3"].sum())
+            assert trend.peak_consumption == pytest.approx(rows["consumption_m3h"].max())
+            assert trend.night_consumption == pytest.approx(night)
+            assert trend.day_consumption == pytest.approx(day)
+            assert trend.consumption_efficiency == pytest.approx(min(day / night, 10.0))
+
+    def test_daily_trends_without_night_readings(self):
+        """A date with only daytime readings reports zero night use and ratio 1."""
+        data = make_readings(days=1)
+        hours = data["timestamp"].dt.hour
+        trends = generate_daily_trends(data[(hours >= 8) & (hours < 18)])
+
+        assert trends[0].night_consumption == 0
+        assert trends[0].consumption_efficiency == 1.0
+
+    def test_node_consumption_shares_and_names(self):
+        """Node shares sum to 100% and known nodes get display names."""
+        nodes = ConsumptionAggregates.from_readings(make_readings()).node_consumption()
+
+        assert {node.node_id: node.node_name for node in nodes} == {
+            "281492": "Primary Station", "999": "Node 999"
+        }
+        assert sum(node.consumption_percentage for node in nodes) == pytest.approx(100.0)
+
+    def test_heatmap_covers_hour_and_weekday(self):
+        """Heatmap cells are normalized and cover every observed hour and weekday."""
+        heatmap = ConsumptionAggregates.from_readings(make_readings(days=7)).heatmap_data()
+
+        assert len(heatmap) == 24 * 7
+        intensities = [cell.consumption_intensity for cell in heatmap]
+        assert min(intensities) == 0.0
+        assert max(intensities) == 1.0
+
+    def test_input_frame_is_not_modified(self):
+        """No helper columns are added to the caller's frame."""
+        data = make_readings()
+        columns = list(data.columns)
+
+        analyze_consumption(data)
+
+        assert list(data.columns) == columns
+
+    def test_empty_frame(self):
+        """An empty frame yields zero metrics and no sections."""
+        analysis = analyze_consumption(make_readings().iloc[0:0])
+
+        assert analysis.metrics.total_consumption_m3 == 0.0
+        assert analysis.hourly_patterns == []
+        assert analysis.daily_trends == []
+        assert analysis.node_consumption == []
+        assert analysis.heatmap_data == []
+        assert analysis.insights == []
+
+    def test_optional_sections_skipped(self):
+        """Heatmap and insights are only computed when requested."""
+        analysis = analyze_consumption(make_readings(), include_heatmap=False, include_insights=False)
+
+        assert analysis.heatmap_data == []
+        assert analysis.insights == []
+        assert analysis.daily_trends
+
+    def test_daily_trends_frame_matches_models(self):
+        """The columnar daily trends carry the same values as the row models."""
+        aggregates = ConsumptionAggregates.from_readings(make_readings())
+        frame = aggregates.daily_trends_frame()
+
+        assert [trend.model_dump(exclude={"date"}) for trend in aggregates.daily_trends()] == (
+            frame.to_dict("records")
+        )
+        assert frame.index.strftime("%Y-%m-%d").tolist() == ["2024-01-01", "2024-01-02", "2024-01-03"]
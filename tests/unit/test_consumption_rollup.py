@@ -0,0 +1,209 @@
+"""
+Unit tests for the consumption rollup cache.
+
+Results served from cached closed days plus live partial days must match
+aggregating the whole range from readings.
+"""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.services.consumption_analytics import ConsumptionAggregates
+from src.api.services.consumption_rollup import (
+    DEFAULT_ROLLUP_TTL,
+    ConsumptionRollupCache,
+    rollup_key,
+)
+from src.api.services.consumption_service import get_consumption_data_df
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+from src.infrastructure.cache.data_version import record_write
+from src.infrastructure.cache.fake_redis import FakeAsyncRedis
+
+NODES = ["281492", "211514"]
+NOW = datetime(2024, 1, 11, 9, 45)
+
+
+def make_readings(days: int = 12) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    timestamps = pd.date_range("2024-01-01", periods=days * 48, freq="30min")
+    return pd.DataFrame({
+        "timestamp": np.tile(timestamps, len(NODES)),
+        "node_id": np.repeat(NODES, len(timestamps)).astype(object),
+        "flow_rate": rng.uniform(1, 40, len(timestamps) * len(NODES)),
+        "quality_score": rng.uniform(0.6, 1.0, len(timestamps) * len(NODES)),
+    })
+
+
+def make_hybrid_service(readings: pd.DataFrame) -> MagicMock:
+    """Hybrid service answering range queries (inclusive bounds) from a frame."""
+    async def get_readings_frame(start_time, end_time, node_ids=None, raise_errors=False):
+        mask = readings["timestamp"].between(start_time, end_time)
+        if node_ids:
+            mask &= readings["node_id"].isin(node_ids)
+        return readings[mask].reset_index(drop=True)
+
+    service = MagicMock()
+    service.get_readings_frame = MagicMock(side_effect=get_readings_frame)
+    return service
+
+
+@pytest.mark.unit
+@pytest.mark.consumption
+class TestConsumptionRollupCache:
+    """Test cached closed days combined with live data."""
+
+    @pytest.fixture
+    def readings(self):
+        """Provide twelve days of readings for two nodes."""
+        return make_readings()
+
+    @pytest.fixture
+    def cache(self):
+        """Provide a rollup cache on the in-process Redis fake."""
+        return ConsumptionRollupCache(AsyncRedisClient(client=FakeAsyncRedis()), clock=lambda: NOW)
+
+    async def expected(self, readings, start, end):
+        data = await get_consumption_data_df(make_hybrid_service(readings), start, end, NODES)
+        return ConsumptionAggregates.from_readings(data)
+
+    @pytest.mark.asyncio
+    async def test_matches_direct_aggregation(self, cache, readings):
+        """Cached and live parts combine to the same sections as one pass."""
+        start, end = NOW - timedelta(days=7), NOW
+        service = make_hybrid_service(readings)
+        expected = await self.expected(readings, start, end)
+
+        for _ in range(2):  # cold, then warm
+            result = await cache.load(service, start, end, NODES)
+            assert result.metrics() == expected.metrics()
+            assert result.daily_trends() == expected.daily_trends()
+            assert result.hourly_patterns() == pytest.approx(expected.hourly_patterns())
+            assert result.node_consumption() == expected.node_consumption()
+            assert result.heatmap_data() == expected.heatmap_data()
+
+    @pytest.mark.asyncio
+    async def test_warm_range_fetches_only_partial_days(self, cache, readings):
+        """With closed days cached, only the first partial day and today are queried."""
+        start, end = NOW - timedelta(days=7), NOW
+        service = make_hybrid_service(readings)
+        await cache.load(service, start, end, NODES)
+        service.get_readings_frame.reset_mock()
+
+        await cache.load(service, start, end, NODES)
+
+        assert cache.stats["hits"] == 6 * len(NODES)
+        spans = [
+            call.kwargs["end_time"] - call.kwargs["start_time"]
+            for call in service.get_readings_frame.call_args_list
+        ]
+        assert len(spans) == 2
+        assert all(span <= timedelta(days=1) for span in spans)
+
+    @pytest.mark.asyncio
+    async def test_only_closed_days_are_stored(self, cache, readings):
+        """Today's rollup is never persisted; yesterday's is."""
+        await cache.load(make_hybrid_service(readings), NOW - timedelta(days=3), NOW, NODES)
+
+        assert await cache.redis.get(rollup_key(NODES[0], date(2024, 1, 10))) is not None
+        assert await cache.redis.get(rollup_key(NODES[0], NOW.date())) is None
+
+    @pytest.mark.asyncio
+    async def test_days_without_readings_are_cached_empty(self, cache, readings):
+        """A node-day with no readings is stored and not queried again."""
+        service = make_hybrid_service(readings[readings["timestamp"] >= "2024-01-05"])
+        start = datetime(2024, 1, 3)
+        await cache.load(service, start, NOW, NODES)
+
+        result = await cache.load(service, start, NOW, NODES)
+
+        assert cache.stats["misses"] == 8 * len(NODES)
+        assert result.daily_trends()[0].date == "2024-01-05"
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_cached_empty(self, cache, readings):
+        """Closed days read during an outage are rebuilt once the database is back."""
+        start, end = NOW - timedelta(days=3), NOW
+        outage = MagicMock()
+        outage.get_readings_frame = AsyncMock(side_effect=ConnectionError("database down"))
+
+        result = await cache.load(outage, start, end, NODES)
+
+        assert result.daily_trends() == []
+        assert await cache.redis.get(rollup_key(NODES[0], date(2024, 1, 10))) is None
+
+        result = await cache.load(make_hybrid_service(readings), start, end, NODES)
+
+        assert result.daily_trends() == (await self.expected(readings, start, end)).daily_trends()
+        assert await cache.redis.get(rollup_key(NODES[0], date(2024, 1, 10))) is not None
+
+    @pytest.mark.asyncio
+    async def test_node_selection_reuses_per_node_rollups(self, cache, readings):
+        """Rollups are per node, so a subset is served from an earlier full load."""
+        start, end = NOW - timedelta(days=5), NOW
+        service = make_hybrid_service(readings)
+        await cache.load(service, start, end, NODES)
+
+        result = await cache.load(service, start, end, ["Primary Station"])
+
+        assert [node.node_id for node in result.node_consumption()] == ["281492"]
+        assert cache.stats["misses"] == 4 * len(NODES)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_rebuild(self, cache, readings):
+        """Invalidating retires the stored generation, so closed days are rolled up again."""
+        start, end = NOW - timedelta(days=3), NOW
+        service = make_hybrid_service(readings)
+        await cache.load(service, start, end, NODES)
+
+        deleted = await cache.invalidate(NODES, [date(2024, 1, 9)])
+        await cache.load(service, start, end, NODES)
+
+        assert deleted == len(NODES)
+        assert cache.stats["misses"] == 2 * len(NODES) + 2 * len(NODES)
+
+    @pytest.mark.asyncio
+    async def test_late_writes_retire_stored_rollups(self, cache, readings):
+        """Rows written into a closed day (a generation bump) are picked up."""
+        start, end = NOW - timedelta(days=3), NOW
+        await cache.load(make_hybrid_service(readings[readings["timestamp"] < "2024-01-10"]), start, end, NODES)
+
+        await record_write(cache.redis, datetime(2024, 1, 10, 12), now=NOW.timestamp())
+        cache.data_version._read_at = float("-inf")
+        result = await cache.load(make_hybrid_service(readings), start, end, NODES)
+
+        assert result.daily_trends() == (await self.expected(readings, start, end)).daily_trends()
+        assert await cache.redis.get(rollup_key(NODES[0], date(2024, 1, 10), 1)) is not None
+
+    @pytest.mark.asyncio
+    async def test_days_within_settle_window_stay_live(self, readings):
+        """Yesterday is not stored until it has been over for the settle window."""
+        cache = ConsumptionRollupCache(
+            AsyncRedisClient(client=FakeAsyncRedis()), clock=lambda: datetime(2024, 1, 11, 0, 30)
+        )
+
+        await cache.load(make_hybrid_service(readings), NOW - timedelta(days=3), NOW, NODES)
+
+        assert await cache.redis.get(rollup_key(NODES[0], date(2024, 1, 9))) is not None
+        assert await cache.redis.get(rollup_key(NODES[0], date(2024, 1, 10))) is None
+
+    @pytest.mark.asyncio
+    async def test_rollups_expire(self, cache, readings):
+        """Stored rollups have a TTL so superseded generations age out."""
+        await cache.load(make_hybrid_service(readings), NOW - timedelta(days=3), NOW, NODES)
+
+        assert 0 < await cache.redis.ttl(rollup_key(NODES[0], date(2024, 1, 10))) <= DEFAULT_ROLLUP_TTL
+
+    @pytest.mark.asyncio
+    async def test_range_within_today_is_live(self, cache, readings):
+        """A range with no closed whole day is one live query."""
+        service = make_hybrid_service(readings)
+
+        result = await cache.load(service, NOW - timedelta(hours=6), NOW, NODES)
+
+        assert service.get_readings_frame.call_count == 1
+        assert not result.empty
+        assert cache.stats["hits"] == cache.stats["misses"] == 0
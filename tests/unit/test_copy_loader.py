@@ -0,0 +1,198 @@
+"""
+Unit tests for the columnar DataFrame-to-COPY conversion.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.infrastructure.database.copy_loader import (
+    DISTRICT_METADATA,
+    SENSOR_READING_COLUMNS,
+    frame_to_copy_records,
+    latest_readings,
+)
+from src.infrastructure.database.postgres_manager import PostgresManager
+
+
+def make_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "timestamp": pd.to_datetime(
+            ["2024-11-01 00:00", "2024-11-01 00:30", "2024-11-01 00:15"], utc=True
+        ),
+        "node_id": ["A", "A", "B"],
+        "temperature": [18.0, np.nan, 17.5],
+        "flow_rate": [1.5, 2.5, np.nan],
+        "pressure": [3.0, 3.1, 2.9],
+        "total_flow": [100.0, 101.0, 50.0],
+        "quality_score": [0.9, np.nan, 0.8],
+        "district_id": ["D1", "D1", None],
+    })
+
+
+@pytest.mark.unit
+class TestFrameToCopyRecords:
+    """Test record conversion."""
+
+    def test_nan_becomes_null_and_quality_defaults(self):
+        """NaN measurements map to None; a missing quality uses the default."""
+        records = frame_to_copy_records(make_frame(), default_quality_score=0.7)
+
+        assert len(records) == 3
+        assert len(records[0]) == len(SENSOR_READING_COLUMNS)
+        assert records[1][2] is None
+        assert records[2][3] is None
+        assert records[1][6] == 0.7
+        assert records[0][6] == 0.9
+        assert isinstance(records[0][3], float)
+        assert records[0][0] == pd.Timestamp("2024-11-01 00:00", tz="UTC").to_pydatetime()
+
+    def test_raw_data_shares_batch_metadata(self):
+        """Batch metadata and per-row columns are merged, with defaults for nulls."""
+        records = frame_to_copy_records(
+            make_frame(),
+            source_metadata={"source": "sensor_readings_ml", "backfill": True},
+            metadata_columns=DISTRICT_METADATA,
+        )
+
+        raw = [json.loads(r[8]) for r in records]
+        assert raw[0] == {
+            "source": "sensor_readings_ml",
+            "backfill": True,
+            "district_id": "D1",
+            "district_name": "Unknown",
+        }
+        assert raw[2]["district_id"] == "unknown"
+        # Rows with the same metadata share one rendered payload
+        assert records[0][8] is records[1][8]
+
+    def test_missing_columns_and_invalid_rows(self):
+        """Absent measurement columns are NULL; rows without keys are dropped."""
+        frame = pd.DataFrame({
+            "timestamp": [pd.Timestamp("2024-11-01", tz="UTC"), pd.NaT],
+            "node_id": ["A", "B"],
+            "flow_rate": [1.0, 2.0],
+        })
+
+        records = frame_to_copy_records(frame)
+
+        assert len(records) == 1
+        assert records[0][2] is None and records[0][5] is None
+        assert records[0][6] == 1.0
+        assert records[0][8] == "{}"
+
+    def test_arrow_table_input(self):
+        """Arrow tables are accepted directly."""
+        records = frame_to_copy_records(pa.Table.from_pandas(make_frame()))
+
+        assert [r[1] for r in records] == ["A", "A", "B"]
+
+    def test_latest_readings_per_node(self):
+        """The newest reading of each node is selected."""
+        latest = {r["node_id"]: r for r in latest_readings(make_frame())}
+
+        assert latest["A"]["flow_rate"] == 2.5
+        assert latest["A"]["temperature"] is None
+        assert latest["B"]["pressure"] == 2.9
+
+
+def make_manager(merged: int):
+    """PostgresManager over a mock connection whose merge inserts `merged` rows."""
+    conn = MagicMock()
+    conn.copy_records_to_table = AsyncMock()
+    conn.execute = AsyncMock(
+        side_effect=lambda query, *args: f"INSERT 0 {merged}" if "INSERT INTO" in query else "OK"
+    )
+    conn.fetch = AsyncMock(return_value=[])
+    conn.transaction.return_value.__aenter__ = AsyncMock()
+    conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    manager = PostgresManager()
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    manager.acquire = acquire
+    return manager, conn
+
+
+def executed(conn) -> list:
+    return [call.args[0] for call in conn.execute.await_args_list]
+
+
+@pytest.mark.unit
+class TestInsertSensorReadingsFrame:
+    """Test the PostgresManager entry point."""
+
+    @pytest.mark.asyncio
+    async def test_copies_records_and_updates_index_in_one_transaction(self):
+        """COPY, merge and the latest-reading update share a transaction."""
+        manager, conn = make_manager(merged=3)
+
+        inserted = await manager.insert_sensor_readings_frame(make_frame(), {"source": "test"})
+
+        assert inserted == 3
+        conn.transaction.assert_called_once()
+        kwargs = conn.copy_records_to_table.await_args.kwargs
+        assert kwargs["columns"] == SENSOR_READING_COLUMNS
+        assert len(kwargs["records"]) == 3
+        node_ids = conn.fetch.await_args.args[1]
+        assert node_ids == ["A", "B"]
+
+
+@pytest.mark.unit
+class TestSensorReadingMerge:
+    """Test the staging-table upsert that deduplicates readings."""
+
+    @pytest.mark.asyncio
+    async def test_copies_into_staging_and_skips_conflicts(self):
+        """Records land in the staging table and are merged with DO NOTHING."""
+        manager, conn = make_manager(merged=1)
+
+        inserted = await manager.insert_sensor_readings_frame(make_frame())
+
+        assert inserted == 1
+        assert conn.copy_records_to_table.await_args.args[0] == "sensor_readings_staging"
+        assert "schema_name" not in conn.copy_records_to_table.await_args.kwargs
+        queries = executed(conn)
+        assert "CREATE TEMP TABLE IF NOT EXISTS sensor_readings_staging" in queries[0]
+        assert "ON COMMIT DELETE ROWS" in queries[0]
+        merge = queries[1]
+        assert "DISTINCT ON (node_id, timestamp)" in merge
+        assert "ON CONFLICT (node_id, timestamp) DO NOTHING" in merge
+
+    @pytest.mark.asyncio
+    async def test_overwrite_updates_existing_rows(self):
+        """overwrite=True replaces measurements but never the key columns."""
+        manager, conn = make_manager(merged=3)
+
+        await manager.insert_sensor_readings_frame(make_frame(), overwrite=True)
+
+        merge = executed(conn)[1]
+        assert "DO UPDATE SET" in merge
+        assert "flow_rate = EXCLUDED.flow_rate" in merge
+        assert "raw_data = EXCLUDED.raw_data" in merge
+        assert "node_id = EXCLUDED" not in merge
+        assert "timestamp = EXCLUDED" not in merge
+
+    @pytest.mark.asyncio
+    async def test_batch_insert_reports_rows_written(self):
+        """The dict-based batch path merges the same way and returns rows written."""
+        manager, conn = make_manager(merged=0)
+        readings = [{
+            "timestamp": pd.Timestamp("2024-11-01", tz="UTC").to_pydatetime(),
+            "node_id": "A",
+            "flow_rate": 1.0,
+        }] * 2
+
+        inserted = await manager.insert_sensor_readings_batch(readings)
+
+        assert inserted == 0
+        assert conn.copy_records_to_table.await_args.args[0] == "sensor_readings_staging"
+        assert len(conn.copy_records_to_table.await_args.kwargs["records"]) == 2
@@ -0,0 +1,220 @@
+"""
+Unit tests for the in-memory and queued event buses.
+
+Covers bounded batch publishing, per-node ordering, batch delivery,
+backpressure, error isolation and dispatch metrics.
+"""
+
+import asyncio
+import threading
+from uuid import uuid4
+
+import pytest
+
+from src.domain.events.sensor_events import AnomalyDetectedEvent
+from src.infrastructure.external_services.event_bus import InMemoryEventBus, QueuedEventBus
+
+
+def anomaly(node_id=None, value: float = 1.0) -> AnomalyDetectedEvent:
+    return AnomalyDetectedEvent(
+        node_id=node_id or uuid4(),
+        sensor_type="flow",
+        anomaly_type="spike",
+        severity="high",
+        measurement_value=value,
+        threshold=0.5,
+        description="test",
+    )
+
+
+@pytest.mark.unit
+class TestInMemoryEventBus:
+    """Test the direct delivery mode."""
+
+    @pytest.mark.asyncio
+    async def test_publish_batch_is_bounded(self):
+        """No more than max_concurrency deliveries run at once."""
+        bus = InMemoryEventBus(max_concurrency=5)
+        running = peak = 0
+
+        async def handler(event):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+        bus.subscribe(AnomalyDetectedEvent, handler)
+        await bus.publish_batch([anomaly() for _ in range(50)])
+
+        assert peak == 5
+
+    @pytest.mark.asyncio
+    async def test_publish_batch_keeps_per_node_order(self):
+        """Events about one node are handled in batch order, never concurrently."""
+        bus = InMemoryEventBus(max_concurrency=10)
+        nodes = [uuid4() for _ in range(3)]
+        received = {node: [] for node in nodes}
+        running = {node: 0 for node in nodes}
+        overlapped = False
+
+        async def handler(event):
+            nonlocal overlapped
+            running[event.node_id] += 1
+            overlapped = overlapped or running[event.node_id] > 1
+            # Later events finish sooner, so concurrent delivery would reorder them
+            await asyncio.sleep(0.001 * (30 - event.measurement_value) / 30)
+            received[event.node_id].append(event.measurement_value)
+            running[event.node_id] -= 1
+
+        bus.subscribe(AnomalyDetectedEvent, handler)
+        await bus.publish_batch([anomaly(nodes[i % 3], float(i)) for i in range(30)])
+
+        assert not overlapped
+        assert all(values == sorted(values) for values in received.values())
+        assert sum(len(values) for values in received.values()) == 30
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_logged(self, caplog):
+        """A failing handler is logged and does not stop the others."""
+        bus = InMemoryEventBus()
+        received = []
+
+        def broken(event):
+            raise RuntimeError("boom")
+
+        bus.subscribe(AnomalyDetectedEvent, broken)
+        bus.subscribe(AnomalyDetectedEvent, received.append)
+        await bus.publish(anomaly())
+
+        assert len(received) == 1
+        assert "boom" in caplog.text
+
+
+@pytest.mark.unit
+class TestQueuedEventBus:
+    """Test the queued delivery mode."""
+
+    @pytest.mark.asyncio
+    async def test_per_node_order_with_several_workers(self):
+        """Events of one node reach the handler in publish order."""
+        bus = QueuedEventBus(workers=4)
+        received = {}
+
+        async def handler(event):
+            await asyncio.sleep(0)
+            received.setdefault(event.node_id, []).append(event.measurement_value)
+
+        bus.subscribe(AnomalyDetectedEvent, handler)
+        nodes = [uuid4() for _ in range(8)]
+        await bus.publish_batch([anomaly(nodes[i % 8], float(i)) for i in range(400)])
+        await bus.stop()
+
+        for index, node_id in enumerate(nodes):
+            assert received[node_id] == [float(i) for i in range(index, 400, 8)]
+
+    @pytest.mark.asyncio
+    async def test_batch_handlers_receive_lists(self):
+        """Batch subscribers get queued events in lists of at most max_batch_size."""
+        bus = QueuedEventBus()
+        sizes = []
+
+        async def handler(events):
+            sizes.append(len(events))
+
+        bus.subscribe(AnomalyDetectedEvent, handler, batch=True, max_batch_size=100)
+        await bus.publish_batch([anomaly() for _ in range(250)])
+        await bus.drain()
+
+        assert sum(sizes) == 250
+        assert max(sizes) <= 100
+        assert len(sizes) < 250
+
+    @pytest.mark.asyncio
+    async def test_sync_handlers_run_off_loop(self):
+        """Sync handlers run in the executor, one hop per group of events."""
+        bus = QueuedEventBus()
+        threads = set()
+        received = []
+
+        def handler(event):
+            threads.add(threading.current_thread())
+            received.append(event)
+
+        bus.subscribe(AnomalyDetectedEvent, handler)
+        await bus.publish_batch([anomaly() for _ in range(20)])
+        await bus.drain()
+
+        assert len(received) == 20
+        assert threading.main_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self):
+        """publish waits while the handler's lane is full."""
+        bus = QueuedEventBus(queue_size=2)
+        release = asyncio.Event()
+
+        async def handler(event):
+            await release.wait()
+
+        bus.subscribe(AnomalyDetectedEvent, handler)
+        for _ in range(3):
+            await bus.publish(anomaly())
+        await asyncio.sleep(0)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(bus.publish(anomaly()), 0.01)
+        release.set()
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_metrics_and_error_isolation(self):
+        """Failures are counted per handler; metrics report depth and latency."""
+        bus = QueuedEventBus()
+
+        async def flaky(event):
+            if event.measurement_value < 0:
+                raise ValueError("negative")
+
+        bus.subscribe(AnomalyDetectedEvent, flaky)
+        await bus.publish_batch([anomaly(value=v) for v in (1.0, -1.0, 2.0)])
+        depth_before = bus.metrics()
+        await bus.drain()
+
+        metrics = next(iter(bus.metrics().values()))
+        assert next(iter(depth_before.values()))["queue_depth"] == 3
+        assert metrics["queue_depth"] == 0
+        assert metrics["delivered"] == 2
+        assert metrics["failed"] == 1
+        assert metrics["handler_calls"] == 3
+        assert metrics["handler_ms_max"] >= 0
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_unsubscribed_types_are_ignored(self):
+        """Publishing without subscribers starts nothing."""
+        bus = QueuedEventBus()
+
+        await bus.publish(anomaly())
+
+        assert bus.metrics() == {}
+        await bus.stop()
+
+    def test_restarts_in_a_new_loop(self):
+        """Workers are recreated when publishing from a later event loop."""
+        bus = QueuedEventBus()
+        received = []
+
+        async def handler(event):
+            received.append(event)
+
+        bus.subscribe(AnomalyDetectedEvent, handler)
+
+        async def run():
+            await bus.publish(anomaly())
+            await bus.drain()
+
+        asyncio.run(run())
+        asyncio.run(run())
+
+        assert len(received) == 2
@@ -0,0 +1,184 @@
+"""
+Unit tests for watermark-based incremental sync.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.bigquery.arrow_stream import ArrowQueryReader
+from src.infrastructure.bigquery.fake_bigquery import ParquetBigQueryFake
+from src.infrastructure.database.postgres_manager import PostgresManager
+from src.infrastructure.etl.bigquery_to_postgres_etl import (
+    WATERMARK_SOURCE,
+    BigQueryToPostgresETL,
+)
+
+T0 = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(days=1)
+
+
+def make_readings(rows) -> pd.DataFrame:
+    return pd.DataFrame({
+        "timestamp": [T0 + timedelta(minutes=m) for _, m in rows],
+        "node_id": [node for node, _ in rows],
+        "flow_rate": [1.0] * len(rows),
+    })
+
+
+def query_params(job_config) -> dict:
+    return {p.name: p for p in job_config.query_parameters}
+
+
+@pytest.mark.unit
+class TestWatermarkAdvance:
+    """Test watermark writes in PostgresManager."""
+
+    @pytest.mark.asyncio
+    async def test_frame_insert_advances_watermarks_in_transaction(self):
+        """The newest timestamp per node is written inside the insert transaction."""
+        conn = MagicMock()
+        conn.copy_records_to_table = AsyncMock()
+        conn.execute = AsyncMock(return_value="INSERT 0 3")
+        conn.fetch = AsyncMock(return_value=[])
+        conn.transaction.return_value.__aenter__ = AsyncMock()
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+        manager = PostgresManager()
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        manager.acquire = acquire
+
+        await manager.insert_sensor_readings_frame(
+            make_readings([("B", 5), ("A", 0), ("A", 30)]), watermark_source="bq"
+        )
+
+        watermark_calls = [
+            call for call in conn.execute.await_args_list
+            if "sync_watermarks" in call.args[0]
+        ]
+        assert len(watermark_calls) == 1
+        query, source, node_ids, timestamps = watermark_calls[0].args
+        assert "WHERE sync_watermarks.watermark < EXCLUDED.watermark" in query
+        assert source == "bq"
+        assert node_ids == ["A", "B"]
+        assert timestamps == [T0 + timedelta(minutes=30), T0 + timedelta(minutes=5)]
+        conn.transaction.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_no_watermarks_without_source(self):
+        """Plain inserts leave watermarks untouched."""
+        conn = MagicMock()
+        conn.copy_records_to_table = AsyncMock()
+        conn.execute = AsyncMock(return_value="INSERT 0 1")
+        conn.fetch = AsyncMock(return_value=[])
+        conn.transaction.return_value.__aenter__ = AsyncMock()
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+        manager = PostgresManager()
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        manager.acquire = acquire
+
+        await manager.insert_sensor_readings_frame(make_readings([("A", 0)]))
+
+        assert not any(
+            "sync_watermarks" in call.args[0] for call in conn.execute.await_args_list
+        )
+
+
+@pytest.mark.unit
+class TestIncrementalSync:
+    """Test BigQueryToPostgresETL.sync_incremental."""
+
+    @pytest.fixture
+    def etl(self):
+        with patch("src.infrastructure.etl.bigquery_to_postgres_etl.BigQueryClient"), \
+                patch("src.infrastructure.etl.bigquery_to_postgres_etl.RedisCacheManager"):
+            etl = BigQueryToPostgresETL(batch_size=2)
+        etl.postgres_manager = MagicMock()
+        etl.postgres_manager.get_watermarks = AsyncMock(return_value={})
+        etl.postgres_manager.set_watermark = AsyncMock()
+        etl.postgres_manager.insert_sensor_readings_frame = AsyncMock(
+            side_effect=lambda batch, **kwargs: len(batch)
+        )
+        etl._refresh_cache = AsyncMock()
+        etl.bigquery_client.project_id = "project"
+        etl.bigquery_client.dataset_id = "dataset"
+        return etl
+
+    def returns(self, etl, df: pd.DataFrame) -> ParquetBigQueryFake:
+        fake = ParquetBigQueryFake({"sensor_readings_ml": df}, batch_size=1)
+        etl.bigquery_client.arrow = ArrowQueryReader(fake)
+        return fake
+
+    @pytest.mark.asyncio
+    async def test_queries_past_each_watermark_in_one_query(self, etl):
+        """One query carries every node's watermark, bounded below by the oldest."""
+        etl.postgres_manager.get_watermarks.return_value = {
+            "B": T0 + timedelta(hours=2),
+            "A": T0,
+        }
+        fake = self.returns(etl, make_readings([("A", 10), ("A", 20), ("B", 130)]))
+
+        stats = await etl.sync_incremental()
+
+        assert len(fake.queries) == 1
+        query, job_config = fake.queries[0]
+        assert "COALESCE(w.watermark, @floor)" in query
+        params = query_params(job_config)
+        assert params["floor"].value == T0
+        assert params["node_ids"].values == ["A", "B"]
+        assert params["watermarks"].values == [T0, T0 + timedelta(hours=2)]
+
+        assert stats["processed_records"] == 3
+        assert stats["nodes_advanced"] == 2
+        calls = etl.postgres_manager.insert_sensor_readings_frame.await_args_list
+        assert [len(call.args[0]) for call in calls] == [2, 1]
+        assert all(call.kwargs["watermark_source"] == WATERMARK_SOURCE for call in calls)
+        etl._refresh_cache.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_first_run_uses_initial_lookback(self, etl):
+        """Without watermarks the sync starts from the initial look-back."""
+        fake = self.returns(etl, make_readings([]))
+
+        stats = await etl.sync_incremental(initial_hours_back=6)
+
+        params = query_params(fake.queries[0][1])
+        expected = datetime.now(timezone.utc) - timedelta(hours=6)
+        assert abs((params["floor"].value - expected).total_seconds()) < 60
+        assert params["node_ids"].values == []
+        assert stats["processed_records"] == 0
+        etl.postgres_manager.insert_sensor_readings_frame.assert_not_awaited()
+        etl._refresh_cache.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_silent_node_does_not_hold_the_floor(self, etl):
+        """A lagging node is caught up in its own bounded query."""
+        silent = T0 - timedelta(days=30)
+        etl.postgres_manager.get_watermarks.return_value = {"A": T0, "S": silent}
+        fake = self.returns(etl, make_readings([("A", 10)]))
+
+        stats = await etl.sync_incremental(max_lookback_hours=48)
+
+        assert len(fake.queries) == 2
+        main, catch_up = (query_params(job_config) for _, job_config in fake.queries)
+        assert main["floor"].value == T0
+        assert main["node_ids"].values == ["A"]
+        assert main["excluded"].values == ["S"]
+        assert catch_up["floor"].value == silent
+        assert catch_up["until"].value == silent + timedelta(hours=48)
+        assert catch_up["node_ids"].values == ["S"]
+        assert "IN UNNEST(@node_ids)" in fake.queries[1][0]
+
+        etl.postgres_manager.set_watermark.assert_awaited_once_with(
+            WATERMARK_SOURCE, silent + timedelta(hours=48), "S"
+        )
+        assert stats["nodes_catching_up"] == 1
@@ -0,0 +1,167 @@
+"""Unit tests for micro-batched ingestion helpers."""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.data.ingest import (
+    IngestQueue,
+    RollingNodeStats,
+    detect_flow_anomalies,
+)
+
+
+def _frame(node_ids, flows, start_epoch=0.0, step=30.0):
+    return pd.DataFrame({
+        "node_id": node_ids,
+        "epoch": [start_epoch + i * step for i in range(len(flows))],
+        "flow_rate": flows,
+    })
+
+
+@pytest.mark.unit
+class TestRollingNodeStats:
+    """Test rolling per-node statistics."""
+
+    def test_mean_and_std_match_pandas(self):
+        """Window statistics equal a direct computation."""
+        flows = [10.0, 12.0, 11.0, 13.0, 9.0, 10.5]
+        stats = RollingNodeStats()
+        stats.update(_frame(["A"] * len(flows), flows))
+
+        snapshot = stats.snapshot(["A", "B"])
+
+        assert snapshot.loc["A", "count"] == len(flows)
+        assert snapshot.loc["A", "mean"] == pytest.approx(pd.Series(flows).mean())
+        assert snapshot.loc["A", "std"] == pytest.approx(pd.Series(flows).std())
+        assert snapshot.loc["B", "count"] == 0
+
+    def test_old_buckets_expire(self):
+        """Minutes older than the window are dropped."""
+        stats = RollingNodeStats(window_minutes=60)
+        stats.update(_frame(["A"] * 10, [1.0] * 10, start_epoch=0))
+        stats.update(_frame(["A"] * 10, [5.0] * 10, start_epoch=3 * 3600))
+
+        snapshot = stats.snapshot(["A"])
+
+        assert snapshot.loc["A", "count"] == 10
+        assert snapshot.loc["A", "mean"] == pytest.approx(5.0)
+
+
+@pytest.mark.unit
+class TestDetectFlowAnomalies:
+    """Test vectorized anomaly detection."""
+
+    def test_flags_spikes_and_drops(self):
+        """Readings beyond three sigma are flagged with their direction."""
+        stats = RollingNodeStats()
+        history = [10.0, 10.5, 9.5] * 5
+        stats.update(_frame(["A"] * len(history), history))
+
+        batch = _frame(["A", "A", "A"], [10.2, 50.0, 1.0], start_epoch=600)
+        flagged = detect_flow_anomalies(batch, stats.snapshot(["A"]))
+
+        assert list(flagged["flow_rate"]) == [50.0, 1.0]
+        assert list(flagged["anomaly_type"]) == ["flow_spike", "flow_drop"]
+
+    def test_nodes_with_short_history_are_skipped(self):
+        """Nodes need more than min_count readings before being checked."""
+        stats = RollingNodeStats()
+        stats.update(_frame(["A"] * 5, [10.0, 10.1, 9.9, 10.0, 10.2]))
+
+        flagged = detect_flow_anomalies(_frame(["A"], [100.0]), stats.snapshot(["A"]))
+
+        assert flagged.empty
+
+
+@pytest.mark.unit
+class TestIngestQueue:
+    """Test micro-batching queue behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_groups_readings_into_batches(self):
+        """Queued readings reach the writer in batches."""
+        batches = []
+
+        async def writer(batch):
+            batches.append(list(batch))
+
+        queue = IngestQueue(writer, max_batch_size=100, max_delay_seconds=0.01)
+        for i in range(250):
+            queue.put_nowait({"i": i})
+        queue.start()
+        await asyncio.sleep(0.05)
+        await queue.stop()
+
+        assert [len(b) for b in batches] == [100, 100, 50]
+        assert queue.readings_written == 250
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_without_waiting(self):
+        """put_nowait raises once the bound is reached."""
+        async def writer(batch):
+            pass
+
+        queue = IngestQueue(writer, max_queue_size=2)
+        queue.put_nowait({})
+        queue.put_nowait({})
+
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait({})
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_pending_readings(self):
+        """Stopping writes out everything still queued."""
+        written = []
+
+        async def writer(batch):
+            written.extend(batch)
+
+        queue = IngestQueue(writer, max_batch_size=10)
+        for i in range(25):
+            queue.put_nowait({"i": i})
+        await queue.stop(drain=True)
+
+        assert len(written) == 25
+
+    @pytest.mark.asyncio
+    async def test_stop_keeps_batch_waiting_for_delay(self):
+        """Readings the consumer already took while waiting to fill a batch are written."""
+        written = []
+
+        async def writer(batch):
+            written.extend(batch)
+
+        queue = IngestQueue(writer, max_batch_size=100, max_delay_seconds=10)
+        queue.start()
+        for i in range(5):
+            await queue.put({"i": i})
+        await asyncio.sleep(0.01)
+        assert queue.depth == 0
+
+        await asyncio.wait_for(queue.stop(), 1)
+
+        assert [r["i"] for r in written] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_write_in_progress(self):
+        """A batch being written when stop is called is not cut short."""
+        written = []
+        started = asyncio.Event()
+
+        async def writer(batch):
+            started.set()
+            await asyncio.sleep(0.02)
+            written.extend(batch)
+
+        queue = IngestQueue(writer, max_batch_size=3, max_delay_seconds=0)
+        queue.start()
+        for i in range(5):
+            queue.put_nowait({"i": i})
+        await started.wait()
+
+        await queue.stop(drain=False)
+
+        assert len(written) == 3
+        assert queue.depth == 0
@@ -0,0 +1,200 @@
+"""
+Unit tests for the shared KPI computation engine.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.services.kpis.kpi_engine import KPIEngine, compute_kpis
+from src.api.services.kpis.kpis_orchestrator import KPIOrchestrator
+from src.api.services.kpis.network_efficiency_service import NetworkEfficiencyService
+from src.api.services.kpis.quality_service import QualityService
+from src.api.services.kpis.system_performance_service import SystemPerformanceService
+from src.schemas.api.kpis import KPIDashboard
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = START + timedelta(days=1)
+
+
+def make_readings(nodes=("A", "B"), periods=48, pressure=4.0) -> pd.DataFrame:
+    timestamps = pd.date_range(START, periods=periods, freq="30min")
+    return pd.DataFrame({
+        "timestamp": np.tile(timestamps, len(nodes)),
+        "node_id": np.repeat(list(nodes), periods),
+        "flow_rate": 10.0,
+        "pressure": pressure,
+        "temperature": 15.0,
+        "total_flow": 0.0,
+        "quality_score": 0.9,
+    })
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def hybrid_service():
+    service = MagicMock()
+    service.get_readings_frame = AsyncMock(return_value=make_readings())
+    return service
+
+
+@pytest.mark.unit
+class TestComputeKPIs:
+    """Test the vectorized KPI pass."""
+
+    def test_complete_healthy_network(self):
+        """Complete, in-band readings give full availability and compliance."""
+        results = compute_kpis(make_readings(), START, END)
+
+        assert results.node_count == 2
+        assert results.reading_count == 96
+        assert results.system_performance.availability == pytest.approx(100.0)
+        assert results.system_performance.system_uptime == 100.0
+        assert results.system_performance.error_rate == 0.0
+        assert results.network_efficiency.pressure_efficiency == 100.0
+        assert results.quality.overall_quality_score == pytest.approx(90.0)
+        assert results.quality.temperature_compliance == 100.0
+        assert results.maintenance.emergency_repair_rate == 0.0
+
+    def test_gaps_and_out_of_band_pressure(self):
+        """Missing readings lower availability; a long gap counts as an outage."""
+        frame = make_readings()
+        # Node A silent for 10 hours; node B over-pressured
+        frame = frame.drop(index=range(4, 24))
+        frame.loc[frame["node_id"] == "B", "pressure"] = 7.0
+
+        results = compute_kpis(frame.sample(frac=1, random_state=1), START, END)
+
+        assert results.system_performance.availability == pytest.approx(100 * 76 / 96)
+        assert results.maintenance.emergency_repair_rate == 50.0
+        assert results.maintenance.mean_time_to_repair == pytest.approx(10.5)
+        assert results.network_efficiency.pressure_efficiency == pytest.approx(100 * 28 / 76)
+        assert results.compliance.safety_compliance == pytest.approx(100 * 28 / 76)
+
+    def test_underivable_metrics_are_zero(self):
+        """Metrics the readings cannot support are not filled from other metrics."""
+        results = compute_kpis(make_readings(), START, END)
+
+        assert results.maintenance.preventive_maintenance_rate == 0.0
+        assert results.maintenance.maintenance_cost_efficiency == 0.0
+        assert results.maintenance.scheduled_maintenance_compliance == 0.0
+        assert results.compliance.environmental_compliance == 0.0
+        assert results.compliance.audit_score == 0.0
+        assert results.compliance.corrective_action_completion == 0.0
+        assert results.financial.roi == 0.0
+
+    def test_missing_values_and_expected_nodes(self):
+        """Null measurements count as errors; silent selected nodes lower uptime."""
+        frame = make_readings(nodes=("A",))
+        frame.loc[:11, "pressure"] = np.nan
+
+        results = compute_kpis(frame, START, END, node_count=2)
+
+        assert results.system_performance.error_rate == pytest.approx(25.0)
+        assert results.system_performance.system_uptime == 50.0
+
+    def test_empty_frame(self):
+        """No readings yields all-zero KPIs."""
+        results = compute_kpis(pd.DataFrame(), START, END)
+
+        assert results.reading_count == 0
+        assert results.quality.overall_quality_score == 0.0
+
+
+@pytest.mark.unit
+class TestKPIEngine:
+    """Test fetch sharing and memoization."""
+
+    @pytest.mark.asyncio
+    async def test_dashboard_and_categories_fetch_once(self, hybrid_service):
+        """The dashboard and every category service share one fetch."""
+        engine = KPIEngine()
+        orchestrator = KPIOrchestrator(engine)
+
+        dashboard = await orchestrator.generate_kpi_dashboard(hybrid_service, START, END)
+        system = await SystemPerformanceService(engine).calculate_system_performance_kpis(
+            hybrid_service, START, END
+        )
+        network = await NetworkEfficiencyService(engine).calculate_network_efficiency_kpis(
+            hybrid_service, START, END
+        )
+        quality = await QualityService(engine).calculate_quality_kpis(hybrid_service, START, END)
+
+        hybrid_service.get_readings_frame.assert_awaited_once_with(START, END, None)
+        assert isinstance(dashboard, KPIDashboard)
+        assert dashboard.system_performance == system
+        assert dashboard.network_efficiency == network
+        assert dashboard.quality == quality
+        assert len(dashboard.kpi_cards) == 4
+        assert 0 < dashboard.overall_health_score <= 100
+        assert engine.stats == {"hits": 3, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_computation(self, hybrid_service):
+        """Requests arriving while a computation runs wait for it."""
+        engine = KPIEngine()
+
+        async def slow_fetch(*args):
+            await asyncio.sleep(0.01)
+            return make_readings()
+
+        hybrid_service.get_readings_frame.side_effect = slow_fetch
+        results = await asyncio.gather(*(
+            engine.compute(hybrid_service, START, END, ["B", "A"]) for _ in range(5)
+        ))
+
+        assert hybrid_service.get_readings_frame.await_count == 1
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_ttl_and_key(self, hybrid_service):
+        """Results expire after the TTL; node order does not matter, node sets do."""
+        clock = FakeClock()
+        engine = KPIEngine(ttl_seconds=60, clock=clock)
+
+        await engine.compute(hybrid_service, START, END, ["A", "B"])
+        # Same window length, end moved by a few seconds: reused
+        await engine.compute(
+            hybrid_service, START + timedelta(seconds=5), END + timedelta(seconds=5), ["B", "A"]
+        )
+        assert hybrid_service.get_readings_frame.await_count == 1
+
+        await engine.compute(hybrid_service, START, END, ["A"])
+        assert hybrid_service.get_readings_frame.await_count == 2
+
+        clock.now = 61
+        await engine.compute(hybrid_service, START, END, ["A", "B"])
+        assert hybrid_service.get_readings_frame.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_other_period_with_same_length_is_not_reused(self, hybrid_service):
+        """A window of the same length ending elsewhere is fetched separately."""
+        engine = KPIEngine()
+
+        await engine.compute(hybrid_service, START, END)
+        await engine.compute(hybrid_service, START - timedelta(days=7), END - timedelta(days=7))
+
+        assert hybrid_service.get_readings_frame.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_memoized(self, hybrid_service):
+        """A failed fetch is retried by the next request."""
+        engine = KPIEngine()
+        hybrid_service.get_readings_frame.side_effect = [RuntimeError("db down"), make_readings()]
+
+        with pytest.raises(RuntimeError):
+            await engine.compute(hybrid_service, START, END)
+        results = await engine.compute(hybrid_service, START, END)
+
+        assert results.reading_count == 96
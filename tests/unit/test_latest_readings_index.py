@@ -0,0 +1,103 @@
+"""
+Unit tests for the latest-reading index.
+
+Covers the per-node reduction done on write by PostgresManager and the
+pipelined read path in HybridDataService.get_latest_readings.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+from src.infrastructure.cache.fake_redis import FakeAsyncRedis
+from src.infrastructure.data.hybrid_data_service import HybridDataService
+from src.infrastructure.database.postgres_manager import PostgresManager
+
+
+@pytest.mark.unit
+class TestLatestByNode:
+    """Test the batch reduction used to advance the index."""
+
+    def test_keeps_newest_reading_per_node(self):
+        """Only the newest reading of each node survives."""
+        base = datetime(2024, 11, 1, tzinfo=timezone.utc)
+        readings = [
+            {"node_id": "A", "timestamp": base, "flow_rate": 1.0},
+            {"node_id": "A", "timestamp": base + timedelta(minutes=30), "flow_rate": 2.0},
+            {"node_id": "B", "timestamp": base + timedelta(minutes=10), "flow_rate": 3.0},
+            {"node_id": "A", "timestamp": base + timedelta(minutes=15), "flow_rate": 4.0},
+        ]
+
+        latest = PostgresManager._latest_by_node(readings)
+
+        assert set(latest) == {"A", "B"}
+        assert latest["A"]["flow_rate"] == 2.0
+        assert latest["B"]["flow_rate"] == 3.0
+
+
+@pytest.mark.unit
+class TestHybridLatestReadings:
+    """Test the pipelined read path."""
+
+    @pytest.fixture
+    def service(self):
+        redis_manager = MagicMock()
+        redis_manager.async_client = AsyncRedisClient(client=FakeAsyncRedis())
+        with patch("src.infrastructure.data.hybrid_data_service.BigQueryClient"):
+            service = HybridDataService(redis_manager=redis_manager)
+        service.postgres_manager = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_all_cached_nodes_use_one_round_trip(self, service):
+        """Cached nodes are served by a single pipeline execute."""
+        for node_id, flow_rate in (("A", 1.5), ("B", 2.5)):
+            await service.redis.hset(
+                f"node:{node_id}:latest",
+                mapping={"timestamp": "2024-11-01T00:00:00", "flow_rate": flow_rate},
+            )
+        service.redis.client.round_trips = 0
+
+        result = await service.get_latest_readings(["A", "B"])
+
+        assert result["A"]["flow_rate"] == "1.5"
+        assert result["B"]["flow_rate"] == "2.5"
+        assert service.redis.client.round_trips == 1
+        service.postgres_manager.get_latest_readings.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_nodes_fall_back_in_one_query(self, service):
+        """Cache misses are fetched from PostgreSQL together and written back."""
+        await service.redis.hset("node:A:latest", mapping={"flow_rate": 1.5})
+        timestamp = datetime(2024, 11, 1, tzinfo=timezone.utc)
+        service.postgres_manager.get_latest_readings.return_value = {
+            "B": {"node_id": "B", "timestamp": timestamp, "flow_rate": 3.0, "pressure": None},
+            "C": {"node_id": "C", "timestamp": timestamp, "flow_rate": 4.0, "pressure": 2.0},
+        }
+        service.redis.client.round_trips = 0
+
+        result = await service.get_latest_readings(["A", "B", "C"])
+
+        service.postgres_manager.get_latest_readings.assert_awaited_once_with(["B", "C"])
+        assert set(result) == {"A", "B", "C"}
+        assert service.redis.client.round_trips == 2
+        assert await service.redis.hgetall("node:B:latest") == {
+            "timestamp": timestamp.isoformat(),
+            "flow_rate": "3.0",
+        }
+        assert await service.redis.smembers("nodes:latest") == {"B", "C"}
+
+    @pytest.mark.asyncio
+    async def test_all_nodes_combines_listed_and_indexed(self, service):
+        """Without node_ids, nodes come from nodes:all and the write-path index."""
+        await service.redis.rpush("nodes:all", "A", "B")
+        await service.redis.sadd("nodes:latest", "B", "C")
+        for node_id in ("A", "B", "C"):
+            await service.redis.hset(f"node:{node_id}:latest", mapping={"flow_rate": 1})
+        service.redis.client.round_trips = 0
+
+        result = await service.get_latest_readings()
+
+        assert list(result) == ["A", "B", "C"]
+        assert service.redis.client.round_trips == 2
@@ -0,0 +1,321 @@
+"""
+Unit tests for the live feed.
+
+Covers the broadcaster (deltas, resume, slow-consumer dropping), the
+Redis relay from HybridDataService and PostgresManager writes, the SSE
+stream endpoint and the dashboard client that applies pushed events.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+from src.infrastructure.cache.fake_redis import FakeAsyncRedis
+from src.infrastructure.data.hybrid_data_service import HybridDataService
+from src.infrastructure.data.live_feed import (
+    EVENT_ANOMALIES,
+    EVENT_READINGS,
+    EVENT_SNAPSHOT,
+    LIVE_CHANNEL,
+    LiveBroadcaster,
+    LiveFeedRelay,
+)
+from src.infrastructure.database.postgres_manager import PostgresManager
+from src.presentation.api.endpoints.live_router import _resume_from, _sse_frames
+from src.presentation.streamlit.utils.live_feed_client import LiveFeedClient, parse_sse
+
+BASE = datetime(2024, 11, 1, 12, 0)
+
+
+def reading(node_id: str, minutes: int = 0, flow_rate: float = 10.0, pressure: float = 2.0) -> dict:
+    return {
+        "node_id": node_id,
+        "timestamp": BASE + timedelta(minutes=minutes),
+        "flow_rate": flow_rate,
+        "pressure": pressure,
+        "temperature": 15.0,
+    }
+
+
+def drain(subscription) -> list:
+    events = []
+    while not subscription._queue.empty():
+        event = subscription._queue.get_nowait()
+        if event is None:
+            break
+        events.append(event)
+    return events
+
+
+@pytest.mark.unit
+class TestLiveBroadcaster:
+    """Test fan-out, deltas and resuming."""
+
+    @pytest.mark.asyncio
+    async def test_new_subscriber_starts_with_snapshot(self):
+        """A fresh subscriber first receives every node's latest state."""
+        broadcaster = LiveBroadcaster()
+        broadcaster.publish_batch({"A": reading("A"), "B": reading("B", flow_rate=5.0)})
+
+        subscription = broadcaster.subscribe()
+        event = await subscription.get(timeout=1)
+
+        assert event.type == EVENT_SNAPSHOT
+        assert event.seq == broadcaster.seq
+        assert set(event.data["nodes"]) == {"A", "B"}
+        assert event.data["nodes"]["B"]["flow_rate"] == 5.0
+
+    @pytest.mark.asyncio
+    async def test_readings_are_published_as_deltas(self):
+        """Only changed fields are sent, and nodes with older readings are skipped."""
+        broadcaster = LiveBroadcaster()
+        broadcaster.publish_batch({"A": reading("A"), "B": reading("B", minutes=5)})
+        subscription = broadcaster.subscribe(last_seq=broadcaster.seq)
+
+        broadcaster.publish_batch({"A": reading("A", minutes=1, pressure=2.5), "B": reading("B", minutes=1)})
+        event = await subscription.get(timeout=1)
+
+        assert event.type == EVENT_READINGS
+        assert event.data["nodes"] == {
+            "A": {"timestamp": BASE + timedelta(minutes=1), "pressure": 2.5}
+        }
+        assert json.loads(event.message)["data"]["nodes"]["A"]["timestamp"] == "2024-11-01T12:01:00"
+
+    @pytest.mark.asyncio
+    async def test_anomalies_are_one_event_per_batch(self):
+        """A batch's anomalies go out together after its readings."""
+        broadcaster = LiveBroadcaster()
+        subscription = broadcaster.subscribe(last_seq=0)
+
+        events = broadcaster.publish_batch(
+            {"A": reading("A")},
+            [{"node_id": "A", "anomaly_type": "flow_spike"}, {"node_id": "A", "anomaly_type": "flow_drop"}]
+        )
+
+        assert [event.type for event in events] == [EVENT_READINGS, EVENT_ANOMALIES]
+        assert [event.seq for event in drain(subscription)] == [1, 2]
+        assert len(events[1].data["anomalies"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_missed_events(self):
+        """A client resuming from a recent sequence number gets only what it missed."""
+        broadcaster = LiveBroadcaster()
+        for minute in range(5):
+            broadcaster.publish_batch({"A": reading("A", minutes=minute)})
+
+        subscription = broadcaster.subscribe(last_seq=3)
+
+        assert [event.seq for event in drain(subscription)] == [4, 5]
+        assert broadcaster.stats["resumed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_resume_outside_history_gets_snapshot(self):
+        """Positions evicted from history, or from before a restart, get a snapshot."""
+        broadcaster = LiveBroadcaster(history_size=3)
+        for minute in range(10):
+            broadcaster.publish_batch({"A": reading("A", minutes=minute)})
+
+        for last_seq in (2, 50):
+            events = drain(broadcaster.subscribe(last_seq=last_seq))
+            assert [event.type for event in events] == [EVENT_SNAPSHOT]
+            assert events[0].seq == 10
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_dropped(self):
+        """A full queue ends that subscription without affecting others."""
+        broadcaster = LiveBroadcaster(queue_size=3)
+        slow = broadcaster.subscribe(last_seq=0)
+        fast = broadcaster.subscribe(last_seq=0)
+
+        for minute in range(5):
+            broadcaster.publish_batch({"A": reading("A", minutes=minute)})
+            await fast.get(timeout=1)
+
+        assert slow.dropped
+        assert await slow.get(timeout=1) is None
+        assert not fast.dropped
+        assert broadcaster.subscriber_count == 1
+        assert broadcaster.stats["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_close_unsubscribes(self):
+        """Closed subscriptions stop receiving events."""
+        broadcaster = LiveBroadcaster()
+        subscription = broadcaster.subscribe()
+        await subscription.get(timeout=1)
+
+        subscription.close()
+        broadcaster.publish_batch({"A": reading("A")})
+
+        assert broadcaster.subscriber_count == 0
+        assert await subscription.get(timeout=1) is None
+
+
+async def wait_for_events(subscription, count: int) -> list:
+    events = []
+    while len(events) < count:
+        events.append(await subscription.get(timeout=1))
+    return events
+
+
+@pytest.mark.unit
+class TestLiveFeedRelay:
+    """Test that written batches reach the broadcaster through Redis."""
+
+    @pytest.fixture
+    def redis(self):
+        return AsyncRedisClient(client=FakeAsyncRedis())
+
+    @pytest_asyncio.fixture
+    async def relay(self, redis):
+        relay = LiveFeedRelay(redis, LiveBroadcaster())
+        relay.start()
+        # Let the relay subscribe before anything is published
+        await asyncio.sleep(0.01)
+        yield relay
+        await relay.stop()
+
+    @pytest.mark.asyncio
+    async def test_hybrid_batch_is_relayed(self, redis, relay):
+        """One readings event carries the newest reading of each node in the batch."""
+        redis_manager = MagicMock()
+        redis_manager.async_client = redis
+        with patch("src.infrastructure.data.hybrid_data_service.BigQueryClient"):
+            service = HybridDataService(redis_manager=redis_manager)
+        service.postgres_manager = AsyncMock()
+        subscription = relay.broadcaster.subscribe(last_seq=0)
+
+        await service.write_sensor_readings([
+            reading("A", minutes=0, flow_rate=1.0),
+            reading("A", minutes=1, flow_rate=2.0),
+            reading("B", minutes=0, flow_rate=3.0),
+        ])
+
+        event, = await wait_for_events(subscription, 1)
+        assert event.type == EVENT_READINGS
+        assert event.data["nodes"]["A"]["flow_rate"] == 2.0
+        assert event.data["nodes"]["A"]["timestamp"] == (BASE + timedelta(minutes=1)).replace(tzinfo=timezone.utc)
+        assert event.data["nodes"]["B"]["flow_rate"] == 3.0
+
+    @pytest.mark.asyncio
+    async def test_postgres_write_announces_advanced_nodes(self, redis, relay):
+        """Only nodes whose latest reading advanced in the index are announced."""
+        conn = MagicMock()
+        conn.copy_records_to_table = AsyncMock()
+        conn.execute = AsyncMock(return_value="INSERT 0 2")
+        conn.fetch = AsyncMock(return_value=[{"node_id": "A"}])
+        conn.transaction.return_value.__aenter__ = AsyncMock()
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+        manager = PostgresManager(redis=redis)
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        manager.acquire = acquire
+        subscription = relay.broadcaster.subscribe(last_seq=0)
+
+        await manager.insert_sensor_readings_batch([reading("A", minutes=5), reading("B", minutes=-60)])
+
+        event, = await wait_for_events(subscription, 1)
+        assert list(event.data["nodes"]) == ["A"]
+        assert "RETURNING node_id" in conn.fetch.await_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_malformed_messages_are_skipped(self, redis, relay):
+        """A bad message is counted and the relay keeps running."""
+        subscription = relay.broadcaster.subscribe(last_seq=0)
+
+        await redis.publish(LIVE_CHANNEL, "not json")
+        await redis.publish(LIVE_CHANNEL, json.dumps({"nodes": {}, "anomalies": [{"node_id": "A"}]}))
+
+        event, = await wait_for_events(subscription, 1)
+        assert event.type == EVENT_ANOMALIES
+        assert relay.stats == {"received": 1, "invalid": 1, "reconnects": 0}
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.mark.unit
+class TestLiveStreamEndpoint:
+    """Test SSE framing and resume parameters."""
+
+    def test_resume_position(self):
+        """The query parameter wins; a malformed header is ignored."""
+        assert _resume_from(7, "3") == 7
+        assert _resume_from(None, "3") == 3
+        assert _resume_from(None, "abc") is None
+        assert _resume_from(None, None) is None
+
+    @pytest.mark.asyncio
+    async def test_sse_frames_carry_ids_and_keepalives(self):
+        """Events are framed with their sequence number; idle periods send comments."""
+        broadcaster = LiveBroadcaster()
+        request = FakeRequest()
+        frames = _sse_frames(request, broadcaster.subscribe(last_seq=0), heartbeat=0.01)
+
+        assert (await frames.__anext__()).startswith("retry:")
+        assert await frames.__anext__() == ": keepalive\n\n"
+        event = broadcaster.publish_batch({"A": reading("A")})[0]
+        assert await frames.__anext__() == event.sse
+        assert event.sse.startswith(f"id: {event.seq}\nevent: readings\n")
+
+        request.disconnected = True
+        with pytest.raises(StopAsyncIteration):
+            await frames.__anext__()
+        assert broadcaster.subscriber_count == 0
+
+    @pytest.mark.asyncio
+    async def test_sse_stream_ends_for_dropped_subscriber(self):
+        """A dropped subscriber's stream closes so the client reconnects and resumes."""
+        broadcaster = LiveBroadcaster(queue_size=1)
+        frames = _sse_frames(FakeRequest(), broadcaster.subscribe(last_seq=0), heartbeat=1)
+        await frames.__anext__()
+
+        for minute in range(3):
+            broadcaster.publish_batch({"A": reading("A", minutes=minute)})
+
+        with pytest.raises(StopAsyncIteration):
+            await frames.__anext__()
+
+
+@pytest.mark.unit
+class TestLiveFeedClient:
+    """Test the dashboard side of the stream."""
+
+    def test_parse_sse(self):
+        """Data lines are joined per event; comments and ids are skipped."""
+        lines = ["retry: 1000", "", ": keepalive", "", "id: 1", "event: readings", "data: {\"a\":", "data: 1}", ""]
+
+        assert list(parse_sse(lines)) == ["{\"a\":\n1}"]
+
+    def test_applies_broadcast_events(self):
+        """Snapshot, deltas and anomalies rebuild the server's state."""
+        broadcaster = LiveBroadcaster()
+        broadcaster.publish_batch({"A": reading("A"), "B": reading("B")})
+        client = LiveFeedClient(base_url="http://test")
+
+        client.apply(json.loads(drain(broadcaster.subscribe())[0].message))
+        for event in broadcaster.publish_batch(
+            {"A": reading("A", minutes=1, flow_rate=12.5)},
+            [{"node_id": "A", "anomaly_type": "flow_spike"}]
+        ):
+            client.apply(json.loads(event.message))
+
+        assert client.get_latest_reading("A")["flow_rate"] == 12.5
+        assert client.get_latest_reading("A")["pressure"] == 2.0
+        assert client.get_latest_reading("B")["timestamp"] == "2024-11-01T12:00:00"
+        assert client.get_recent_anomalies()[0]["anomaly_type"] == "flow_spike"
+        assert client.last_seq == broadcaster.seq
@@ -0,0 +1,83 @@
+"""
+Unit tests for the batch node metrics endpoint and its Streamlit client.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.presentation.streamlit.utils.api_client import APIClient
+
+
+def metrics_row(node_id: str) -> dict:
+    return {
+        "node_id": node_id,
+        "node_name": f"Node {node_id}",
+        "timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "flow_rate": 12.5,
+        "pressure": 3.1,
+        "temperature": 14.0,
+        "efficiency": 97.0,
+        "anomaly_count": 0,
+    }
+
+
+@pytest.mark.unit
+class TestNodeMetricsBatch:
+    """Test batch and single-node metrics served from one query."""
+
+    @pytest.fixture
+    def postgres(self):
+        """Provide a PostgresManager stub answering the latest-metrics query."""
+        manager = MagicMock()
+        manager.get_latest_node_metrics = AsyncMock(
+            side_effect=lambda node_ids, time_window: [
+                metrics_row(node_id) for node_id in (node_ids or ["A", "B", "C"]) if node_id != "missing"
+            ]
+        )
+        app.state.postgres = manager
+        yield manager
+        del app.state.postgres
+
+    def test_batch_for_selected_nodes(self, postgres):
+        """Selected nodes are fetched with a single query."""
+        response = TestClient(app).get(
+            "/api/v1/nodes/metrics", params={"node_ids": ["A", "C"], "time_window": "5min"}
+        )
+
+        assert response.status_code == 200
+        assert [item["node_id"] for item in response.json()] == ["A", "C"]
+        postgres.get_latest_node_metrics.assert_awaited_once_with(["A", "C"], "5min")
+
+    def test_batch_for_all_nodes(self, postgres):
+        """Without node_ids every node is returned."""
+        response = TestClient(app).get("/api/v1/nodes/metrics")
+
+        assert [item["node_id"] for item in response.json()] == ["A", "B", "C"]
+        postgres.get_latest_node_metrics.assert_awaited_once_with(None, "1hour")
+
+    def test_single_node_uses_batch_query(self, postgres):
+        """The per-node endpoint shares the batch query and 404s on no metrics."""
+        client = TestClient(app)
+
+        assert client.get("/api/v1/nodes/B/metrics").json()["node_id"] == "B"
+        assert client.get("/api/v1/nodes/missing/metrics").status_code == 404
+
+    def test_client_serves_nodes_from_one_request(self):
+        """Per-node lookups in the client reuse one cached batch request."""
+        client = APIClient(base_url="http://api")
+        client._make_request = MagicMock(return_value=[metrics_row("A"), metrics_row("B")])
+        client.get_nodes_metrics.clear()
+
+        first = client.get_node_metrics("A", "1day")
+        second = client.get_node_metrics("B", "1day")
+
+        assert first["node_id"] == "A"
+        assert second["node_id"] == "B"
+        assert client.get_node_metrics("unknown", "1day") is None
+        client._make_request.assert_called_once_with(
+            "GET", "/api/v1/nodes/metrics", params={"time_window": "1day"}
+        )
@@ -0,0 +1,151 @@
+"""
+Unit tests for the node registry and bulk node upsert.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.database.node_registry import NodeRegistry
+from src.infrastructure.database.postgres_manager import PostgresManager
+
+
+def node_info(row):
+    return {
+        "node_id": row["node_id"],
+        "node_name": row.get("node_name", f"Node {row['node_id']}"),
+        "node_type": "meter",
+        "location_name": row.get("district_name", "Unknown"),
+        "is_active": True,
+        "metadata": {"district_id": row.get("district_id", "unknown")},
+    }
+
+
+def make_batch(nodes, rows_per_node=1000, district="D1") -> pd.DataFrame:
+    return pd.DataFrame({
+        "node_id": [node for node in nodes for _ in range(rows_per_node)],
+        "node_name": [f"Meter {node}" for node in nodes for _ in range(rows_per_node)],
+        "district_id": district,
+        "district_name": "District",
+        "flow_rate": 1.0,
+    })
+
+
+@pytest.fixture
+def manager():
+    manager = MagicMock()
+    manager.get_all_nodes = AsyncMock(return_value=[])
+    manager.upsert_nodes_bulk = AsyncMock(side_effect=lambda nodes: len(nodes))
+    return manager
+
+
+@pytest.mark.unit
+class TestNodeRegistry:
+    """Test NodeRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_new_nodes_upserted_once_in_one_statement(self, manager):
+        """The first batch writes each node once; later batches write nothing."""
+        registry = NodeRegistry(manager)
+
+        written = await registry.ensure_nodes(make_batch(["A", "B", "C"]), node_info)
+        again = await registry.ensure_nodes(make_batch(["C", "B"]), node_info)
+
+        assert written == 3
+        assert again == 0
+        manager.upsert_nodes_bulk.assert_awaited_once()
+        nodes = manager.upsert_nodes_bulk.await_args.args[0]
+        assert [n["node_id"] for n in nodes] == ["A", "B", "C"]
+        assert nodes[0]["node_name"] == "Meter A"
+        manager.get_all_nodes.assert_awaited_once()
+        assert "A" in registry
+
+    @pytest.mark.asyncio
+    async def test_only_changed_nodes_are_written(self, manager):
+        """A node whose attributes changed is upserted again, alone."""
+        registry = NodeRegistry(manager)
+        await registry.ensure_nodes(make_batch(["A", "B"]), node_info)
+
+        batch = pd.concat([make_batch(["A"], district="D2"), make_batch(["B"])])
+        written = await registry.ensure_nodes(batch, node_info)
+
+        assert written == 1
+        nodes = manager.upsert_nodes_bulk.await_args.args[0]
+        assert [n["node_id"] for n in nodes] == ["A"]
+        assert nodes[0]["metadata"] == {"district_id": "D2"}
+
+    @pytest.mark.asyncio
+    async def test_existing_database_nodes_are_skipped(self, manager):
+        """Nodes loaded from the database with identical attributes are not rewritten."""
+        manager.get_all_nodes.return_value = [{
+            "node_id": "A",
+            "node_name": "Meter A",
+            "node_type": "meter",
+            "location_name": "District",
+            "is_active": True,
+            "metadata": json.dumps({"district_id": "D1"}),
+        }]
+        registry = NodeRegistry(manager)
+
+        written = await registry.ensure_nodes(make_batch(["A", "B"]), node_info)
+
+        assert written == 1
+        assert [n["node_id"] for n in manager.upsert_nodes_bulk.await_args.args[0]] == ["B"]
+
+    @pytest.mark.asyncio
+    async def test_failed_upsert_is_retried(self, manager):
+        """Nodes from a failed upsert are written again by the next batch."""
+        manager.upsert_nodes_bulk.side_effect = [RuntimeError("db down"), 1]
+        registry = NodeRegistry(manager)
+
+        with pytest.raises(RuntimeError):
+            await registry.ensure_nodes(make_batch(["A"]), node_info)
+        written = await registry.ensure_nodes(make_batch(["A"]), node_info)
+
+        assert written == 1
+        assert manager.upsert_nodes_bulk.await_count == 2
+
+
+@pytest.mark.unit
+class TestUpsertNodesBulk:
+    """Test PostgresManager.upsert_nodes_bulk."""
+
+    @pytest.mark.asyncio
+    async def test_single_statement_skips_unchanged_rows(self):
+        """Nodes are deduplicated, sorted and written with one conditional upsert."""
+        conn = MagicMock()
+        conn.execute = AsyncMock(return_value="INSERT 0 1")
+        manager = PostgresManager()
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        manager.acquire = acquire
+
+        written = await manager.upsert_nodes_bulk([
+            {"node_id": "B", "node_name": "Old", "node_type": "meter"},
+            {"node_id": "A", "node_name": "Meter A", "node_type": "meter", "metadata": {"x": 1}},
+            {"node_id": "B", "node_name": "Meter B", "node_type": "meter"},
+        ])
+
+        assert written == 1
+        conn.execute.assert_awaited_once()
+        query, node_ids, names, *_, metadata = conn.execute.await_args.args
+        assert "unnest(" in query
+        assert "IS DISTINCT FROM" in query
+        assert node_ids == ["A", "B"]
+        assert names == ["Meter A", "Meter B"]
+        assert metadata == ['{"x": 1}', "{}"]
+
+    @pytest.mark.asyncio
+    async def test_empty_input(self):
+        """No nodes means no statement."""
+        manager = PostgresManager()
+        manager.acquire = MagicMock()
+
+        assert await manager.upsert_nodes_bulk([]) == 0
+        manager.acquire.assert_not_called()
@@ -0,0 +1,236 @@
+"""
+Unit tests for the partitioned, resumable backfill runner.
+"""
+
+import asyncio
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from unittest.mock import AsyncMock
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.etl.partitioned_backfill import (
+    BackfillPartition,
+    BigQueryPartitionExtractor,
+    PartitionedBackfill,
+    day_bounds,
+    plan_partitions,
+)
+
+START = datetime(2024, 1, 1)
+
+
+def extract_readings(partition: BackfillPartition) -> Optional[pd.DataFrame]:
+    """Three readings per partition; module-level so it can run in a process pool."""
+    return pd.DataFrame({
+        "timestamp": [partition.start + timedelta(hours=h) for h in range(3)],
+        "node_id": f"N{partition.group}",
+        "flow_rate": 1.0,
+    })
+
+
+def extract_failing_group(partition: BackfillPartition) -> Optional[pd.DataFrame]:
+    if partition.group == 1:
+        raise RuntimeError("query failed")
+    return extract_readings(partition)
+
+
+class FakeCheckpointStore:
+    """PostgresManager stand-in recording loads and checkpoints."""
+
+    def __init__(self, completed=None):
+        self.completed = dict.fromkeys(completed or [], 0)
+        self.loaded_rows = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def get_completed_partitions(self, job_name):
+        return set(self.completed)
+
+    async def mark_partition_complete(self, job_name, partition_key, rows_loaded):
+        self.completed[partition_key] = rows_loaded
+
+    async def insert_sensor_readings_frame(self, data, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.005)
+        self.active -= 1
+        self.loaded_rows += len(data)
+        return len(data)
+
+
+@pytest.mark.unit
+class TestPlanPartitions:
+    """Test partition planning."""
+
+    def test_day_by_hash_group(self):
+        """Each day is split into the requested number of hash groups."""
+        partitions = plan_partitions("bq", START, START + timedelta(days=3), groups=4)
+
+        assert len(partitions) == 12
+        assert len({p.key for p in partitions}) == 12
+        assert partitions[0].end == START + timedelta(days=1)
+        assert {p.group for p in partitions} == {0, 1, 2, 3}
+
+    def test_explicit_node_groups_and_partial_last_day(self):
+        """Explicit nodes are sliced into groups; a partial last day is planned whole."""
+        partitions = plan_partitions(
+            "bq", START, START + timedelta(days=1, hours=6),
+            groups=2, node_ids=["C", "A", "B"]
+        )
+
+        assert [p.node_ids for p in partitions[:2]] == [("A", "B"), ("C",)]
+        assert partitions[-1].end == START + timedelta(days=2)
+        assert len(partitions) == 4
+
+    def test_range_is_widened_to_utc_days(self):
+        """Bounds are floored and ceiled to UTC midnight, keeping awareness."""
+        cet = timezone(timedelta(hours=1))
+
+        assert day_bounds(START + timedelta(hours=5), START + timedelta(days=1)) == (
+            START, START + timedelta(days=1)
+        )
+        assert day_bounds(
+            datetime(2024, 1, 2, 0, 30, tzinfo=cet), datetime(2024, 1, 2, 0, 30, tzinfo=cet)
+        ) == (
+            datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 1, 2, tzinfo=timezone.utc)
+        )
+
+    def test_node_group_key_is_fixed_length_and_resumable(self):
+        """Node-group keys fit the checkpoint column and ignore the group count."""
+        nodes = [f"node-{i:05d}" for i in range(2000)]
+        whole = plan_partitions("bq", START, START + timedelta(days=1), groups=1, node_ids=nodes)[0]
+        reordered = BackfillPartition(
+            source="bq", start=START, end=START + timedelta(days=1),
+            group=3, groups=7, node_ids=tuple(reversed(nodes))
+        )
+
+        assert len(whole.key) <= 500
+        assert whole.key == reordered.key
+        assert whole.key != plan_partitions(
+            "bq", START, START + timedelta(days=1), groups=2, node_ids=nodes
+        )[0].key
+
+
+@pytest.mark.unit
+class TestBigQueryPartitionExtractor:
+    """Test per-partition query rendering."""
+
+    def test_hash_group_filter(self):
+        """Hash groups filter on a fingerprint bucket of node_id."""
+        extractor = BigQueryPartitionExtractor(
+            "SELECT * FROM t WHERE timestamp >= @start AND timestamp < @end {partition_filter}",
+            "project", "dataset"
+        )
+        partition = plan_partitions("bq", START, START + timedelta(days=1), groups=4)[2]
+
+        query, job_config = extractor.build(partition)
+
+        assert "MOD(ABS(FARM_FINGERPRINT(node_id)), @groups) = @group" in query
+        params = {p.name: p.value for p in job_config.query_parameters}
+        assert params["groups"] == 4 and params["group"] == 2
+        assert set(params) == {"start", "end", "groups", "group"}
+
+    def test_node_list_filter_and_pickling(self):
+        """Explicit node groups use UNNEST, and extractors survive pickling."""
+        extractor = BigQueryPartitionExtractor("SELECT 1 {partition_filter}", "p", "d")
+        partition = BackfillPartition("bq", START, START + timedelta(days=1), node_ids=("A",))
+
+        query, _ = pickle.loads(pickle.dumps(extractor)).build(partition)
+
+        assert query == "SELECT 1 AND node_id IN UNNEST(@node_ids)"
+
+
+@pytest.mark.unit
+class TestPartitionedBackfill:
+    """Test the extraction and loading pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_loads_and_checkpoints_every_partition(self):
+        """Every partition is loaded once and checkpointed; writers stay bounded."""
+        store = FakeCheckpointStore()
+        partitions = plan_partitions("bq", START, START + timedelta(days=5), groups=4)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            runner = PartitionedBackfill(
+                store, extract_readings, "job", writers=2, executor=executor
+            )
+            stats = await runner.run(partitions)
+
+        assert stats["partitions_completed"] == 20
+        assert stats["rows_loaded"] == 60
+        assert store.loaded_rows == 60
+        assert set(store.completed) == {p.key for p in partitions}
+        assert store.max_active <= 2
+        assert stats["rows_per_second"] > 0
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_interruption(self):
+        """Checkpointed partitions are skipped on the next run."""
+        partitions = plan_partitions("bq", START, START + timedelta(days=2), groups=2)
+        store = FakeCheckpointStore(completed=[p.key for p in partitions[:3]])
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            runner = PartitionedBackfill(store, extract_readings, "job", executor=executor)
+            stats = await runner.run(partitions)
+
+        assert stats["partitions_resumed"] == 3
+        assert stats["partitions_completed"] == 1
+        assert store.loaded_rows == 3
+
+    @pytest.mark.asyncio
+    async def test_rerun_planned_later_resumes(self):
+        """A rerun of a rolling range planned from a later "now" skips completed days."""
+        first_now = START + timedelta(days=3, hours=23, minutes=30)
+        store = FakeCheckpointStore()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            runner = PartitionedBackfill(store, extract_readings, "job", executor=executor)
+            await runner.run(plan_partitions("bq", first_now - timedelta(days=3), first_now, groups=2))
+
+            later_now = first_now + timedelta(hours=1)
+            rerun = PartitionedBackfill(store, extract_readings, "job", executor=executor)
+            stats = await rerun.run(plan_partitions("bq", later_now - timedelta(days=3), later_now, groups=2))
+
+        # Days 1-3 were loaded by the first run (days 0-3); only day 4 is new
+        assert stats["partitions_resumed"] == 6
+        assert stats["partitions_completed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_partitions_are_not_checkpointed(self):
+        """A failing partition is counted and left for the next run."""
+        store = FakeCheckpointStore()
+        partitions = plan_partitions("bq", START, START + timedelta(days=1), groups=3)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            runner = PartitionedBackfill(store, extract_failing_group, "job", executor=executor)
+            stats = await runner.run(partitions)
+
+        assert stats["partitions_failed"] == 1
+        assert stats["partitions_completed"] == 2
+        assert partitions[1].key not in store.completed
+
+    @pytest.mark.asyncio
+    async def test_before_load_hook(self):
+        """The hook sees each partition's frame before it is loaded."""
+        store = FakeCheckpointStore()
+        hook = AsyncMock()
+        partitions = plan_partitions("bq", START, START + timedelta(days=1), groups=2)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            runner = PartitionedBackfill(
+                store, extract_readings, "job", executor=executor, before_load=hook
+            )
+            await runner.run(partitions)
+
+        assert hook.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_process_pool_extraction(self):
+        """Extraction runs in worker processes."""
+        store = FakeCheckpointStore()
+        partitions = plan_partitions("bq", START, START + timedelta(days=2), groups=2)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            runner = PartitionedBackfill(store, extract_readings, "job", executor=executor)
+            stats = await runner.run(partitions)
+
+        assert stats["partitions_completed"] == 4
+        assert store.loaded_rows == 12
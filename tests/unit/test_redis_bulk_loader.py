@@ -0,0 +1,123 @@
+"""
+Unit tests for the pipelined Redis bulk loader and cache warm-up.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure.bigquery.fake_bigquery import ParquetBigQueryFake
+from src.infrastructure.cache.bulk_loader import RedisBulkLoader
+from src.infrastructure.cache.redis_cache_manager import RedisCacheManager
+
+
+def make_manager(frame: pd.DataFrame) -> RedisCacheManager:
+    manager = RedisCacheManager()
+    manager.redis_client = MagicMock()
+    manager.bigquery_client = ParquetBigQueryFake({"": frame})
+    return manager
+
+
+def pipeline_calls(manager: RedisCacheManager, command: str):
+    pipe = manager.redis_client.pipeline.return_value
+    return getattr(pipe, command).call_args_list
+
+
+@pytest.mark.unit
+class TestRedisBulkLoader:
+    """Test chunking and accounting."""
+
+    def test_commands_are_flushed_in_chunks(self):
+        """Pipelines execute every chunk_size commands, not per key."""
+        client = MagicMock()
+        loader = RedisBulkLoader(client, ttl_seconds=60, chunk_size=5000)
+        columns = {"value": [str(i) for i in range(12_000)]}
+
+        loader.write_hashes([f"key:{i}" for i in range(12_000)], columns)
+        loader.flush()
+
+        pipe = client.pipeline.return_value
+        assert pipe.hset.call_count == 12_000
+        assert pipe.expire.call_count == 12_000
+        assert pipe.execute.call_count == 5
+        assert loader.round_trips == 5
+        assert loader.keys_written == 12_000
+        assert loader.keys_per_second > 0
+
+    def test_replace_list_deletes_before_pushing(self):
+        """Lists are replaced rather than appended to on every warm-up."""
+        client = MagicMock()
+        loader = RedisBulkLoader(client, chunk_size=2)
+
+        loader.replace_list("nodes:all", ["A", "B", "C"])
+        loader.flush()
+
+        pipe = client.pipeline.return_value
+        pipe.delete.assert_called_once_with("nodes:all")
+        assert [c.args for c in pipe.rpush.call_args_list] == [
+            ("nodes:all", "A", "B"),
+            ("nodes:all", "C"),
+        ]
+
+
+@pytest.mark.unit
+class TestCacheWarmup:
+    """Test the warm-up methods built on the loader."""
+
+    def test_latest_readings_are_converted_column_wise(self):
+        """Missing values become zero and timestamps are ISO formatted."""
+        timestamp = pd.Timestamp("2024-11-01T10:00:00", tz="UTC")
+        manager = make_manager(pd.DataFrame({
+            "node_id": ["A", "B"],
+            "timestamp": [timestamp, timestamp],
+            "flow_rate": [1.5, np.nan],
+            "pressure": [3.0, 2.0],
+            "temperature": [np.nan, 18.0],
+            "volume": [10.0, 20.0],
+        }))
+
+        keys = manager._cache_latest_readings()
+
+        assert keys == 2
+        calls = pipeline_calls(manager, "hset")
+        assert calls[0].args == ("node:A:latest",)
+        assert calls[0].kwargs["mapping"] == {
+            "timestamp": timestamp.isoformat(),
+            "flow_rate": "1.5",
+            "pressure": "3.0",
+            "temperature": "0.0",
+            "volume": "10.0",
+        }
+        assert calls[1].kwargs["mapping"]["flow_rate"] == "0.0"
+
+    def test_time_series_grouped_once_and_sorted_by_hour(self):
+        """Each node's series is written as one ordered JSON payload."""
+        hours = pd.to_datetime(["2024-11-01 02:00", "2024-11-01 01:00", "2024-11-01 00:00"])
+        manager = make_manager(pd.DataFrame({
+            "hour": list(hours) * 2,
+            "node_id": ["A"] * 3 + ["B"] * 3,
+            "avg_flow": [3.0, 2.0, 1.0, 6.0, np.nan, 4.0],
+            "avg_pressure": [1.0] * 6,
+        }))
+
+        keys = manager._cache_time_series_data()
+
+        assert keys == 2
+        calls = {c.args[0]: json.loads(c.args[1]) for c in pipeline_calls(manager, "set")}
+        assert calls["node:A:timeseries:7d"]["flow_rates"] == [1.0, 2.0, 3.0]
+        assert calls["node:B:timeseries:7d"]["flow_rates"] == [4.0, 0.0, 6.0]
+        assert calls["node:A:timeseries:7d"]["timestamps"][0] == "2024-11-01 00:00:00"
+
+    def test_arrow_reader_is_reused_across_queries(self):
+        """Warm-up queries share one reader, and so one Storage read client."""
+        manager = make_manager(pd.DataFrame({"node_id": ["A"], "value": [1.0]}))
+
+        manager._read_dataframe("SELECT 1")
+        reader = manager._arrow_reader
+        manager._read_dataframe("SELECT 2")
+
+        assert manager._arrow_reader is reader
+        assert reader.client is manager.bigquery_client
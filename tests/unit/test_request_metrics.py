@@ -0,0 +1,184 @@
+"""
+Unit tests for request instrumentation and its system-performance KPI feed.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.api.services.kpis.kpi_defaults import get_default_system_performance_kpis
+from src.api.services.kpis.kpi_engine import KPIEngine, apply_request_metrics
+from src.infrastructure.monitoring.request_metrics import (
+    UNMATCHED_ROUTE,
+    RequestMetrics,
+    RouteStats,
+)
+from src.presentation.api.middleware.instrumentation import instrument_app
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_app(metrics: RequestMetrics) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/nodes/{node_id}")
+    async def node(node_id: str):
+        return {"node_id": node_id}
+
+    @app.get("/fail")
+    async def fail():
+        raise HTTPException(status_code=503, detail="down")
+
+    @app.get("/crash")
+    async def crash():
+        raise RuntimeError("boom")
+
+    instrument_app(app, metrics)
+    return app
+
+
+@pytest.mark.unit
+class TestRequestMetrics:
+    """Test RequestMetrics."""
+
+    def test_window_statistics(self):
+        """Windowed rates and percentiles cover only recent requests."""
+        clock = FakeClock()
+        metrics = RequestMetrics(clock=clock)
+        clock.now += 400
+        for duration in (10.0, 20.0, 30.0):
+            metrics.request_started()
+            metrics.request_finished("GET", "/old", 200, duration)
+        clock.now += 400
+        for duration, status in ((100.0, 200), (300.0, 500)):
+            metrics.request_started()
+            metrics.request_finished("GET", "/new", status, duration)
+
+        window = metrics.window(300)
+
+        assert window["requests"] == 2
+        assert window["errors"] == 1
+        assert window["error_rate"] == 50.0
+        assert window["mean_ms"] == 200.0
+        assert window["throughput_rps"] == pytest.approx(2 / 300)
+        assert window["in_flight"] == 0
+
+    def test_ring_buffer_is_bounded(self):
+        """Only the most recent requests are kept for windows; routes keep totals."""
+        metrics = RequestMetrics(capacity=10)
+        for _ in range(25):
+            metrics.request_started()
+            metrics.request_finished("GET", "/x", 200, 1.0)
+
+        assert metrics.window(300)["requests"] == 10
+        assert metrics.routes()["GET /x"]["count"] == 25
+
+    def test_route_histogram_quantiles(self):
+        """Quantiles resolve to histogram bucket bounds, capped at the max."""
+        stats = RouteStats()
+        for duration in [3.0] * 90 + [700.0] * 10:
+            stats.record(duration, error=False)
+
+        assert stats.quantile(0.5) == 5
+        assert stats.quantile(0.95) == 700.0
+        assert stats.as_dict()["histogram"]["1000"] == 10
+
+    def test_process_usage(self):
+        """Process CPU and RSS are always reported."""
+        process = RequestMetrics().process()
+
+        assert process["cpu_percent"] >= 0
+        assert process["rss_mb"] > 0
+
+
+@pytest.mark.unit
+class TestInstrumentationMiddleware:
+    """Test the middleware and metrics endpoint."""
+
+    def test_records_route_templates_and_statuses(self):
+        """Requests are keyed by route template; 5xx and crashes count as errors."""
+        metrics = RequestMetrics()
+        client = TestClient(make_app(metrics), raise_server_exceptions=False)
+
+        for node_id in ("A", "B", "C"):
+            assert client.get(f"/nodes/{node_id}").status_code == 200
+        assert client.get("/fail").status_code == 503
+        assert client.get("/crash").status_code == 500
+        assert client.get("/missing").status_code == 404
+
+        routes = metrics.routes()
+        assert routes["GET /nodes/{node_id}"]["count"] == 3
+        assert routes["GET /fail"]["errors"] == 1
+        assert routes["GET /crash"]["errors"] == 1
+        assert routes[f"GET {UNMATCHED_ROUTE}"]["errors"] == 0
+        assert metrics.in_flight == 0
+
+    def test_metrics_endpoint(self):
+        """The endpoint serves window, route and process metrics."""
+        metrics = RequestMetrics()
+        client = TestClient(make_app(metrics))
+        client.get("/nodes/A")
+
+        payload = client.get("/api/v1/metrics", params={"window_seconds": 60}).json()
+
+        assert payload["window"]["requests"] == 1
+        assert payload["window"]["window_seconds"] == 60
+        assert "GET /nodes/{node_id}" in payload["routes"]
+        assert payload["process"]["rss_mb"] > 0
+
+
+@pytest.mark.unit
+class TestSystemPerformanceFeed:
+    """Test request metrics reaching the system performance KPIs."""
+
+    def test_overlay_replaces_request_level_values(self):
+        """Measured latency, throughput and error rate replace reading-derived values."""
+        metrics = RequestMetrics()
+        for status in (200, 200, 200, 500):
+            metrics.request_started()
+            metrics.request_finished("GET", "/x", status, 40.0)
+        system = get_default_system_performance_kpis().model_copy(
+            update={"system_uptime": 99.0, "error_rate": 3.0}
+        )
+
+        result = apply_request_metrics(system, metrics)
+
+        assert result.response_time == 40.0
+        assert result.error_rate == 25.0
+        assert result.throughput > 0
+        assert result.system_uptime == 99.0
+        assert result.cpu_utilization is not None
+
+    def test_no_requests_keeps_reading_values(self):
+        """Without recorded requests only process usage is added."""
+        system = get_default_system_performance_kpis().model_copy(update={"error_rate": 3.0})
+
+        result = apply_request_metrics(system, RequestMetrics())
+
+        assert result.error_rate == 3.0
+        assert result.response_time == 0.0
+
+    @pytest.mark.asyncio
+    async def test_engine_applies_request_metrics(self):
+        """KPIs computed by the engine carry the API's measured response time."""
+        metrics = RequestMetrics()
+        metrics.request_started()
+        metrics.request_finished("GET", "/x", 200, 120.0)
+        hybrid_service = MagicMock()
+        hybrid_service.get_readings_frame = AsyncMock(return_value=pd.DataFrame())
+        engine = KPIEngine(request_metrics=metrics)
+
+        end = datetime(2024, 1, 2)
+        results = await engine.compute(hybrid_service, end - timedelta(days=1), end)
+
+        assert results.system_performance.response_time == 120.0
@@ -0,0 +1,264 @@
+"""
+Unit tests for conditional response caching.
+
+Covers ETag/Last-Modified validators derived from the data version, 304
+answers, the server-side body cache and the writers bumping the version.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.infrastructure.cache.async_redis import AsyncRedisClient
+from src.infrastructure.cache.data_version import (
+    DATA_VERSION_KEY,
+    DataVersion,
+    bump_generation,
+    record_ingest,
+    record_write,
+)
+from src.infrastructure.cache.fake_redis import FakeAsyncRedis
+from src.infrastructure.data.hybrid_data_service import HybridDataService
+from src.infrastructure.database.postgres_manager import PostgresManager
+from src.presentation.api.middleware.response_cache import ResponseCache, enable_response_cache
+
+NOW = datetime(2024, 11, 10, 12, 0, tzinfo=timezone.utc)
+CLOSED = {"start_time": "2024-11-01T00:00:00", "end_time": "2024-11-02T00:00:00"}
+OPEN = {"start_time": "2024-11-10T00:00:00", "end_time": "2024-11-10T12:00:00"}
+
+
+class FailingRedis:
+    async def hgetall(self, key):
+        raise ConnectionError("redis down")
+
+
+def make_app(redis) -> FastAPI:
+    app = FastAPI()
+    app.state.calls = 0
+    enable_response_cache(app, data_version=DataVersion(redis, ttl_seconds=0), clock=lambda: NOW)
+
+    @app.get("/api/v1/nodes/{node_id}/history")
+    async def history(node_id: str, start_time: str = None, end_time: str = None, a: str = None, b: str = None):
+        app.state.calls += 1
+        if node_id == "missing":
+            raise HTTPException(status_code=404, detail="not found")
+        return {"node_id": node_id, "calls": app.state.calls}
+
+    @app.get("/api/v1/stream/readings")
+    async def stream(end_time: str = None):
+        app.state.calls += 1
+        return {}
+
+    return app
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test validators, 304s and the body cache."""
+
+    @pytest.fixture
+    def redis(self):
+        """Provide the in-process Redis holding the data version."""
+        return AsyncRedisClient(client=FakeAsyncRedis())
+
+    @pytest.fixture
+    def app(self, redis):
+        """Provide an app with one ranged endpoint behind the cache."""
+        return make_app(redis)
+
+    @pytest.fixture
+    def client(self, app):
+        return TestClient(app)
+
+    def test_closed_range_gets_validators_and_long_max_age(self, client):
+        """Ranges ending in the past are cacheable by clients."""
+        response = client.get("/api/v1/nodes/A/history", params=CLOSED)
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('W/"')
+        assert response.headers["cache-control"] == "public, max-age=86400"
+
+    def test_if_none_match_answers_304_without_endpoint(self, app, client):
+        """A matching ETag is answered before the endpoint runs."""
+        etag = client.get("/api/v1/nodes/A/history", params=CLOSED).headers["etag"]
+
+        response = client.get("/api/v1/nodes/A/history", params=CLOSED, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert app.state.calls == 1
+        assert app.state.response_cache.stats["not_modified"] == 1
+
+    def test_body_cache_keyed_by_normalized_query(self, app, client):
+        """Parameter order does not matter; cached bodies are served as-is."""
+        first = client.get("/api/v1/nodes/A/history?a=1&b=2&start_time=2024-11-01&end_time=2024-11-02")
+        second = client.get("/api/v1/nodes/A/history?end_time=2024-11-02&b=2&start_time=2024-11-01&a=1")
+
+        assert second.json() == first.json() == {"node_id": "A", "calls": 1}
+        assert second.headers["etag"] == first.headers["etag"]
+        assert app.state.response_cache.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ingest_changes_open_but_not_closed_ranges(self, redis, app, client):
+        """New readings invalidate open ranges only."""
+        open_before = client.get("/api/v1/nodes/A/history", params=OPEN)
+        closed_before = client.get("/api/v1/nodes/A/history", params=CLOSED)
+
+        pipe = redis.pipeline()
+        record_ingest(pipe)
+        await pipe.execute()
+
+        open_after = client.get("/api/v1/nodes/A/history", params=OPEN)
+        closed_after = client.get("/api/v1/nodes/A/history", params=CLOSED)
+        assert open_before.headers["cache-control"] == "public, no-cache"
+        assert open_after.headers["etag"] != open_before.headers["etag"]
+        assert open_after.json()["calls"] == 3
+        assert closed_after.headers["etag"] == closed_before.headers["etag"]
+        assert "last-modified" in open_after.headers
+
+    @pytest.mark.asyncio
+    async def test_generation_bump_revalidates_closed_ranges(self, redis, client):
+        """Backfills and corrected loads change closed-range ETags."""
+        etag = client.get("/api/v1/nodes/A/history", params=CLOSED).headers["etag"]
+
+        await bump_generation(redis)
+
+        response = client.get("/api/v1/nodes/A/history", params=CLOSED, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_if_modified_since(self, redis, client):
+        """Last-Modified follows the version change time and is honoured."""
+        await bump_generation(redis)
+        last_modified = client.get("/api/v1/nodes/A/history", params=CLOSED).headers["last-modified"]
+
+        response = client.get("/api/v1/nodes/A/history", params=CLOSED, headers={"If-Modified-Since": last_modified})
+
+        assert response.status_code == 304
+
+    def test_requests_without_range_bypass(self, app, client):
+        """Without an end time nothing is cached or validated."""
+        client.get("/api/v1/nodes/A/history")
+        response = client.get("/api/v1/nodes/A/history")
+
+        assert "etag" not in response.headers
+        assert app.state.calls == 2
+
+    def test_errors_and_streams_are_not_cached(self, app, client):
+        """Only 200 responses are stored; stream paths are excluded."""
+        for _ in range(2):
+            assert client.get("/api/v1/nodes/missing/history", params=CLOSED).status_code == 404
+            client.get("/api/v1/stream/readings", params={"end_time": CLOSED["end_time"]})
+
+        assert app.state.calls == 4
+        assert len(app.state.response_cache) == 0
+
+    def test_redis_unavailable_disables_caching(self):
+        """Without a readable data version responses pass through."""
+        app = make_app(FailingRedis())
+        client = TestClient(app)
+
+        client.get("/api/v1/nodes/A/history", params=CLOSED)
+        response = client.get("/api/v1/nodes/A/history", params=CLOSED)
+
+        assert "etag" not in response.headers
+        assert app.state.calls == 2
+
+    def test_lru_eviction(self):
+        """The body cache keeps at most max_entries responses."""
+        app = FastAPI()
+        cache = enable_response_cache(
+            app, cache=ResponseCache(max_entries=2),
+            data_version=DataVersion(AsyncRedisClient(client=FakeAsyncRedis()), ttl_seconds=0),
+            clock=lambda: NOW
+        )
+
+        @app.get("/series")
+        async def series(end_time: str, n: int):
+            return {"n": n}
+
+        client = TestClient(app)
+        for n in range(3):
+            client.get("/series", params={"end_time": CLOSED["end_time"], "n": n})
+
+        assert len(cache) == 2
+
+
+@pytest.mark.unit
+class TestDataVersionWriters:
+    """Test the paths that bump the data version."""
+
+    @pytest.mark.asyncio
+    async def test_reads_are_reused_within_ttl(self):
+        """One Redis read serves every request inside the TTL."""
+        redis = AsyncRedisClient(client=FakeAsyncRedis())
+        now = [0.0]
+        version = DataVersion(redis, ttl_seconds=1.0, clock=lambda: now[0])
+
+        first = await version.current()
+        pipe = redis.pipeline()
+        record_ingest(pipe)
+        await pipe.execute()
+
+        assert (await version.current()).ingest == first.ingest == 0
+        now[0] = 2.0
+        assert (await version.current()).ingest == 1
+
+    @pytest.mark.asyncio
+    async def test_hot_tier_batch_bumps_ingest(self):
+        """Each written batch advances the ingest counter in the same pipeline."""
+        redis_manager = MagicMock()
+        redis_manager.async_client = AsyncRedisClient(client=FakeAsyncRedis())
+        with patch("src.infrastructure.data.hybrid_data_service.BigQueryClient"):
+            service = HybridDataService(redis_manager=redis_manager)
+        service.postgres_manager = AsyncMock()
+        reading = {"node_id": "A", "timestamp": NOW.replace(tzinfo=None), "flow_rate": 1.0, "pressure": 2.0}
+
+        await service.write_sensor_readings([reading])
+        await service.write_sensor_readings([{**reading, "timestamp": reading["timestamp"] + timedelta(minutes=1)}])
+
+        stored = await service.redis.hgetall(DATA_VERSION_KEY)
+        assert stored["ingest"] == "2"
+
+    @pytest.mark.asyncio
+    async def test_record_write_picks_counter_by_row_age(self):
+        """Recent rows bump ingest; rows older than the settle window bump generation."""
+        redis = AsyncRedisClient(client=FakeAsyncRedis())
+        now = NOW.timestamp()
+
+        await record_write(redis, NOW - timedelta(minutes=10), now=now)
+        await record_write(redis, (NOW - timedelta(days=3)).replace(tzinfo=None), now=now)
+
+        stored = await redis.hgetall(DATA_VERSION_KEY)
+        assert (stored["ingest"], stored["generation"]) == ("1", "1")
+
+    @pytest.mark.asyncio
+    async def test_postgres_writes_move_the_version(self):
+        """Committed reading loads bump the version; fully duplicate loads do not."""
+        redis = AsyncRedisClient(client=FakeAsyncRedis())
+        conn = MagicMock()
+        conn.copy_records_to_table = AsyncMock()
+        conn.execute = AsyncMock(side_effect=["", "INSERT 0 1", "", "INSERT 0 0"])
+        conn.fetch = AsyncMock(return_value=[])
+        conn.transaction.return_value.__aenter__ = AsyncMock()
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+        manager = PostgresManager(redis=redis)
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        manager.acquire = acquire
+        backfilled = {"node_id": "A", "timestamp": datetime(2024, 1, 1), "flow_rate": 1.0}
+
+        await manager.insert_sensor_readings_batch([backfilled])
+        await manager.insert_sensor_readings_batch([backfilled])
+
+        stored = await redis.hgetall(DATA_VERSION_KEY)
+        assert stored.get("generation") == "1"
+        assert "ingest" not in stored
@@ -0,0 +1,218 @@
+"""
+Unit tests for password hashing and session tokens.
+
+Covers the bounded hashing pool, keyed token digests, the session cache
+and the login/session/logout routes built on them.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import src.infrastructure.security.passwords as passwords
+import src.infrastructure.security.sessions as sessions
+from src.infrastructure.security.passwords import PasswordHasher, hash_password
+from src.infrastructure.security.sessions import SessionCache, SessionInfo, token_digest
+from src.presentation.api.user_routes import router
+
+SECRET = b"test-secret"
+USER_ID = "6f1c1d7e-4c1e-4c52-9a38-5b8f0f0e3a11"
+
+
+def session_info(user_id: str = USER_ID, hours: int = 8) -> SessionInfo:
+    return SessionInfo(
+        user_id=user_id,
+        email="operator@example.com",
+        name="Operator",
+        role="operator",
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=hours),
+        permissions=("view_dashboard",),
+    )
+
+
+@pytest.mark.unit
+class TestPasswordHasher:
+    """Test bcrypt in the worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        """Hashes made in the pool verify, wrong passwords and bad hashes do not."""
+        hasher = PasswordHasher(max_workers=2, rounds=4)
+        hashed = await hasher.hash("s3cret")
+
+        assert await hasher.verify("s3cret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert not await hasher.verify("s3cret", "not-a-bcrypt-hash")
+        assert not await hasher.verify("s3cret", None)
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop(self):
+        """Hashing happens in the pool's threads, never on the loop thread."""
+        hasher = PasswordHasher(max_workers=1, rounds=4)
+
+        await asyncio.gather(*(hasher.hash("x") for _ in range(3)))
+
+        assert hasher._executor._max_workers == 1
+        assert all(thread.name.startswith("password-hash") for thread in hasher._executor._threads)
+
+
+@pytest.mark.unit
+class TestSessionTokens:
+    """Test token digests and the session cache."""
+
+    def test_digest_is_deterministic_and_keyed(self):
+        """The same token and key always give the same indexable digest."""
+        digest = token_digest("abc", SECRET)
+
+        assert digest == token_digest("abc", SECRET)
+        assert digest != token_digest("abc", b"other-secret")
+        assert len(digest) == 64
+
+    def test_cache_expires_after_ttl(self):
+        """Entries are trusted for ttl_seconds only."""
+        now = [0.0]
+        cache = SessionCache(ttl_seconds=60, clock=lambda: now[0])
+        cache.put("d1", session_info())
+
+        assert cache.get("d1") is not None
+        now[0] = 61
+        assert cache.get("d1") is None
+        assert len(cache) == 0
+
+    def test_expired_sessions_are_not_served(self):
+        """A session past its expiry is dropped even within the TTL."""
+        cache = SessionCache()
+        cache.put("d1", session_info(hours=-1))
+
+        assert cache.get("d1") is None
+
+    def test_revoke_and_revoke_user(self):
+        """Revocation removes one session or all of a user's sessions."""
+        cache = SessionCache()
+        cache.put("d1", session_info())
+        cache.put("d2", session_info())
+        cache.put("d3", session_info(user_id="other"))
+
+        cache.revoke("d1")
+        assert cache.get("d1") is None
+        cache.revoke_user(USER_ID)
+
+        assert cache.get("d2") is None
+        assert cache.get("d3") is not None
+        assert cache.stats["revoked"] == 2
+
+    def test_bounded(self):
+        """The least recently used session is evicted first."""
+        cache = SessionCache(max_entries=2)
+        for digest in ("d1", "d2", "d3"):
+            cache.put(digest, session_info())
+
+        assert len(cache) == 2
+        assert cache.get("d1") is None
+
+
+@pytest.mark.unit
+class TestSessionRoutes:
+    """Test login, session validation and logout."""
+
+    @pytest.fixture(autouse=True)
+    def security(self, monkeypatch):
+        """Use a fixed token key, a cheap bcrypt cost and a fresh session cache."""
+        monkeypatch.setattr(sessions, "_token_secret", SECRET)
+        monkeypatch.setattr(sessions, "_session_cache", SessionCache())
+        monkeypatch.setattr(passwords, "_password_hasher", PasswordHasher(max_workers=2, rounds=4))
+
+    @pytest.fixture
+    def conn(self):
+        """Provide a connection stub holding one active user."""
+        conn = MagicMock()
+        conn.fetchrow = AsyncMock(return_value={
+            "id": USER_ID,
+            "email": "operator@example.com",
+            "name": "Operator",
+            "password_hash": hash_password("s3cret", rounds=4),
+            "role": "operator",
+            "status": "active",
+            "failed_login_attempts": 0,
+            "locked_until": None,
+        })
+        conn.fetch = AsyncMock(return_value=[{"permission": "view_dashboard"}])
+        conn.execute = AsyncMock()
+        conn.fetchval = AsyncMock(return_value=USER_ID)
+        return conn
+
+    @pytest.fixture
+    def client(self, conn):
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        app = FastAPI()
+        app.state.pool = MagicMock()
+        app.state.pool.acquire = acquire
+        app.include_router(router)
+        return TestClient(app)
+
+    def login(self, client, password="s3cret"):
+        return client.post("/api/v1/auth/login", json={"email": "operator@example.com", "password": password})
+
+    def test_login_stores_token_digest(self, client, conn):
+        """The session row holds the HMAC digest of the returned token."""
+        response = self.login(client)
+
+        assert response.status_code == 200
+        token = response.json()["token"]
+        insert = next(call for call in conn.execute.await_args_list if "user_sessions" in call.args[0])
+        assert insert.args[2] == token_digest(token, SECRET)
+
+    def test_wrong_password_rejected(self, client):
+        """A failed bcrypt check in the pool still answers 401."""
+        assert self.login(client, password="wrong").status_code == 401
+
+    def test_session_served_from_cache(self, client, conn):
+        """A freshly issued token validates without another query."""
+        token = self.login(client).json()["token"]
+        conn.fetchrow.reset_mock()
+
+        response = client.get("/api/v1/auth/session", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert response.json()["user"]["permissions"] == ["view_dashboard"]
+        conn.fetchrow.assert_not_awaited()
+
+    def test_cache_miss_is_one_indexed_lookup(self, client, conn):
+        """Unknown tokens are looked up once by digest and then cached."""
+        conn.fetchrow = AsyncMock(return_value={
+            "id": USER_ID, "email": "operator@example.com", "name": "Operator", "role": "operator",
+            "expires_at": datetime.now(timezone.utc) + timedelta(hours=1), "permissions": ["view_dashboard"],
+        })
+        headers = {"Authorization": "Bearer issued-elsewhere"}
+
+        assert client.get("/api/v1/auth/session", headers=headers).status_code == 200
+        assert client.get("/api/v1/auth/session", headers=headers).status_code == 200
+
+        conn.fetchrow.assert_awaited_once()
+        assert conn.fetchrow.await_args.args[1] == token_digest("issued-elsewhere", SECRET)
+
+    def test_invalid_or_missing_token(self, client, conn):
+        """Tokens without a session, or no token at all, get 401."""
+        conn.fetchrow = AsyncMock(return_value=None)
+
+        assert client.get("/api/v1/auth/session", headers={"Authorization": "Bearer nope"}).status_code == 401
+        assert client.get("/api/v1/auth/session").status_code == 401
+
+    def test_logout_revokes(self, client, conn):
+        """After logout the token is neither cached nor in the database."""
+        token = self.login(client).json()["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+        conn.fetchrow = AsyncMock(return_value=None)
+
+        assert client.get("/api/v1/auth/session", headers=headers).status_code == 401
+        assert conn.fetchval.await_args.args[1] == token_digest(token, SECRET)